@@ -42,6 +42,7 @@ hiddenimports = [
     'requests',
     'sqlite3',
     'py_mini_racer',
+    'jsonschema',
 ]
 
 a = Analysis(
@@ -11,11 +11,26 @@ Date: 2025
 
 import sys
 import os
+import multiprocessing
+
+if __name__ == "__main__":
+    # Worker processes of batch security scans and sharded collection runs
+    # start the frozen executable; they must not get as far as loading Qt
+    multiprocessing.freeze_support()
+
+if __name__ == "__main__" and sys.argv[1:2] in (["run"], ["load"]):
+    # Headless collection run or load test (`postmini run ...`): don't load Qt at all
+    from src.cli import main as cli_main
+    sys.exit(cli_main(sys.argv[1:]))
+
 from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QIcon, QFontDatabase
 
-from src.ui.main_window import MainWindow
+from src.core.startup_trace import startup_trace
+
+with startup_trace.section("import_main_window"):
+    from src.ui.main_window import MainWindow
 from src.core.app_paths import get_app_paths
 
 
@@ -52,15 +67,13 @@ def load_custom_fonts():
                 if font_id != -1:
                     font_families = QFontDatabase.applicationFontFamilies(font_id)
                     loaded_fonts.extend(font_families)
-                    print(f"[OK] Loaded font: {font_path.name}")
                 else:
                     print(f"[Warning] Failed to load font: {font_path}")
             else:
                 print(f"[Warning] Font file not found: {font_path}")
         
         if loaded_fonts:
-            print(f"[OK] Successfully loaded {len(set(loaded_fonts))} custom font families")
-            print(f"[OK] Font families available: {', '.join(set(loaded_fonts))}")
+            print(f"[OK] Loaded custom fonts: {', '.join(sorted(set(loaded_fonts)))}")
         else:
             print("[Warning] No custom fonts were loaded. Using system defaults.")
             
@@ -170,7 +183,8 @@ def main():
     )
     
     # Create the application instance
-    app = QApplication(sys.argv)
+    with startup_trace.section("qapplication"):
+        app = QApplication(sys.argv)
     
     # Set application metadata
     app.setApplicationName("PostMini")
@@ -178,7 +192,8 @@ def main():
     app.setApplicationVersion("2.0.3")
     
     # Load custom fonts BEFORE loading stylesheets
-    load_custom_fonts()
+    with startup_trace.section("fonts"):
+        load_custom_fonts()
     
     # Set application icon (try ICO first for better Windows support, fallback to PNG)
     icon_path_ico = app_paths.get_resources_dir() / "postmini_logo.ico"
@@ -198,18 +213,24 @@ def main():
     stylesheet_file = "styles_dark.qss" if current_theme == "dark" else "styles.qss"
     
     # Load and apply the stylesheet
-    stylesheet = load_stylesheet(stylesheet_file)
-    if stylesheet:
-        app.setStyleSheet(stylesheet)
-        print(f"[OK] {current_theme.capitalize()} theme loaded successfully")
+    with startup_trace.section("stylesheet"):
+        stylesheet = load_stylesheet(stylesheet_file)
+        if stylesheet:
+            app.setStyleSheet(stylesheet)
+            print(f"[OK] {current_theme.capitalize()} theme loaded successfully")
     
     # Create and show the main window with the database path and theme
-    main_window = MainWindow(db_path=str(app_paths.database_path), theme=current_theme)
+    with startup_trace.section("main_window"):
+        main_window = MainWindow(db_path=str(app_paths.database_path), theme=current_theme)
     
     # Update script tab theme to match saved preference (already set in __init__)
     # No need to set current_theme again, it's already set in constructor
     
-    main_window.show()
+    with startup_trace.section("show"):
+        main_window.show()
+    
+    # Report startup timings once the first event loop iteration has run
+    QTimer.singleShot(0, startup_trace.print_report)
     
     # Start the event loop
     sys.exit(app.exec())
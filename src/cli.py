@@ -0,0 +1,491 @@
+"""
+PostMini Command Line
+
+    postmini run <collection> [options]
+    postmini load <collection> [options]
+
+``run`` runs a collection's tests without the desktop UI (e.g. in CI) and
+writes the same reports as the Collection Test Runner; ``load`` load tests
+the collection (or one of its requests) like the Load Test dialog. The
+collection is a git-sync export (a ``.postmini/collections`` file or split
+collection directory) or the name or ID of a collection in the application
+database.
+
+Nothing here may import PyQt6: main.py dispatches ``run`` and ``load`` to
+this module before loading Qt, and ``python -m src.cli run ...`` works the
+same way.
+
+Exit codes: 0 if all tests passed (or the error rate of a load test stayed
+within --max-error-rate), 1 if a test failed or a request could not be sent
+(or the error rate was exceeded), 2 for invalid arguments or an unreadable
+collection / environment.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from src.features import iteration_data
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_ERROR = 2
+
+# Reporter name -> (generator class name, default output file)
+REPORTERS = {
+    'html': ('HTMLReportGenerator', 'postmini-report.html'),
+    'junit': ('JUnitXMLGenerator', 'postmini-report.xml'),
+    'json': ('JSONReportGenerator', 'postmini-report.json'),
+    'csv': ('CSVReportGenerator', 'postmini-report.csv'),
+}
+
+# Reporters of `postmini load`
+LOAD_REPORTERS = {
+    'html': ('LoadTestHTMLReportGenerator', 'postmini-load-report.html'),
+    'json': ('LoadTestJSONReportGenerator', 'postmini-load-report.json'),
+}
+
+
+class CliError(Exception):
+    """Raised for errors reported to the user with EXIT_ERROR."""
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser."""
+    parser = argparse.ArgumentParser(prog='postmini', description="PostMini command line")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser(
+        'run', help="Run a collection's tests",
+        description="Run the tests of a collection without the desktop UI."
+    )
+    _add_collection_arguments(run)
+    run.add_argument('-n', '--iterations', type=int, metavar='N',
+                     help="Number of times to run the collection (default: 1, or one per data row)")
+    run.add_argument('-d', '--iteration-data', metavar='PATH',
+                     help="CSV or JSON (lines or array) data file with one row per iteration")
+    run.add_argument('--data-format', choices=iteration_data.FORMATS,
+                     help="Format of the data file (default: detected from the file)")
+    run.add_argument('-c', '--concurrency', type=int, default=1, metavar='N',
+                     help="Number of requests run at once, across iterations and independent "
+                          "requests of an iteration (default: 1)")
+    run.add_argument('-p', '--processes', type=int, default=1, metavar='N',
+                     help="Split the run across N worker processes, each running --concurrency "
+                          "requests at once, for collections with CPU-heavy scripts (default: 1)")
+    run.add_argument('-r', '--reporter', action='append', default=[], metavar='NAME[:PATH]',
+                     help="Report format: cli, html, junit, json or csv, optionally with an "
+                          "output file (repeatable; default: cli)")
+    run.add_argument('--no-scripts', action='store_true',
+                     help="Do not run pre-request and post-response scripts")
+    run.add_argument('--serial', action='store_true',
+                     help="Send the requests of each iteration one after another in collection order "
+                          "(default: in parallel where they don't share variables)")
+    _add_client_arguments(run)
+
+    load = commands.add_parser(
+        'load', help="Load test a collection or request",
+        description="Send the requests of a collection (or one request) under load and "
+                    "report throughput, error rate and latency percentiles."
+    )
+    _add_collection_arguments(load)
+    load.add_argument('--request', metavar='NAME',
+                      help="Load test only this request (name or ID) of the collection")
+    load.add_argument('-c', '--concurrency', type=int, default=10, metavar='N',
+                      help="Number of workers, i.e. requests in flight at once (default: 10)")
+    load.add_argument('--rps', type=float, metavar='RATE',
+                      help="Target requests per second (default: as fast as the workers can send)")
+    load.add_argument('--duration', type=float, default=30, metavar='SECONDS',
+                      help="Duration of the load test, including the ramp-up (default: 30)")
+    load.add_argument('--ramp-up', type=float, default=0, metavar='SECONDS',
+                      help="Seconds over which the workers start, or the rate rises (default: 0)")
+    load.add_argument('--max-error-rate', type=float, metavar='PERCENT',
+                      help="Exit with 1 if more than this percentage of requests failed")
+    load.add_argument('-r', '--reporter', action='append', default=[], metavar='NAME[:PATH]',
+                      help="Report format: cli, html or json, optionally with an output file "
+                           "(repeatable; default: cli)")
+    _add_client_arguments(load)
+    return parser
+
+
+def _add_collection_arguments(parser: argparse.ArgumentParser):
+    """Arguments selecting the collection and variables (shared by the commands)."""
+    parser.add_argument('collection',
+                        help="Collection export file or split collection directory, "
+                             "or the name or ID of a collection in the database")
+    parser.add_argument('--db', metavar='PATH',
+                        help="Application database (default: the desktop app's database)")
+    parser.add_argument('-e', '--environment', metavar='ENV',
+                        help="Environment export file, or the name of an environment in the database")
+    parser.add_argument('--env-var', metavar='KEY=VALUE', action='append', default=[],
+                        help="Set an environment variable, e.g. a secret (repeatable)")
+
+
+def _add_client_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--timeout', type=int, default=30, metavar='SECONDS',
+                        help="Request timeout in seconds (default: 30)")
+    parser.add_argument('--insecure', action='store_true',
+                        help="Do not verify SSL certificates")
+
+
+def parse_reporters(specs: List[str], available: Optional[Dict] = None) -> List[Tuple[str, Optional[str]]]:
+    """
+    Parse --reporter values.
+
+    Args:
+        specs: NAME[:PATH] values
+        available: File reporters of the command (default: REPORTERS)
+
+    Returns:
+        List of (name, output path); the path is None for the cli reporter
+
+    Raises:
+        CliError: If a reporter is unknown
+    """
+    available = available or REPORTERS
+    reporters = []
+    for spec in specs or ['cli']:
+        name, _, path = spec.partition(':')
+        name = name.strip().lower()
+        if name == 'cli':
+            reporters.append(('cli', None))
+        elif name in available:
+            reporters.append((name, path or available[name][1]))
+        else:
+            raise CliError(f"Unknown reporter '{name}' (choose from cli, {', '.join(available)})")
+    return reporters
+
+
+def parse_env_vars(pairs: List[str]) -> Dict[str, str]:
+    """Parse --env-var KEY=VALUE pairs."""
+    variables = {}
+    for pair in pairs:
+        key, sep, value = pair.partition('=')
+        if not sep or not key.strip():
+            raise CliError(f"Invalid --env-var '{pair}' (expected KEY=VALUE)")
+        variables[key.strip()] = value
+    return variables
+
+
+def _open_db(path: Optional[str]):
+    """Open an existing application database."""
+    from src.core.database import DatabaseManager
+
+    if not path:
+        from src.core.app_paths import get_app_paths
+        path = str(get_app_paths().database_path)
+    if not os.path.isfile(path):
+        raise CliError(f"Database not found: {path}")
+    return DatabaseManager(path)
+
+
+def load_collection(target: str, db_path: Optional[str]) -> Tuple[Dict, object]:
+    """
+    Load the collection to run.
+
+    Returns:
+        Tuple of (collection, database or None if read from an export)
+    """
+    from src.features import collection_runner
+
+    if os.path.exists(target):
+        try:
+            return collection_runner.read_collection(target), None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise CliError(f"Cannot read collection '{target}': {e}")
+
+    db = _open_db(db_path)
+    collections = db.get_all_collections()
+    match = next((c for c in collections if c['name'] == target), None)
+    if match is None and target.isdigit():
+        match = next((c for c in collections if c['id'] == int(target)), None)
+    if match is None:
+        raise CliError(f"Collection '{target}' is neither a file nor a collection in {db.db_path}")
+    return collection_runner.load_collection(db, match['id']), db
+
+
+def load_environment(target: Optional[str], db, db_path: Optional[str]) -> Tuple[str, Dict[str, str]]:
+    """
+    Load the environment's name and variables.
+
+    The file may be a git-sync environment export or a plain JSON object of
+    variables. Secret variables are exported as placeholders and have to be
+    passed with --env-var.
+    """
+    if not target:
+        return '', {}
+
+    if os.path.isfile(target):
+        try:
+            with open(target, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CliError(f"Cannot read environment '{target}': {e}")
+        if isinstance(data, dict) and isinstance(data.get('environment'), dict):
+            environment = data['environment']
+            return environment.get('name', target), dict(environment.get('variables') or {})
+        if isinstance(data, dict):
+            return os.path.splitext(os.path.basename(target))[0], data
+        raise CliError(f"Environment '{target}' is not a JSON object")
+
+    db = db or _open_db(db_path)
+    environment = next((e for e in db.get_all_environments() if e['name'] == target), None)
+    if environment is None:
+        raise CliError(f"Environment '{target}' is neither a file nor an environment in {db.db_path}")
+    return environment['name'], dict(environment.get('variables') or {})
+
+
+def print_summary(summary: Dict, out=None):
+    """Print the results of a run (the cli reporter)."""
+    out = out or sys.stdout
+    iterations = summary.get('iterations', 1)
+    for entry in summary['results']:
+        name = entry['request_name']
+        if iterations > 1:
+            name = f"{name} (iteration {entry['iteration']})"
+        if not entry['success']:
+            print(f"[ERROR] {name}: {entry['error']}", file=out)
+            continue
+        results = entry['results']
+        failed = [r for r in results if not r.passed]
+        status = 'FAIL' if failed else 'PASS'
+        print(f"[{status}] {name}: {len(results) - len(failed)}/{len(results)} tests passed", file=out)
+        for result in failed:
+            assertion = result.assertion
+            print(f"    - {assertion.type}: {assertion.field or assertion.operator}: "
+                  f"{result.error_message or 'Assertion failed'}", file=out)
+
+    print("", file=out)
+    print(f"Requests: {summary['total_requests']}  Tests: {summary['total_tests']}  "
+          f"Passed: {summary['passed']}  Failed: {summary['failed']}  Errors: {summary['errors']}", file=out)
+    if summary.get('stopped'):
+        print("Run stopped before all requests completed", file=out)
+
+
+def write_reports(reporters: List[Tuple[str, Optional[str]]], summary: Dict, metadata: Dict):
+    """Write the file reports with the report generators of the desktop app."""
+    from src.features import test_report_generator
+
+    test_results = [result for entry in summary['results'] for result in entry.get('results', [])]
+    for name, path in reporters:
+        if name == 'cli':
+            continue
+        generator = getattr(test_report_generator, REPORTERS[name][0])
+        content = generator.generate(test_results, metadata)
+        try:
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                f.write(content)
+        except OSError as e:
+            raise CliError(f"Cannot write {name} report to {path}: {e}")
+        print(f"[OK] {name} report written to {path}")
+
+
+def run_command(args) -> int:
+    """Run a collection; returns the exit code."""
+    from src.core.api_client import ApiClient
+    from src.features.collection_runner import CollectionRunner
+    from src.features.sharded_runner import ShardedCollectionRunner
+
+    if (args.iterations is not None and args.iterations < 1) or args.concurrency < 1 or args.processes < 1:
+        raise CliError("--iterations, --concurrency and --processes must be at least 1")
+    if args.iteration_data and not os.path.isfile(args.iteration_data):
+        raise CliError(f"Data file not found: {args.iteration_data}")
+    reporters = parse_reporters(args.reporter)
+    env_overrides = parse_env_vars(args.env_var)
+
+    collection, db = load_collection(args.collection, args.db)
+    environment_name, environment = load_environment(args.environment, db, args.db)
+    environment.update(env_overrides)
+    extracted = {var['name']: var['value'] for var in db.get_all_extracted_variables()} if db else {}
+
+    api_client = ApiClient(timeout=args.timeout, verify_ssl=not args.insecure)
+    sharding = {'processes': args.processes} if args.processes > 1 else {}
+    runner = (ShardedCollectionRunner if sharding else CollectionRunner)(
+        api_client,
+        environment=environment,
+        collection_variables=collection['variables'],
+        extracted_variables=extracted,
+        run_scripts=not args.no_scripts,
+        iterations=args.iterations,
+        concurrency=args.concurrency,
+        data_file=args.iteration_data,
+        data_format=args.data_format,
+        keep_responses=False,
+        serial=args.serial,
+        **sharding
+    )
+
+    start = time.time()
+    try:
+        summary = runner.run(collection['requests'])
+    except (iteration_data.DataFileError, OSError) as e:
+        raise CliError(f"Cannot read data file '{args.iteration_data}': {e}")
+    except KeyboardInterrupt:
+        runner.stop()
+        raise
+    finally:
+        api_client.close()
+    duration = round(time.time() - start, 3)
+
+    if any(name == 'cli' for name, _ in reporters):
+        print_summary(summary)
+    metadata = {
+        'collection_name': collection['name'],
+        'timestamp': datetime.now().isoformat(),
+        'environment': environment_name,
+        'duration': duration
+    }
+    write_reports(reporters, summary, metadata)
+
+    if summary['failed'] or summary['errors']:
+        return EXIT_FAILED
+    return EXIT_OK
+
+
+def select_requests(collection: Dict, target: Optional[str]) -> List[Dict]:
+    """The requests to load test: all of the collection, or the one named `target`."""
+    requests = collection['requests']
+    if target:
+        match = next((r for r in requests if r['name'] == target), None)
+        if match is None and target.isdigit():
+            match = next((r for r in requests if r['id'] == int(target)), None)
+        if match is None:
+            raise CliError(f"Request '{target}' not found in collection '{collection['name']}'")
+        return [match]
+    if not requests:
+        raise CliError(f"Collection '{collection['name']}' has no requests")
+    return requests
+
+
+def print_load_progress(snapshot: Dict, out=None):
+    """Print one line of the progress of a load test."""
+    latency = snapshot['latency']
+    print(f"{snapshot['elapsed']:6.1f}s  {snapshot['total_requests']:7d} requests  "
+          f"{snapshot['current_rps']:8.1f} req/s  p50 {latency['p50']:.1f} ms  p99 {latency['p99']:.1f} ms  "
+          f"errors {snapshot['error_rate'] * 100:.2f}%", file=out or sys.stdout)
+
+
+def print_load_summary(result: Dict, out=None):
+    """Print the results of a load test (the cli reporter)."""
+    out = out or sys.stdout
+    columns = ('min', 'p50', 'p90', 'p99', 'p999', 'max')
+    print("", file=out)
+    print(f"{'Request':<32} {'Count':>8} {'Errors':>7} " + ' '.join(f"{c:>9}" for c in columns), file=out)
+    rows = [(f"{r['method']} {r['name']}", r['requests'], r['errors'] + r['failed'], r['latency'])
+            for r in result['requests']]
+    if len(rows) > 1:
+        rows.append(("All requests", result['total_requests'], result['errors'] + result['failed'],
+                     result['latency']))
+    for name, count, errors, latency in rows:
+        print(f"{name[:32]:<32} {count:>8} {errors:>7} " + ' '.join(f"{latency[c]:>9.1f}" for c in columns),
+              file=out)
+    print("", file=out)
+    print(f"Requests: {result['total_requests']}  Throughput: {result['throughput']:.1f} req/s  "
+          f"Error rate: {result['error_rate'] * 100:.2f}%  (latency in ms)", file=out)
+    for code, count in result['status_codes'].items():
+        print(f"    HTTP {code}: {count}", file=out)
+    for message, count in result['error_messages'].items():
+        print(f"    Error: {message}: {count}", file=out)
+    if result['stopped']:
+        print("Load test stopped before the end of its duration", file=out)
+
+
+def load_command(args) -> int:
+    """Load test a collection or request; returns the exit code."""
+    from src.core.api_client import ApiClient
+    from src.features import test_report_generator
+    from src.features.load_test import LoadTest
+
+    reporters = parse_reporters(args.reporter, LOAD_REPORTERS)
+    env_overrides = parse_env_vars(args.env_var)
+    collection, db = load_collection(args.collection, args.db)
+    requests = select_requests(collection, args.request)
+    environment_name, environment = load_environment(args.environment, db, args.db)
+    environment.update(env_overrides)
+    extracted = {var['name']: var['value'] for var in db.get_all_extracted_variables()} if db else {}
+
+    show_progress = any(name == 'cli' for name, _ in reporters)
+    api_client = ApiClient(timeout=args.timeout, verify_ssl=not args.insecure)
+    try:
+        load_test = LoadTest(
+            api_client,
+            requests,
+            environment=environment,
+            collection_variables=collection['variables'],
+            extracted_variables=extracted,
+            duration=args.duration,
+            concurrency=args.concurrency,
+            target_rps=args.rps,
+            ramp_up=args.ramp_up,
+            progress_callback=print_load_progress if show_progress else None
+        )
+    except ValueError as e:
+        raise CliError(str(e))
+
+    try:
+        result = load_test.run()
+    except KeyboardInterrupt:
+        load_test.stop()
+        raise
+    finally:
+        api_client.close()
+
+    if show_progress:
+        print_load_summary(result)
+    metadata = {
+        'name': args.request or collection['name'],
+        'environment': environment_name
+    }
+    for name, path in reporters:
+        if name == 'cli':
+            continue
+        generator = getattr(test_report_generator, LOAD_REPORTERS[name][0])
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(generator.generate(result, metadata))
+        except OSError as e:
+            raise CliError(f"Cannot write {name} report to {path}: {e}")
+        print(f"[OK] {name} report written to {path}")
+
+    if args.max_error_rate is not None and result['error_rate'] * 100 > args.max_error_rate:
+        return EXIT_FAILED
+    return EXIT_OK
+
+
+COMMANDS = {
+    'run': run_command,
+    'load': load_command,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point.
+
+    Args:
+        argv: Arguments without the program name (default: sys.argv[1:])
+
+    Returns:
+        Exit code
+    """
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return EXIT_OK if e.code == 0 else EXIT_ERROR
+
+    try:
+        return COMMANDS[args.command](args)
+    except CliError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    except KeyboardInterrupt:
+        print("Interrupted", file=sys.stderr)
+        return EXIT_FAILED
+
+
+if __name__ == '__main__':
+    sys.exit(main())
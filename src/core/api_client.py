@@ -31,6 +31,22 @@ class ApiResponse:
         self.text = response.text
         self.size = len(response.content)
     
+    def iter_content(self, chunk_size: int):
+        """
+        Iterate over the raw response body in chunks, without decoding it.
+        
+        Chunks are sliced as they are consumed, so a reader that stops early
+        (e.g. a size-limited security scan) only copies what it read.
+        
+        Args:
+            chunk_size: Size of each chunk in bytes
+        
+        Returns:
+            Iterator of bytes chunks
+        """
+        content = self.response.content
+        return (content[i:i + chunk_size] for i in range(0, len(content), chunk_size))
+    
     def json(self):
         """
         Parse response as JSON.
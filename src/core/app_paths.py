@@ -54,6 +54,7 @@ class AppPaths:
         # Create subdirectories
         self.logs_dir.mkdir(exist_ok=True)
         self.exports_dir.mkdir(exist_ok=True)
+        self.security_rules_dir.mkdir(exist_ok=True)
     
     @property
     def app_data_dir(self) -> Path:
@@ -75,6 +76,11 @@ class AppPaths:
         """Get the exports directory."""
         return self._app_data_dir / "exports"
     
+    @property
+    def security_rules_dir(self) -> Path:
+        """Get the directory of user security rule packs (*.json)."""
+        return self._app_data_dir / "security_rules"
+    
     @property
     def settings_file(self) -> Path:
         """Get the settings file path."""
@@ -126,6 +132,7 @@ class AppPaths:
             f"  Database: {self.database_path}\n"
             f"  Logs: {self.logs_dir}\n"
             f"  Exports: {self.exports_dir}\n"
+            f"  Security Rules: {self.security_rules_dir}\n"
             f"  Install Dir: {self.get_install_dir()}\n"
         )
 
@@ -7,31 +7,109 @@ It manages collections, requests, and environments with full CRUD functionality.
 
 import sqlite3
 import json
+from contextlib import contextmanager
+from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 
 
+class _DeferredCommitConnection:
+    """
+    Connection proxy used inside DatabaseManager.transaction().
+    
+    Individual operations keep their commit() / rollback() semantics within
+    the transaction: commit() marks the writes made so far as done and
+    rollback() undoes the writes made since the last commit(), through a
+    savepoint of the transaction block. Whether anything is committed is
+    left to the transaction.
+    """
+    
+    def __init__(self, connection: sqlite3.Connection, savepoint: str):
+        self._connection = connection
+        self._savepoint = savepoint
+        connection.execute(f"SAVEPOINT {savepoint}")
+    
+    def commit(self):
+        self._connection.execute(f"RELEASE {self._savepoint}")
+        self._connection.execute(f"SAVEPOINT {self._savepoint}")
+    
+    def rollback(self):
+        self._connection.execute(f"ROLLBACK TO {self._savepoint}")
+    
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
 class DatabaseManager:
     """
     Manages SQLite database operations for collections, requests, and environments.
     """
     
-    def __init__(self, db_path: str = "api_client.db"):
+    def __init__(self, db_path: str = "api_client.db", read_only: bool = False):
         """
         Initialize the database manager and create tables if they don't exist.
         
         Args:
             db_path: Path to the SQLite database file
+            read_only: Open an existing database read-only, without creating
+                tables or running migrations (for background readers, which
+                then never hold a write lock the UI thread waits on)
         """
         self.db_path = db_path
+        self.read_only = read_only
         self.connection = None
+        self._transaction_depth = 0
         self._connect()
-        self._create_tables()
+        if not read_only:
+            self._create_tables()
     
     def _connect(self):
         """Establish connection to the SQLite database."""
-        self.connection = sqlite3.connect(self.db_path)
+        if self.read_only:
+            uri = Path(self.db_path).absolute().as_uri() + "?mode=ro"
+            self.connection = sqlite3.connect(uri, uri=True)
+        else:
+            self.connection = sqlite3.connect(self.db_path)
         self.connection.row_factory = sqlite3.Row  # Enable column access by name
     
+    @contextmanager
+    def transaction(self):
+        """
+        Group database writes into a single transaction.
+        
+        Operations inside the block do not commit individually; everything is
+        committed once when the block ends, or rolled back if it raises. An
+        operation that rolls back after an error still undoes its own writes
+        (see _DeferredCommitConnection). Nested blocks use savepoints, so a
+        failing inner block only undoes its own writes.
+        
+        Like the connection itself, a DatabaseManager belongs to the thread
+        that created it (sqlite3 refuses calls from other threads), so the
+        connection swapped in here is only ever seen by that thread.
+        """
+        outer = self.connection
+        if self._transaction_depth == 0:
+            outer.commit()
+            connection = outer
+        else:
+            connection = outer._connection
+        
+        depth = self._transaction_depth
+        savepoint = f"postmini_tx_{depth}"
+        connection.execute(f"SAVEPOINT {savepoint}")
+        self.connection = _DeferredCommitConnection(connection, f"postmini_op_{depth}")
+        self._transaction_depth += 1
+        try:
+            yield
+        except BaseException:
+            connection.execute(f"ROLLBACK TO {savepoint}")
+            connection.execute(f"RELEASE {savepoint}")
+            raise
+        else:
+            connection.execute(f"RELEASE {savepoint}")
+        finally:
+            self._transaction_depth -= 1
+            self.connection = outer
+    
     def _create_tables(self):
         """Create the database schema if tables don't exist."""
         cursor = self.connection.cursor()
@@ -387,9 +465,115 @@ class DatabaseManager:
                 FOREIGN KEY (environment_id) REFERENCES environments(id) ON DELETE CASCADE
             )
         """)
-        
+
+        # Add revision counters to collections and environments (migration).
+        # Triggers bump them on every change to exported content, so Git sync
+        # can tell in O(1) whether an item changed since it was last compared.
+        for table in ('collections', 'environments'):
+            try:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN revision INTEGER DEFAULT 0")
+                cursor.execute(f"UPDATE {table} SET revision = 0 WHERE revision IS NULL")
+                self.connection.commit()
+            except sqlite3.OperationalError:
+                # Column already exists, ignore
+                pass
+        self._create_revision_triggers(cursor)
+
+        # Track the revision last exported to each sync target (e.g. a Git
+        # workspace path) so exports can skip unchanged items
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sync_export_revisions (
+                target TEXT NOT NULL,
+                item_type TEXT NOT NULL,
+                item_id INTEGER NOT NULL,
+                revision INTEGER NOT NULL,
+                exported_at TEXT NOT NULL,
+                PRIMARY KEY (target, item_type, item_id)
+            )
+        """)
+        for table, item_type in (('collections', 'collection'), ('environments', 'environment')):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_export_rev_delete AFTER DELETE ON {table}
+                BEGIN
+                    DELETE FROM sync_export_revisions WHERE item_type = '{item_type}' AND item_id = OLD.id;
+                END
+            """)
+        
+        # Checkpoints of collection runs: a run and the result of each request
+        # as it completes, so stopped or interrupted runs can be resumed
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                collection_id INTEGER,
+                collection_name TEXT NOT NULL,
+                status TEXT NOT NULL,
+                options TEXT,
+                initial_scope TEXT,
+                total_requests INTEGER DEFAULT 0,
+                started_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                finished_at TEXT,
+                FOREIGN KEY (collection_id) REFERENCES collections(id) ON DELETE CASCADE
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS run_results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id INTEGER NOT NULL,
+                iteration INTEGER NOT NULL,
+                request_index INTEGER NOT NULL,
+                request_id INTEGER,
+                request_name TEXT,
+                success INTEGER NOT NULL,
+                error TEXT,
+                results TEXT,
+                changes TEXT,
+                completed_at TEXT NOT NULL,
+                UNIQUE (run_id, iteration, request_index),
+                FOREIGN KEY (run_id) REFERENCES runs(id) ON DELETE CASCADE
+            )
+        """)
+
         self.connection.commit()
-    
+
+    def _create_revision_triggers(self, cursor):
+        """Create triggers that bump collection/environment revision counters."""
+        bump_collection = "UPDATE collections SET revision = revision + 1 WHERE id = {}"
+        bump_environment = "UPDATE environments SET revision = revision + 1 WHERE id = {}"
+        request_collection = "(SELECT collection_id FROM requests WHERE id = {}.request_id)"
+
+        # (trigger name, event, table, statements)
+        triggers = [
+            ('collections_rev_update', 'UPDATE OF name, order_index', 'collections',
+             [bump_collection.format('NEW.id')]),
+            ('environments_rev_update', 'UPDATE OF name, variables', 'environments',
+             [bump_environment.format('NEW.id')]),
+        ]
+        for table in ('requests', 'folders', 'collection_variables'):
+            triggers += [
+                (f'{table}_rev_insert', 'INSERT', table, [bump_collection.format('NEW.collection_id')]),
+                (f'{table}_rev_update', 'UPDATE', table, [bump_collection.format('NEW.collection_id'),
+                                                          bump_collection.format('OLD.collection_id')
+                                                          + ' AND OLD.collection_id != NEW.collection_id']),
+                (f'{table}_rev_delete', 'DELETE', table, [bump_collection.format('OLD.collection_id')]),
+            ]
+        triggers += [
+            ('test_assertions_rev_insert', 'INSERT', 'test_assertions',
+             [bump_collection.format(request_collection.format('NEW'))]),
+            ('test_assertions_rev_update', 'UPDATE', 'test_assertions',
+             [bump_collection.format(request_collection.format('NEW'))]),
+            ('test_assertions_rev_delete', 'DELETE', 'test_assertions',
+             [bump_collection.format(request_collection.format('OLD'))]),
+            ('env_secrets_rev_insert', 'INSERT', 'environment_variable_secrets',
+             [bump_environment.format('NEW.environment_id')]),
+            ('env_secrets_rev_delete', 'DELETE', 'environment_variable_secrets',
+             [bump_environment.format('OLD.environment_id')]),
+        ]
+
+        for name, event, table, statements in triggers:
+            body = ' '.join(f"{statement};" for statement in statements)
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON {table} BEGIN {body} END")
+
     # ==================== Collection Operations ====================
     
     def create_collection(self, name: str, order_index: Optional[int] = None) -> int:
@@ -467,6 +651,10 @@ class DatabaseManager:
         cursor = self.connection.cursor()
         # First delete all requests in this collection
         cursor.execute("DELETE FROM requests WHERE collection_id = ?", (collection_id,))
+        # And its run checkpoints
+        cursor.execute("DELETE FROM run_results WHERE run_id IN (SELECT id FROM runs WHERE collection_id = ?)",
+                       (collection_id,))
+        cursor.execute("DELETE FROM runs WHERE collection_id = ?", (collection_id,))
         # Then delete the collection itself
         cursor.execute("DELETE FROM collections WHERE id = ?", (collection_id,))
         self.connection.commit()
@@ -738,6 +926,39 @@ class DatabaseManager:
                       (name, variables_json, environment_id))
         self.connection.commit()
     
+    def update_environment_variables(self, environment_id: int,
+                                     changes: Dict[str, Optional[str]]) -> Optional[Dict]:
+        """
+        Set and remove several variables of an environment with a single write.
+        
+        Only the variables column is read and written, in one transaction, so
+        a batch of script changes costs one UPDATE and one commit however many
+        keys it touches.
+        
+        Args:
+            environment_id: ID of the environment
+            changes: Variable names to new values; None removes the variable
+            
+        Returns:
+            The updated variables, or None if the environment doesn't exist
+        """
+        with self.transaction():
+            cursor = self.connection.cursor()
+            cursor.execute("SELECT variables FROM environments WHERE id = ?", (environment_id,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            
+            variables = json.loads(row['variables']) if row['variables'] else {}
+            for key, value in changes.items():
+                if value is None:
+                    variables.pop(key, None)
+                else:
+                    variables[key] = value
+            cursor.execute("UPDATE environments SET variables = ? WHERE id = ?",
+                           (json.dumps(variables), environment_id))
+        return variables
+    
     def delete_environment(self, environment_id: int):
         """
         Delete an environment.
@@ -857,6 +1078,26 @@ class DatabaseManager:
         cursor.execute("SELECT * FROM collections WHERE sync_to_git = 1 ORDER BY order_index, id")
         return [dict(row) for row in cursor.fetchall()]
     
+    def get_sync_fingerprint(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Get a cheap fingerprint of all public collections and environments.
+        
+        Combines ids, names and revision counters, so it changes whenever a
+        public item is added, removed, renamed or edited.
+        
+        Returns:
+            Tuple of (collections fingerprint, environments fingerprint)
+        """
+        cursor = self.connection.cursor()
+        fingerprint = []
+        for table in ('collections', 'environments'):
+            cursor.execute(f"""
+                SELECT group_concat(id || ':' || revision || ':' || name, '|')
+                FROM (SELECT id, revision, name FROM {table} WHERE sync_to_git = 1 ORDER BY id)
+            """)
+            fingerprint.append(cursor.fetchone()[0])
+        return tuple(fingerprint)
+    
     def get_public_environments(self) -> List[Dict]:
         """
         Get all environments marked as public (sync_to_git = 1).
@@ -1108,6 +1349,52 @@ class DatabaseManager:
         cursor.execute("SELECT COUNT(*) FROM request_history")
         return cursor.fetchone()[0]
     
+    def get_history_responses(self, before_id: Optional[int] = None, limit: int = 200) -> List[Dict]:
+        """
+        Retrieve the responses of history entries, paging by id.
+        
+        Only entries that received a response are returned, with the fields a
+        security scan needs. Pass the id of the last entry of a page as
+        `before_id` to get the next page.
+        
+        Args:
+            before_id: Only return entries with a lower id (None: start at the newest)
+            limit: Maximum number of entries to return
+            
+        Returns:
+            List of history entries (highest id first)
+        """
+        query = """
+            SELECT id, collection_id, request_id, method, url,
+                   response_status, response_headers, response_body
+            FROM request_history
+            WHERE response_status IS NOT NULL
+        """
+        params: List = []
+        if before_id is not None:
+            query += " AND id < ?"
+            params.append(before_id)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        
+        cursor = self.connection.cursor()
+        cursor.execute(query, params)
+        
+        entries = []
+        for row in cursor.fetchall():
+            entry = dict(row)
+            if entry['response_headers']:
+                entry['response_headers'] = json.loads(entry['response_headers'])
+            entries.append(entry)
+        
+        return entries
+    
+    def get_history_response_count(self) -> int:
+        """Get the number of history entries that received a response."""
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT COUNT(*) FROM request_history WHERE response_status IS NOT NULL")
+        return cursor.fetchone()[0]
+    
     # ==================== OAuth Operations ====================
     
     def create_oauth_config(self, name: str, flow_type: str, auth_url: Optional[str],
@@ -1513,6 +1800,47 @@ class DatabaseManager:
         cursor.execute("DELETE FROM git_workspaces WHERE id = ?", (workspace_id,))
         self.connection.commit()
     
+    # ==================== Sync Export Revision Operations ====================
+    
+    def set_last_exported_revision(self, target: str, item_type: str, item_id: int, revision: int):
+        """
+        Record the revision of an item that was exported to a sync target.
+        
+        Args:
+            target: Sync target identifier (e.g. Git workspace path)
+            item_type: 'collection' or 'environment'
+            item_id: ID of the exported item
+            revision: Revision of the item at export time
+        """
+        from datetime import datetime
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            INSERT INTO sync_export_revisions (target, item_type, item_id, revision, exported_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(target, item_type, item_id) DO UPDATE SET
+                revision = excluded.revision,
+                exported_at = excluded.exported_at
+        """, (target, item_type, item_id, revision, datetime.now().isoformat()))
+        self.connection.commit()
+    
+    def get_last_exported_revisions(self, target: str, item_type: str) -> Dict[int, int]:
+        """
+        Get the last exported revision of every item of a type.
+        
+        Args:
+            target: Sync target identifier
+            item_type: 'collection' or 'environment'
+            
+        Returns:
+            Dictionary mapping item ID to exported revision
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            SELECT item_id, revision FROM sync_export_revisions
+            WHERE target = ? AND item_type = ?
+        """, (target, item_type))
+        return {row['item_id']: row['revision'] for row in cursor.fetchall()}
+    
     # ==================== Folder Operations ====================
     
     def create_folder(self, collection_id: int, name: str, parent_id: Optional[int] = None, order_index: Optional[int] = None) -> int:
@@ -1937,6 +2265,30 @@ class DatabaseManager:
         cursor.execute("DELETE FROM collection_variables WHERE collection_id = ?", (collection_id,))
         self.connection.commit()
     
+    def update_collection_variables(self, collection_id: int, changes: Dict[str, Optional[str]]):
+        """
+        Set and remove several variables of a collection with a single commit.
+        
+        Args:
+            collection_id: ID of the collection
+            changes: Variable keys to new values (created if missing); None
+                removes the variable
+        """
+        cursor = self.connection.cursor()
+        for key, value in changes.items():
+            if value is None:
+                cursor.execute("DELETE FROM collection_variables WHERE collection_id = ? AND key = ?",
+                               (collection_id, key))
+                continue
+            cursor.execute("UPDATE collection_variables SET value = ? WHERE collection_id = ? AND key = ?",
+                           (value, collection_id, key))
+            if cursor.rowcount == 0:
+                cursor.execute("""
+                    INSERT INTO collection_variables (collection_id, key, value, description)
+                    VALUES (?, ?, ?, '')
+                """, (collection_id, key, value))
+        self.connection.commit()
+    
     # ==================== Extracted Variables Operations (Request Chaining) ====================
     
     def create_extracted_variable(self, name: str, value: str, source_request_id: Optional[int] = None,
@@ -2335,6 +2687,53 @@ class DatabaseManager:
         self.connection.commit()
         return cursor.lastrowid
     
+    def create_security_findings_bulk(self, findings: List[Dict]) -> int:
+        """
+        Create many security finding records with a single statement.
+        
+        Args:
+            findings: Finding dictionaries with the arguments of
+                create_security_finding() as keys (scan_id, check_id, title,
+                severity, description, recommendation, timestamp and optionally
+                evidence, cwe_id, owasp_category)
+        
+        Returns:
+            Number of findings created
+        """
+        if not findings:
+            return 0
+        cursor = self.connection.cursor()
+        cursor.executemany("""
+            INSERT INTO security_findings
+            (scan_id, check_id, title, severity, description, recommendation,
+             evidence, cwe_id, owasp_category, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (f['scan_id'], f['check_id'], f['title'], f['severity'], f['description'],
+             f['recommendation'], f.get('evidence'), f.get('cwe_id'), f.get('owasp_category'),
+             f['timestamp'])
+            for f in findings
+        ])
+        self.connection.commit()
+        return len(findings)
+    
+    def link_history_to_scans(self, links: List[Tuple[int, int]]):
+        """
+        Set the security scan of history entries that have none yet.
+        
+        Args:
+            links: (history_id, scan_id) pairs
+        """
+        if not links:
+            return
+        cursor = self.connection.cursor()
+        cursor.executemany("""
+            UPDATE request_history
+            SET scan_id = ?
+            WHERE id = ? AND scan_id IS NULL
+        """, [(scan_id, history_id) for history_id, scan_id in links])
+        self.connection.commit()
+    
     def get_security_scans(
         self,
         request_id: Optional[int] = None,
@@ -2475,6 +2874,176 @@ class DatabaseManager:
         self.connection.commit()
         return True
     
+    # ==================== Collection Run Operations ====================
+    
+    def create_collection_run(self, collection_id: Optional[int], collection_name: str,
+                              options: Dict, initial_scope: Dict, total_requests: int,
+                              status: str = 'running') -> int:
+        """
+        Create the checkpoint of a collection run.
+        
+        Args:
+            collection_id: ID of the collection (None if it was read from an export)
+            collection_name: Name of the collection
+            options: Runner options needed to resume the run
+            initial_scope: Variables every iteration starts with
+            total_requests: Number of requests of the run (over all iterations)
+            status: Status of the run
+        
+        Returns:
+            ID of the new run
+        """
+        from datetime import datetime
+        now = datetime.now().isoformat()
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            INSERT INTO runs
+            (collection_id, collection_name, status, options, initial_scope, total_requests,
+             started_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (collection_id, collection_name, status, json.dumps(options), json.dumps(initial_scope),
+              total_requests, now, now))
+        self.connection.commit()
+        return cursor.lastrowid
+    
+    def _run_from_row(self, row) -> Dict:
+        run = dict(row)
+        run['options'] = json.loads(run['options']) if run['options'] else {}
+        run['initial_scope'] = json.loads(run['initial_scope']) if run['initial_scope'] else {}
+        return run
+    
+    def get_collection_run(self, run_id: int) -> Optional[Dict]:
+        """
+        Get a collection run, with the number of requests completed so far.
+        
+        Args:
+            run_id: ID of the run
+        
+        Returns:
+            Run dictionary (options and initial_scope decoded, plus
+            'completed_requests') or None if not found
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            SELECT runs.*, (SELECT COUNT(*) FROM run_results WHERE run_id = runs.id) AS completed_requests
+            FROM runs WHERE id = ?
+        """, (run_id,))
+        row = cursor.fetchone()
+        return self._run_from_row(row) if row else None
+    
+    def get_collection_runs(self, collection_id: Optional[int] = None,
+                            statuses: Optional[List[str]] = None, limit: int = 20) -> List[Dict]:
+        """
+        Get the latest collection runs.
+        
+        Args:
+            collection_id: Optional filter by collection ID
+            statuses: Optional filter by status
+            limit: Maximum number of runs to return
+        
+        Returns:
+            Run dictionaries as returned by get_collection_run(), newest first
+        """
+        conditions = []
+        params: List = []
+        if collection_id is not None:
+            conditions.append("collection_id = ?")
+            params.append(collection_id)
+        if statuses:
+            conditions.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        cursor = self.connection.cursor()
+        cursor.execute(f"""
+            SELECT runs.*, (SELECT COUNT(*) FROM run_results WHERE run_id = runs.id) AS completed_requests
+            FROM runs {where}
+            ORDER BY id DESC
+            LIMIT ?
+        """, params + [limit])
+        return [self._run_from_row(row) for row in cursor.fetchall()]
+    
+    def update_collection_run_status(self, run_id: int, status: str, finished: bool = False):
+        """
+        Set the status of a collection run.
+        
+        Args:
+            run_id: ID of the run
+            status: New status
+            finished: Whether the run ended (sets its finish time; cleared otherwise)
+        """
+        from datetime import datetime
+        now = datetime.now().isoformat()
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            UPDATE runs SET status = ?, updated_at = ?, finished_at = ? WHERE id = ?
+        """, (status, now, now if finished else None, run_id))
+        self.connection.commit()
+    
+    def save_collection_run_result(self, run_id: int, iteration: int, request_index: int,
+                                   request_id: Optional[int], request_name: str, success: bool,
+                                   error: Optional[str] = None, results: Optional[List[Dict]] = None,
+                                   changes: Optional[Dict] = None):
+        """
+        Save the result of one request of a collection run as soon as it completes.
+        
+        Args:
+            run_id: ID of the run
+            iteration: Iteration of the request (0-based)
+            request_index: Index of the request among the requests of the run
+            request_id: ID of the request
+            request_name: Name of the request
+            success: Whether the request could be sent
+            error: Error message if it couldn't
+            results: Test results (as dictionaries)
+            changes: Variables the request set (None for removed variables)
+        """
+        from datetime import datetime
+        now = datetime.now().isoformat()
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            INSERT OR REPLACE INTO run_results
+            (run_id, iteration, request_index, request_id, request_name, success, error,
+             results, changes, completed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (run_id, iteration, request_index, request_id, request_name, 1 if success else 0, error,
+              json.dumps(results or [], default=str), json.dumps(changes or {}), now))
+        cursor.execute("UPDATE runs SET updated_at = ? WHERE id = ?", (now, run_id))
+        self.connection.commit()
+    
+    def get_collection_run_results(self, run_id: int) -> List[Dict]:
+        """
+        Get the results saved for a collection run.
+        
+        Args:
+            run_id: ID of the run
+        
+        Returns:
+            Result dictionaries (results and changes decoded), in completion order
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT * FROM run_results WHERE run_id = ? ORDER BY id", (run_id,))
+        results = []
+        for row in cursor.fetchall():
+            result = dict(row)
+            result['success'] = bool(result['success'])
+            result['results'] = json.loads(result['results']) if result['results'] else []
+            result['changes'] = json.loads(result['changes']) if result['changes'] else {}
+            results.append(result)
+        return results
+    
+    def delete_collection_run(self, run_id: int):
+        """
+        Delete a collection run and its results.
+        
+        Args:
+            run_id: ID of the run
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("DELETE FROM run_results WHERE run_id = ?", (run_id,))
+        cursor.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+        self.connection.commit()
+
     def close(self):
         """Close the database connection."""
         if self.connection:
@@ -0,0 +1,74 @@
+"""
+Startup Trace
+
+Lightweight timing of application startup, broken down per component.
+Set the POSTMINI_STARTUP_TRACE environment variable to print the full
+per-component report; otherwise only the total is printed.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+
+class StartupTrace:
+    """
+    Collects (component, seconds) timings measured during startup.
+
+    Usage:
+        with startup_trace.section("main_window"):
+            window = MainWindow()
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.records: List[Tuple[str, float]] = []
+        self.finished_at = None
+        self._depth = 0
+
+    @contextmanager
+    def section(self, name: str):
+        """Time a block of code and record it under name (nested sections are indented)."""
+        slot = len(self.records)
+        self.records.append(("  " * self._depth + name, 0.0))
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.records[slot] = (self.records[slot][0], time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float):
+        """Record a timing measured elsewhere (e.g. a lazily built panel)."""
+        self.records.append(("  " * self._depth + name, seconds))
+
+    def finish(self):
+        """Mark startup as complete (first event loop iteration)."""
+        if self.finished_at is None:
+            self.finished_at = time.perf_counter()
+
+    def total(self) -> float:
+        """Seconds from process start of tracing until finish() (or now)."""
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return end - self.started_at
+
+    def report(self) -> str:
+        """Format all recorded timings as a table."""
+        lines = ["Startup trace:"]
+        for name, seconds in self.records:
+            lines.append(f"  {name:<40} {seconds * 1000:8.1f} ms")
+        lines.append(f"  {'TOTAL':<40} {self.total() * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+    def print_report(self):
+        """Print the total, plus the full report if tracing is enabled."""
+        self.finish()
+        if os.environ.get('POSTMINI_STARTUP_TRACE'):
+            print(self.report())
+        print(f"[OK] Startup completed in {self.total():.2f}s")
+
+
+# Global trace for the running application
+startup_trace = StartupTrace()
@@ -0,0 +1,774 @@
+"""
+Collection Runner
+
+Runs the requests of a collection and evaluates their tests without any UI.
+The Collection Test Runner dialog runs it in a QThread and ``postmini run``
+(src/cli.py) runs it from the command line, so it must not import PyQt6.
+
+A collection is loaded from the database or read directly from a git-sync
+export (a collection file or split collection directory) into the same plain
+dictionaries. Every iteration works on its own copy of the environment,
+collection and extracted variables, which pre-request and post-response
+scripts and the extraction rules of requests may change as the iteration
+goes. Nothing is written back to the database: the summary reports the
+variables the run changed, for the caller to commit once the run ends (the
+Collection Test Runner writes them to the active environment in one go).
+
+A run can be driven by a data file (CSV or JSON, see iteration_data): each
+row is one iteration, bound as the highest-priority {{variable}} scope and
+exposed to scripts as pm.iterationData. Rows are read as iterations are
+started, so the file is never loaded as a whole.
+
+With a concurrency above 1, iterations run concurrently on a thread pool, and
+so do the requests of an iteration that don't depend on each other:
+request_graph infers which variables each request reads and writes, and a
+request is only sent once the earlier requests it depends on have completed.
+With a concurrency of 1 (the default) requests are sent in collection order,
+one iteration after the other, as collections may rely on server-side effects
+of earlier requests (create, then list, then delete) that no variable shows. Scripts are the exception: V8
+can't run scripts on several threads at once, so they run one at a time (see
+script_engine) while the requests themselves are sent in parallel; runs whose
+scripts are the bottleneck can be split across processes (sharded_runner).
+
+A run can be checkpointed in the database (RunCheckpoint): each request is
+saved as soon as it completes, with the variables it set, so a run that was
+stopped or interrupted by a crash can be resumed later. Resuming replays the
+saved variable changes on each iteration's initial variables and only sends
+the requests that hadn't completed.
+"""
+
+import json
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import repeat
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from src.features import iteration_data, request_graph, split_collection
+from src.features.script_engine import ScriptEngine, ScriptExecutionError
+from src.features.security_batch import capture_response
+from src.features.test_engine import TestAssertion, TestEngine, TestResult
+from src.features.variable_extractor import ExtractionRule
+from src.features.variable_substitution import VariableSubstitution
+
+# Assertion type / operator of the results of pm.test() calls in scripts
+TYPE_SCRIPT_TEST = "script"
+OP_SCRIPT_TEST = "pm.test"
+
+ProgressCallback = Callable[[int, int, str], None]
+RequestCallback = Callable[[Dict], None]
+
+# Statuses of checkpointed runs; a run still 'running' when no runner is
+# running it was interrupted (e.g. the app crashed)
+RUN_RUNNING = "running"
+RUN_STOPPED = "stopped"
+RUN_COMPLETED = "completed"
+RUN_FAILED = "failed"
+RESUMABLE_STATUSES = (RUN_RUNNING, RUN_STOPPED)
+
+# Variable scopes a request can change; in the changes saved for a request, a
+# variable set to None was removed
+SCOPE_KEYS = ('environment', 'collection_variables', 'extracted')
+
+
+def load_collection(db, collection_id: int) -> Dict:
+    """
+    Load a collection from the database for running.
+
+    Args:
+        db: DatabaseManager instance
+        collection_id: ID of the collection
+
+    Returns:
+        Dictionary with 'name', 'variables' and 'requests' (request rows, each
+        with its test assertion rows under 'assertions' and the extraction
+        rules of the variables extracted from its response under
+        'extractions')
+
+    Raises:
+        ValueError: If the collection doesn't exist
+    """
+    collection = db.get_collection(collection_id)
+    if not collection:
+        raise ValueError(f"Collection with ID {collection_id} not found")
+
+    # Variables extracted with a JSON path are extracted again when their
+    # source request runs, so later requests use this run's values
+    extractions: Dict[int, List[Dict]] = {}
+    for variable in db.get_all_extracted_variables():
+        if variable['source_request_id'] is not None and variable['json_path']:
+            rule = ExtractionRule(variable['name'], 'json_path', json_path=variable['json_path'])
+            extractions.setdefault(variable['source_request_id'], []).append(rule.to_dict())
+
+    requests = db.get_requests_by_collection(collection_id)
+    for request in requests:
+        request['assertions'] = db.get_test_assertions(request['id'])
+        request['extractions'] = extractions.get(request['id'], [])
+
+    return {
+        'name': collection['name'],
+        'variables': db.get_collection_variables(collection_id),
+        'requests': requests
+    }
+
+
+def read_collection(path) -> Dict:
+    """
+    Read a collection from a git-sync export, without a database.
+
+    Args:
+        path: Collection file in the internal export format, or split
+              collection directory
+
+    Returns:
+        Dictionary in the format of load_collection(); requests and assertions
+        are numbered in file order
+
+    Raises:
+        OSError, ValueError, KeyError: If the export is missing or invalid
+    """
+    if split_collection.is_split_collection(path):
+        data = split_collection.read_split_collection(path)
+    else:
+        with open(str(path), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    collection = data['collection']
+
+    requests = []
+    assertion_id = 0
+    for request_id, request in enumerate(collection.get('requests', []), 1):
+        assertions = []
+        for test in request.get('tests', []):
+            assertion_id += 1
+            assertions.append({
+                'id': assertion_id,
+                'assertion_type': test['type'],
+                'operator': test['operator'],
+                'field': test.get('field'),
+                'expected_value': test.get('expected_value'),
+                'enabled': test.get('enabled', True)
+            })
+        requests.append(dict(request, id=request_id, assertions=assertions))
+
+    return {
+        'name': collection['name'],
+        'variables': {var['key']: var.get('value', '') for var in collection.get('variables', [])},
+        'requests': requests
+    }
+
+
+def script_test_result(name: str, passed: bool, error: Optional[str] = None) -> TestResult:
+    """Report a pm.test() call (or a failing script) like an assertion result."""
+    assertion = TestAssertion(None, TYPE_SCRIPT_TEST, OP_SCRIPT_TEST, name)
+    return TestResult(assertion, passed, error_message=error)
+
+
+def merge_changes(changes: Iterable[Dict[str, Dict]]) -> Dict[str, Dict]:
+    """
+    Combine the variable changes of requests, later changes winning.
+
+    Args:
+        changes: Changes recorded for each request, in the order they apply
+            (by iteration, then collection order)
+
+    Returns:
+        The resulting changes per scope; a variable set to None was removed
+    """
+    merged: Dict[str, Dict] = {key: {} for key in SCOPE_KEYS}
+    for change in changes:
+        for key in SCOPE_KEYS:
+            merged[key].update(change.get(key, {}))
+    return merged
+
+
+def result_to_dict(result: TestResult) -> Dict:
+    """Serialize a test result for a run checkpoint."""
+    assertion = result.assertion
+    return {
+        'assertion_id': assertion.id,
+        'assertion_type': assertion.type,
+        'operator': assertion.operator,
+        'field': assertion.field,
+        'expected_value': assertion.expected_value,
+        'passed': result.passed,
+        'actual_value': result.actual_value,
+        'error_message': result.error_message
+    }
+
+
+def result_from_dict(data: Dict) -> TestResult:
+    """Restore a test result saved by result_to_dict()."""
+    assertion = TestAssertion(data['assertion_id'], data['assertion_type'], data['operator'],
+                              data.get('field'), data.get('expected_value'))
+    return TestResult(assertion, data['passed'], data.get('actual_value'), data.get('error_message'))
+
+
+class RunCheckpoint:
+    """
+    Saves a collection run in the database (runs / run_results tables) as it
+    goes, so it can be resumed.
+
+    The runner saves from the thread calling run(), never from its workers,
+    so `db` is only used by the thread that opened it.
+    """
+
+    def __init__(self, db, collection_id: Optional[int] = None, collection_name: str = "",
+                 run_id: Optional[int] = None):
+        """
+        Initialize a checkpoint; a new run is created when the runner starts.
+
+        Args:
+            db: DatabaseManager instance
+            collection_id: ID of the collection (None if read from an export)
+            collection_name: Name of the collection
+            run_id: ID of the run to resume (see load())
+        """
+        self.db = db
+        self.collection_id = collection_id
+        self.collection_name = collection_name
+        self.run_id = run_id
+        self.options: Dict[str, Any] = {}
+        self.initial_scope: Dict[str, Dict[str, str]] = {}
+
+    @classmethod
+    def load(cls, db, run_id: int) -> 'RunCheckpoint':
+        """
+        Load the checkpoint of a stopped or interrupted run, to resume it with
+        CollectionRunner.resume().
+
+        Raises:
+            ValueError: If the run doesn't exist or can't be resumed
+        """
+        run = db.get_collection_run(run_id)
+        if not run:
+            raise ValueError(f"Run #{run_id} not found")
+        if run['status'] not in RESUMABLE_STATUSES:
+            raise ValueError(f"Run #{run_id} is {run['status']} and can't be resumed")
+
+        checkpoint = cls(db, run['collection_id'], run['collection_name'], run_id)
+        checkpoint.options = run['options']
+        checkpoint.initial_scope = run['initial_scope']
+        return checkpoint
+
+    def begin(self, options: Dict[str, Any], initial_scope: Dict[str, Dict[str, str]],
+              total_requests: int) -> List[Dict]:
+        """
+        Create the run, or mark the resumed run as running again.
+
+        Returns:
+            The results saved so far, in completion order (see
+            DatabaseManager.get_collection_run_results())
+        """
+        if self.run_id is None:
+            self.options = options
+            self.initial_scope = initial_scope
+            self.run_id = self.db.create_collection_run(
+                self.collection_id, self.collection_name, options, initial_scope, total_requests,
+                status=RUN_RUNNING
+            )
+            return []
+
+        self.db.update_collection_run_status(self.run_id, RUN_RUNNING)
+        return self.db.get_collection_run_results(self.run_id)
+
+    def save(self, iteration: int, index: int, entry: Dict, changes: Dict[str, Dict]):
+        """Save a completed request with the variables it changed."""
+        self.db.save_collection_run_result(
+            self.run_id, iteration, index, entry['request_id'], entry['request_name'], entry['success'],
+            entry.get('error'), [result_to_dict(result) for result in entry.get('results', [])], changes
+        )
+
+    def finish(self, status: str):
+        """Record how the run ended."""
+        self.db.update_collection_run_status(self.run_id, status, finished=True)
+
+
+class CollectionRunner:
+    """
+    Runs the requests of a collection and evaluates their tests.
+
+    As in the Collection Test Runner, requests with nothing to check or
+    extract (no enabled assertions, no extraction rules, and no scripts when
+    scripts run) are skipped.
+    """
+
+    def __init__(self, api_client, environment: Optional[Dict[str, str]] = None,
+                 collection_variables: Optional[Dict[str, str]] = None,
+                 extracted_variables: Optional[Dict[str, str]] = None,
+                 run_scripts: bool = True, script_timeout_ms: int = 5000,
+                 iterations: Optional[int] = None, first_iteration: int = 0, concurrency: int = 1,
+                 data_file: Optional[str] = None, data_format: Optional[str] = None,
+                 keep_responses: bool = True, serial: bool = False,
+                 checkpoint: Optional[RunCheckpoint] = None,
+                 progress_callback: Optional[ProgressCallback] = None,
+                 request_callback: Optional[RequestCallback] = None):
+        """
+        Initialize the runner.
+
+        Args:
+            api_client: ApiClient used for all requests (shared by the workers)
+            environment: Environment variables each iteration starts with
+            collection_variables: Collection variables each iteration starts with
+            extracted_variables: Extracted variables (read-only)
+            run_scripts: Run pre-request and post-response scripts
+            script_timeout_ms: Timeout of each script
+            iterations: Number of times the collection is run (default: once,
+                or once per row of the data file; when there are more
+                iterations than rows, the last row is used again)
+            first_iteration: Number of iterations before this run's first
+                one, when it runs part of a larger run's iterations (see
+                sharded_runner); its iterations use the data rows from there
+            concurrency: Number of worker threads; with 1, requests are sent
+                in collection order
+            data_file: CSV or JSON data file with one row per iteration
+            data_format: Format of the data file (detected if None)
+            keep_responses: Keep a capture of each response in the results
+                (for security scans of the run)
+            serial: Send the requests of an iteration one after another in
+                collection order even with a concurrency above 1, instead of
+                in parallel where they don't depend on each other (for
+                scripts whose variables can't be inferred, see request_graph)
+            checkpoint: Save the run in the database as it goes (see
+                RunCheckpoint); use resume() to resume a saved run
+            progress_callback: Called with (started, total, message) when a
+                request starts (from worker threads)
+            request_callback: Called with the result of each request when it
+                completes (from worker threads)
+        """
+        self.api_client = api_client
+        self.environment = dict(environment or {})
+        self.collection_variables = dict(collection_variables or {})
+        self.extracted_variables = dict(extracted_variables or {})
+        self.run_scripts = run_scripts
+        self.script_timeout_ms = script_timeout_ms
+        self.iterations = iterations
+        self.first_iteration = first_iteration
+        self.concurrency = max(1, concurrency)
+        self.data_file = data_file
+        self.data_format = data_format
+        self.keep_responses = keep_responses
+        self.serial = serial
+        self.checkpoint = checkpoint
+        self.progress_callback = progress_callback
+        self.request_callback = request_callback
+        self._stop_requested = False
+        self._engines = threading.local()
+        self._lock = threading.Lock()
+        self._started = 0
+        self._total = 0
+
+    @classmethod
+    def resume(cls, api_client, checkpoint: RunCheckpoint, **kwargs) -> 'CollectionRunner':
+        """
+        Create a runner that resumes a stopped or interrupted run.
+
+        The run keeps the options and initial variables it was started with;
+        keyword arguments (callbacks, keep_responses ...) are passed to the
+        runner and may override options such as concurrency.
+
+        Args:
+            api_client: ApiClient used for all requests
+            checkpoint: Checkpoint of the run (see RunCheckpoint.load())
+        """
+        scope = checkpoint.initial_scope
+        options = dict(checkpoint.options, **kwargs)
+        return cls(
+            api_client,
+            environment=scope.get('environment'),
+            collection_variables=scope.get('collection_variables'),
+            extracted_variables=scope.get('extracted'),
+            checkpoint=checkpoint,
+            **options
+        )
+
+    def stop(self):
+        """Request to stop; requests already sent are completed."""
+        self._stop_requested = True
+
+    def _script_engine(self) -> ScriptEngine:
+        """
+        The script engine of the current worker thread.
+
+        Engines are reused by the requests a thread runs, but not shared
+        between threads, as an engine holds the state of the script it runs.
+        Every script still gets a fresh JavaScript context, and scripts of
+        different threads don't run at the same time (script_engine
+        serializes all V8 use of the process).
+        """
+        engine = getattr(self._engines, 'engine', None)
+        if engine is None:
+            engine = self._engines.engine = ScriptEngine(timeout_ms=self.script_timeout_ms)
+        return engine
+
+    def _has_scripts(self, request: Dict) -> bool:
+        return self.run_scripts and bool(
+            (request.get('pre_request_script') or '').strip()
+            or (request.get('post_response_script') or '').strip()
+        )
+
+    def _is_runnable(self, request: Dict) -> bool:
+        if any(a.get('enabled', True) for a in request.get('assertions', [])):
+            return True
+        return bool(request.get('extractions')) or self._has_scripts(request)
+
+    def run(self, requests: List[Dict]) -> Dict:
+        """
+        Run requests (as returned by load_collection() / read_collection()).
+
+        Returns:
+            Summary with 'total_requests', 'total_tests', 'passed', 'failed',
+            'errors' (requests that could not be sent), 'iterations',
+            'stopped' and 'results' (one entry per request run, in collection
+            order per iteration), 'variable_changes' (see merge_changes()) and,
+            with a checkpoint, 'run_id'
+
+        Raises:
+            iteration_data.DataFileError, OSError: If the data file cannot be
+                read (checked before the first request is sent)
+            ValueError: If a resumed run's requests don't match `requests`
+        """
+        runnable = [request for request in requests if self._is_runnable(request)]
+        iterations = self._iteration_count()
+        self._total = len(runnable) * iterations
+        completed: Dict[tuple, Dict] = {}
+        changed: Dict[tuple, Dict] = {}  # Variable changes of the requests that changed any
+        replayed: Dict[int, List[Dict]] = {}  # Iteration -> changes of its completed requests
+        if self.checkpoint:
+            saved = self.checkpoint.begin(self._checkpoint_options(iterations), self._initial_scope(), self._total)
+            for row in saved:
+                index = row['request_index']
+                if row['iteration'] >= self.first_iteration + iterations or index >= len(runnable) \
+                        or runnable[index]['id'] != row['request_id']:
+                    raise ValueError(f"The requests of run #{self.checkpoint.run_id} changed, "
+                                     f"so it can't be resumed")
+                completed[(row['iteration'], index)] = self._saved_entry(row)
+                if any(row['changes'].values()):
+                    changed[(row['iteration'], index)] = row['changes']
+                replayed.setdefault(row['iteration'], []).append(row['changes'])
+        self._started = len(completed)
+        # A single worker keeps the collection order, not just the order of dependencies
+        in_order = self.serial or self.concurrency == 1
+        dependencies = request_graph.build_dependencies(runnable, self.run_scripts, in_order)
+        dependents = request_graph.dependents(dependencies)
+
+        def run_request(iteration: int, index: int, scope: Dict) -> Optional[Dict]:
+            if self._stop_requested:
+                return None
+            changes = {key: {} for key in SCOPE_KEYS}
+            completed[(iteration, index)] = self._run_request(runnable[index], iteration, scope, changes)
+            return changes
+
+        rows = enumerate(self._iteration_rows(iterations) if runnable else (), self.first_iteration)
+        scopes: Dict[int, Dict] = {}
+        waiting: Dict[int, List[int]] = {}  # Iteration -> number of dependencies left per request
+        remaining: Dict[int, int] = {}
+        ready = deque()
+        # A single worker only starts an iteration once the previous one is done
+        limit = self.concurrency * 2 if self.concurrency > 1 else 1
+
+        # Only a few requests are queued ahead, so rows are read as they are needed
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            running = {}
+            try:
+                while True:
+                    while not self._stop_requested and rows is not None and len(ready) + len(running) < limit:
+                        started = next(rows, None)
+                        if started is None:
+                            rows = None
+                            break
+                        iteration, row = started
+                        finished = {index for index in range(len(runnable)) if (iteration, index) in completed}
+                        if len(finished) == len(runnable):
+                            continue
+                        scopes[iteration] = self._new_scope(row)
+                        for changes in replayed.pop(iteration, ()):
+                            self._apply_changes(scopes[iteration], changes)
+                        waiting[iteration] = [len(earlier - finished) for earlier in dependencies]
+                        remaining[iteration] = len(runnable) - len(finished)
+                        ready.extend(
+                            (iteration, index) for index, count in enumerate(waiting[iteration])
+                            if not count and index not in finished
+                        )
+
+                    if self._stop_requested:
+                        ready.clear()
+                    while ready and len(running) < limit:
+                        iteration, index = ready.popleft()
+                        running[pool.submit(run_request, iteration, index, scopes[iteration])] = (iteration, index)
+                    if not running:
+                        break
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        iteration, index = running.pop(future)
+                        changes = future.result()
+                        if changes is not None and any(changes.values()):
+                            changed[(iteration, index)] = changes
+                        if changes is not None and self.checkpoint:
+                            self.checkpoint.save(iteration, index, completed[(iteration, index)], changes)
+                        for dependent in dependents[index]:
+                            waiting[iteration][dependent] -= 1
+                            if not waiting[iteration][dependent]:
+                                ready.append((iteration, dependent))
+                        remaining[iteration] -= 1
+                        if not remaining[iteration]:
+                            del scopes[iteration], waiting[iteration], remaining[iteration]
+            except Exception:
+                if self.checkpoint:
+                    self.checkpoint.finish(RUN_FAILED)
+                raise
+            finally:
+                for future in running:
+                    future.result()
+
+        if self.checkpoint:
+            self.checkpoint.finish(RUN_STOPPED if self._stop_requested else RUN_COMPLETED)
+
+        summary = self._summarize([completed[key] for key in sorted(completed)], iterations)
+        summary['variable_changes'] = merge_changes(changed[key] for key in sorted(changed))
+        if self.checkpoint:
+            summary['run_id'] = self.checkpoint.run_id
+        return summary
+
+    def _summarize(self, results: List[Dict], iterations: int) -> Dict:
+        """Build the summary of run() from the result entries, in report order."""
+        test_results = [result for entry in results for result in entry.get('results', [])]
+        passed = sum(1 for result in test_results if result.passed)
+        return {
+            'total_requests': len(results),
+            'total_tests': len(test_results),
+            'passed': passed,
+            'failed': len(test_results) - passed,
+            'errors': sum(1 for entry in results if not entry['success']),
+            'iterations': iterations,
+            'stopped': self._stop_requested,
+            'results': results
+        }
+
+    def _checkpoint_options(self, iterations: int) -> Dict[str, Any]:
+        """The options a resumed run is created with (see resume())."""
+        return {
+            'run_scripts': self.run_scripts,
+            'script_timeout_ms': self.script_timeout_ms,
+            'iterations': iterations,
+            'concurrency': self.concurrency,
+            'data_file': self.data_file,
+            'data_format': self.data_format,
+            'serial': self.serial
+        }
+
+    def _initial_scope(self) -> Dict[str, Dict[str, str]]:
+        return {
+            'environment': self.environment,
+            'collection_variables': self.collection_variables,
+            'extracted': self.extracted_variables
+        }
+
+    @staticmethod
+    def _saved_entry(row: Dict) -> Dict:
+        """The result entry of a request completed before the run was resumed."""
+        entry = {
+            'request_id': row['request_id'],
+            'request_name': row['request_name'],
+            'iteration': row['iteration'] + 1,
+            'success': row['success']
+        }
+        if row['success']:
+            entry['results'] = [result_from_dict(data) for data in row['results']]
+        else:
+            entry['error'] = row['error']
+        return entry
+
+    def _iteration_count(self) -> int:
+        if self.iterations is not None:
+            return max(1, self.iterations)
+        if self.data_file:
+            return iteration_data.count_rows(self.data_file, self.data_format)
+        return 1
+
+    def _iteration_rows(self, iterations: int) -> Iterator[Optional[Dict]]:
+        """The data row of each iteration (None without a data file)."""
+        if not self.data_file:
+            yield from repeat(None, iterations)
+            return
+
+        rows = iteration_data.iter_rows(self.data_file, self.data_format)
+        row = {}
+        for _ in range(self.first_iteration):
+            row = next(rows, row)
+        for _ in range(iterations):
+            row = next(rows, row)
+            yield row
+
+    def _new_scope(self, row: Optional[Dict] = None) -> Dict[str, Any]:
+        return {
+            'environment': dict(self.environment),
+            'collection_variables': dict(self.collection_variables),
+            'extracted': dict(self.extracted_variables),
+            'data': row or {},
+            'data_variables': iteration_data.to_variables(row) if row else {},
+            'lock': threading.Lock()
+        }
+
+    @staticmethod
+    def _read_scope(scope: Dict) -> Dict[str, Dict[str, str]]:
+        """Copy the variables of an iteration for one request."""
+        with scope['lock']:
+            return {key: dict(scope[key]) for key in SCOPE_KEYS}
+
+    @staticmethod
+    def _update_scope(scope: Dict, variables: Dict[str, Dict[str, str]], script_result: Dict,
+                      changes: Dict[str, Dict]):
+        """
+        Apply the variables a script set or unset to the iteration.
+
+        Only changed keys are written, as requests that don't depend on each
+        other may change other variables of the iteration at the same time.
+        They are also recorded in `changes`, for the run's checkpoint.
+        """
+        with scope['lock']:
+            for key in ('environment', 'collection_variables'):
+                before, after = variables[key], script_result[key]
+                for name, value in after.items():
+                    if before.get(name) != value:
+                        scope[key][name] = changes[key][name] = value
+                for name in before.keys() - after.keys():
+                    scope[key].pop(name, None)
+                    changes[key][name] = None
+                variables[key] = dict(after)
+
+    @staticmethod
+    def _apply_changes(scope: Dict, changes: Dict[str, Dict]):
+        """Replay the variable changes saved for a request on its iteration."""
+        for key in SCOPE_KEYS:
+            for name, value in changes.get(key, {}).items():
+                if value is None:
+                    scope[key].pop(name, None)
+                else:
+                    scope[key][name] = value
+
+    def _run_request(self, request: Dict, iteration: int, scope: Dict, changes: Dict[str, Dict]) -> Dict:
+        """
+        Run one request of an iteration; scripts and extractions update `scope`
+        and the variables they change are recorded in `changes`.
+        """
+        with self._lock:
+            self._started += 1
+            started = self._started
+        if self.progress_callback:
+            self.progress_callback(started, self._total, f"Testing: {request['name']}")
+
+        entry = {
+            'request_id': request['id'],
+            'request_name': request['name'],
+            'iteration': iteration + 1
+        }
+        method = request['method']
+        url = request['url']
+        params = request.get('params') or {}
+        headers = request.get('headers') or {}
+        body = request.get('body') or ''
+        variables = self._read_scope(scope)
+        engine = self._script_engine() if self._has_scripts(request) else None
+
+        try:
+            if engine and (request.get('pre_request_script') or '').strip():
+                script_result = engine.execute_pre_request_script(
+                    script=request['pre_request_script'],
+                    url=url,
+                    method=method,
+                    headers=headers,
+                    body=body,
+                    params=params,
+                    environment=variables['environment'],
+                    collection_vars=variables['collection_variables'],
+                    iteration_data=scope['data']
+                )
+                url = script_result['url']
+                method = script_result['method']
+                headers = script_result['headers']
+                body = script_result['body']
+                params = script_result['params']
+                self._update_scope(scope, variables, script_result, changes)
+
+            # Substitute after the script, so variables it sets are used
+            substituted, _ = VariableSubstitution.substitute_request(
+                url, params, headers, body, request.get('auth_token') or '',
+                variables['environment'], variables['collection_variables'], variables['extracted'],
+                scope['data_variables']
+            )
+
+            response = self.api_client.execute_request(
+                method=method,
+                url=substituted['url'],
+                params=substituted['params'],
+                headers=substituted['headers'],
+                body=substituted['body'],
+                auth_type=request.get('auth_type') or 'None',
+                auth_token=substituted['auth_token']
+            )
+
+            test_assertions = [
+                TestAssertion(
+                    assertion_id=a['id'],
+                    assertion_type=a['assertion_type'],
+                    operator=a['operator'],
+                    field=a.get('field'),
+                    expected_value=a.get('expected_value'),
+                    enabled=a.get('enabled', True)
+                )
+                for a in request.get('assertions', []) if a.get('enabled', True)
+            ]
+            test_results = TestEngine.evaluate_all(test_assertions, response)
+            self._extract_variables(request, response, scope, changes)
+
+            if engine and (request.get('post_response_script') or '').strip():
+                test_results.extend(
+                    self._run_post_response_script(request, response, scope, variables, changes, engine)
+                )
+
+            entry.update({'results': test_results, 'success': True})
+            if self.keep_responses:
+                entry['response'] = capture_response(method, substituted['url'], response)
+        except Exception as e:
+            entry.update({'error': str(e), 'success': False})
+
+        if self.request_callback:
+            self.request_callback(entry)
+        return entry
+
+    @staticmethod
+    def _extract_variables(request: Dict, response: Any, scope: Dict, changes: Dict[str, Dict]):
+        """Extract the request's variables from its response into the iteration."""
+        for data in request.get('extractions') or []:
+            value = ExtractionRule.from_dict(data).extract(response)
+            if value is None:
+                continue
+            value = value if isinstance(value, str) else json.dumps(value)
+            with scope['lock']:
+                scope['extracted'][data['variable_name']] = changes['extracted'][data['variable_name']] = value
+
+    @classmethod
+    def _run_post_response_script(cls, request: Dict, response: Any, scope: Dict,
+                                  variables: Dict[str, Dict[str, str]], changes: Dict[str, Dict],
+                                  engine: ScriptEngine) -> List[TestResult]:
+        """Run a post-response script; its pm.test() calls become test results."""
+        try:
+            script_result = engine.execute_post_response_script(
+                script=request['post_response_script'],
+                response_status=response.status_code,
+                response_headers=dict(response.headers),
+                response_body=response.text,
+                response_time_ms=response.elapsed_time * 1000,
+                environment=variables['environment'],
+                collection_vars=variables['collection_variables'],
+                iteration_data=scope['data']
+            )
+        except ScriptExecutionError as e:
+            return [script_test_result("Post-response script", False, str(e))]
+
+        cls._update_scope(scope, variables, script_result, changes)
+        return [
+            script_test_result(test['name'], test['passed'], test.get('error'))
+            for test in script_result['test_results']
+        ]
@@ -8,13 +8,28 @@ which can be version controlled with Git.
 
 import os
 import json
-import hashlib
-from typing import Dict, List, Optional, Tuple, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Any
 from datetime import datetime
 from pathlib import Path
 
 from src.core.database import DatabaseManager
 from src.features.collection_io import CollectionExporter, CollectionImporter
+from src.features.sync_manifest import SyncManifest, content_hash
+from src.features import split_collection
+from src.features.split_collection import LAYOUT_SINGLE, LAYOUT_SPLIT
+
+
+# Worker threads reading/parsing and writing workspace files
+SYNC_WORKERS = min(8, (os.cpu_count() or 2) * 2)
+
+# Progress callback: (done, total, message)
+ProgressCallback = Callable[[int, int, str], None]
+
+
+class _ImportFailed(Exception):
+    """Raised inside an import transaction to roll back a failed item."""
 
 
 class GitSyncConfig:
@@ -85,15 +100,29 @@ class GitSyncManager:
         # Use proper collection exporter/importer for data integrity
         self.exporter = CollectionExporter(db)
         self.importer = CollectionImporter(db)
+        
+        # Sync target id for last exported revisions, and the file stat/hash
+        # cache used for fast change detection
+        self.target = str(config.project_path)
+        self.manifest = SyncManifest(db, self.target)
+        
+        # Number of files actually written by exports (unchanged items are skipped)
+        self._exported_count = 0
+        
+        # Nesting depth of _batch() (manifest loaded/saved once per bulk export)
+        self._batch_depth = 0
     
     # ==================== Workspace Setup ====================
     
-    def initialize_workspace(self, create_gitignore: bool = True) -> Tuple[bool, str]:
+    def initialize_workspace(self, create_gitignore: bool = True,
+                             collection_layout: str = LAYOUT_SINGLE) -> Tuple[bool, str]:
         """
         Initialize Git sync workspace in the project directory.
         
         Args:
             create_gitignore: Whether to add .postmini-secrets to .gitignore
+            collection_layout: 'single' (one JSON file per collection) or
+                'split' (one directory per collection, one file per request)
             
         Returns:
             Tuple of (success, message)
@@ -111,7 +140,8 @@ class GitSyncManager:
                 "created_at": datetime.now().isoformat(),
                 "last_updated": datetime.now().isoformat(),
                 "app": "PostMini",
-                "description": "PostMini workspace for API collections and tests"
+                "description": "PostMini workspace for API collections and tests",
+                "collection_layout": collection_layout
             }
             
             with open(self.config.workspace_file, 'w', encoding='utf-8') as f:
@@ -151,7 +181,7 @@ class GitSyncManager:
                 workspace_data = json.load(f)
             
             # Count collections, environments
-            num_collections = len(list(self.config.collections_path.glob("*.json"))) if self.config.collections_path.exists() else 0
+            num_collections = len(split_collection.find_collections(self.config.collections_path))
             num_environments = len(list(self.config.environments_path.glob("*.json"))) if self.config.environments_path.exists() else 0
             
             workspace_info = {
@@ -167,6 +197,64 @@ class GitSyncManager:
         except Exception as e:
             return False, None
     
+    def get_collection_layout(self) -> str:
+        """
+        Get the on-disk collection layout of the workspace.
+        
+        Returns:
+            'split' or 'single' (default for workspaces created without one)
+        """
+        try:
+            with open(self.config.workspace_file, 'r', encoding='utf-8') as f:
+                layout = json.load(f).get('collection_layout')
+        except (OSError, ValueError):
+            return LAYOUT_SINGLE
+        return LAYOUT_SPLIT if layout == LAYOUT_SPLIT else LAYOUT_SINGLE
+    
+    def set_collection_layout(self, layout: str) -> Tuple[bool, str]:
+        """
+        Switch the workspace's collection layout and convert existing
+        collection files. The layout is stored in workspace.json so it is
+        shared with everyone using the repository.
+        
+        Args:
+            layout: 'single' or 'split'
+            
+        Returns:
+            Tuple of (success, message)
+        """
+        if layout not in (LAYOUT_SINGLE, LAYOUT_SPLIT):
+            return False, f"Unknown collection layout: {layout}"
+        if not self.is_workspace_initialized():
+            return False, "Workspace not initialized"
+        
+        try:
+            with open(self.config.workspace_file, 'r', encoding='utf-8') as f:
+                workspace_data = json.load(f)
+            
+            if workspace_data.get('collection_layout', LAYOUT_SINGLE) == layout:
+                return True, f"Collections already use the '{layout}' layout"
+            
+            workspace_data['collection_layout'] = layout
+            workspace_data['last_updated'] = datetime.now().isoformat()
+            with open(self.config.workspace_file, 'w', encoding='utf-8') as f:
+                json.dump(workspace_data, f, indent=2)
+            
+            # Collections are written to their new location, which also
+            # removes the files of the old layout
+            success, message, _ = self.export_all_collections()
+            return success, f"Switched to '{layout}' collection layout. {message}"
+            
+        except Exception as e:
+            return False, f"Failed to change collection layout: {str(e)}"
+    
+    def _collection_path(self, name: str, layout: str) -> Path:
+        """Get the file (single layout) or directory (split layout) of a collection."""
+        stem = self._sanitize_filename(name)
+        if layout == LAYOUT_SPLIT:
+            return self.config.collections_path / stem
+        return self.config.collections_path / (stem + ".json")
+    
     def _update_gitignore(self):
         """Add .postmini-secrets to .gitignore if not already present."""
         gitignore_content = ""
@@ -188,13 +276,14 @@ class GitSyncManager:
     
     # ==================== Export to File System ====================
     
-    def export_collection_to_file(self, collection_id: int) -> Tuple[bool, str]:
+    def export_collection_to_file(self, collection_id: int, layout: Optional[str] = None) -> Tuple[bool, str]:
         """
         Export a single collection to the file system using CollectionExporter.
         This ensures complete schema support (folders, scripts, variables, order_index).
         
         Args:
             collection_id: ID of the collection to export
+            layout: 'single' or 'split' (default: the workspace's layout)
             
         Returns:
             Tuple of (success, message/file_path)
@@ -204,21 +293,86 @@ class GitSyncManager:
             if not collection:
                 return False, f"Collection {collection_id} not found"
             
-            # Generate filename
-            filename = self._sanitize_filename(collection['name']) + ".json"
-            file_path = self.config.collections_path / filename
-            
-            # Use CollectionExporter to export with complete schema
-            success = self.exporter.export_collection_to_file(collection_id, str(file_path), format='internal')
-            
-            if not success:
-                return False, "Export failed"
-            
-            return True, str(file_path)
+            job = self._prepare_collection_export(collection, layout or self.get_collection_layout())
+            self._finish_collection_export(job, self._write_collection_export(job))
+            return True, str(job['path'])
             
         except Exception as e:
             return False, f"Export failed: {str(e)}"
     
+    def _prepare_collection_export(self, collection: Dict, layout: str) -> Dict:
+        """
+        Collect everything needed to write a collection (runs on the DB thread).
+        
+        Args:
+            collection: Collection row from the database
+            layout: 'single' or 'split'
+            
+        Returns:
+            Export job for _write_collection_export()
+        """
+        path = self._collection_path(collection['name'], layout)
+        job = {
+            'collection': collection,
+            'layout': layout,
+            'path': path,
+            'data': self.exporter.export_collection(collection['id']),
+            'known_hashes': None
+        }
+        if layout == LAYOUT_SPLIT:
+            # Hashes of files untouched since they were last seen avoid re-reading them
+            if not self._batch_depth:
+                self.manifest.load()
+            files = split_collection.stat_signature(split_collection.list_files(path))
+            job['known_hashes'] = self.manifest.cached_file_hashes('collections', path.name, files)
+        return job
+    
+    @staticmethod
+    def _write_collection_export(job: Dict) -> Tuple[bool, Optional[Dict[str, str]]]:
+        """
+        Write a prepared collection export. Touches only the file system, so
+        it can run on a worker thread.
+        
+        Args:
+            job: Export job from _prepare_collection_export()
+            
+        Returns:
+            Tuple of (files_changed, file_hashes); file_hashes is only set for
+            split collections, where only files whose content changed are rewritten
+        """
+        if job['layout'] == LAYOUT_SPLIT:
+            parts = split_collection.split_collection(job['data'])
+            written, removed = split_collection.write_split_collection(parts, job['path'], job['known_hashes'])
+            changed = bool(written or removed)
+            file_hashes = split_collection.part_hashes(parts)
+            single_file = GitSyncManager._other_layout_path(job)
+            if single_file.exists():
+                single_file.unlink()
+                changed = True
+            return changed, file_hashes
+        
+        with open(job['path'], 'w', encoding='utf-8') as f:
+            json.dump(job['data'], f, indent=2, ensure_ascii=False)
+        split_collection.remove_split_collection(GitSyncManager._other_layout_path(job))
+        return True, None
+    
+    @staticmethod
+    def _other_layout_path(job: Dict) -> Path:
+        """Get where a collection would be stored in the layout not being exported."""
+        if job['layout'] == LAYOUT_SPLIT:
+            return job['path'].with_name(job['path'].name + ".json")
+        return job['path'].with_suffix("")
+    
+    def _finish_collection_export(self, job: Dict, result: Tuple[bool, Optional[Dict[str, str]]]):
+        """Record a written collection export (runs on the DB thread)."""
+        changed, file_hashes = result
+        if changed:
+            self._exported_count += 1
+        
+        # Record the file as in sync so the next status check can skip it
+        self._update_hash('collection', job['collection']['id'], job['data'], job['path'],
+                          file_hashes=file_hashes)
+    
     def remove_collection_file(self, collection_id: int) -> Tuple[bool, str]:
         """
         Remove a collection's file from the file system when marked as private.
@@ -235,13 +389,15 @@ class GitSyncManager:
                 return False, f"Collection {collection_id} not found"
             
             # Generate filename
-            filename = self._sanitize_filename(collection['name']) + ".json"
-            file_path = self.config.collections_path / filename
+            file_path = self._collection_path(collection['name'], LAYOUT_SINGLE)
+            split_dir = self._collection_path(collection['name'], LAYOUT_SPLIT)
             
-            # Remove file if it exists
+            # Remove file (or split collection directory) if it exists
+            if split_collection.remove_split_collection(split_dir):
+                return True, f"Removed directory: {split_dir.name}"
             if file_path.exists():
                 file_path.unlink()
-                return True, f"Removed file: {filename}"
+                return True, f"Removed file: {file_path.name}"
             else:
                 return True, "File does not exist (already removed)"
             
@@ -277,30 +433,63 @@ class GitSyncManager:
         except Exception as e:
             return False, f"Failed to remove file: {str(e)}"
     
-    def export_all_collections(self) -> Tuple[bool, str, List[str]]:
+    def export_all_collections(self, progress_callback: Optional[ProgressCallback] = None,
+                               is_cancelled: Optional[Callable[[], bool]] = None) -> Tuple[bool, str, List[str]]:
         """
         Export all PUBLIC collections to file system (only collections with sync_to_git=1).
+        Collections unchanged since their last export (same DB revision, file
+        untouched) are skipped. Files are written on a thread pool while the
+        database work stays on the calling thread, in one transaction.
+        
+        Args:
+            progress_callback: Called with (done, total, message) after each collection
+            is_cancelled: Polled between collections; returning True stops the export
         
         Returns:
             Tuple of (success, message, list_of_file_paths)
         """
         # Get only public collections
         collections = self.db.get_public_collections()
+        exported_revisions = self.db.get_last_exported_revisions(self.target, 'collection')
+        layout = self.get_collection_layout()
         exported_files = []
         failed = []
+        unchanged = 0
         
-        for collection in collections:
-            success, result = self.export_collection_to_file(collection['id'])
-            if success:
-                exported_files.append(result)
-            else:
-                failed.append(f"{collection['name']}: {result}")
+        def finish(collection: Dict, job: Optional[Dict], future: Future):
+            try:
+                self._finish_collection_export(job, future.result())
+                exported_files.append(str(job['path']))
+            except Exception as e:
+                failed.append(f"{collection['name']}: Export failed: {str(e)}")
+        
+        with self._batch():
+            pending = []
+            for collection in collections:
+                file_path = self._collection_path(collection['name'], layout)
+                if self._is_export_current('collections', collection, exported_revisions, file_path):
+                    exported_files.append(str(file_path))
+                    unchanged += 1
+                else:
+                    pending.append(collection)
+            
+            cancelled = self._run_parallel(
+                pending, self._write_collection_export, finish,
+                prepare=lambda collection: self._prepare_collection_export(collection, layout),
+                progress_callback=progress_callback, is_cancelled=is_cancelled,
+                describe=lambda collection: f"Exported collection '{collection['name']}'"
+            )
         
+        if cancelled:
+            return False, f"Export cancelled after {len(exported_files)}/{len(collections)} collections", exported_files
         if failed:
             message = f"Exported {len(exported_files)}/{len(collections)} collections. Failures: {', '.join(failed)}"
             return False, message, exported_files
         else:
-            return True, f"Exported {len(exported_files)} public collections", exported_files
+            message = f"Exported {len(exported_files)} public collections"
+            if unchanged:
+                message += f" ({unchanged} unchanged)"
+            return True, message, exported_files
     
     def export_environment_to_file(self, environment_id: int, include_secrets: bool = False) -> Tuple[bool, str]:
         """
@@ -318,62 +507,117 @@ class GitSyncManager:
             if not environment:
                 return False, f"Environment {environment_id} not found"
             
-            # Get list of secret variable keys from database
-            secret_keys = self.db.get_secret_variables(environment_id)
-            
-            # Separate secrets from regular variables
-            variables = environment.get('variables', {})
-            public_vars = {}
-            
-            for key, value in variables.items():
-                if key in secret_keys and not include_secrets:
-                    # Secret variables get placeholder in public file
-                    public_vars[key] = f"{{{{SECRET_{key}}}}}"
-                else:
-                    public_vars[key] = value
-            
-            export_data = {
-                "export_version": self.EXPORT_VERSION,
-                "export_date": datetime.now().isoformat(),
-                "environment": {
-                    "id": environment_id,
-                    "name": environment['name'],
-                    "variables": public_vars if not include_secrets else variables,
-                    "secret_keys": secret_keys if not include_secrets else []  # Track which keys are secrets
-                }
-            }
-            
-            filename = self._sanitize_filename(environment['name']) + ".json"
-            file_path = self.config.environments_path / filename
-            
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
+            job = self._prepare_environment_export(environment, include_secrets)
+            self._write_json(job['path'], job['data'])
+            self._finish_environment_export(job)
             
-            # Update hash
-            self._update_hash('environment', environment_id, export_data)
-            
-            return True, str(file_path)
+            return True, str(job['path'])
             
         except Exception as e:
             return False, f"Export failed: {str(e)}"
     
-    def export_all_environments(self) -> Tuple[bool, str, List[str]]:
+    def _prepare_environment_export(self, environment: Dict, include_secrets: bool = False) -> Dict:
+        """
+        Build an environment's export data (runs on the DB thread).
+        
+        Args:
+            environment: Environment row from the database
+            include_secrets: If True, include actual secret values
+            
+        Returns:
+            Export job with 'environment', 'path' and 'data'
+        """
+        environment_id = environment['id']
+        
+        # Get list of secret variable keys from database
+        secret_keys = self.db.get_secret_variables(environment_id)
+        
+        # Separate secrets from regular variables
+        variables = environment.get('variables', {})
+        public_vars = {}
+        
+        for key, value in variables.items():
+            if key in secret_keys and not include_secrets:
+                # Secret variables get placeholder in public file
+                public_vars[key] = f"{{{{SECRET_{key}}}}}"
+            else:
+                public_vars[key] = value
+        
+        export_data = {
+            "export_version": self.EXPORT_VERSION,
+            "export_date": datetime.now().isoformat(),
+            "environment": {
+                "id": environment_id,
+                "name": environment['name'],
+                "variables": public_vars if not include_secrets else variables,
+                "secret_keys": secret_keys if not include_secrets else []  # Track which keys are secrets
+            }
+        }
+        
+        filename = self._sanitize_filename(environment['name']) + ".json"
+        return {
+            'environment': environment,
+            'path': self.config.environments_path / filename,
+            'data': export_data
+        }
+    
+    def _finish_environment_export(self, job: Dict):
+        """Record a written environment export (runs on the DB thread)."""
+        self._exported_count += 1
+        
+        # Update hash
+        self._update_hash('environment', job['environment']['id'], job['data'], job['path'])
+    
+    def export_all_environments(self, progress_callback: Optional[ProgressCallback] = None,
+                                is_cancelled: Optional[Callable[[], bool]] = None) -> Tuple[bool, str, List[str]]:
         """
         Export all PUBLIC environments to file system (only environments with sync_to_git=1).
         
+        Args:
+            progress_callback: Called with (done, total, message) after each environment
+            is_cancelled: Polled between environments; returning True stops the export
+        
         Returns:
             Tuple of (success, message, list_of_file_paths)
         """
         # Get only public environments
         environments = self.db.get_public_environments()
+        exported_revisions = self.db.get_last_exported_revisions(self.target, 'environment')
         exported_files = []
+        unchanged = 0
+        
+        def finish(env: Dict, job: Optional[Dict], future: Future):
+            try:
+                future.result()
+                self._finish_environment_export(job)
+                exported_files.append(str(job['path']))
+            except Exception:
+                pass
+        
+        with self._batch():
+            pending = []
+            for env in environments:
+                file_path = self.config.environments_path / (self._sanitize_filename(env['name']) + ".json")
+                if self._is_export_current('environments', env, exported_revisions, file_path):
+                    exported_files.append(str(file_path))
+                    unchanged += 1
+                else:
+                    pending.append(env)
+            
+            cancelled = self._run_parallel(
+                pending, lambda job: self._write_json(job['path'], job['data']), finish,
+                prepare=self._prepare_environment_export,
+                progress_callback=progress_callback, is_cancelled=is_cancelled,
+                describe=lambda env: f"Exported environment '{env['name']}'"
+            )
         
-        for env in environments:
-            success, result = self.export_environment_to_file(env['id'])
-            if success:
-                exported_files.append(result)
+        if cancelled:
+            return False, f"Export cancelled after {len(exported_files)}/{len(environments)} environments", exported_files
         
-        return True, f"Exported {len(exported_files)} public environments", exported_files
+        message = f"Exported {len(exported_files)} public environments"
+        if unchanged:
+            message += f" ({unchanged} unchanged)"
+        return True, message, exported_files
     
     # ==================== Import from File System ====================
     
@@ -384,7 +628,7 @@ class GitSyncManager:
         Collections imported from Git sync are automatically marked as public (sync_to_git=1).
         
         Args:
-            file_path: Path to the JSON file
+            file_path: Path to the JSON file (or split collection directory)
             update_existing: If True, update existing collection with same name
             
         Returns:
@@ -392,49 +636,81 @@ class GitSyncManager:
         """
         try:
             # Read file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            collection_data = data['collection']
-            collection_name = collection_data['name']
-            
-            # Check if collection exists
-            existing_collections = self.db.get_all_collections()
-            existing_collection = next((c for c in existing_collections if c['name'] == collection_name), None)
+            data = self._read_collection_source(file_path)
+        except Exception as e:
+            return False, f"Import failed: {str(e)}", None
+        
+        return self._import_collection_data(data, update_existing)
+    
+    @staticmethod
+    def _read_collection_source(file_path) -> Dict:
+        """Read and parse a collection file or split collection directory (thread-safe)."""
+        if os.path.isdir(str(file_path)):
+            return split_collection.read_split_collection(file_path)
+        return GitSyncManager._read_json(file_path)
+    
+    def _import_collection_data(self, data: Dict, update_existing: bool = True) -> Tuple[bool, str, Optional[int]]:
+        """
+        Write a parsed collection to the database. Runs in its own (nested)
+        transaction, so a failed import leaves an existing collection untouched.
+        
+        Args:
+            data: Parsed collection export
+            update_existing: If True, update existing collection with same name
             
-            if existing_collection and update_existing:
-                # Delete existing collection entirely to reimport
-                collection_id = existing_collection['id']
-                self.db.delete_collection(collection_id)
+        Returns:
+            Tuple of (success, message, collection_id)
+        """
+        try:
+            with self.db.transaction():
+                collection_data = data['collection']
+                collection_name = collection_data['name']
                 
-                # Use CollectionImporter to import with complete schema
-                success, message, collection_id = self.importer.import_collection(data, rename_if_exists=False, skip_if_exists=False)
+                # Check if collection exists
+                existing_collections = self.db.get_all_collections()
+                existing_collection = next((c for c in existing_collections if c['name'] == collection_name), None)
                 
-            elif existing_collection and not update_existing:
-                # Skip
-                return False, f"Collection '{collection_name}' already exists (skipped)", None
+                if existing_collection and update_existing:
+                    # Delete existing collection entirely to reimport
+                    collection_id = existing_collection['id']
+                    self.db.delete_collection(collection_id)
+                    
+                    # Use CollectionImporter to import with complete schema
+                    success, message, collection_id = self.importer.import_collection(data, rename_if_exists=False, skip_if_exists=False)
+                    
+                elif existing_collection and not update_existing:
+                    # Skip
+                    raise _ImportFailed(f"Collection '{collection_name}' already exists (skipped)")
+                    
+                else:
+                    # Use CollectionImporter to import new collection with complete schema
+                    success, message, collection_id = self.importer.import_collection(data, rename_if_exists=False, skip_if_exists=False)
                 
-            else:
-                # Use CollectionImporter to import new collection with complete schema
-                success, message, collection_id = self.importer.import_collection(data, rename_if_exists=False, skip_if_exists=False)
-            
-            if not success:
-                return False, message, None
-            
-            # Mark as public (sync_to_git=1) since it came from Git sync
-            self.db.set_collection_sync_status(collection_id, 1)
+                if not success:
+                    raise _ImportFailed(message)
+                
+                # Mark as public (sync_to_git=1) since it came from Git sync
+                self.db.set_collection_sync_status(collection_id, 1)
             
             return True, message, collection_id
             
+        except _ImportFailed as e:
+            return False, str(e), None
         except Exception as e:
             return False, f"Import failed: {str(e)}", None
     
-    def import_all_collections(self, update_existing: bool = True) -> Tuple[bool, str, List[int]]:
+    def import_all_collections(self, update_existing: bool = True,
+                               progress_callback: Optional[ProgressCallback] = None,
+                               is_cancelled: Optional[Callable[[], bool]] = None) -> Tuple[bool, str, List[int]]:
         """
-        Import all collections from file system.
+        Import all collections from file system. Files are read and parsed on
+        a thread pool; the database writes happen on the calling thread in a
+        single transaction.
         
         Args:
             update_existing: If True, update existing collections
+            progress_callback: Called with (done, total, message) after each collection
+            is_cancelled: Polled between collections; returning True stops the import
             
         Returns:
             Tuple of (success, message, list_of_collection_ids)
@@ -442,16 +718,31 @@ class GitSyncManager:
         if not self.config.collections_path.exists():
             return False, "Collections directory not found", []
         
-        collection_files = list(self.config.collections_path.glob("*.json"))
+        collection_files = split_collection.find_collections(self.config.collections_path)
         imported_ids = []
         messages = []
         
-        for file_path in collection_files:
-            success, message, coll_id = self.import_collection_from_file(str(file_path), update_existing)
+        def finish(file_path: Path, _, future: Future):
+            try:
+                data = future.result()
+            except Exception as e:
+                messages.append(f"Import failed: {str(e)}")
+                return
+            success, message, coll_id = self._import_collection_data(data, update_existing)
             if success and coll_id:
                 imported_ids.append(coll_id)
             messages.append(message)
         
+        with self.db.transaction():
+            cancelled = self._run_parallel(
+                collection_files, self._read_collection_source, finish,
+                progress_callback=progress_callback, is_cancelled=is_cancelled,
+                describe=lambda file_path: f"Imported {file_path.name}"
+            )
+        
+        if cancelled:
+            return False, f"Import cancelled after {len(imported_ids)}/{len(collection_files)} collections", imported_ids
+        
         summary = f"Imported {len(imported_ids)} collections"
         return True, summary, imported_ids
     
@@ -469,43 +760,69 @@ class GitSyncManager:
             Tuple of (success, message, environment_id)
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            env_data = data['environment']
-            env_name = env_data['name']
-            variables = env_data.get('variables', {})
-            secret_keys = env_data.get('secret_keys', [])  # List of variable keys that are secrets
-            
-            # Check if environment exists
-            existing_envs = self.db.get_all_environments()
-            existing_env = next((e for e in existing_envs if e['name'] == env_name), None)
-            
-            if existing_env and update_existing:
-                # Update
-                env_id = existing_env['id']
-                self.db.update_environment(env_id, env_name, variables)
-            elif existing_env and not update_existing:
-                return False, f"Environment '{env_name}' already exists (skipped)", None
-            else:
-                # Create
-                env_id = self.db.create_environment(env_name, variables)
-            
-            # Mark as public (sync_to_git=1) since it came from Git sync
-            self.db.set_environment_sync_status(env_id, 1)
+            data = self._read_json(file_path)
+        except Exception as e:
+            return False, f"Import failed: {str(e)}", None
+        
+        return self._import_environment_data(data, update_existing)
+    
+    def _import_environment_data(self, data: Dict, update_existing: bool = True) -> Tuple[bool, str, Optional[int]]:
+        """
+        Write a parsed environment to the database in its own (nested) transaction.
+        
+        Args:
+            data: Parsed environment export
+            update_existing: If True, update existing environment with same name
             
-            # Restore secret variable tracking
-            for key in secret_keys:
-                self.db.mark_variable_as_secret(env_id, key)
+        Returns:
+            Tuple of (success, message, environment_id)
+        """
+        try:
+            with self.db.transaction():
+                env_data = data['environment']
+                env_name = env_data['name']
+                variables = env_data.get('variables', {})
+                secret_keys = env_data.get('secret_keys', [])  # List of variable keys that are secrets
+                
+                # Check if environment exists
+                existing_envs = self.db.get_all_environments()
+                existing_env = next((e for e in existing_envs if e['name'] == env_name), None)
+                
+                if existing_env and update_existing:
+                    # Update
+                    env_id = existing_env['id']
+                    self.db.update_environment(env_id, env_name, variables)
+                elif existing_env and not update_existing:
+                    raise _ImportFailed(f"Environment '{env_name}' already exists (skipped)")
+                else:
+                    # Create
+                    env_id = self.db.create_environment(env_name, variables)
+                
+                # Mark as public (sync_to_git=1) since it came from Git sync
+                self.db.set_environment_sync_status(env_id, 1)
+                
+                # Restore secret variable tracking
+                for key in secret_keys:
+                    self.db.mark_variable_as_secret(env_id, key)
             
             return True, f"Imported environment '{env_name}'", env_id
             
+        except _ImportFailed as e:
+            return False, str(e), None
         except Exception as e:
             return False, f"Import failed: {str(e)}", None
     
-    def import_all_environments(self, update_existing: bool = True) -> Tuple[bool, str, List[int]]:
+    def import_all_environments(self, update_existing: bool = True,
+                                progress_callback: Optional[ProgressCallback] = None,
+                                is_cancelled: Optional[Callable[[], bool]] = None) -> Tuple[bool, str, List[int]]:
         """
-        Import all environments from file system.
+        Import all environments from file system (parsed on a thread pool,
+        written in a single transaction).
+        
+        Args:
+            update_existing: If True, update existing environments
+            progress_callback: Called with (done, total, message) after each environment
+            is_cancelled: Polled between environments; returning True stops the import
         
         Returns:
             Tuple of (success, message, list_of_environment_ids)
@@ -513,22 +830,41 @@ class GitSyncManager:
         if not self.config.environments_path.exists():
             return False, "Environments directory not found", []
         
-        env_files = list(self.config.environments_path.glob("*.json"))
+        env_files = sorted(self.config.environments_path.glob("*.json"))
         imported_ids = []
         
-        for file_path in env_files:
-            success, message, env_id = self.import_environment_from_file(str(file_path), update_existing)
+        def finish(file_path: Path, _, future: Future):
+            try:
+                data = future.result()
+            except Exception:
+                return
+            success, message, env_id = self._import_environment_data(data, update_existing)
             if success and env_id:
                 imported_ids.append(env_id)
         
+        with self.db.transaction():
+            cancelled = self._run_parallel(
+                env_files, self._read_json, finish,
+                progress_callback=progress_callback, is_cancelled=is_cancelled,
+                describe=lambda file_path: f"Imported {file_path.name}"
+            )
+        
+        if cancelled:
+            return False, f"Import cancelled after {len(imported_ids)}/{len(env_files)} environments", imported_ids
+        
         return True, f"Imported {len(imported_ids)} environments", imported_ids
     
     # ==================== Sync Operations ====================
     
-    def sync_to_filesystem(self) -> Tuple[bool, str]:
+    def sync_to_filesystem(self, progress_callback: Optional[ProgressCallback] = None,
+                           is_cancelled: Optional[Callable[[], bool]] = None) -> Tuple[bool, str]:
         """
         Sync all database content to file system (push).
         
+        Args:
+            progress_callback: Called with (done, total, message) after each item
+            is_cancelled: Polled between items; returning True stops the sync
+        
         Returns:
             Tuple of (success, message)
         """
@@ -536,14 +872,21 @@ class GitSyncManager:
             return False, "Workspace not initialized"
         
         try:
+            self._exported_count = 0
+            
             # Export all collections
-            coll_success, coll_msg, coll_files = self.export_all_collections()
+            coll_success, coll_msg, coll_files = self.export_all_collections(progress_callback, is_cancelled)
+            if is_cancelled and is_cancelled():
+                return False, coll_msg
             
             # Export all environments
-            env_success, env_msg, env_files = self.export_all_environments()
+            env_success, env_msg, env_files = self.export_all_environments(progress_callback, is_cancelled)
+            if is_cancelled and is_cancelled():
+                return False, env_msg
             
-            # Update workspace metadata
-            self._update_workspace_metadata()
+            # Update workspace metadata (only if something was written)
+            if self._exported_count:
+                self._update_workspace_metadata()
             
             message = f"Synced to filesystem: {len(coll_files)} collections, {len(env_files)} environments"
             return True, message
@@ -551,12 +894,16 @@ class GitSyncManager:
         except Exception as e:
             return False, f"Sync failed: {str(e)}"
     
-    def sync_from_filesystem(self, update_existing: bool = True) -> Tuple[bool, str]:
+    def sync_from_filesystem(self, update_existing: bool = True,
+                             progress_callback: Optional[ProgressCallback] = None,
+                             is_cancelled: Optional[Callable[[], bool]] = None) -> Tuple[bool, str]:
         """
         Sync file system content to database (pull).
         
         Args:
             update_existing: If True, update existing items
+            progress_callback: Called with (done, total, message) after each item
+            is_cancelled: Polled between items; returning True stops the sync
             
         Returns:
             Tuple of (success, message)
@@ -566,10 +913,14 @@ class GitSyncManager:
         
         try:
             # Import all collections
-            coll_success, coll_msg, coll_ids = self.import_all_collections(update_existing)
+            coll_success, coll_msg, coll_ids = self.import_all_collections(update_existing, progress_callback, is_cancelled)
+            if is_cancelled and is_cancelled():
+                return False, coll_msg
             
             # Import all environments
-            env_success, env_msg, env_ids = self.import_all_environments(update_existing)
+            env_success, env_msg, env_ids = self.import_all_environments(update_existing, progress_callback, is_cancelled)
+            if is_cancelled and is_cancelled():
+                return False, env_msg
             
             message = f"Synced from filesystem: {len(coll_ids)} collections, {len(env_ids)} environments"
             return True, message
@@ -577,43 +928,92 @@ class GitSyncManager:
         except Exception as e:
             return False, f"Sync failed: {str(e)}"
     
-    def detect_changes(self) -> Dict[str, List[Dict]]:
+    def detect_changes(self, save_manifest: bool = True,
+                       changed_paths: Optional[Iterable[str]] = None) -> Dict[str, List[Dict]]:
         """
         Detect changes between database and file system.
         
+        Uses the sync manifest to skip work: files whose mtime/size are
+        unchanged are not re-parsed, and collections whose file hash and DB
+        revision are unchanged since the last comparison are not re-exported.
+        For split collections only the files that changed are read.
+        
+        Args:
+            save_manifest: Save the updated manifest; without it (read-only
+                connections) the caller saves manifest.pending_update()
+            changed_paths: Workspace files known to have changed since the
+                manifest was last updated (e.g. from WorkspaceWatcher). Only
+                the collections they belong to are re-checked on disk; the
+                others are taken from the manifest as recorded. None checks
+                every collection.
+        
         Returns:
             Dictionary with changes categorized as:
             - new_files: Files on disk not in database
             - modified_files: Files changed on disk
             - deleted_files: Files in database but not on disk
             - new_db_items: Items in database not on disk
+            - modified_db_items: Items changed in database since their file
+              was last exported (and the file was not edited since)
         """
         changes = {
             "new_files": [],
             "modified_files": [],
             "deleted_files": [],
-            "new_db_items": []
+            "new_db_items": [],
+            "modified_db_items": []
         }
         
         if not self.is_workspace_initialized():
             return changes
         
+        self.manifest.load()
+        
         # Check collections - ONLY public ones (sync_to_git=1)
         db_collections = {c['name']: c for c in self.db.get_public_collections()}
+        exported_revisions = self.db.get_last_exported_revisions(self.target, 'collection')
+        touched = self._touched_collections(changed_paths)
         
         if self.config.collections_path.exists():
             file_collections = {}
-            for file_path in self.config.collections_path.glob("*.json"):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        coll_name = data['collection']['name']
-                        file_collections[coll_name] = {
+            file_names = []
+            for file_path in split_collection.find_collections(self.config.collections_path):
+                file_names.append(file_path.name)
+                if touched is not None and file_path.name not in touched:
+                    entry = self.manifest.recorded_entry('collections', file_path.name)
+                    if entry is not None:
+                        file_collections[entry['name']] = {
                             'path': str(file_path),
-                            'data': data
+                            'entry': entry,
+                            'data': None,
+                            'split': file_path.is_dir()
                         }
+                        continue
+                if file_path.is_dir():
+                    info = self._scan_split_collection(file_path)
+                    if info:
+                        file_collections[info['entry']['name']] = info
+                    continue
+                try:
+                    stat = file_path.stat()
+                    data = None
+                    entry = self.manifest.get_entry('collections', file_path.name, stat)
+                    if entry is None:
+                        # New or changed file - parse it
+                        with open(file_path, 'r', encoding='utf-8') as f:
+                            data = json.load(f)
+                        entry = self.manifest.record_file(
+                            'collections', file_path.name, stat,
+                            data['collection']['name'], content_hash(data['collection'])
+                        )
+                    file_collections[entry['name']] = {
+                        'path': str(file_path),
+                        'entry': entry,
+                        'data': data
+                    }
                 except Exception:
                     continue
+            self.manifest.prune('collections', file_names)
             
             # Detect new files (files on disk not in DB as public collection)
             for name, info in file_collections.items():
@@ -623,10 +1023,17 @@ class GitSyncManager:
                         'name': name,
                         'path': info['path']
                     })
-                else:
-                    # Check if modified
-                    coll_id = db_collections[name]['id']
-                    if self._is_modified('collection', coll_id, info['data']):
+                elif self._is_collection_modified(db_collections[name], info):
+                    collection = db_collections[name]
+                    if collection['id'] in exported_revisions and \
+                            not self.manifest.changed_since_export(info['entry']):
+                        # File is as we exported it - the change is on the DB side
+                        changes['modified_db_items'].append({
+                            'type': 'collection',
+                            'name': name,
+                            'id': collection['id']
+                        })
+                    else:
                         changes['modified_files'].append({
                             'type': 'collection',
                             'name': name,
@@ -642,22 +1049,116 @@ class GitSyncManager:
                         'id': coll['id']
                     })
         
+        if save_manifest:
+            self.manifest.save()
         return changes
     
-    def get_sync_status(self) -> SyncStatus:
+    def _touched_collections(self, changed_paths: Optional[Iterable[str]]) -> Optional[Set[str]]:
+        """
+        Get the collection files and split collection directories (names
+        within the collections directory) that changed paths belong to.
+        
+        Returns:
+            Set of names, or None if changed_paths is None
+        """
+        if changed_paths is None:
+            return None
+        collections_path = os.path.abspath(str(self.config.collections_path))
+        touched = set()
+        for path in changed_paths:
+            try:
+                parts = Path(os.path.relpath(os.path.abspath(str(path)), collections_path)).parts
+            except ValueError:
+                continue  # On another drive
+            if parts and parts[0] not in (os.curdir, os.pardir):
+                touched.add(parts[0])
+        return touched
+    
+    def _scan_split_collection(self, directory: Path) -> Optional[Dict]:
+        """
+        Refresh the manifest entry of a split collection directory, reading
+        only the files whose stat changed since they were last seen.
+        
+        Args:
+            directory: Split collection directory
+            
+        Returns:
+            File info for detect_changes, or None if the directory is unreadable
+        """
+        try:
+            files = split_collection.stat_signature(split_collection.list_files(directory))
+            entry = self.manifest.get_dir_entry('collections', directory.name, files)
+            if entry is None:
+                file_hashes = self.manifest.cached_file_hashes('collections', directory.name, files)
+                previous = self.manifest.entries.get('collections', {}).get(directory.name) or {}
+                name = previous.get('name') if split_collection.INDEX_FILE in file_hashes else None
+                
+                for rel_path in files:
+                    if rel_path in file_hashes:
+                        continue
+                    data = split_collection.read_file(directory, rel_path)
+                    file_hashes[rel_path] = content_hash(data)
+                    if rel_path == split_collection.INDEX_FILE:
+                        name = data['collection']['name']
+                
+                entry = self.manifest.record_dir('collections', directory.name, files, name, file_hashes)
+            return {
+                'path': str(directory),
+                'entry': entry,
+                'data': None,
+                'split': True
+            }
+        except Exception:
+            return None
+    
+    def _is_collection_modified(self, collection: Dict, file_info: Dict) -> bool:
+        """
+        Check a collection against its file, reusing the last comparison if
+        neither the file content nor the DB revision changed since.
+        
+        Args:
+            collection: Collection row from the database (with 'revision')
+            file_info: File info built by detect_changes ('path', 'entry', 'data')
+            
+        Returns:
+            True if file differs from database, False if identical
+        """
+        entry = file_info['entry']
+        revision = collection.get('revision') or 0
+        in_sync = self.manifest.cached_comparison(entry, collection['id'], revision)
+        if in_sync is not None:
+            return not in_sync
+        
+        if file_info.get('split'):
+            modified = self._is_split_modified(collection['id'], entry['file_hashes'])
+        else:
+            data = file_info['data']
+            if data is None:
+                with open(file_info['path'], 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            modified = self._is_modified('collection', collection['id'], data)
+        self.manifest.record_comparison(entry, collection['id'], revision, not modified)
+        return modified
+    
+    def get_sync_status(self, save_manifest: bool = True,
+                        changed_paths: Optional[Iterable[str]] = None) -> SyncStatus:
         """
         Get current sync status.
         
+        Args:
+            save_manifest: Save the updated manifest (see detect_changes())
+            changed_paths: Only re-check the collections of these files (see detect_changes())
+        
         Returns:
             SyncStatus object
         """
         if not self.is_workspace_initialized():
             return SyncStatus(SyncStatus.STATUS_DISABLED, "Git sync not enabled")
         
-        changes = self.detect_changes()
+        changes = self.detect_changes(save_manifest, changed_paths)
         
         has_new_files = len(changes['new_files']) > 0 or len(changes['modified_files']) > 0
-        has_new_db = len(changes['new_db_items']) > 0
+        has_new_db = len(changes['new_db_items']) > 0 or len(changes['modified_db_items']) > 0
         
         if has_new_files and has_new_db:
             return SyncStatus(
@@ -674,7 +1175,7 @@ class GitSyncManager:
         elif has_new_db:
             return SyncStatus(
                 SyncStatus.STATUS_NEEDS_PUSH,
-                f"{len(changes['new_db_items'])} item(s) not yet synced",
+                f"{len(changes['new_db_items']) + len(changes['modified_db_items'])} item(s) not yet synced",
                 changes
             )
         else:
@@ -682,6 +1183,84 @@ class GitSyncManager:
     
     # ==================== Helper Methods ====================
     
+    def _run_parallel(self, items: List[Any], work: Callable[[Any], Any],
+                      finish: Callable[[Any, Any, Future], None],
+                      prepare: Optional[Callable[[Any], Any]] = None,
+                      progress_callback: Optional[ProgressCallback] = None,
+                      is_cancelled: Optional[Callable[[], bool]] = None,
+                      describe: Callable[[Any], str] = str) -> bool:
+        """
+        Run file work for many items on a thread pool, keeping all database
+        access on the calling thread (SQLite connections are per thread).
+        
+        For each item, `prepare(item)` runs first on the calling thread, then
+        `work(prepared)` runs on a worker and `finish(item, prepared, future)`
+        runs on the calling thread in item order.
+        
+        Args:
+            items: Items to process
+            work: File system work (must not touch the database)
+            finish: Consumes the result; `future.result()` re-raises worker errors
+            prepare: Optional database reads needed by `work`
+            progress_callback: Called with (done, total, message) after each item
+            is_cancelled: Polled between items; returning True stops processing
+            describe: Builds the progress message for an item
+            
+        Returns:
+            True if processing was cancelled before all items finished
+        """
+        total = len(items)
+        cancelled = False
+        with ThreadPoolExecutor(max_workers=SYNC_WORKERS) as pool:
+            submitted = []
+            for item in items:
+                if is_cancelled and is_cancelled():
+                    cancelled = True
+                    break
+                prepared = prepare(item) if prepare else item
+                submitted.append((item, prepared, pool.submit(work, prepared)))
+            
+            for done, (item, prepared, future) in enumerate(submitted, 1):
+                if cancelled or (is_cancelled and is_cancelled()):
+                    cancelled = True
+                    future.cancel()
+                    continue
+                finish(item, prepared, future)
+                if progress_callback:
+                    progress_callback(done, total, describe(item))
+        return cancelled
+    
+    @contextmanager
+    def _batch(self):
+        """
+        Group the manifest and database writes of a bulk export: the manifest
+        is loaded and saved once and everything is committed in one transaction.
+        """
+        if self._batch_depth:
+            yield
+            return
+        
+        self.manifest.load()
+        self._batch_depth += 1
+        try:
+            with self.db.transaction():
+                yield
+                self.manifest.save()
+        finally:
+            self._batch_depth -= 1
+    
+    @staticmethod
+    def _read_json(file_path) -> Dict:
+        """Read and parse a JSON file (thread-safe)."""
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    @staticmethod
+    def _write_json(file_path, data: Dict):
+        """Write data as a JSON file (thread-safe)."""
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    
     def _sanitize_filename(self, name: str) -> str:
         """Convert collection/environment name to safe filename."""
         # Remove invalid characters
@@ -712,8 +1291,100 @@ class GitSyncManager:
     
     def _compute_hash(self, data: Dict) -> str:
         """Compute hash of data for change detection."""
-        json_str = json.dumps(data, sort_keys=True)
-        return hashlib.sha256(json_str.encode()).hexdigest()
+        return content_hash(data)
+    
+    def _update_hash(self, item_type: str, item_id: int, data: Dict, file_path: Path,
+                     file_hashes: Optional[Dict[str, str]] = None):
+        """
+        Record a just-exported file in the sync manifest as in sync with its
+        database item, and the item's revision as last exported to this
+        workspace, so the next change detection and export skip it.
+        
+        Args:
+            item_type: 'collection' or 'environment'
+            item_id: ID of the item in database
+            data: Exported data as written to the file
+            file_path: Path of the written file (or split collection directory)
+            file_hashes: Hashes of the written files, for split collections
+        """
+        try:
+            if item_type == 'collection':
+                item = self.db.get_collection(item_id)
+            else:
+                item = self.db.get_environment(item_id)
+            if not item:
+                return
+            
+            if not self._batch_depth:
+                self.manifest.load()
+            if file_hashes is not None:
+                entry = self.manifest.record_dir(
+                    item_type + 's', Path(file_path).name,
+                    split_collection.stat_signature(split_collection.list_files(file_path)),
+                    item['name'], file_hashes
+                )
+            else:
+                entry = self.manifest.record_file(
+                    item_type + 's', Path(file_path).name, os.stat(file_path),
+                    item['name'], content_hash(data[item_type])
+                )
+            revision = item.get('revision') or 0
+            self.manifest.record_comparison(entry, item_id, revision, True)
+            self.manifest.record_export(entry)
+            if not self._batch_depth:
+                self.manifest.save()
+            self.db.set_last_exported_revision(self.target, item_type, item_id, revision)
+        except Exception as e:
+            # The manifest is only a cache - never fail an export because of it
+            print(f"[WARNING] Could not update sync manifest: {e}")
+    
+    def _is_export_current(self, kind: str, item: Dict, exported_revisions: Dict[int, int],
+                           file_path: Path) -> bool:
+        """
+        Check whether an item's file already holds its current content, so
+        exporting it again can be skipped.
+        
+        Args:
+            kind: 'collections' or 'environments'
+            item: Collection or environment row (with 'revision')
+            exported_revisions: Last exported revision per item ID for this workspace
+            file_path: Path the item would be exported to (file or split directory)
+            
+        Returns:
+            True if the item is unchanged since its last export and the file
+            was not edited since
+        """
+        if exported_revisions.get(item['id']) != (item.get('revision') or 0):
+            return False
+        if file_path.is_dir():
+            files = split_collection.stat_signature(split_collection.list_files(file_path))
+            entry = self.manifest.get_dir_entry(kind, file_path.name, files)
+            return entry is not None and not self.manifest.changed_since_export(entry)
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return False
+        entry = self.manifest.get_entry(kind, file_path.name, stat)
+        return entry is not None and not self.manifest.changed_since_export(entry)
+    
+    def _is_split_modified(self, collection_id: int, file_hashes: Dict[str, str]) -> bool:
+        """
+        Check a split collection against the database by comparing per-file
+        hashes, so no file has to be read.
+        
+        Args:
+            collection_id: ID of the collection in database
+            file_hashes: Hashes of the collection's files on disk
+            
+        Returns:
+            True if files differ from database, False if identical
+        """
+        try:
+            parts = split_collection.split_collection(self.exporter.export_collection(collection_id))
+            return split_collection.part_hashes(parts) != file_hashes
+        except Exception:
+            # If comparison fails, assume modified to be safe
+            return True
     
     def _is_modified(self, item_type: str, item_id: int, file_data: Dict) -> bool:
         """
@@ -781,15 +1452,20 @@ class GitSyncManager:
         db_collections = {c['name']: c['id'] for c in self.db.get_all_collections()}
         
         # Remove collection files not in database
-        if self.config.collections_path.exists():
-            for file_path in self.config.collections_path.glob("*.json"):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        coll_name = data['collection']['name']
-                        
-                        if coll_name not in db_collections:
-                            file_path.unlink()
-                except Exception:
-                    pass
+        for file_path in split_collection.find_collections(self.config.collections_path):
+            try:
+                if file_path.is_dir():
+                    coll_name = split_collection.read_file(file_path, split_collection.INDEX_FILE)['collection']['name']
+                    if coll_name not in db_collections:
+                        split_collection.remove_split_collection(file_path)
+                    continue
+                
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                    coll_name = data['collection']['name']
+                    
+                    if coll_name not in db_collections:
+                        file_path.unlink()
+            except Exception:
+                pass
 
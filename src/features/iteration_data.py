@@ -0,0 +1,197 @@
+"""
+Iteration Data Files
+
+Reads the data file of a data-driven collection run: each CSV row or JSON
+object is the data of one iteration, bound as {{variables}} and exposed to
+scripts as pm.iterationData.
+
+Rows are streamed, so replaying a fixture with 100k rows keeps one chunk of
+the file in memory rather than the whole file. Supported formats:
+
+- CSV with a header row (.csv)
+- JSON lines, one object per line (.jsonl, .ndjson)
+- A JSON array of objects (.json, as used for Postman data files), parsed
+  one element at a time
+"""
+
+import csv
+import json
+from typing import Any, Dict, Iterator, Optional, TextIO
+
+FORMAT_CSV = "csv"
+FORMAT_JSON_LINES = "jsonl"
+FORMAT_JSON = "json"
+
+FORMATS = (FORMAT_CSV, FORMAT_JSON_LINES, FORMAT_JSON)
+
+# Characters read at a time from JSON array files
+READ_CHUNK_SIZE = 64 * 1024
+
+_EXTENSIONS = {
+    '.csv': FORMAT_CSV,
+    '.jsonl': FORMAT_JSON_LINES,
+    '.ndjson': FORMAT_JSON_LINES,
+}
+
+
+class DataFileError(ValueError):
+    """Raised when a data file cannot be parsed."""
+
+
+def detect_format(path) -> str:
+    """
+    Detect the format of a data file from its extension.
+
+    A .json file holding objects on separate lines instead of an array is
+    read as JSON lines.
+    """
+    name = str(path).lower()
+    for extension, data_format in _EXTENSIONS.items():
+        if name.endswith(extension):
+            return data_format
+
+    with open(str(path), 'r', encoding='utf-8-sig') as f:
+        while True:
+            char = f.read(1)
+            if not char or not char.isspace():
+                break
+    if char == '{':
+        return FORMAT_JSON_LINES
+    if char == '[' or name.endswith('.json'):
+        return FORMAT_JSON
+    return FORMAT_CSV
+
+
+def iter_rows(path, data_format: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the rows of a data file.
+
+    Args:
+        path: Data file
+        data_format: One of FORMATS (detected from the file if None)
+
+    Yields:
+        One dictionary per iteration; CSV values are strings, JSON values
+        keep their type
+
+    Raises:
+        DataFileError: If the file is not valid (raised when the bad row is
+            reached)
+        OSError: If the file cannot be read
+    """
+    data_format = data_format or detect_format(path)
+    if data_format not in FORMATS:
+        raise DataFileError(f"Unknown data file format '{data_format}'")
+
+    with open(str(path), 'r', encoding='utf-8-sig', newline='' if data_format == FORMAT_CSV else None) as f:
+        if data_format == FORMAT_CSV:
+            yield from _iter_csv(f)
+        elif data_format == FORMAT_JSON_LINES:
+            yield from _iter_json_lines(f)
+        else:
+            yield from _iter_json_array(f)
+
+
+def count_rows(path, data_format: Optional[str] = None) -> int:
+    """Count the rows of a data file (streams it once, validating every row)."""
+    return sum(1 for _ in iter_rows(path, data_format))
+
+
+def to_variables(row: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Convert a row to variable values for substitution.
+
+    Strings are kept; other JSON values are written as JSON (true, 3, null,
+    {"a": 1}), as Postman does.
+    """
+    return {
+        key: value if isinstance(value, str) else json.dumps(value)
+        for key, value in row.items()
+    }
+
+
+def _iter_csv(f: TextIO) -> Iterator[Dict[str, Any]]:
+    reader = csv.DictReader(f)
+    if reader.fieldnames is None:
+        return
+    for row in reader:
+        # Missing trailing cells are empty; cells beyond the header are dropped
+        yield {key: value if value is not None else '' for key, value in row.items() if key is not None}
+
+
+def _iter_json_lines(f: TextIO) -> Iterator[Dict[str, Any]]:
+    for line_number, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            raise DataFileError(f"Line {line_number}: {e}") from None
+        if not isinstance(row, dict):
+            raise DataFileError(f"Line {line_number}: expected a JSON object")
+        yield row
+
+
+def _iter_json_array(f: TextIO) -> Iterator[Dict[str, Any]]:
+    """Parse a JSON array of objects element by element."""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    state = 'start'  # start -> first -> (value -> separator)* -> end
+    item = 0
+
+    def read_more():
+        nonlocal buffer, pos, eof
+        chunk = f.read(READ_CHUNK_SIZE)
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        eof = not chunk
+
+    while True:
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            read_more()
+
+        if pos >= len(buffer):
+            if state == 'start':
+                return  # Empty file
+            raise DataFileError("Unexpected end of JSON array")
+
+        char = buffer[pos]
+        if state == 'start':
+            if char != '[':
+                raise DataFileError("Expected a JSON array of objects")
+            pos += 1
+            state = 'first'
+            continue
+        if char == ']' and state in ('first', 'separator'):
+            return
+        if state == 'separator':
+            if char != ',':
+                raise DataFileError(f"Expected ',' or ']' after item {item}")
+            pos += 1
+            state = 'value'
+            continue
+
+        while True:
+            try:
+                row, end = decoder.raw_decode(buffer, pos)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(buffer) or eof:
+                    break
+            except ValueError as e:
+                if eof:
+                    raise DataFileError(f"Item {item + 1}: {e}") from None
+            read_more()
+
+        item += 1
+        if not isinstance(row, dict):
+            raise DataFileError(f"Item {item}: expected a JSON object")
+        yield row
+        pos = end
+        state = 'separator'
@@ -0,0 +1,515 @@
+"""
+JSONPath
+
+One JSONPath implementation shared by JSON path test assertions and
+variable extraction.
+
+Supported syntax:
+
+    $                       root ("user.name" is short for "$.user.name")
+    .name  ['name']         member (['a', 'b'] selects several)
+    [0]  [-1]  [0, 2]       array index (negative counts from the end)
+    [start:end:step]        array slice
+    .*  [*]                 all members / elements
+    ..name  ..*  ..[0]      recursive descent
+    [?(<expr>)]             filter, e.g. [?(@.price < 10 && @.tags)]
+
+Filter expressions compare "@" (the current item) or "$" paths with numbers,
+strings, true, false and null using == != < <= > >= and =~ (regex, e.g.
+@.name =~ /^a/i), combined with &&, || and !; a path on its own tests that
+it exists.
+
+Expressions are compiled once into a list of steps (cached by expression)
+and evaluated lazily: matches are generated one at a time, so taking the
+first match of "$..id" in a large document stops as soon as one is found.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Iterator, List, Optional
+
+# Number of compiled expressions kept in memory
+PATH_CACHE_SIZE = 512
+
+# Filter predicate: (item, root) -> bool
+Predicate = Callable[[Any, Any], bool]
+
+_MISSING = object()
+
+_INTEGER = re.compile(r'-?\d+')
+_NUMBER = re.compile(r'-?\d+(\.\d+)?([eE][+-]?\d+)?')
+_COMPARISONS = ('==', '!=', '<=', '>=', '=~', '<', '>')
+_FILTER_NAME_END = set(' \t\r\n.[]()=!<>&|,~')
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f'}
+_REGEX_FLAGS = {'i': re.IGNORECASE, 'm': re.MULTILINE, 's': re.DOTALL, 'x': re.VERBOSE}
+
+
+class JSONPathError(ValueError):
+    """Raised for an invalid JSONPath expression."""
+
+
+class _Step:
+    """A path segment: selects zero or more values from each input value."""
+
+    # True if the step selects at most one value
+    definite = True
+
+    def select(self, value: Any, root: Any) -> Iterator[Any]:
+        raise NotImplementedError
+
+    def apply(self, values: Iterator[Any], root: Any) -> Iterator[Any]:
+        for value in values:
+            yield from self.select(value, root)
+
+
+class _Members(_Step):
+    """.name, ['name'] or ['a', 'b']."""
+
+    def __init__(self, names: List[str]):
+        self.names = names
+        self.definite = len(names) == 1
+
+    def select(self, value, root):
+        if isinstance(value, dict):
+            for name in self.names:
+                if name in value:
+                    yield value[name]
+
+
+class _Indexes(_Step):
+    """[0], [-1] or [0, 2]."""
+
+    def __init__(self, indexes: List[int]):
+        self.indexes = indexes
+        self.definite = len(indexes) == 1
+
+    def select(self, value, root):
+        if isinstance(value, list):
+            for index in self.indexes:
+                if -len(value) <= index < len(value):
+                    yield value[index]
+
+
+class _Slice(_Step):
+    """[start:end:step]."""
+
+    definite = False
+
+    def __init__(self, start: Optional[int], stop: Optional[int], step: Optional[int]):
+        self.slice = slice(start, stop, step)
+
+    def select(self, value, root):
+        if isinstance(value, list):
+            for index in range(*self.slice.indices(len(value))):
+                yield value[index]
+
+
+class _Wildcard(_Step):
+    """.* or [*]."""
+
+    definite = False
+
+    def select(self, value, root):
+        if isinstance(value, dict):
+            yield from value.values()
+        elif isinstance(value, list):
+            yield from value
+
+
+class _Filter(_Step):
+    """[?(<expr>)]: members / elements for which the expression holds."""
+
+    definite = False
+
+    def __init__(self, predicate: Predicate):
+        self.predicate = predicate
+
+    def select(self, value, root):
+        if isinstance(value, dict):
+            items = value.values()
+        elif isinstance(value, list):
+            items = value
+        else:
+            return
+        for item in items:
+            if self.predicate(item, root):
+                yield item
+
+
+class _Descendants(_Step):
+    """..<selector>: the selector applied to a value and all its descendants, in document order."""
+
+    definite = False
+
+    def __init__(self, selector: _Step):
+        self.selector = selector
+
+    def select(self, value, root):
+        stack = [iter((value,))]
+        while stack:
+            current = next(stack[-1], _MISSING)
+            if current is _MISSING:
+                stack.pop()
+                continue
+            yield from self.selector.select(current, root)
+            if isinstance(current, dict):
+                stack.append(iter(current.values()))
+            elif isinstance(current, list):
+                stack.append(iter(current))
+
+
+def _run(steps, value: Any, root: Any) -> Iterator[Any]:
+    """Lazily evaluate steps starting from value."""
+    values = iter((value,))
+    for step in steps:
+        values = step.apply(values, root)
+    return values
+
+
+class JsonPath:
+    """A compiled JSONPath expression."""
+
+    def __init__(self, expression: str, steps: List[_Step]):
+        self.expression = expression
+        self.steps = tuple(steps)
+        # Definite paths (no wildcards, filters, slices, unions or "..") match at most one value
+        self.definite = all(step.definite for step in self.steps)
+
+    def find(self, data: Any) -> Iterator[Any]:
+        """Iterate over all matches in document order, lazily."""
+        return _run(self.steps, data, data)
+
+    def first(self, data: Any) -> Any:
+        """First match that is not null, or None."""
+        return next((value for value in self.find(data) if value is not None), None)
+
+    def value(self, data: Any) -> Any:
+        """
+        The value the path refers to.
+
+        Returns:
+            For a definite path the matched value (None if there is none);
+            otherwise a list of all matches (None if there are none)
+        """
+        if self.definite:
+            return next(self.find(data), None)
+        matches = list(self.find(data))
+        return matches if matches else None
+
+    def __repr__(self):
+        return f"JsonPath({self.expression!r})"
+
+
+@lru_cache(maxsize=PATH_CACHE_SIZE)
+def compile_path(expression: str) -> JsonPath:
+    """
+    Compile a JSONPath expression (cached).
+
+    Raises:
+        JSONPathError: If the expression is invalid
+    """
+    return JsonPath(expression, _Parser(expression).parse())
+
+
+def _equals(left: Any, right: Any) -> bool:
+    """JSON equality: true/false are not numbers."""
+    if isinstance(left, bool) != isinstance(right, bool):
+        return False
+    return left == right
+
+
+def _compare(operator: str, left: Any, right: Any) -> bool:
+    """Evaluate a filter comparison; missing values only equal each other."""
+    if operator == '==':
+        return _equals(left, right)
+    if operator == '!=':
+        return not _equals(left, right)
+    if left is _MISSING or right is _MISSING or isinstance(left, bool) or isinstance(right, bool):
+        return False
+
+    numbers = isinstance(left, (int, float)) and isinstance(right, (int, float))
+    if not numbers and not (isinstance(left, str) and isinstance(right, str)):
+        return False
+    if operator == '<':
+        return left < right
+    if operator == '<=':
+        return left <= right
+    if operator == '>':
+        return left > right
+    return left >= right
+
+
+def _matches(pattern: 're.Pattern', value: Any) -> bool:
+    """Evaluate a =~ filter: only strings can match."""
+    return isinstance(value, str) and pattern.search(value) is not None
+
+
+class _Parser:
+    """Recursive descent parser for paths and filter expressions."""
+
+    def __init__(self, text: str):
+        self.text = text.strip()
+        self.pos = 0
+
+    def error(self, message: str):
+        raise JSONPathError(f"{message} at position {self.pos} in '{self.text}'")
+
+    def peek(self, length: int = 1) -> str:
+        return self.text[self.pos:self.pos + length]
+
+    def skip_spaces(self):
+        while self.peek().isspace():
+            self.pos += 1
+
+    def expect(self, token: str):
+        self.skip_spaces()
+        if self.peek(len(token)) != token:
+            self.error(f"Expected '{token}'")
+        self.pos += len(token)
+
+    # ---- Paths
+
+    def parse(self) -> List[_Step]:
+        if not self.text:
+            self.error("Empty path")
+
+        steps = []
+        if self.peek() == '$':
+            self.pos += 1
+        elif self.peek() not in ('.', '['):
+            steps.append(_Members([self.member_name(in_filter=False)]))
+
+        steps += self.segments(in_filter=False)
+        if self.pos < len(self.text):
+            self.error(f"Unexpected '{self.peek()}'")
+        return steps
+
+    def segments(self, in_filter: bool) -> List[_Step]:
+        steps = []
+        while self.pos < len(self.text):
+            if self.peek(2) == '..':
+                self.pos += 2
+                if self.peek() == '[':
+                    steps.append(_Descendants(self.bracket()))
+                else:
+                    steps.append(_Descendants(self.dot_selector(in_filter)))
+            elif self.peek() == '.':
+                self.pos += 1
+                steps.append(self.dot_selector(in_filter))
+            elif self.peek() == '[':
+                steps.append(self.bracket())
+            else:
+                break
+        return steps
+
+    def dot_selector(self, in_filter: bool) -> _Step:
+        if self.peek() == '*':
+            self.pos += 1
+            return _Wildcard()
+        return _Members([self.member_name(in_filter)])
+
+    def member_name(self, in_filter: bool) -> str:
+        start = self.pos
+        while self.pos < len(self.text):
+            char = self.text[self.pos]
+            if char in '.[' or (in_filter and char in _FILTER_NAME_END):
+                break
+            self.pos += 1
+        if self.pos == start:
+            self.error("Expected a member name")
+        return self.text[start:self.pos]
+
+    def bracket(self) -> _Step:
+        self.expect('[')
+        self.skip_spaces()
+
+        if self.peek() == '*':
+            self.pos += 1
+            self.expect(']')
+            return _Wildcard()
+
+        if self.peek() == '?':
+            self.pos += 1
+            predicate = self.or_expression()
+            self.expect(']')
+            return _Filter(predicate)
+
+        if self.peek() in ('"', "'"):
+            names = [self.string()]
+            self.skip_spaces()
+            while self.peek() == ',':
+                self.pos += 1
+                self.skip_spaces()
+                names.append(self.string())
+                self.skip_spaces()
+            self.expect(']')
+            return _Members(names)
+
+        indexes = []
+        while True:
+            start = self.integer()
+            self.skip_spaces()
+            if self.peek() == ':' and not indexes:
+                return self.slice(start)
+            if start is None:
+                self.error("Expected an index, slice, name or filter")
+            indexes.append(start)
+            if self.peek() != ',':
+                break
+            self.pos += 1
+            self.skip_spaces()
+        self.expect(']')
+        return _Indexes(indexes)
+
+    def slice(self, start: Optional[int]) -> _Step:
+        bounds = [start]
+        while self.peek() == ':' and len(bounds) < 3:
+            self.pos += 1
+            self.skip_spaces()
+            bounds.append(self.integer())
+            self.skip_spaces()
+        self.expect(']')
+        stop, step = (bounds + [None, None])[1:3]
+        if step == 0:
+            self.error("Slice step cannot be 0")
+        return _Slice(start, stop, step)
+
+    def integer(self) -> Optional[int]:
+        match = _INTEGER.match(self.text, self.pos)
+        if not match:
+            return None
+        self.pos = match.end()
+        return int(match.group())
+
+    def string(self) -> str:
+        quote = self.peek()
+        self.pos += 1
+        chars = []
+        while True:
+            if self.pos >= len(self.text):
+                self.error("Unterminated string")
+            char = self.text[self.pos]
+            self.pos += 1
+            if char == quote:
+                return ''.join(chars)
+            if char == '\\' and self.pos < len(self.text):
+                char = self.text[self.pos]
+                self.pos += 1
+                if char == 'u' and re.fullmatch(r'[0-9a-fA-F]{4}', self.peek(4)):
+                    char = chr(int(self.peek(4), 16))
+                    self.pos += 4
+                else:
+                    char = _ESCAPES.get(char, char)
+            chars.append(char)
+
+    # ---- Filter expressions
+
+    def or_expression(self) -> Predicate:
+        left = self.and_expression()
+        self.skip_spaces()
+        while self.peek(2) == '||':
+            self.pos += 2
+            right = self.and_expression()
+            left = (lambda a, b: lambda item, root: a(item, root) or b(item, root))(left, right)
+            self.skip_spaces()
+        return left
+
+    def and_expression(self) -> Predicate:
+        left = self.unary_expression()
+        self.skip_spaces()
+        while self.peek(2) == '&&':
+            self.pos += 2
+            right = self.unary_expression()
+            left = (lambda a, b: lambda item, root: a(item, root) and b(item, root))(left, right)
+            self.skip_spaces()
+        return left
+
+    def unary_expression(self) -> Predicate:
+        self.skip_spaces()
+        if self.peek() == '!' and self.peek(2) != '!=':
+            self.pos += 1
+            inner = self.unary_expression()
+            return lambda item, root: not inner(item, root)
+        return self.primary_expression()
+
+    def primary_expression(self) -> Predicate:
+        self.skip_spaces()
+        if self.peek() == '(':
+            self.pos += 1
+            predicate = self.or_expression()
+            self.expect(')')
+            return predicate
+
+        left, is_path = self.operand()
+        self.skip_spaces()
+        operator = next((op for op in _COMPARISONS if self.peek(len(op)) == op), None)
+        if operator is None:
+            if is_path:
+                return lambda item, root: left(item, root) is not _MISSING
+            constant = bool(left(None, None))
+            return lambda item, root: constant
+        self.pos += len(operator)
+        self.skip_spaces()
+
+        if operator == '=~':
+            pattern = self.regex()
+            return lambda item, root: _matches(pattern, left(item, root))
+
+        right, _ = self.operand()
+        return lambda item, root: _compare(operator, left(item, root), right(item, root))
+
+    def operand(self):
+        """Parse a path or literal: (getter(item, root) -> value or _MISSING, is_path)."""
+        self.skip_spaces()
+        char = self.peek()
+
+        if char in ('@', '$'):
+            self.pos += 1
+            steps = tuple(self.segments(in_filter=True))
+            if char == '@':
+                return (lambda item, root: next(_run(steps, item, root), _MISSING)), True
+            return (lambda item, root: next(_run(steps, root, root), _MISSING)), True
+
+        if char in ('"', "'"):
+            value = self.string()
+        elif _NUMBER.match(self.text, self.pos):
+            match = _NUMBER.match(self.text, self.pos)
+            self.pos = match.end()
+            value = float(match.group()) if match.group(1) or match.group(2) else int(match.group())
+        else:
+            for word, value in (('true', True), ('false', False), ('null', None)):
+                if self.peek(len(word)) == word:
+                    self.pos += len(word)
+                    break
+            else:
+                self.error("Expected a path or value")
+        return (lambda item, root: value), False
+
+    def regex(self) -> 're.Pattern':
+        """Parse /pattern/flags or a quoted pattern after =~."""
+        if self.peek() in ('"', "'"):
+            source, flags = self.string(), 0
+        elif self.peek() == '/':
+            self.pos += 1
+            chars = []
+            while self.peek() != '/':
+                if self.pos >= len(self.text):
+                    self.error("Unterminated regex")
+                if self.peek(2) == '\\/':
+                    chars.append('/')
+                    self.pos += 2
+                    continue
+                chars.append(self.peek())
+                self.pos += 1
+            self.pos += 1
+            source, flags = ''.join(chars), 0
+            while self.peek() in _REGEX_FLAGS and self.peek():
+                flags |= _REGEX_FLAGS[self.peek()]
+                self.pos += 1
+        else:
+            self.error("Expected a regex")
+
+        try:
+            return re.compile(source, flags)
+        except re.error as e:
+            self.error(f"Invalid regex ({e})")
@@ -0,0 +1,414 @@
+"""
+Load Testing
+
+Replays a request or the requests of a collection under load, so the
+requests kept in PostMini don't have to be re-authored in a separate load
+testing tool. Like the collection runner this module must not import PyQt6:
+the Load Test dialog runs it in a QThread and ``postmini load`` (src/cli.py)
+from the command line.
+
+A load test has a duration, a number of workers (virtual users) and an
+optional target rate:
+
+- Concurrency mode: every worker sends requests back to back; during the
+  ramp-up the workers are started one after another.
+- Rate mode: sends are scheduled at a target number of requests per second
+  (ramped up linearly from zero), the workers only bound how many are in
+  flight at once. Latency is measured from the scheduled send time, so a
+  server that stalls is not hidden by sends that were delayed by it
+  (coordinated omission).
+
+Requests are picked round-robin and substituted for every send, so dynamic
+variables ({{$guid}}, ...) get fresh values; scripts and tests are not run.
+The workers share one session whose connection pool has a connection per
+worker. Latencies are recorded in LatencyHistogram, an HDR histogram with
+three significant digits, so percentiles are exact to 0.1% in a fixed amount
+of memory however many requests are sent.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+from requests.adapters import HTTPAdapter
+
+from src.features.variable_substitution import VariableSubstitution
+
+MODE_CONCURRENCY = "concurrency"
+MODE_RATE = "rps"
+
+# Percentiles reported for every latency histogram: (key, percentile)
+PERCENTILES = (('p50', 50.0), ('p90', 90.0), ('p99', 99.0), ('p999', 99.9))
+
+# Distinct transport error messages kept per load test
+MAX_ERROR_MESSAGES = 20
+
+ProgressCallback = Callable[[Dict], None]
+
+
+class LatencyHistogram:
+    """
+    HDR (high dynamic range) histogram of latencies in microseconds.
+
+    Values below 2048 are counted exactly; above, each power of two is split
+    into 1024 linear sub-buckets, which keeps three significant digits for
+    any latency with a bucket count that grows only logarithmically.
+    Histograms of the same kind can be merged, e.g. per-request histograms
+    into the total.
+    """
+
+    SUB_BUCKET_BITS = 11
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    @classmethod
+    def _index(cls, value: int) -> int:
+        bucket = max(0, value.bit_length() - cls.SUB_BUCKET_BITS)
+        return (bucket << (cls.SUB_BUCKET_BITS - 1)) + (value >> bucket)
+
+    @classmethod
+    def _highest_equivalent(cls, index: int) -> int:
+        """Highest value counted in the bucket at index."""
+        bucket = max(0, (index >> (cls.SUB_BUCKET_BITS - 1)) - 1)
+        sub_bucket = index - (bucket << (cls.SUB_BUCKET_BITS - 1))
+        return ((sub_bucket + 1) << bucket) - 1
+
+    def record(self, microseconds: int, count: int = 1):
+        """Record a latency (negative values are recorded as 0)."""
+        value = max(0, int(microseconds))
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        if not self.count or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += count
+        self.total += value * count
+
+    def merge(self, other: 'LatencyHistogram'):
+        """Add the values recorded in another histogram."""
+        if not other.count:
+            return
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        if not self.count or other.min < self.min:
+            self.min = other.min
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percentile: float) -> int:
+        """
+        Value at a percentile (0-100) in microseconds.
+
+        As in HdrHistogram, this is the highest value equivalent to the
+        recorded value at that rank (within 0.1%), capped at the maximum.
+        """
+        if not self.count:
+            return 0
+        rank = min(max(1, int(percentile / 100.0 * self.count + 0.5)), self.count)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Latency statistics in milliseconds: min, mean, percentiles and max."""
+        stats = {'min': self.min / 1000.0, 'mean': round(self.mean() / 1000.0, 3)}
+        for key, percentile in PERCENTILES:
+            stats[key] = self.percentile(percentile) / 1000.0
+        stats['max'] = self.max / 1000.0
+        return stats
+
+
+class _RequestStats:
+    """Results of one request of a load test (updated under LoadTest._lock)."""
+
+    def __init__(self, request: Dict):
+        self.request = request
+        self.histogram = LatencyHistogram()
+        self.errors = 0
+        self.failed = 0
+
+    def to_dict(self) -> Dict:
+        count = self.histogram.count
+        return {
+            'request_id': self.request.get('id'),
+            'name': self.request.get('name', ''),
+            'method': self.request.get('method', 'GET'),
+            'url': self.request.get('url', ''),
+            'requests': count,
+            'errors': self.errors,
+            'failed': self.failed,
+            'error_rate': (self.errors + self.failed) / count if count else 0.0,
+            'latency': self.histogram.summary()
+        }
+
+
+class LoadTest:
+    """
+    Sends requests under load for a duration and measures latencies.
+
+    Transport errors (timeouts, refused connections) count as errors with
+    the time until the failure as their latency; responses with a status of
+    400 or above count as failed. Both make up the error rate.
+    """
+
+    def __init__(self, api_client, requests: List[Dict],
+                 environment: Optional[Dict[str, str]] = None,
+                 collection_variables: Optional[Dict[str, str]] = None,
+                 extracted_variables: Optional[Dict[str, str]] = None,
+                 duration: float = 30.0, concurrency: int = 10,
+                 target_rps: Optional[float] = None, ramp_up: float = 0.0,
+                 progress_callback: Optional[ProgressCallback] = None,
+                 progress_interval: float = 1.0):
+        """
+        Initialize the load test.
+
+        Args:
+            api_client: ApiClient used by all workers; its session's
+                connection pool is sized to the number of workers
+            requests: Request rows to send (a single request, or the requests
+                of a collection as returned by collection_runner.load_collection())
+            environment: Environment variables
+            collection_variables: Collection variables
+            extracted_variables: Extracted variables
+            duration: Seconds during which requests are sent (including the
+                ramp-up)
+            concurrency: Number of workers, i.e. requests in flight at once
+            target_rps: Requests per second to send (rate mode); None sends
+                as fast as the workers can (concurrency mode)
+            ramp_up: Seconds over which the workers are started (concurrency
+                mode) or the rate rises from zero to target_rps (rate mode)
+            progress_callback: Called with a snapshot (see snapshot()) every
+                progress_interval seconds, from the thread calling run()
+            progress_interval: Seconds between progress snapshots
+
+        Raises:
+            ValueError: If there are no requests or the profile is invalid
+        """
+        if not requests:
+            raise ValueError("No requests to send")
+        if duration <= 0:
+            raise ValueError("The duration must be positive")
+        if concurrency < 1:
+            raise ValueError("The concurrency must be at least 1")
+        if target_rps is not None and target_rps <= 0:
+            raise ValueError("The target rate must be positive")
+        if ramp_up < 0 or ramp_up > duration:
+            raise ValueError("The ramp-up must be between 0 and the duration")
+
+        self.api_client = api_client
+        self.requests = list(requests)
+        self.environment = dict(environment or {})
+        self.collection_variables = dict(collection_variables or {})
+        self.extracted_variables = dict(extracted_variables or {})
+        self.duration = float(duration)
+        self.concurrency = concurrency
+        self.target_rps = target_rps
+        self.ramp_up = float(ramp_up)
+        self.progress_callback = progress_callback
+        self.progress_interval = progress_interval
+
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._reset()
+
+    @property
+    def mode(self) -> str:
+        return MODE_RATE if self.target_rps else MODE_CONCURRENCY
+
+    def stop(self):
+        """Request to stop; requests in flight are completed."""
+        self._stop.set()
+
+    def _reset(self):
+        self._start = 0.0
+        self._end = 0.0
+        self._sends = 0
+        self._stats = [_RequestStats(request) for request in self.requests]
+        self._status_codes: Dict[int, int] = {}
+        self._error_messages: Dict[str, int] = {}
+        self._interval = LatencyHistogram()
+        self._interval_errors = 0
+        self._interval_start = 0.0
+        self._timeline: List[Dict] = []
+
+    def run(self) -> Dict:
+        """
+        Run the load test (blocks until the duration has passed or stop()).
+
+        Returns:
+            The final snapshot, see snapshot()
+        """
+        self._stop.clear()
+        self._reset()
+        # One pooled connection per worker, instead of requests' default of 10
+        adapter = HTTPAdapter(pool_connections=len(self.requests), pool_maxsize=self.concurrency)
+        self.api_client.session.mount('http://', adapter)
+        self.api_client.session.mount('https://', adapter)
+
+        self._start = self._interval_start = time.monotonic()
+        self._end = self._start + self.duration
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = [pool.submit(self._worker, worker) for worker in range(self.concurrency)]
+            while True:
+                done, pending = wait(futures, timeout=self.progress_interval)
+                self._tick()
+                if not pending:
+                    break
+                if self.progress_callback:
+                    self.progress_callback(self.snapshot())
+            for future in done:
+                future.result()
+
+        snapshot = self.snapshot()
+        if self.progress_callback:
+            self.progress_callback(snapshot)
+        return snapshot
+
+    def _send_delay(self, send: int) -> float:
+        """Seconds from the start at which send number `send` is scheduled (rate mode)."""
+        rate = self.target_rps
+        ramp_sends = rate * self.ramp_up / 2
+        if send < ramp_sends:
+            # The rate rises linearly, so sends by time t are rate * t^2 / (2 * ramp_up)
+            return (2 * send * self.ramp_up / rate) ** 0.5
+        return self.ramp_up + (send - ramp_sends) / rate
+
+    def _worker(self, worker: int):
+        if self.mode == MODE_CONCURRENCY and self.ramp_up:
+            if self._stop.wait(self.ramp_up * worker / self.concurrency):
+                return
+
+        while not self._stop.is_set():
+            with self._lock:
+                send = self._sends
+                self._sends += 1
+            if self.mode == MODE_RATE:
+                scheduled = self._start + self._send_delay(send)
+                if scheduled >= self._end:
+                    return
+                delay = scheduled - time.monotonic()
+                if delay > 0 and self._stop.wait(delay):
+                    return
+            else:
+                scheduled = time.monotonic()
+                if scheduled >= self._end:
+                    return
+            self._send(self._stats[send % len(self._stats)], scheduled)
+
+    def _send(self, stats: _RequestStats, scheduled: float):
+        request = stats.request
+        status = None
+        error = None
+        try:
+            substituted, _ = VariableSubstitution.substitute_request(
+                request['url'], request.get('params') or {}, request.get('headers') or {},
+                request.get('body') or '', request.get('auth_token') or '',
+                self.environment, self.collection_variables, self.extracted_variables
+            )
+            response = self.api_client.execute_request(
+                method=request.get('method') or 'GET',
+                url=substituted['url'],
+                params=substituted['params'],
+                headers=substituted['headers'],
+                body=substituted['body'],
+                auth_type=request.get('auth_type') or 'None',
+                auth_token=substituted['auth_token']
+            )
+            status = response.status_code
+        except Exception as e:
+            error = str(e)[:200] or type(e).__name__
+        latency = int((time.monotonic() - scheduled) * 1000000)
+
+        with self._lock:
+            stats.histogram.record(latency)
+            self._interval.record(latency)
+            if error is not None:
+                stats.errors += 1
+                self._interval_errors += 1
+                if error in self._error_messages or len(self._error_messages) < MAX_ERROR_MESSAGES:
+                    self._error_messages[error] = self._error_messages.get(error, 0) + 1
+            else:
+                self._status_codes[status] = self._status_codes.get(status, 0) + 1
+                if status >= 400:
+                    stats.failed += 1
+                    self._interval_errors += 1
+
+    def _tick(self):
+        """Close the current interval of the timeline."""
+        now = time.monotonic()
+        with self._lock:
+            interval, self._interval = self._interval, LatencyHistogram()
+            errors, self._interval_errors = self._interval_errors, 0
+            started, self._interval_start = self._interval_start, now
+        seconds = now - started
+        if seconds <= 0:
+            return
+        self._timeline.append({
+            'time': round(now - self._start, 3),
+            'requests': interval.count,
+            'errors': errors,
+            'rps': round(interval.count / seconds, 2),
+            'p50': interval.percentile(50.0) / 1000.0,
+            'p99': interval.percentile(99.0) / 1000.0
+        })
+
+    def snapshot(self) -> Dict:
+        """
+        Results so far.
+
+        Returns:
+            Dictionary with the profile ('mode', 'duration', 'concurrency',
+            'target_rps', 'ramp_up'), 'elapsed', 'total_requests', 'errors'
+            (transport errors), 'failed' (status >= 400), 'error_rate',
+            'throughput' (requests per second overall), 'current_rps' (in the
+            last interval), 'latency' (min, mean, p50, p90, p99, p999 and max
+            in ms), 'status_codes', 'error_messages', 'requests' (the same per
+            request), 'timeline' (one entry per progress interval) and
+            'stopped'
+        """
+        with self._lock:
+            total = LatencyHistogram()
+            for stats in self._stats:
+                total.merge(stats.histogram)
+            requests = [stats.to_dict() for stats in self._stats]
+            errors = sum(stats.errors for stats in self._stats)
+            failed = sum(stats.failed for stats in self._stats)
+            status_codes = dict(sorted(self._status_codes.items()))
+            error_messages = dict(self._error_messages)
+        elapsed = min(time.monotonic(), self._end) - self._start if self._start else 0.0
+        timeline = list(self._timeline)
+
+        return {
+            'mode': self.mode,
+            'duration': self.duration,
+            'concurrency': self.concurrency,
+            'target_rps': self.target_rps,
+            'ramp_up': self.ramp_up,
+            'elapsed': round(elapsed, 3),
+            'total_requests': total.count,
+            'errors': errors,
+            'failed': failed,
+            'error_rate': (errors + failed) / total.count if total.count else 0.0,
+            'throughput': round(total.count / elapsed, 2) if elapsed > 0 else 0.0,
+            'current_rps': timeline[-1]['rps'] if timeline else 0.0,
+            'latency': total.summary(),
+            'status_codes': status_codes,
+            'error_messages': error_messages,
+            'requests': requests,
+            'timeline': timeline,
+            'stopped': self._stop.is_set()
+        }
@@ -158,6 +158,11 @@ class OpenAPIImporter:
         if security:
             self._add_security_headers(request, security)
         
+        # Response schema for contract tests (json_schema assertion)
+        response_schema = self.get_response_schema(operation)
+        if response_schema:
+            request['response_schema'] = response_schema
+        
         return request
     
     def _add_parameter(self, request: Dict, param: Dict):
@@ -292,6 +297,106 @@ class OpenAPIImporter:
         }
         return defaults.get(param_type, 'value')
     
+    def get_response_schema(self, operation: Dict) -> Optional[Dict]:
+        """
+        Get the JSON Schema of an operation's success response.
+        
+        The schema is standalone, so it can be used directly in a json_schema
+        test assertion: referenced components are copied into "$defs", and
+        OpenAPI 2.0/3.0 keywords (nullable, boolean exclusiveMinimum/Maximum)
+        are converted to their JSON Schema form.
+        
+        Args:
+            operation: OpenAPI operation object
+            
+        Returns:
+            JSON Schema of the first 2xx JSON response, or None if there is none
+            (or it references another file)
+        """
+        responses = operation.get('responses', {})
+        for status in sorted(responses, key=str):
+            if not str(status).startswith('2'):
+                continue
+            
+            try:
+                response = self._resolve_pointer(responses[status])
+                if self.version == '2.0':
+                    schema = response.get('schema')
+                else:
+                    content = response.get('content', {})
+                    media_type = next((value for key, value in content.items() if 'json' in key.lower()), {})
+                    schema = media_type.get('schema')
+                
+                if schema:
+                    return self._to_json_schema(schema)
+            except (KeyError, TypeError, ValueError):
+                continue
+        
+        return None
+    
+    def _resolve_pointer(self, item: Any) -> Any:
+        """Follow a local $ref ("#/components/...") to the referenced object."""
+        seen = set()
+        while isinstance(item, dict) and '$ref' in item:
+            ref = item['$ref']
+            if not isinstance(ref, str) or not ref.startswith('#/') or ref in seen:
+                raise ValueError(f"Unsupported reference: {ref}")
+            seen.add(ref)
+            item = self.spec
+            for part in ref[2:].split('/'):
+                item = item[part.replace('~1', '/').replace('~0', '~')]
+        return item
+    
+    def _to_json_schema(self, schema: Dict) -> Dict:
+        """Make a standalone JSON Schema from an OpenAPI schema object."""
+        definitions = {}  # $ref -> name in $defs
+        defs = {}
+        
+        def convert(node: Any) -> Any:
+            if isinstance(node, list):
+                return [convert(item) for item in node]
+            if not isinstance(node, dict):
+                return node
+            
+            if isinstance(node.get('$ref'), str):
+                ref = node['$ref']
+                if ref not in definitions:
+                    name = ref.rsplit('/', 1)[-1]
+                    while name in defs:
+                        name += '_'
+                    definitions[ref] = name
+                    defs[name] = None  # Reserve the name (the component may refer to itself)
+                    defs[name] = convert(self._resolve_pointer(node))
+                return {'$ref': f"#/$defs/{definitions[ref]}"}
+            
+            result = {key: convert(value) for key, value in node.items()}
+            if self.version != '3.1':
+                self._convert_openapi_keywords(result)
+            return result
+        
+        result = convert(schema)
+        if defs:
+            result['$defs'] = defs
+        if self.version == '3.1':
+            result['$schema'] = 'https://json-schema.org/draft/2020-12/schema'
+        else:
+            result['$schema'] = 'http://json-schema.org/draft-07/schema#'
+        return result
+    
+    @staticmethod
+    def _convert_openapi_keywords(schema: Dict):
+        """Convert OpenAPI 2.0/3.0 schema keywords to JSON Schema (in place)."""
+        if schema.pop('nullable', False) or schema.pop('x-nullable', False):
+            if isinstance(schema.get('type'), str):
+                schema['type'] = [schema['type'], 'null']
+            if isinstance(schema.get('enum'), list) and None not in schema['enum']:
+                schema['enum'] = schema['enum'] + [None]
+        
+        for exclusive, bound in (('exclusiveMinimum', 'minimum'), ('exclusiveMaximum', 'maximum')):
+            if isinstance(schema.get(exclusive), bool):
+                if schema.pop(exclusive) and bound in schema:
+                    schema[exclusive] = schema.pop(bound)
+    
     def _add_security_headers(self, request: Dict, security: List[Dict]):
         """Add security/authentication to the request."""
         if not security:
@@ -0,0 +1,99 @@
+"""
+URL / Query Params Synchronization
+
+Pure helpers for keeping the URL bar and the params table in sync. The UI
+debounces edits and uses these helpers to compute the minimal set of cell
+updates, so that bursts of keystrokes on long URLs result in a single,
+incremental table update instead of repopulating the whole table.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+
+
+# Delay used to coalesce bursts of edits into a single sync
+PARAM_SYNC_DEBOUNCE_MS = 150
+
+# A cell update: (row, column, text)
+CellUpdate = Tuple[int, int, str]
+
+
+def parse_query_params(url: str) -> Optional[Dict[str, str]]:
+    """
+    Extract query parameters from a URL.
+
+    Only the first value of a repeated key is kept (the params table holds
+    one row per key). Insertion order follows the URL.
+
+    Args:
+        url: URL text from the URL bar
+
+    Returns:
+        Ordered dict of parameters, or None if the URL cannot be parsed
+    """
+    try:
+        query = urlparse(url).query
+        params = {}
+        for key, value in parse_qsl(query, keep_blank_values=True):
+            params.setdefault(key, value)
+        return params
+    except ValueError:
+        return None
+
+
+def build_url_with_params(url: str, params: Dict[str, str]) -> Optional[str]:
+    """
+    Replace the query string of a URL with the given parameters.
+
+    The URL is returned unchanged if it already carries exactly these
+    parameters, so re-syncing never re-encodes what the user typed.
+
+    Args:
+        url: Current URL text
+        params: Parameters from the params table
+
+    Returns:
+        New URL text, or None if the URL cannot be parsed
+    """
+    if parse_query_params(url) == params:
+        return url
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return None
+    new_query = urlencode(params) if params else ''
+    return urlunparse((
+        parsed.scheme,
+        parsed.netloc,
+        parsed.path,
+        parsed.params,
+        new_query,
+        parsed.fragment
+    ))
+
+
+def diff_param_rows(current_rows: List[Tuple[Optional[str], Optional[str]]],
+                    params: Dict[str, str]) -> Tuple[List[CellUpdate], int]:
+    """
+    Compute the cell updates that turn the table into the given parameters.
+
+    The target table is one row per parameter followed by a single empty
+    row for adding new parameters. Rows are compared by position, which
+    matches how URLs are edited (typing a value, appending a parameter).
+
+    Args:
+        current_rows: (key, value) text of every current table row (None for cells without an item)
+        params: Parameters parsed from the URL
+
+    Returns:
+        Tuple of (cell updates, target row count)
+    """
+    target_rows = list(params.items()) + [('', '')]
+    updates = []
+    for row, (key, value) in enumerate(target_rows):
+        current_key, current_value = current_rows[row] if row < len(current_rows) else (None, None)
+        if current_key != key:
+            updates.append((row, 0, key))
+        if current_value != value:
+            updates.append((row, 1, value))
+    return updates, len(target_rows)
@@ -0,0 +1,313 @@
+"""
+Pattern Scanner Module
+
+Searches a text for many regular expressions in a single pass.
+
+Each rule lists keywords that every match must contain. Rules whose keywords
+are missing from the text are dropped up front (a fast substring check), and
+the remaining rules are combined into one alternation that the regex engine
+walks over the text once. Per-rule results are identical to running
+re.findall()/re.search() for every rule separately:
+
+- The combined pattern is a zero-width lookahead, so it stops at every
+  position where any rule matches and no match hides another one.
+- At each such position the rules after the one that matched are tried too,
+  and matches overlapping the previous match of the same rule are skipped
+  (re.findall() semantics).
+
+Combined patterns are compiled once per set of active rules and cached.
+
+PatternStream scans a text that arrives in chunks (e.g. a download) in
+overlapping windows. Matches up to STREAM_OVERLAP characters long are found
+exactly as in a single scan; longer matches spanning chunk boundaries may be
+missed.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+
+# Characters that re.IGNORECASE matches to an ASCII letter although
+# str.lower() does not map them to it
+_CASE_FOLD_FIXES = (('İ', 'i'), ('ı', 'i'), ('ſ', 's'))
+
+# Characters a match may extend past the end of a chunk (PatternStream)
+STREAM_OVERLAP = 4096
+# Characters kept before the next window for \b and lookbehinds
+STREAM_CONTEXT = 64
+
+
+class PatternRule:
+    """A regular expression searched for by a PatternScanner."""
+
+    def __init__(
+        self,
+        rule_id: str,
+        group: str,
+        pattern: str,
+        flags: int = 0,
+        keywords: Sequence[str] = (),
+        label: Optional[str] = None
+    ):
+        """
+        Initialize a rule.
+
+        Args:
+            rule_id: Unique rule identifier
+            group: Name of the check the rule belongs to
+            pattern: Regular expression
+            flags: re.IGNORECASE or 0 (other flags are not supported)
+            keywords: Literals every match contains (lowercase if the rule
+                ignores case); the rule is skipped if one is missing
+            label: Human readable name used in findings
+        """
+        if flags & ~re.IGNORECASE:
+            raise ValueError(f"Unsupported flags for rule '{rule_id}'")
+        self.rule_id = rule_id
+        self.group = group
+        self.pattern = re.compile(pattern, flags)
+        self.keywords = tuple(keywords)
+        self.label = label
+
+    @property
+    def ignore_case(self) -> bool:
+        """Whether the rule matches case-insensitively."""
+        return bool(self.pattern.flags & re.IGNORECASE)
+
+    def __repr__(self):
+        return f"PatternRule({self.rule_id!r})"
+
+
+class RuleMatches:
+    """
+    Matches of one rule: their count (as re.findall()) and the first match.
+
+    `first` is relative to the scanned text (or window, for streams); `start`
+    and `end` are positions in the whole text.
+    """
+
+    __slots__ = ('count', 'first', 'start', 'end')
+
+    def __init__(self, first: 're.Match', offset: int = 0):
+        self.count = 1
+        self.first = first
+        self.start = offset + first.start()
+        self.end = offset + first.end()
+
+
+class PatternScanner:
+    """Scans texts for a fixed list of PatternRules in a single pass."""
+
+    def __init__(self, rules: Iterable[PatternRule]):
+        self.rules: List[PatternRule] = list(rules)
+        self._by_id = {rule.rule_id: rule for rule in self.rules}
+
+    def rule(self, rule_id: str) -> PatternRule:
+        """Get a rule by id."""
+        return self._by_id[rule_id]
+
+    def rules_for(self, group: str) -> List[PatternRule]:
+        """Get the rules of a check, in definition order."""
+        return [rule for rule in self.rules if rule.group == group]
+
+    def scan(self, text: str, groups: Optional[Iterable[str]] = None) -> Dict[str, RuleMatches]:
+        """
+        Scan a text.
+
+        Args:
+            text: Text to scan
+            groups: Only run rules of these checks (default: all rules)
+
+        Returns:
+            Dictionary mapping the id of every matching rule to its matches
+        """
+        results: Dict[str, RuleMatches] = {}
+        if text:
+            self._scan_window(text, self.select(groups), results, 0, 0, len(text))
+        return results
+
+    def select(self, groups: Optional[Iterable[str]] = None) -> List[PatternRule]:
+        """Get the rules of the given checks (default: all rules)."""
+        if groups is None:
+            return self.rules
+        groups = set(groups)
+        return [rule for rule in self.rules if rule.group in groups]
+
+    def stream(self, groups: Optional[Iterable[str]] = None) -> 'PatternStream':
+        """Start scanning a text that arrives in chunks."""
+        return PatternStream(self, groups)
+
+    def _scan_window(self, window: str, rules: Sequence[PatternRule], results: Dict[str, RuleMatches],
+                     offset: int, accept_from: int, accept_to: int):
+        """
+        Scan a window of the text and add the matches starting in
+        [accept_from, accept_to) to `results`.
+
+        Args:
+            window: Part of the text
+            rules: Rules to run
+            results: Matches found so far (updated in place)
+            offset: Position of the window in the whole text
+            accept_from, accept_to: Range of match starts, relative to the window
+        """
+        rules = self._active_rules(window, rules)
+        if not rules:
+            return
+
+        pattern, ordered = _combined_pattern(tuple(rules))
+        for match in pattern.finditer(window, accept_from):
+            start = match.start()
+            if start >= accept_to:
+                break
+            # Rules before the matching branch do not match here; later ones might
+            for index in range(int(match.lastgroup[1:]), len(ordered)):
+                rule = ordered[index]
+                found = results.get(rule.rule_id)
+                if found is not None and found.end > offset + start:
+                    continue
+                rule_match = rule.pattern.match(window, start)
+                if rule_match is None:
+                    continue
+                if found is None:
+                    results[rule.rule_id] = RuleMatches(rule_match, offset)
+                else:
+                    found.count += 1
+                    found.end = offset + rule_match.end()
+
+    @staticmethod
+    def _active_rules(text: str, rules: Sequence[PatternRule]) -> List[PatternRule]:
+        """Drop the rules whose keywords do not all occur in the text."""
+        folded = None
+        active = []
+        for rule in rules:
+            if rule.keywords:
+                if rule.ignore_case:
+                    if folded is None:
+                        folded = _fold_case(text)
+                    haystack = folded
+                else:
+                    haystack = text
+                if not all(keyword in haystack for keyword in rule.keywords):
+                    continue
+            active.append(rule)
+        return active
+
+
+class PatternStream:
+    """
+    Incremental scan of a text that arrives in chunks.
+
+    Each chunk is scanned together with the end of the previous one. Matches
+    starting in the last STREAM_OVERLAP characters are left for the next
+    window, so they are seen with enough text after them.
+    """
+
+    def __init__(self, scanner: PatternScanner, groups: Optional[Iterable[str]] = None):
+        self.scanner = scanner
+        self.rules = scanner.select(groups)
+        self.results: Dict[str, RuleMatches] = {}
+        self.length = 0
+        self._tail = ''
+        self._tail_offset = 0
+        self._accept_from = 0
+
+    def feed(self, chunk: str):
+        """Scan the next chunk of the text."""
+        if not chunk:
+            return
+        self.length += len(chunk)
+        window = self._tail + chunk
+        accept_to = len(window) - STREAM_OVERLAP
+        accept_from = self._accept_from - self._tail_offset
+        if accept_to <= accept_from:
+            self._tail = window
+            return
+
+        self.scanner._scan_window(window, self.rules, self.results, self._tail_offset, accept_from, accept_to)
+        keep_from = max(0, accept_to - STREAM_CONTEXT)
+        self._tail = window[keep_from:]
+        self._accept_from = self._tail_offset + accept_to
+        self._tail_offset += keep_from
+
+    def finish(self) -> Dict[str, RuleMatches]:
+        """
+        Scan the rest of the text. The text is treated as ending here, also
+        when the stream was cut short.
+
+        Returns:
+            Dictionary mapping the id of every matching rule to its matches
+        """
+        if self._tail:
+            accept_from = self._accept_from - self._tail_offset
+            self.scanner._scan_window(self._tail, self.rules, self.results, self._tail_offset,
+                                      accept_from, len(self._tail))
+            self._tail = ''
+        return self.results
+
+
+def _fold_case(text: str) -> str:
+    """Lowercase a text so that keyword checks agree with re.IGNORECASE."""
+    if not text.isascii():
+        for char, replacement in _CASE_FOLD_FIXES:
+            if char in text:
+                text = text.replace(char, replacement)
+    return text.lower()
+
+
+def _starts_at_boundary(source: str) -> bool:
+    """Check whether every match of a pattern starts with \\b (a leading \\b outside any alternation)."""
+    if not source.startswith(r'\b'):
+        return False
+    depth = 0
+    in_class = False
+    escaped = False
+    for char in source:
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            return False
+    return True
+
+
+@lru_cache(maxsize=64)
+def _combined_pattern(rules: Tuple[PatternRule, ...]) -> Tuple[Pattern, Tuple[PatternRule, ...]]:
+    """
+    Combine rules into one zero-width alternation.
+
+    Rules starting with a word boundary share a single leading \\b, which
+    lets the engine skip positions inside words cheaply; they are tried last.
+    The \\b is moved out of the rules, not added: \\b(?:A|B) matches where
+    \\bA|\\bB does, so every rule (e.g. the credit-card pattern) matches the
+    same strings as on its own.
+
+    Returns:
+        Tuple of (compiled pattern, rules in branch order). Branch i is the
+        named group 'r<i>'.
+    """
+    bounded = [rule for rule in rules if _starts_at_boundary(rule.pattern.pattern)]
+    plain = [rule for rule in rules if rule not in bounded]
+    ordered = tuple(plain + bounded)
+
+    def branch(index: int, source: str) -> str:
+        flags = 'i' if ordered[index].ignore_case else ''
+        return f'(?P<r{index}>(?{flags}:{source}))' if flags else f'(?P<r{index}>{source})'
+
+    branches = [branch(index, rule.pattern.pattern) for index, rule in enumerate(plain)]
+    if bounded:
+        offset = len(plain)
+        bounded_branches = [
+            branch(offset + index, rule.pattern.pattern[2:]) for index, rule in enumerate(bounded)
+        ]
+        branches.append(r'\b(?:' + '|'.join(bounded_branches) + ')')
+    return re.compile('(?=' + '|'.join(branches) + ')'), ordered
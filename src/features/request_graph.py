@@ -0,0 +1,226 @@
+"""
+Request Dependency Graph
+
+Works out which requests of a collection run have to wait for which, so the
+collection runner can send independent requests in parallel and keep the
+collection order only where a request depends on another one.
+
+Each request reads and writes variables:
+
+- Reads: {{variables}} and :pathParams in the URL, params, headers, body and
+  auth token, and pm.environment / pm.collectionVariables / pm.variables
+  get() calls in its scripts
+- Writes: the variables extracted from its response (extraction rules) and
+  pm.environment / pm.collectionVariables set() / unset() calls in its
+  scripts
+
+A request depends on every earlier request that writes a variable it reads
+or writes, or that reads a variable it writes. A script whose accesses can't
+be read from its text (a key that isn't a string literal, toObject(), clear()
+...) is opaque: it is treated as reading or writing every variable. Scripts
+can declare their accesses instead, which replaces what is inferred from that
+script, or ask to be run in collection order:
+
+    // @reads token, env.userId
+    // @writes orderId
+    // @serial
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.features.variable_substitution import VariableSubstitution
+
+SCOPE_ENVIRONMENT = "env"
+SCOPE_COLLECTION = "col"
+SCOPE_EXTRACTED = "ext"
+
+# Name of a variable access that may be any variable of its scope
+ANY = "*"
+
+# (scope, name); the scope is None for unprefixed {{variables}}, which may
+# resolve from any scope
+Variable = Tuple[Optional[str], str]
+
+_SCRIPT_SCOPES = {
+    'environment': SCOPE_ENVIRONMENT,
+    'collectionVariables': SCOPE_COLLECTION,
+    'variables': None,
+}
+
+_SCRIPT_ACCESS = re.compile(
+    r"\bpm\.(environment|collectionVariables|variables)\s*\.\s*(get|has|set|unset|clear|toObject|replaceIn)"
+    r"\s*\(\s*(?:(['\"])((?:\\.|(?!\3).)*)\3\s*[,)])?"
+)
+_LEGACY_ACCESS = re.compile(
+    r"\bpostman\s*\.\s*(get|set|clear)EnvironmentVariable\s*\(\s*(?:(['\"])((?:\\.|(?!\2).)*)\2\s*[,)])?"
+)
+_ANNOTATION = re.compile(r"//\s*@(reads|writes|serial)\b[ \t:]*([^\n]*)")
+
+_READS = ('get', 'has', 'toObject', 'replaceIn')
+
+
+def request_accesses(request: Dict, run_scripts: bool = True) -> Tuple[Set[Variable], Set[Variable]]:
+    """
+    Infer the variables a request reads and writes.
+
+    Args:
+        request: Request row; its extraction rules are under 'extractions'
+                 (see collection_runner.load_collection())
+        run_scripts: Whether its pre-request and post-response scripts run
+
+    Returns:
+        Tuple of (reads, writes)
+    """
+    reads: Set[Variable] = set()
+    writes: Set[Variable] = set()
+
+    texts = [request.get('url') or '', request.get('body') or '', request.get('auth_token') or '']
+    for mapping in (request.get('params') or {}, request.get('headers') or {}):
+        texts.extend(str(key) + '\n' + str(value) for key, value in mapping.items())
+    for text in texts:
+        for match in VariableSubstitution.VARIABLE_PATTERN.finditer(text):
+            if not match.group(1):  # {{$dynamic}} variables are generated
+                reads.add((match.group(3), match.group(4)))
+    for match in VariableSubstitution.PATH_PARAM_PATTERN.finditer(request.get('url') or ''):
+        reads.add((None, match.group(1)))
+
+    for rule in request.get('extractions') or []:
+        writes.add((SCOPE_EXTRACTED, rule['variable_name']))
+
+    if run_scripts:
+        for field in ('pre_request_script', 'post_response_script'):
+            script_reads, script_writes = script_accesses(request.get(field) or '')
+            reads |= script_reads
+            writes |= script_writes
+
+    return reads, writes
+
+
+def script_accesses(script: str) -> Tuple[Set[Variable], Set[Variable]]:
+    """
+    Infer the variables a script reads and writes.
+
+    @reads / @writes annotations replace the inferred accesses; @serial makes
+    the script read and write every variable.
+    """
+    reads: Set[Variable] = set()
+    writes: Set[Variable] = set()
+    if not script.strip():
+        return reads, writes
+
+    annotations = _ANNOTATION.findall(script)
+    if any(tag == 'serial' for tag, _ in annotations):
+        return {(None, ANY)}, {(None, ANY)}
+    if annotations:
+        for tag, names in annotations:
+            target = reads if tag == 'reads' else writes
+            target.update(_parse_declared(names))
+        return reads, writes
+
+    for match in _SCRIPT_ACCESS.finditer(script):
+        scope = _SCRIPT_SCOPES[match.group(1)]
+        method = match.group(2)
+        name = match.group(4)
+        if name is None or method in ('toObject', 'replaceIn', 'clear') or '${' in name:
+            name = ANY
+        if method in _READS:
+            reads.add((scope, name))
+        elif scope is not None:
+            writes.add((scope, name))
+        # pm.variables.set() only sets a variable local to the script
+
+    for match in _LEGACY_ACCESS.finditer(script):
+        name = match.group(3)
+        if name is None:
+            name = ANY
+        target = reads if match.group(1) == 'get' else writes
+        target.add((SCOPE_ENVIRONMENT, name))
+
+    return reads, writes
+
+
+def _parse_declared(names: str) -> Iterable[Variable]:
+    for name in re.split(r'[\s,]+', names.strip()):
+        scope, dot, variable = name.partition('.')
+        if dot and scope in (SCOPE_ENVIRONMENT, SCOPE_COLLECTION, SCOPE_EXTRACTED):
+            yield scope, variable
+        elif name:
+            yield None, name
+
+
+def _overlaps(first: Variable, second: Variable) -> bool:
+    """Whether two accesses may be to the same variable."""
+    scopes_match = first[0] is None or second[0] is None or first[0] == second[0]
+    names_match = ANY in (first[1], second[1]) or first[1] == second[1]
+    return scopes_match and names_match
+
+
+def _conflicts(first: Iterable[Variable], second: Iterable[Variable]) -> bool:
+    return any(_overlaps(a, b) for a in first for b in second)
+
+
+def build_dependencies(requests: List[Dict], run_scripts: bool = True,
+                       serial: bool = False) -> List[Set[int]]:
+    """
+    Build the dependency graph of the requests of an iteration.
+
+    Args:
+        requests: Requests in collection order
+        run_scripts: Whether scripts run (their accesses are ignored if not)
+        serial: Run every request after the previous one
+
+    Returns:
+        For each request, the indexes of the earlier requests it has to wait for
+    """
+    if serial:
+        return [set() if index == 0 else {index - 1} for index in range(len(requests))]
+
+    accesses = [request_accesses(request, run_scripts) for request in requests]
+    dependencies = []
+    for index, (reads, writes) in enumerate(accesses):
+        dependencies.append({
+            earlier for earlier, (earlier_reads, earlier_writes) in enumerate(accesses[:index])
+            if _conflicts(earlier_writes, reads)
+            or _conflicts(earlier_writes, writes)
+            or _conflicts(earlier_reads, writes)
+        })
+    return dependencies
+
+
+def dependents(dependencies: List[Set[int]]) -> List[List[int]]:
+    """Invert build_dependencies(): the requests waiting for each request."""
+    waiting: List[List[int]] = [[] for _ in dependencies]
+    for index, earlier in enumerate(dependencies):
+        for dependency in sorted(earlier):
+            waiting[dependency].append(index)
+    return waiting
+
+
+def components(dependencies: List[Set[int]]) -> List[List[int]]:
+    """
+    Group requests that are connected through dependencies, directly or not.
+
+    Requests of different groups share no variables, so each group can run
+    with its own copy of the variables.
+
+    Returns:
+        The indexes of each group, in collection order; groups are ordered by
+        their first request
+    """
+    parents = list(range(len(dependencies)))
+
+    def root(index: int) -> int:
+        while parents[index] != index:
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    for index, earlier in enumerate(dependencies):
+        for dependency in earlier:
+            parents[root(index)] = root(dependency)
+
+    groups: Dict[int, List[int]] = {}
+    for index in range(len(dependencies)):
+        groups.setdefault(root(index), []).append(index)
+    return list(groups.values())
@@ -0,0 +1,169 @@
+"""
+JSON Schema Validation
+
+Validates response bodies against JSON Schemas for the ``json_schema``
+assertion type. Schemas are compiled into validators once and cached by the
+hash of their content, so the same schema used by many requests (e.g. an
+OpenAPI component) is compiled a single time.
+
+Validation uses the ``jsonschema`` package: the draft is taken from the
+schema's ``$schema`` keyword, defaulting to Draft 2020-12 (Draft 7 schemas
+validate the same for the keywords they share). If the package is not
+installed, only the basic ``type`` / ``required`` checks are made.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Dict, List
+
+try:
+    import jsonschema
+except ImportError:  # Optional: fall back to basic checks
+    jsonschema = None
+
+# At most this many errors are reported per response (validation stops there)
+MAX_SCHEMA_ERRORS = 20
+
+# Longest error message kept (messages can quote large parts of the response)
+MAX_ERROR_LENGTH = 200
+
+# Number of compiled validators kept in memory
+VALIDATOR_CACHE_SIZE = 128
+
+_validators: "OrderedDict[str, SchemaValidator]" = OrderedDict()
+_validators_lock = threading.Lock()
+
+
+class SchemaError(ValueError):
+    """Raised when a schema is not a valid JSON Schema."""
+
+
+def schema_hash(schema: Any) -> str:
+    """Hash of a schema's content (independent of key order)."""
+    text = json.dumps(schema, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def get_validator(schema: Any) -> 'SchemaValidator':
+    """
+    Get the compiled validator for a schema, compiling it on first use.
+
+    Args:
+        schema: Parsed JSON Schema
+
+    Returns:
+        SchemaValidator for the schema
+
+    Raises:
+        SchemaError: If the schema is not a valid JSON Schema
+    """
+    key = schema_hash(schema)
+    with _validators_lock:
+        validator = _validators.get(key)
+        if validator is not None:
+            _validators.move_to_end(key)
+            return validator
+
+    validator = SchemaValidator(schema)
+    with _validators_lock:
+        _validators[key] = validator
+        while len(_validators) > VALIDATOR_CACHE_SIZE:
+            _validators.popitem(last=False)
+    return validator
+
+
+def _error_path(path) -> str:
+    """Format a path in the instance as "$.items[3].id"."""
+    return '$' + ''.join(f"[{part}]" if isinstance(part, int) else f".{part}" for part in path)
+
+
+class SchemaValidator:
+    """A JSON Schema compiled for validating many responses."""
+
+    def __init__(self, schema: Any):
+        """
+        Compile a schema.
+
+        Raises:
+            SchemaError: If the schema is not a valid JSON Schema
+        """
+        self.schema = schema
+        self._validator = None
+
+        if jsonschema is not None:
+            validator_class = jsonschema.validators.validator_for(
+                schema, default=jsonschema.Draft202012Validator
+            )
+            try:
+                validator_class.check_schema(schema)
+            except jsonschema.SchemaError as e:
+                raise SchemaError(e.message) from None
+            self._validator = validator_class(schema, format_checker=validator_class.FORMAT_CHECKER)
+        elif not isinstance(schema, dict):
+            raise SchemaError(f"{schema!r} is not of type 'object'")
+
+    def validate(self, data: Any, max_errors: int = MAX_SCHEMA_ERRORS) -> List[str]:
+        """
+        Validate data against the schema.
+
+        Validation stops after max_errors errors, so a large array with an
+        error in every item is not walked to the end.
+
+        Args:
+            data: Parsed JSON to validate
+            max_errors: Maximum number of errors to report
+
+        Returns:
+            List of error messages (empty if the data is valid)
+        """
+        if self._validator is None:
+            return _simple_errors(data, self.schema)[:max_errors]
+
+        errors = []
+        for error in islice(self._validator.iter_errors(data), max_errors + 1):
+            if len(errors) == max_errors:
+                errors.append(f"(more than {max_errors} errors)")
+                break
+            message = error.message
+            if len(message) > MAX_ERROR_LENGTH:
+                message = message[:MAX_ERROR_LENGTH] + '...'
+            errors.append(f"{_error_path(error.absolute_path)}: {message}")
+        return errors
+
+
+def _simple_errors(data: Any, schema: Dict) -> List[str]:
+    """Basic type / required checks, used when jsonschema is not installed."""
+    errors = []
+
+    if 'type' in schema:
+        expected_type = schema['type']
+        actual_type = type(data).__name__
+
+        type_map = {
+            'string': 'str',
+            'number': ('int', 'float'),
+            'integer': 'int',
+            'boolean': 'bool',
+            'array': 'list',
+            'object': 'dict',
+            'null': 'NoneType'
+        }
+
+        expected = type_map.get(expected_type, expected_type)
+        if isinstance(expected, tuple):
+            if actual_type not in expected:
+                errors.append(f"Type mismatch: expected {expected_type}, got {actual_type}")
+        else:
+            if actual_type != expected:
+                errors.append(f"Type mismatch: expected {expected_type}, got {actual_type}")
+
+    if 'properties' in schema and isinstance(data, dict):
+        for prop, prop_schema in schema['properties'].items():
+            if 'required' in schema and prop in schema['required']:
+                if prop not in data:
+                    errors.append(f"Required property '{prop}' is missing")
+
+    return errors
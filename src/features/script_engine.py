@@ -6,11 +6,33 @@ It implements a Postman-compatible 'pm' API for script compatibility.
 """
 
 import json
+import threading
 import time
-from typing import Dict, List, Optional, Any, Tuple
-from py_mini_racer import MiniRacer
+from typing import Dict, List, Optional, Any, Tuple, TYPE_CHECKING
 from src.features.dynamic_variables import resolve_dynamic_variable
 
+if TYPE_CHECKING:
+    from py_mini_racer import MiniRacer
+
+# py_mini_racer can crash the interpreter when V8 contexts are created, used
+# or freed by several threads at once, so every script of the process runs
+# under this lock: collection runner workers, the Collection Test Runner
+# thread and interactive sends alike. CPU-bound collection runs scale with
+# worker processes instead (see sharded_runner).
+_V8_LOCK = threading.RLock()
+
+
+def _create_js_context() -> 'MiniRacer':
+    """
+    Create a fresh V8 context.
+
+    py_mini_racer is imported here rather than at module level: loading it
+    (and the V8 binary) is one of the slowest imports of the application and
+    is only needed once a script actually runs.
+    """
+    from py_mini_racer import MiniRacer
+    return MiniRacer()
+
 
 class ScriptExecutionError(Exception):
     """Exception raised when script execution fails."""
@@ -32,6 +54,7 @@ class ScriptContext:
         self.environment = {}
         self.collection_variables = {}
         self.globals_vars = {}
+        self.iteration_data = {}
         self.request = {}
         self.response = {}
         self.console_logs = []
@@ -44,6 +67,7 @@ class ScriptContext:
             'environment': self.environment,
             'collectionVariables': self.collection_variables,
             'globals': self.globals_vars,
+            'iterationData': self.iteration_data,
             'request': self.request,
             'response': self.response,
             'console_logs': self.console_logs,
@@ -79,7 +103,8 @@ class ScriptEngine:
         body: str,
         params: Dict[str, str],
         environment: Dict[str, str],
-        collection_vars: Dict[str, str]
+        collection_vars: Dict[str, str],
+        iteration_data: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Execute a pre-request script.
@@ -93,6 +118,8 @@ class ScriptEngine:
             params: Query parameters
             environment: Environment variables
             collection_vars: Collection variables
+            iteration_data: Row of the data file of a collection run
+                (pm.iterationData), if any
             
         Returns:
             Dictionary with:
@@ -123,6 +150,7 @@ class ScriptEngine:
         self._context = ScriptContext()
         self._context.environment = environment.copy()
         self._context.collection_variables = collection_vars.copy()
+        self._context.iteration_data = dict(iteration_data or {})
         self._context.request = {
             'url': url,
             'method': method,
@@ -134,20 +162,24 @@ class ScriptEngine:
         start_time = time.time()
         
         try:
-            # Create JavaScript context
-            js_ctx = MiniRacer()
-            
-            # Inject pm API
-            self._inject_pm_api(js_ctx, is_pre_request=True)
-            
-            # Execute script with timeout
-            js_ctx.eval(script)
-            
-            # Handle any pm.sendRequest() calls
-            self._handle_pending_requests(js_ctx)
-            
-            # Extract results from context
-            result = self._extract_context_state(js_ctx)
+            with _V8_LOCK:
+                # Create JavaScript context
+                js_ctx = _create_js_context()
+                try:
+                    # Inject pm API
+                    self._inject_pm_api(js_ctx, is_pre_request=True)
+                    
+                    # Execute script with timeout
+                    js_ctx.eval(script)
+                    
+                    # Handle any pm.sendRequest() calls
+                    self._handle_pending_requests(js_ctx)
+                    
+                    # Extract results from context
+                    result = self._extract_context_state(js_ctx)
+                finally:
+                    # Free the context before releasing the lock
+                    del js_ctx
             
             execution_time = (time.time() - start_time) * 1000  # Convert to ms
             result['execution_time_ms'] = round(execution_time, 2)
@@ -169,7 +201,8 @@ class ScriptEngine:
         response_body: str,
         response_time_ms: float,
         environment: Dict[str, str],
-        collection_vars: Dict[str, str]
+        collection_vars: Dict[str, str],
+        iteration_data: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Execute a post-response script.
@@ -182,6 +215,8 @@ class ScriptEngine:
             response_time_ms: Response time in milliseconds
             environment: Environment variables
             collection_vars: Collection variables
+            iteration_data: Row of the data file of a collection run
+                (pm.iterationData), if any
             
         Returns:
             Dictionary with:
@@ -204,6 +239,7 @@ class ScriptEngine:
         self._context = ScriptContext()
         self._context.environment = environment.copy()
         self._context.collection_variables = collection_vars.copy()
+        self._context.iteration_data = dict(iteration_data or {})
         self._context.response = {
             'code': response_status,
             'status': self._get_status_text(response_status),
@@ -215,20 +251,24 @@ class ScriptEngine:
         start_time = time.time()
         
         try:
-            # Create JavaScript context
-            js_ctx = MiniRacer()
-            
-            # Inject pm API
-            self._inject_pm_api(js_ctx, is_pre_request=False)
-            
-            # Execute script with timeout
-            js_ctx.eval(script)
-            
-            # Handle any pm.sendRequest() calls
-            self._handle_pending_requests(js_ctx)
-            
-            # Extract results
-            result = self._extract_post_response_state(js_ctx)
+            with _V8_LOCK:
+                # Create JavaScript context
+                js_ctx = _create_js_context()
+                try:
+                    # Inject pm API
+                    self._inject_pm_api(js_ctx, is_pre_request=False)
+                    
+                    # Execute script with timeout
+                    js_ctx.eval(script)
+                    
+                    # Handle any pm.sendRequest() calls
+                    self._handle_pending_requests(js_ctx)
+                    
+                    # Extract results
+                    result = self._extract_post_response_state(js_ctx)
+                finally:
+                    # Free the context before releasing the lock
+                    del js_ctx
             
             execution_time = (time.time() - start_time) * 1000
             result['execution_time_ms'] = round(execution_time, 2)
@@ -242,7 +282,7 @@ class ScriptEngine:
             else:
                 raise ScriptExecutionError(f"Script execution failed: {error_msg}")
     
-    def _inject_pm_api(self, js_ctx: MiniRacer, is_pre_request: bool):
+    def _inject_pm_api(self, js_ctx: 'MiniRacer', is_pre_request: bool):
         """Inject Postman-compatible pm API into JavaScript context."""
         
         # Pre-generate dynamic variables for use in JavaScript
@@ -257,6 +297,7 @@ class ScriptEngine:
             'environment': self._context.environment,
             'collectionVariables': self._context.collection_variables,
             'globals': self._context.globals_vars,
+            'iterationData': self._context.iteration_data,
             'request': self._context.request if is_pre_request else {},
             'response': self._context.response if not is_pre_request else {},
         })
@@ -360,11 +401,29 @@ class ScriptEngine:
                 }}
             }},
             
-            // Variables (combined with priority: local > globals > collection > environment)
+            // Data file row of the current collection run iteration (read-only)
+            iterationData: {{
+                get: function(key) {{
+                    return __context.iterationData[key];
+                }},
+                has: function(key) {{
+                    return key in __context.iterationData;
+                }},
+                toObject: function() {{
+                    return {{...__context.iterationData}};
+                }},
+                toJSON: function() {{
+                    return {{...__context.iterationData}};
+                }}
+            }},
+            
+            // Variables (combined with priority: local > iteration data > globals > collection > environment)
             variables: {{
                 get: function(key) {{
                     // Check local variables first (temporary, script-scoped)
                     if (key in __localVars) return __localVars[key];
+                    // Then the data file row
+                    if (key in __context.iterationData) return __context.iterationData[key];
                     // Then globals
                     if (key in __context.globals) return __context.globals[key];
                     // Then collection variables
@@ -379,6 +438,7 @@ class ScriptEngine:
                 }},
                 has: function(key) {{
                     return key in __localVars || 
+                           key in __context.iterationData || 
                            key in __context.globals || 
                            key in __context.collectionVariables || 
                            key in __context.environment;
@@ -389,6 +449,7 @@ class ScriptEngine:
                         ...__context.environment,
                         ...__context.collectionVariables,
                         ...__context.globals,
+                        ...__context.iterationData,
                         ...__localVars
                     }};
                 }},
@@ -411,6 +472,10 @@ class ScriptEngine:
                         if (varName in __localVars) {{
                             return __localVars[varName];
                         }}
+                        // Then the data file row
+                        if (varName in __context.iterationData) {{
+                            return __context.iterationData[varName];
+                        }}
                         // Then check globals
                         if (varName in __context.globals) {{
                             return __context.globals[varName];
@@ -1181,7 +1246,7 @@ class ScriptEngine:
         
         js_ctx.eval(pm_api)
     
-    def _extract_context_state(self, js_ctx: MiniRacer) -> Dict[str, Any]:
+    def _extract_context_state(self, js_ctx: 'MiniRacer') -> Dict[str, Any]:
         """Extract modified context state from JavaScript after pre-request script execution."""
         
         # Get modified context
@@ -1204,7 +1269,7 @@ class ScriptEngine:
             'console_logs': logs
         }
     
-    def _extract_post_response_state(self, js_ctx: MiniRacer) -> Dict[str, Any]:
+    def _extract_post_response_state(self, js_ctx: 'MiniRacer') -> Dict[str, Any]:
         """Extract modified context state from JavaScript after post-response script execution."""
         
         # Get modified context
@@ -1226,7 +1291,7 @@ class ScriptEngine:
             'test_results': tests
         }
     
-    def _handle_pending_requests(self, js_ctx: MiniRacer):
+    def _handle_pending_requests(self, js_ctx: 'MiniRacer'):
         """Execute any pending pm.sendRequest() calls and invoke their callbacks."""
         try:
             # Check if there are any pending requests
@@ -0,0 +1,469 @@
+"""
+Batch Security Scanning Module
+
+Scans many stored responses at once: the whole request history or the
+responses of a collection run.
+
+- Responses are streamed: the history is read a page at a time, and only the
+  responses waiting to be scanned are held in memory with their bodies.
+- Identical responses (same URL scheme, status, headers and body) are scanned
+  once; the scanner's findings depend on nothing else.
+- Responses are scanned on a process pool, since scanning is CPU bound and
+  threads would serialize on the GIL. Work is sent in chunks to keep the
+  pickling overhead low, with a bounded number of chunks in flight. Small
+  batches, and systems where worker processes cannot be started, are scanned
+  in-process.
+- Findings are grouped per endpoint (method and URL without query string).
+  A finding repeated by several responses of an endpoint is stored once.
+- Each endpoint gets one security scan record; all findings are written with
+  a single bulk insert in one transaction.
+
+SecurityReportGenerator.generate_batch_html_report() turns the resulting scan
+ids into a report per endpoint, listing findings shared by several endpoints
+once.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from src.core.database import DatabaseManager
+from src.features.security_rules import RulePack
+from src.features.security_scanner import (
+    SecurityFinding, SecurityScanner, DEFAULT_MAX_BODY_SIZE, DEFAULT_TIME_BUDGET
+)
+
+
+ProgressCallback = Callable[[int, int, str], None]
+
+# Responses sent to a worker process per task
+SCAN_CHUNK_SIZE = 16
+# Chunks queued on the process pool per worker; more are read only as
+# chunks complete
+CHUNKS_IN_FLIGHT = 2
+# Batches with fewer responses are scanned in-process; starting worker
+# processes would take longer than the scan
+MIN_PROCESS_BATCH = 48
+# History rows read per query
+HISTORY_PAGE_SIZE = 200
+# Largest response body kept per request of a collection run
+RUN_BODY_LIMIT = 1024 * 1024
+
+SEVERITIES = (
+    SecurityFinding.SEVERITY_CRITICAL,
+    SecurityFinding.SEVERITY_HIGH,
+    SecurityFinding.SEVERITY_MEDIUM,
+    SecurityFinding.SEVERITY_LOW,
+    SecurityFinding.SEVERITY_INFO,
+)
+
+
+def endpoint_key(method: str, url: str) -> Tuple[str, str]:
+    """Get the endpoint a request belongs to: (method, URL without query string)."""
+    parts = urlsplit(url)
+    return method.upper(), urlunsplit((parts.scheme, parts.netloc, parts.path, '', ''))
+
+
+def response_key(target: Dict) -> str:
+    """Hash everything of a response that scan results depend on."""
+    headers = [(str(key).lower(), str(value)) for key, value in (target.get('response_headers') or {}).items()]
+    digest = hashlib.sha256(json.dumps([
+        urlsplit(target['url']).scheme.lower(),
+        target.get('response_status'),
+        headers,
+    ]).encode('utf-8'))
+    digest.update(b'\0')
+    digest.update((target.get('response_body') or '').encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+def finding_key(finding: Dict) -> Tuple[str, str, Optional[str]]:
+    """Identify findings that report the same issue with the same evidence."""
+    return finding['check_id'], finding['title'], finding.get('evidence')
+
+
+def capture_response(method: str, url: str, response: Any) -> Dict:
+    """
+    Keep what a batch scan needs of an ApiResponse (e.g. during a collection
+    run), with the body cut to RUN_BODY_LIMIT characters.
+    """
+    return {
+        'method': method,
+        'url': url,
+        'response_status': response.status_code,
+        'response_headers': dict(response.headers),
+        'response_body': (response.text or '')[:RUN_BODY_LIMIT],
+    }
+
+
+def _scan_responses(targets: List[Dict], max_body_size: Optional[int],
+                    time_budget: Optional[float], rule_packs: Tuple[RulePack, ...] = ()) -> List[List[Dict]]:
+    """
+    Scan responses (runs in worker processes, so it must stay a picklable
+    module-level function).
+
+    Returns:
+        The findings of each response, as dictionaries
+    """
+    scanner = SecurityScanner(max_body_size=max_body_size, time_budget=time_budget, rule_packs=rule_packs)
+    return [
+        [
+            finding.to_dict()
+            for finding in scanner.scan_response(
+                method=target['method'],
+                url=target['url'],
+                request_headers=target.get('request_headers') or {},
+                response_status=target.get('response_status'),
+                response_headers=target.get('response_headers') or {},
+                response_body=target.get('response_body') or ''
+            )
+        ]
+        for target in targets
+    ]
+
+
+class BatchScanResult:
+    """Outcome of a batch scan."""
+
+    def __init__(self):
+        self.scan_ids: List[int] = []  # One security scan per endpoint
+        self.responses = 0  # Responses in the batch
+        self.scanned = 0  # Distinct responses actually scanned
+        self.findings = 0  # Findings stored
+        self.duplicates = 0  # Repeated findings of an endpoint that were dropped
+        self.shared = 0  # Distinct findings that occur on more than one endpoint
+        self.cancelled = False
+
+
+class BatchSecurityScanner:
+    """Scans stored responses in bulk and saves the findings per endpoint."""
+
+    def __init__(
+        self,
+        db: DatabaseManager,
+        max_workers: Optional[int] = None,
+        use_processes: bool = True,
+        max_body_size: Optional[int] = DEFAULT_MAX_BODY_SIZE,
+        time_budget: Optional[float] = DEFAULT_TIME_BUDGET,
+        rule_packs: Iterable[RulePack] = ()
+    ):
+        """
+        Initialize the batch scanner.
+
+        Args:
+            db: DatabaseManager instance (used on the calling thread only)
+            max_workers: Number of worker processes (default: one per CPU)
+            use_processes: Scan on a process pool; False scans in-process
+            max_body_size: Per-response body limit of the scanner
+            time_budget: Per-response time budget of the scanner
+            rule_packs: Rule packs the scanner applies
+        """
+        self.db = db
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self.max_body_size = max_body_size
+        self.time_budget = time_budget
+        self.rule_packs = tuple(rule_packs)
+
+    def history_count(self) -> int:
+        """Get the number of responses history_targets() yields."""
+        return self.db.get_history_response_count()
+
+    def history_targets(self) -> Iterator[Dict]:
+        """Yield every history entry that has a response, most recent first."""
+        before_id = None
+        while True:
+            page = self.db.get_history_responses(before_id=before_id, limit=HISTORY_PAGE_SIZE)
+            for entry in page:
+                yield {
+                    'method': entry['method'],
+                    'url': entry['url'],
+                    'response_status': entry['response_status'],
+                    'response_headers': entry.get('response_headers') or {},
+                    'response_body': entry.get('response_body') or '',
+                    'history_id': entry['id'],
+                    'request_id': entry.get('request_id'),
+                    'collection_id': entry.get('collection_id'),
+                }
+            if len(page) < HISTORY_PAGE_SIZE:
+                return
+            before_id = page[-1]['id']
+
+    @staticmethod
+    def run_targets(results: Iterable[Dict], collection_id: Optional[int] = None) -> List[Dict]:
+        """
+        Get the responses of a collection run.
+
+        Args:
+            results: Per-request results of CollectionTestThread; those with a
+                'response' (see capture_response()) are used
+            collection_id: Collection the run belongs to
+        """
+        return [
+            dict(result['response'], request_id=result.get('request_id'), collection_id=collection_id)
+            for result in results
+            if result.get('response')
+        ]
+
+    def scan(
+        self,
+        targets: Iterable[Dict],
+        scan_name: Optional[str] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        total: Optional[int] = None
+    ) -> BatchScanResult:
+        """
+        Scan responses and save the findings, one security scan per endpoint.
+
+        Args:
+            targets: Responses as dictionaries with method, url,
+                response_status, response_headers, response_body and
+                optionally history_id, request_id, collection_id. Read once,
+                so a generator such as history_targets() can be passed.
+            scan_name: Name stored with every security scan of the batch
+            progress_callback: Called with (done, total, message) as responses
+                finish scanning
+            is_cancelled: Polled while scanning; returning True stops the scan
+                and nothing is saved
+            total: Number of targets, for progress (default: len(targets))
+
+        Returns:
+            BatchScanResult
+        """
+        result = BatchScanResult()
+        if total is None and isinstance(targets, (list, tuple)):
+            total = len(targets)
+
+        refs: List[Dict] = []  # Every response, without its body
+        queued: Dict[str, Dict] = {}  # Distinct responses read but not scanned yet
+        findings_by_response: Dict[str, List[Dict]] = {}
+        chunks = self._distinct_chunks(targets, refs, queued, findings_by_response)
+
+        def report(message: str):
+            if progress_callback:
+                done = len(refs) - len(queued)
+                progress_callback(done, max(total or 0, len(refs)), message)
+
+        use_pool = self.use_processes and (total is None or total >= MIN_PROCESS_BATCH)
+        if not self._scan_chunks(chunks, queued, findings_by_response, report, is_cancelled, use_pool):
+            result.cancelled = True
+            return result
+
+        result.responses = len(refs)
+        result.scanned = len(findings_by_response)
+        endpoints = self._group_by_endpoint(refs, findings_by_response, result)
+        self._save(endpoints, scan_name or f"Batch scan {datetime.now().strftime('%Y-%m-%d %H:%M')}", result)
+        return result
+
+    @staticmethod
+    def _distinct_chunks(
+        targets: Iterable[Dict],
+        refs: List[Dict],
+        queued: Dict[str, Dict],
+        scanned: Dict[str, List[Dict]]
+    ) -> Iterator[List[str]]:
+        """
+        Read targets and yield the keys of responses not seen before, in
+        chunks of SCAN_CHUNK_SIZE.
+
+        Every target is added to `refs` without its body; the responses to
+        scan are added to `queued` until their findings are in `scanned`.
+        """
+        chunk: List[str] = []
+        for target in targets:
+            key = response_key(target)
+            refs.append({
+                'key': key,
+                'method': target['method'],
+                'url': target['url'],
+                'history_id': target.get('history_id'),
+                'request_id': target.get('request_id'),
+                'collection_id': target.get('collection_id'),
+            })
+            if key in scanned or key in queued:
+                continue
+            queued[key] = target
+            chunk.append(key)
+            if len(chunk) == SCAN_CHUNK_SIZE:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _scan_chunks(
+        self,
+        chunks: Iterator[List[str]],
+        queued: Dict[str, Dict],
+        results: Dict[str, List[Dict]],
+        report: Callable[[str], None],
+        is_cancelled: Optional[Callable[[], bool]],
+        use_pool: bool
+    ) -> bool:
+        """
+        Scan the queued responses of every chunk, moving their findings to
+        `results`.
+
+        Returns:
+            False if cancelled
+        """
+        if use_pool:
+            try:
+                return self._scan_in_processes(chunks, queued, results, report, is_cancelled)
+            except (BrokenProcessPool, OSError) as e:
+                print(f"[Security] Worker processes unavailable, scanning in-process: {e}")
+                # Chunks that were on the pool are still queued
+                if not self._scan_in_process(list(queued), queued, results, report, is_cancelled):
+                    return False
+
+        for chunk in chunks:
+            if not self._scan_in_process(chunk, queued, results, report, is_cancelled):
+                return False
+        return True
+
+    def _scan_in_process(
+        self,
+        keys: List[str],
+        queued: Dict[str, Dict],
+        results: Dict[str, List[Dict]],
+        report: Callable[[str], None],
+        is_cancelled: Optional[Callable[[], bool]]
+    ) -> bool:
+        """
+        Scan queued responses one by one.
+
+        Returns:
+            False if cancelled
+        """
+        for key in keys:
+            if is_cancelled and is_cancelled():
+                return False
+            target = queued[key]
+            results[key] = _scan_responses([target], self.max_body_size, self.time_budget, self.rule_packs)[0]
+            del queued[key]
+            report(target['url'])
+        return True
+
+    def _scan_in_processes(
+        self,
+        chunks: Iterator[List[str]],
+        queued: Dict[str, Dict],
+        results: Dict[str, List[Dict]],
+        report: Callable[[str], None],
+        is_cancelled: Optional[Callable[[], bool]]
+    ) -> bool:
+        """
+        Scan chunks on a process pool, moving findings to `results` as chunks
+        complete. The next chunk is only read when one is done, so at most
+        CHUNKS_IN_FLIGHT chunks per worker are held in memory.
+
+        Returns:
+            False if cancelled
+        """
+        workers = self.max_workers or os.cpu_count() or 1
+        # Fresh interpreters rather than fork(): the caller is usually a
+        # thread of the GUI process, and forking a threaded process is unsafe
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            pending = {}
+
+            def collect(futures) -> bool:
+                for future in futures:
+                    chunk = pending.pop(future)
+                    for key, findings in zip(chunk, future.result()):
+                        results[key] = findings
+                        target = queued.pop(key)
+                    report(target['url'])
+                if is_cancelled and is_cancelled():
+                    for future in pending:
+                        future.cancel()
+                    pool.shutdown(wait=False)
+                    return False
+                return True
+
+            for chunk in chunks:
+                while len(pending) >= workers * CHUNKS_IN_FLIGHT:
+                    if not collect(wait(pending, return_when=FIRST_COMPLETED).done):
+                        return False
+                targets = [queued[key] for key in chunk]
+                pending[pool.submit(_scan_responses, targets, self.max_body_size,
+                                    self.time_budget, self.rule_packs)] = chunk
+            while pending:
+                if not collect(wait(pending, return_when=FIRST_COMPLETED).done):
+                    return False
+        return True
+
+    @staticmethod
+    def _group_by_endpoint(
+        refs: List[Dict],
+        findings_by_response: Dict[str, List[Dict]],
+        result: BatchScanResult
+    ) -> Dict[Tuple[str, str], Dict]:
+        """Collect the distinct findings and the targets of every endpoint."""
+        endpoints: Dict[Tuple[str, str], Dict] = {}
+        finding_endpoints: Dict[Tuple[str, str, Optional[str]], Set[Tuple[str, str]]] = {}
+        for ref in refs:
+            method, url = endpoint_key(ref['method'], ref['url'])
+            endpoint = endpoints.setdefault((method, url), {
+                'method': method,
+                'url': url,
+                'targets': [],
+                'findings': {},
+            })
+            endpoint['targets'].append(ref)
+            for finding in findings_by_response[ref['key']]:
+                key = finding_key(finding)
+                finding_endpoints.setdefault(key, set()).add((method, url))
+                if key in endpoint['findings']:
+                    result.duplicates += 1
+                else:
+                    endpoint['findings'][key] = finding
+        result.shared = sum(1 for keys in finding_endpoints.values() if len(keys) > 1)
+        return endpoints
+
+    def _save(self, endpoints: Dict[Tuple[str, str], Dict], scan_name: str, result: BatchScanResult):
+        """Write one security scan per endpoint and all findings in one transaction."""
+        timestamp = datetime.now().isoformat()
+        finding_rows = []
+        history_links = []
+        with self.db.transaction():
+            for endpoint in endpoints.values():
+                findings = list(endpoint['findings'].values())
+                counts = {severity: 0 for severity in SEVERITIES}
+                for finding in findings:
+                    if finding['severity'] in counts:
+                        counts[finding['severity']] += 1
+                scan_id = self.db.create_security_scan(
+                    url=endpoint['url'],
+                    method=endpoint['method'],
+                    timestamp=timestamp,
+                    request_id=_shared_value(endpoint['targets'], 'request_id'),
+                    collection_id=_shared_value(endpoint['targets'], 'collection_id'),
+                    scan_name=scan_name,
+                    findings_count=len(findings),
+                    critical_count=counts[SecurityFinding.SEVERITY_CRITICAL],
+                    high_count=counts[SecurityFinding.SEVERITY_HIGH],
+                    medium_count=counts[SecurityFinding.SEVERITY_MEDIUM],
+                    low_count=counts[SecurityFinding.SEVERITY_LOW],
+                    info_count=counts[SecurityFinding.SEVERITY_INFO]
+                )
+                result.scan_ids.append(scan_id)
+                finding_rows.extend(dict(finding, scan_id=scan_id) for finding in findings)
+                history_links.extend(
+                    (target['history_id'], scan_id) for target in endpoint['targets'] if target.get('history_id')
+                )
+
+            result.findings = self.db.create_security_findings_bulk(finding_rows)
+            self.db.link_history_to_scans(history_links)
+
+
+def _shared_value(targets: List[Dict], field: str) -> Optional[Any]:
+    """Get a field's value if all targets agree on it, else None."""
+    values = {target.get(field) for target in targets}
+    return values.pop() if len(values) == 1 else None
@@ -4,11 +4,43 @@ Security Report Generator Module
 Generates HTML and JSON reports for security scan results.
 """
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import json
 
 
+SEVERITY_ORDER = ('critical', 'high', 'medium', 'low', 'info')
+
+# Styles of the batch report
+BATCH_REPORT_CSS = """
+* { margin: 0; padding: 0; box-sizing: border-box; }
+body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Arial, sans-serif;
+       background: #f5f5f5; color: #333; line-height: 1.6; padding: 20px; }
+.container { max-width: 1200px; margin: 0 auto; background: white; border-radius: 8px;
+             box-shadow: 0 2px 8px rgba(0,0,0,0.1); overflow: hidden; }
+.header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px 40px; }
+.header p { opacity: 0.9; }
+section { padding: 24px 40px; border-bottom: 1px solid #eee; }
+h2 { font-size: 20px; margin-bottom: 16px; word-break: break-all; }
+table { width: 100%; border-collapse: collapse; font-size: 14px; }
+th, td { padding: 8px 10px; border-bottom: 1px solid #eee; text-align: left; word-break: break-all; }
+td.count { text-align: center; font-weight: 600; }
+a { color: #333; text-decoration: none; }
+.method { font-family: 'Courier New', monospace; font-weight: 700; color: #667eea; margin-right: 6px; }
+.finding { border-left: 4px solid #9E9E9E; background: #fafafa; padding: 12px 16px; margin-bottom: 12px; }
+.finding.critical { border-left-color: #F44336; }
+.finding.high { border-left-color: #FF9800; }
+.finding.medium { border-left-color: #FFC107; }
+.finding.low { border-left-color: #2196F3; }
+.finding p { font-size: 14px; margin-top: 6px; }
+.check-id { color: #666; font-family: 'Courier New', monospace; }
+pre { background: #2d2d2d; color: #f8f8f2; padding: 10px; border-radius: 4px; font-size: 12px;
+      white-space: pre-wrap; word-break: break-all; margin-top: 6px; }
+ul { list-style: none; font-size: 13px; margin-top: 6px; word-break: break-all; }
+.footer { padding: 20px 40px; color: #666; font-size: 13px; text-align: center; }
+"""
+
+
 class SecurityReportGenerator:
     """Generates security scan reports in various formats."""
     
@@ -91,6 +123,131 @@ class SecurityReportGenerator:
         
         return json.dumps(report, indent=2)
     
+    def generate_batch_html_report(self, scan_ids: List[int]) -> str:
+        """
+        Generate an HTML report for a batch scan with a section per endpoint.
+        
+        Findings that occur on several endpoints are listed once, with the
+        endpoints they affect, instead of in every endpoint's section.
+        
+        Args:
+            scan_ids: IDs of the security scans of the batch (one per endpoint)
+        
+        Returns:
+            HTML report as string
+        """
+        endpoints, shared = self._aggregate_batch(scan_ids)
+        if not endpoints:
+            return "<html><body><h1>Error: Scan not found</h1></body></html>"
+        return self._generate_batch_html_template(endpoints, shared)
+    
+    def generate_batch_json_report(self, scan_ids: List[int]) -> str:
+        """
+        Generate a JSON report for a batch scan with a section per endpoint.
+        
+        Findings that occur on several endpoints are listed once under
+        "shared_findings"; endpoints refer to them by index.
+        
+        Args:
+            scan_ids: IDs of the security scans of the batch (one per endpoint)
+        
+        Returns:
+            JSON report as string
+        """
+        endpoints, shared = self._aggregate_batch(scan_ids)
+        if not endpoints:
+            return json.dumps({"error": "Scan not found"}, indent=2)
+        
+        def finding_json(f: Dict) -> Dict:
+            return {
+                "check_id": f['check_id'],
+                "title": f['title'],
+                "severity": f['severity'],
+                "description": f['description'],
+                "recommendation": f['recommendation'],
+                "evidence": f.get('evidence'),
+                "cwe_id": f.get('cwe_id'),
+                "owasp_category": f.get('owasp_category')
+            }
+        
+        report = {
+            "scan_info": {
+                "scan_name": endpoints[0]['scan'].get('scan_name') or 'Unnamed Scan',
+                "timestamp": endpoints[0]['scan']['timestamp'],
+                "endpoints": len(endpoints)
+            },
+            "summary": self._batch_counts(endpoints, shared),
+            "endpoints": [
+                {
+                    "scan_id": endpoint['scan']['id'],
+                    "method": endpoint['scan']['method'],
+                    "url": endpoint['scan']['url'],
+                    "findings": [finding_json(f) for f in endpoint['findings']],
+                    "shared_findings": endpoint['shared']
+                }
+                for endpoint in endpoints
+            ],
+            "shared_findings": [
+                dict(finding_json(group['finding']),
+                     endpoints=[f"{method} {url}" for method, url in group['endpoints']])
+                for group in shared
+            ]
+        }
+        
+        return json.dumps(report, indent=2)
+    
+    def _aggregate_batch(self, scan_ids: List[int]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Load the scans of a batch and group identical findings across them.
+        
+        Returns:
+            Tuple of (endpoints, shared findings). Each shared finding has
+            'finding' and 'endpoints' (method, url) and occurs on more than
+            one endpoint. Each endpoint has 'scan', its other 'findings' and
+            'shared', the indexes of the shared findings it has.
+        """
+        endpoints = []
+        groups = {}
+        for scan_id in scan_ids:
+            scan = self.db.get_security_scan(scan_id)
+            if not scan:
+                continue
+            findings = self.db.get_security_findings(scan_id)
+            endpoints.append({'scan': scan, 'findings': findings})
+            for finding in findings:
+                key = (finding['check_id'], finding['title'], finding.get('evidence'))
+                group = groups.setdefault(key, {'finding': finding, 'endpoints': []})
+                group['endpoints'].append((scan['method'], scan['url']))
+        
+        severity_order = {severity: index for index, severity in enumerate(SEVERITY_ORDER)}
+        shared = sorted(
+            (group for group in groups.values() if len(group['endpoints']) > 1),
+            key=lambda group: (severity_order.get(group['finding']['severity'], len(SEVERITY_ORDER)),
+                               -len(group['endpoints']))
+        )
+        shared_index = {
+            (g['finding']['check_id'], g['finding']['title'], g['finding'].get('evidence')): index
+            for index, g in enumerate(shared)
+        }
+        for endpoint in endpoints:
+            findings = endpoint['findings']
+            keys = [(f['check_id'], f['title'], f.get('evidence')) for f in findings]
+            endpoint['findings'] = [f for f, key in zip(findings, keys) if key not in shared_index]
+            endpoint['shared'] = [shared_index[key] for key in keys if key in shared_index]
+        return endpoints, shared
+    
+    def _batch_counts(self, endpoints: List[Dict], shared: List[Dict]) -> Dict[str, int]:
+        """Count the distinct findings of a batch by severity."""
+        counts = {'total_findings': 0}
+        counts.update({severity: 0 for severity in SEVERITY_ORDER})
+        findings = [f for endpoint in endpoints for f in endpoint['findings']]
+        findings.extend(group['finding'] for group in shared)
+        for finding in findings:
+            counts['total_findings'] += 1
+            if finding['severity'] in counts:
+                counts[finding['severity']] += 1
+        return counts
+    
     def _generate_html_template(self, scan: Dict, findings: List[Dict]) -> str:
         """Generate HTML report template."""
         
@@ -513,6 +670,97 @@ class SecurityReportGenerator:
         
         return html
     
+    def _generate_batch_html_template(self, endpoints: List[Dict], shared: List[Dict]) -> str:
+        """Generate the HTML batch report template."""
+        first_scan = endpoints[0]['scan']
+        scan_name = self._escape_html(first_scan.get('scan_name') or 'Batch Scan')
+        timestamp = datetime.fromisoformat(first_scan['timestamp']).strftime("%Y-%m-%d %H:%M:%S")
+        counts = self._batch_counts(endpoints, shared)
+        summary = " · ".join(
+            f"{self._get_severity_icon(severity)} {counts[severity]} {severity.capitalize()}"
+            for severity in SEVERITY_ORDER
+        )
+        
+        # Endpoint overview table
+        severity_headers = "".join(f"<th>{severity.capitalize()}</th>" for severity in SEVERITY_ORDER)
+        rows_html = ""
+        for index, endpoint in enumerate(endpoints):
+            scan = endpoint['scan']
+            cells = "".join(f"<td class='count'>{scan[f'{severity}_count'] or ''}</td>" for severity in SEVERITY_ORDER)
+            rows_html += (f"<tr><td><span class='method'>{scan['method']}</span>"
+                          f"<a href='#endpoint-{index}'>{self._escape_html(scan['url'])}</a></td>"
+                          f"{cells}<td class='count'>{scan['findings_count']}</td></tr>")
+        
+        # Findings shared by several endpoints
+        shared_html = ""
+        for index, group in enumerate(shared):
+            affected = "".join(
+                f"<li><span class='method'>{method}</span>{self._escape_html(url)}</li>"
+                for method, url in group['endpoints']
+            )
+            shared_html += self._batch_finding_html(
+                group['finding'], f"shared-{index}",
+                f"<p><strong>Affected endpoints ({len(group['endpoints'])}):</strong></p><ul>{affected}</ul>"
+            )
+        if shared_html:
+            shared_html = f"<section><h2>Findings Across Endpoints</h2>{shared_html}</section>"
+        
+        # Findings of each endpoint that no other endpoint has
+        endpoints_html = ""
+        for index, endpoint in enumerate(endpoints):
+            scan = endpoint['scan']
+            findings_html = "".join(self._batch_finding_html(finding) for finding in endpoint['findings'])
+            if endpoint['shared']:
+                links = ", ".join(
+                    f"<a href='#shared-{i}'>{self._escape_html(shared[i]['finding']['title'])}</a>"
+                    for i in endpoint['shared']
+                )
+                findings_html += f"<p>Also affected by findings across endpoints: {links}</p>"
+            if not findings_html:
+                findings_html = "<p>✅ No Security Issues Found</p>"
+            endpoints_html += (f"<section id=\"endpoint-{index}\"><h2><span class='method'>{scan['method']}</span>"
+                               f"{self._escape_html(scan['url'])}</h2>{findings_html}</section>")
+        
+        return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>Security Scan Report - {scan_name}</title>
+<style>{BATCH_REPORT_CSS}</style>
+</head>
+<body>
+<div class="container">
+<div class="header">
+<h1>🔒 Security Scan Report</h1>
+<p>{scan_name} · {len(endpoints)} endpoints · {timestamp}</p>
+<p>{counts['total_findings']} distinct findings: {summary}</p>
+</div>
+<section><h2>Endpoints</h2><table><tr><th>Endpoint</th>{severity_headers}<th>Total</th></tr>{rows_html}</table></section>
+{shared_html}
+{endpoints_html}
+<div class="footer">
+<p>Report generated by PostMini Security Scanner | {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
+<p>All checks performed locally without external network calls</p>
+</div>
+</div>
+</body>
+</html>
+"""
+    
+    def _batch_finding_html(self, finding: Dict, anchor: Optional[str] = None, extra_html: str = "") -> str:
+        """Build the entry of one finding in the batch report."""
+        evidence_html = ""
+        if finding.get('evidence'):
+            evidence_html = f"<pre>{self._escape_html(finding['evidence'][:500])}</pre>"
+        anchor_attr = f' id="{anchor}"' if anchor else ""
+        return (f"<div class='finding {finding['severity']}'{anchor_attr}>"
+                f"<strong>{self._get_severity_icon(finding['severity'])} {self._escape_html(finding['title'])}</strong> "
+                f"<span class='check-id'>{finding['severity'].upper()} · {finding['check_id']}</span>"
+                f"<p>{self._escape_html(finding['description'])}</p>"
+                f"<p><strong>Recommendation:</strong> {self._escape_html(finding['recommendation'])}</p>"
+                f"{evidence_html}{extra_html}</div>")
+    
     def _get_severity_icon(self, severity: str) -> str:
         """Get emoji icon for severity level."""
         icons = {
@@ -0,0 +1,469 @@
+"""
+Security Rule Packs Module
+
+Declarative security rules loaded from JSON rule-pack files, so teams can add
+their own leak patterns and header/cookie policies without writing code.
+
+A rule pack looks like:
+
+    {
+        "name": "acme",
+        "description": "ACME internal leak patterns",
+        "rules": [
+            {
+                "id": "ACME001",
+                "title": "Internal Hostname in Response",
+                "severity": "medium",
+                "target": "body",
+                "pattern": "[a-z0-9-]+\\\\.corp\\\\.acme\\\\.com",
+                "ignore_case": true,
+                "description": "...",
+                "recommendation": "...",
+                "cwe": "CWE-200",
+                "owasp": "A01:2021 – Broken Access Control"
+            }
+        ]
+    }
+
+Targets:
+- body:   `pattern` is searched in the response body. Body rules are compiled
+          into the scanner's single-pass PatternScanner together with the
+          built-in rules, so they add no extra pass over the body. Rules are
+          skipped for bodies missing their `keywords`; if none are given,
+          the longest literal the pattern requires is used.
+- header: the header `name` is checked; with a `pattern` its value must
+          match (search), otherwise its presence is enough.
+- cookie: `pattern` is searched in each Set-Cookie header, optionally only
+          for the cookie `name`.
+
+With "absent": true, header and cookie rules report a header or cookie
+that does NOT match (e.g. a required header that is missing).
+
+Packs are installed by copying them into the security_rules directory of
+the app data folder (see load_installed_rule_packs()). Rules are validated
+and compiled when a pack is loaded. Loaded packs are
+cached by file path, size and modification time, and the combined scanner
+for a set of packs is cached by the packs' content, so scanners created
+per request or in worker processes reuse them.
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+from src.core.app_paths import get_app_paths
+from src.features.pattern_scanner import PatternRule
+
+
+TARGET_BODY = 'body'
+TARGET_HEADER = 'header'
+TARGET_COOKIE = 'cookie'
+TARGETS = (TARGET_BODY, TARGET_HEADER, TARGET_COOKIE)
+
+SEVERITIES = ('critical', 'high', 'medium', 'low', 'info')
+
+# Check name of rule-pack body rules in the PatternScanner and in
+# SecurityScanner.checks_enabled
+RULE_PACK_CHECK = 'rule_packs'
+
+# Shortest literal worth using as a keyword
+MIN_KEYWORD_LENGTH = 3
+
+_RULE_ID = re.compile(r'[A-Za-z][\w.-]*\Z')
+_BUILTIN_ID = re.compile(r'SEC\d{3}\Z')
+_RULE_KEYS = {
+    'id', 'title', 'severity', 'target', 'pattern', 'ignore_case', 'keywords', 'name', 'absent',
+    'description', 'recommendation', 'cwe', 'owasp', 'enabled',
+}
+
+# (path, size, mtime_ns) -> RulePack
+_loaded_packs: Dict[Tuple[str, int, int], 'RulePack'] = {}
+
+
+class RulePackError(ValueError):
+    """Raised when a rule pack is invalid."""
+
+
+class SecurityRule:
+    """A declarative security check: a matcher plus the finding it reports."""
+
+    def __init__(
+        self,
+        rule_id: str,
+        title: str,
+        severity: str,
+        target: str,
+        pattern: Optional[str] = None,
+        ignore_case: bool = False,
+        keywords: Optional[Sequence[str]] = None,
+        name: Optional[str] = None,
+        absent: bool = False,
+        description: str = '',
+        recommendation: str = '',
+        cwe_id: Optional[str] = None,
+        owasp_category: Optional[str] = None
+    ):
+        """
+        Initialize and validate a rule.
+
+        Args:
+            rule_id: Unique rule id, used as the finding's check id
+            title: Finding title
+            severity: One of SEVERITIES
+            target: One of TARGETS
+            pattern: Regular expression (required for body rules)
+            ignore_case: Match case-insensitively
+            keywords: Literals every body match contains (default: derived
+                from the pattern)
+            name: Header name (required for header rules) or cookie name
+            absent: Report headers/cookies that do not match
+            description: Finding description
+            recommendation: Finding recommendation
+            cwe_id: CWE tag, e.g. 'CWE-200'
+            owasp_category: OWASP tag
+
+        Raises:
+            RulePackError: If the rule is invalid
+        """
+        if not isinstance(rule_id, str) or not _RULE_ID.match(rule_id):
+            raise RulePackError(f"Invalid rule id: {rule_id!r}")
+        if _BUILTIN_ID.match(rule_id):
+            raise RulePackError(f"Rule id '{rule_id}' is reserved for built-in checks")
+        if not title:
+            raise RulePackError(f"Rule '{rule_id}' has no title")
+        if severity not in SEVERITIES:
+            raise RulePackError(f"Rule '{rule_id}' has invalid severity {severity!r} (use one of {', '.join(SEVERITIES)})")
+        if target not in TARGETS:
+            raise RulePackError(f"Rule '{rule_id}' has invalid target {target!r} (use one of {', '.join(TARGETS)})")
+        if target == TARGET_BODY and not pattern:
+            raise RulePackError(f"Body rule '{rule_id}' needs a pattern")
+        if target == TARGET_BODY and absent:
+            raise RulePackError(f"Body rule '{rule_id}' cannot use 'absent'")
+        if target == TARGET_HEADER and not name:
+            raise RulePackError(f"Header rule '{rule_id}' needs a header name")
+
+        self.rule_id = rule_id
+        self.title = title
+        self.severity = severity
+        self.target = target
+        self.ignore_case = bool(ignore_case)
+        self.name = name
+        self.absent = bool(absent)
+        self.description = description or title
+        self.recommendation = recommendation or ''
+        self.cwe_id = cwe_id
+        self.owasp_category = owasp_category
+        self.pattern = _compile(rule_id, pattern, self.ignore_case) if pattern else None
+
+        if keywords is None:
+            keywords = derive_keywords(self.pattern) if self.pattern is not None else ()
+        elif self.ignore_case:
+            keywords = [keyword.lower() for keyword in keywords]
+        self.keywords = tuple(keywords)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SecurityRule':
+        """Create a rule from its rule-pack entry."""
+        if not isinstance(data, dict):
+            raise RulePackError(f"Rule must be an object, got {type(data).__name__}")
+        unknown = set(data) - _RULE_KEYS
+        if unknown:
+            raise RulePackError(f"Rule '{data.get('id')}' has unknown fields: {', '.join(sorted(unknown))}")
+        keywords = data.get('keywords')
+        if keywords is not None and (not isinstance(keywords, list) or not all(isinstance(k, str) and k for k in keywords)):
+            raise RulePackError(f"Rule '{data.get('id')}': keywords must be a list of non-empty strings")
+        return cls(
+            rule_id=data.get('id'),
+            title=data.get('title'),
+            severity=data.get('severity'),
+            target=data.get('target', TARGET_BODY),
+            pattern=data.get('pattern'),
+            ignore_case=data.get('ignore_case', False),
+            keywords=keywords,
+            name=data.get('name'),
+            absent=data.get('absent', False),
+            description=data.get('description', ''),
+            recommendation=data.get('recommendation', ''),
+            cwe_id=data.get('cwe'),
+            owasp_category=data.get('owasp')
+        )
+
+    @property
+    def pattern_rule_id(self) -> str:
+        """Id of the rule in a PatternScanner (distinct from built-in rule ids)."""
+        return f"{RULE_PACK_CHECK}:{self.rule_id}"
+
+    def to_pattern_rule(self) -> PatternRule:
+        """Get the PatternScanner rule of a body rule."""
+        return PatternRule(
+            self.pattern_rule_id, RULE_PACK_CHECK, self.pattern.pattern,
+            re.IGNORECASE if self.ignore_case else 0, self.keywords, self.title
+        )
+
+    def check_headers(self, headers: Dict[str, str]) -> Optional[str]:
+        """
+        Evaluate a header rule.
+
+        Args:
+            headers: Response headers with lowercase names
+
+        Returns:
+            Evidence if the rule reports a finding, else None
+        """
+        value = headers.get(self.name.lower())
+        matched = value is not None and (self.pattern is None or self.pattern.search(value) is not None)
+        if matched == self.absent:
+            return None
+        if value is None:
+            return f"{self.name} header not present"
+        return f"{self.name}: {value}"[:100]
+
+    def check_cookie(self, cookie_header: str) -> Optional[str]:
+        """
+        Evaluate a cookie rule against one Set-Cookie header.
+
+        Returns:
+            Evidence if the rule reports a finding, else None
+        """
+        if self.name is not None and cookie_header.split('=', 1)[0].strip() != self.name:
+            return None
+        matched = self.pattern is None or self.pattern.search(cookie_header) is not None
+        if matched == self.absent:
+            return None
+        return cookie_header[:100]
+
+    def fingerprint(self) -> Tuple:
+        """Everything that defines the rule, for caching."""
+        return (
+            self.rule_id, self.title, self.severity, self.target,
+            self.pattern.pattern if self.pattern is not None else None,
+            self.ignore_case, self.keywords, self.name, self.absent,
+            self.description, self.recommendation, self.cwe_id, self.owasp_category,
+        )
+
+    def __repr__(self):
+        return f"SecurityRule({self.rule_id!r})"
+
+
+class RulePack:
+    """A named set of security rules, usually loaded from a JSON file."""
+
+    def __init__(self, name: str, rules: Iterable[SecurityRule], description: str = '', source: Optional[str] = None):
+        """
+        Initialize a rule pack.
+
+        Args:
+            name: Pack name
+            rules: Rules of the pack (ids must be unique)
+            description: Human readable description
+            source: File the pack was loaded from
+
+        Raises:
+            RulePackError: If rule ids are duplicated
+        """
+        self.name = name
+        self.description = description
+        self.source = source
+        self.rules: List[SecurityRule] = list(rules)
+        check_unique_ids(self.rules, f"rule pack '{name}'")
+        self._key = hashlib.sha256(
+            json.dumps([name, [rule.fingerprint() for rule in self.rules]]).encode('utf-8')
+        ).hexdigest()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], source: Optional[str] = None) -> 'RulePack':
+        """
+        Create a pack from parsed rule-pack JSON. Rules with "enabled": false
+        are left out.
+
+        Raises:
+            RulePackError: If the pack or one of its rules is invalid
+        """
+        if not isinstance(data, dict):
+            raise RulePackError("Rule pack must be a JSON object")
+        name = data.get('name')
+        if not name or not isinstance(name, str):
+            raise RulePackError("Rule pack has no name")
+        rules = data.get('rules')
+        if not isinstance(rules, list):
+            raise RulePackError(f"Rule pack '{name}' needs a list of rules")
+        return cls(
+            name,
+            [SecurityRule.from_dict(rule) for rule in rules if not isinstance(rule, dict) or rule.get('enabled', True)],
+            data.get('description', ''),
+            source
+        )
+
+    def rules_for(self, target: str) -> List[SecurityRule]:
+        """Get the rules of a target."""
+        return [rule for rule in self.rules if rule.target == target]
+
+    def __eq__(self, other):
+        return isinstance(other, RulePack) and self._key == other._key
+
+    def __hash__(self):
+        return hash(self._key)
+
+    def __repr__(self):
+        return f"RulePack({self.name!r}, {len(self.rules)} rules)"
+
+
+def check_unique_ids(rules: Iterable[SecurityRule], where: str):
+    """Raise RulePackError if two rules share an id."""
+    seen = set()
+    for rule in rules:
+        if rule.rule_id in seen:
+            raise RulePackError(f"Duplicate rule id '{rule.rule_id}' in {where}")
+        seen.add(rule.rule_id)
+
+
+def load_rule_pack(path: str) -> RulePack:
+    """
+    Load a rule pack from a JSON file. Unchanged files are not parsed again.
+
+    Raises:
+        RulePackError: If the file cannot be read or is invalid
+    """
+    path = os.path.abspath(str(path))
+    try:
+        stat = os.stat(path)
+    except OSError as e:
+        raise RulePackError(f"Cannot read rule pack {path}: {e}")
+    cache_key = (path, stat.st_size, stat.st_mtime_ns)
+    pack = _loaded_packs.get(cache_key)
+    if pack is not None:
+        return pack
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise RulePackError(f"Cannot read rule pack {os.path.basename(path)}: {e}")
+    try:
+        pack = RulePack.from_dict(data, source=path)
+    except RulePackError as e:
+        raise RulePackError(f"{os.path.basename(path)}: {e}")
+
+    for stale in [key for key in _loaded_packs if key[0] == path]:
+        del _loaded_packs[stale]
+    _loaded_packs[cache_key] = pack
+    return pack
+
+
+def load_rule_packs(directory: str) -> Tuple[List[RulePack], List[str]]:
+    """
+    Load every *.json rule pack in a directory, in file name order.
+
+    Invalid packs, and packs whose rule ids clash with an earlier pack, are
+    skipped and reported.
+
+    Returns:
+        Tuple of (rule packs, error messages)
+    """
+    packs = []
+    errors = []
+    seen_ids = set()
+    if not directory or not os.path.isdir(directory):
+        return packs, errors
+    for file_name in sorted(os.listdir(directory)):
+        if not file_name.lower().endswith('.json'):
+            continue
+        try:
+            pack = load_rule_pack(os.path.join(directory, file_name))
+        except RulePackError as e:
+            errors.append(str(e))
+            continue
+        clashes = sorted(seen_ids.intersection(rule.rule_id for rule in pack.rules))
+        if clashes:
+            errors.append(f"{file_name}: rule ids already used by another pack: {', '.join(clashes)}")
+            continue
+        seen_ids.update(rule.rule_id for rule in pack.rules)
+        packs.append(pack)
+    return packs, errors
+
+
+def load_installed_rule_packs() -> List[RulePack]:
+    """Load the rule packs in the user's security rules directory, logging invalid ones."""
+    packs, errors = load_rule_packs(str(get_app_paths().security_rules_dir))
+    for error in errors:
+        print(f"[Security] Skipped rule pack: {error}")
+    return packs
+
+
+def derive_keywords(pattern: re.Pattern) -> Tuple[str, ...]:
+    """
+    Find the longest literal every match of a pattern contains, for the
+    PatternScanner keyword check. Only ASCII literals outside groups,
+    alternations and repeats are considered.
+
+    Returns:
+        A one-element tuple with the literal (lowercase if the pattern
+        ignores case), or () if there is none of MIN_KEYWORD_LENGTH
+    """
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return ()
+
+    best = ''
+    current = []
+    for op, value in list(parsed) + [(None, None)]:
+        if op == sre_constants.LITERAL and value < 128:
+            current.append(chr(value))
+            continue
+        literal = ''.join(current)
+        if len(literal) > len(best):
+            best = literal
+        current = []
+
+    if len(best) < MIN_KEYWORD_LENGTH:
+        return ()
+    return (best.lower(),) if pattern.flags & re.IGNORECASE else (best,)
+
+
+def _compile(rule_id: str, pattern: str, ignore_case: bool) -> re.Pattern:
+    """Compile and check a rule pattern."""
+    if not isinstance(pattern, str):
+        raise RulePackError(f"Rule '{rule_id}': pattern must be a string")
+    try:
+        compiled = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+    except re.error as e:
+        raise RulePackError(f"Rule '{rule_id}' has an invalid pattern: {e}")
+    if compiled.flags != re.compile('', re.IGNORECASE if ignore_case else 0).flags:
+        raise RulePackError(f"Rule '{rule_id}': global inline flags are not supported (use ignore_case)")
+    if compiled.match('') is not None:
+        raise RulePackError(f"Rule '{rule_id}': pattern matches empty text")
+    if compiled.groupindex and any(re.match(r'r\d+\Z', group) for group in compiled.groupindex):
+        raise RulePackError(f"Rule '{rule_id}': group names like 'r0' are reserved")
+    if _has_backreference(pattern):
+        raise RulePackError(f"Rule '{rule_id}': backreferences are not supported")
+    return compiled
+
+
+def _has_backreference(pattern: str) -> bool:
+    """Check whether a pattern refers back to one of its groups."""
+    def walk(items) -> bool:
+        for op, value in items:
+            if op in (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS):
+                return True
+            values = value if isinstance(value, (list, tuple)) else [value]
+            for item in values:
+                if isinstance(item, sre_parse.SubPattern) and walk(item):
+                    return True
+                if isinstance(item, (list, tuple)) and any(
+                    isinstance(sub, sre_parse.SubPattern) and walk(sub) for sub in item
+                ):
+                    return True
+        return False
+
+    return walk(sre_parse.parse(pattern))
+
@@ -5,12 +5,141 @@ This module provides OWASP-based security scanning for API endpoints.
 All checks run locally without any external network calls, ensuring 100% privacy.
 """
 
+import codecs
 import re
 import json
-from typing import List, Dict, Optional, Any
+import time
+from functools import lru_cache
+from typing import List, Dict, Optional, Any, Iterable, Tuple, Union
 from datetime import datetime
 from urllib.parse import urlparse
 
+from src.features.pattern_scanner import PatternRule, PatternScanner, RuleMatches
+from src.features.security_rules import (
+    RulePack, SecurityRule, RULE_PACK_CHECK, TARGET_BODY, TARGET_HEADER, TARGET_COOKIE, check_unique_ids
+)
+
+
+# Response body rules, grouped by the check they belong to. Keywords are
+# literals every match contains; rules whose keywords are missing from a body
+# are skipped before the single scanning pass.
+BODY_RULES = [
+    # Sensitive data exposure
+    PatternRule('credit_card', 'sensitive_data', r'\b(?:\d[ -]*?){13,19}\b'),
+    PatternRule('ssn', 'sensitive_data', r'\b\d{3}[-\s]?\d{2}[-\s]?\d{4}\b'),
+    PatternRule('api_key', 'sensitive_data', r'["\']?api[_-]?key["\']?\s*[:=]\s*["\']([a-zA-Z0-9_\-]{20,})["\']',
+                re.IGNORECASE, ('api', 'key'), 'API Key'),
+    PatternRule('secret_key', 'sensitive_data', r'["\']?secret[_-]?key["\']?\s*[:=]\s*["\']([a-zA-Z0-9_\-]{20,})["\']',
+                re.IGNORECASE, ('secret', 'key'), 'Secret Key'),
+    PatternRule('bearer_token', 'sensitive_data', r'Bearer\s+([a-zA-Z0-9_\-\.]{20,})',
+                re.IGNORECASE, ('bearer',), 'Bearer Token'),
+    PatternRule('access_token', 'sensitive_data', r'["\']?access[_-]?token["\']?\s*[:=]\s*["\']([a-zA-Z0-9_\-]{20,})["\']',
+                re.IGNORECASE, ('access', 'token'), 'Access Token'),
+    PatternRule('email', 'sensitive_data', r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', keywords=('@',)),
+    PatternRule('aws_access_key', 'sensitive_data', r'AKIA[0-9A-Z]{16}', keywords=('AKIA',)),
+    PatternRule('private_key_rsa', 'sensitive_data', r'BEGIN RSA PRIVATE KEY',
+                keywords=('BEGIN RSA PRIVATE KEY',), label='BEGIN RSA PRIVATE KEY'),
+    PatternRule('private_key', 'sensitive_data', r'BEGIN PRIVATE KEY',
+                keywords=('BEGIN PRIVATE KEY',), label='BEGIN PRIVATE KEY'),
+    PatternRule('private_key_ec', 'sensitive_data', r'BEGIN EC PRIVATE KEY',
+                keywords=('BEGIN EC PRIVATE KEY',), label='BEGIN EC PRIVATE KEY'),
+
+    # SQL error messages
+    PatternRule('sql_mysql_syntax', 'sql_injection_indicators', r'SQL syntax.*?MySQL',
+                re.IGNORECASE, ('sql syntax', 'mysql'), 'MySQL'),
+    PatternRule('sql_mysql_warning', 'sql_injection_indicators', r'Warning.*?\Wmysqli?_',
+                re.IGNORECASE, ('warning', 'mysql'), 'MySQL'),
+    PatternRule('sql_mysql_exception', 'sql_injection_indicators', r'MySQLSyntaxErrorException',
+                re.IGNORECASE, ('mysqlsyntaxerrorexception',), 'MySQL'),
+    PatternRule('sql_mysql_result', 'sql_injection_indicators', r'valid MySQL result',
+                re.IGNORECASE, ('valid mysql result',), 'MySQL'),
+    PatternRule('sql_postgresql_error', 'sql_injection_indicators', r'PostgreSQL.*?ERROR',
+                re.IGNORECASE, ('postgresql', 'error'), 'PostgreSQL'),
+    PatternRule('sql_postgresql_warning', 'sql_injection_indicators', r'Warning.*?\Wpg_',
+                re.IGNORECASE, ('warning', 'pg_'), 'PostgreSQL'),
+    PatternRule('sql_postgresql_result', 'sql_injection_indicators', r'valid PostgreSQL result',
+                re.IGNORECASE, ('valid postgresql result',), 'PostgreSQL'),
+    PatternRule('sql_npgsql', 'sql_injection_indicators', r'Npgsql\.',
+                re.IGNORECASE, ('npgsql.',), 'PostgreSQL'),
+    PatternRule('sql_server_driver', 'sql_injection_indicators', r'Driver.*? SQL[\-\_\ ]*Server',
+                re.IGNORECASE, ('driver', ' sql', 'server'), 'SQL Server'),
+    PatternRule('sql_server_ole_db', 'sql_injection_indicators', r'OLE DB.*? SQL Server',
+                re.IGNORECASE, ('ole db', ' sql server'), 'SQL Server'),
+    PatternRule('sql_server_jdbc', 'sql_injection_indicators', r'SQLServer JDBC Driver',
+                re.IGNORECASE, ('sqlserver jdbc driver',), 'SQL Server'),
+    PatternRule('sql_oracle_code', 'sql_injection_indicators', r'\bORA-\d{5}',
+                re.IGNORECASE, ('ora-',), 'Oracle'),
+    PatternRule('sql_oracle_error', 'sql_injection_indicators', r'Oracle error',
+                re.IGNORECASE, ('oracle error',), 'Oracle'),
+    PatternRule('sql_oracle_driver', 'sql_injection_indicators', r'Oracle.*?Driver',
+                re.IGNORECASE, ('oracle', 'driver'), 'Oracle'),
+    PatternRule('sql_oracle_warning', 'sql_injection_indicators', r'Warning.*?\Woci_',
+                re.IGNORECASE, ('warning', 'oci_'), 'Oracle'),
+    PatternRule('sql_sqlite_jdbc', 'sql_injection_indicators', r'SQLite/JDBCDriver',
+                re.IGNORECASE, ('sqlite/jdbcdriver',), 'SQLite'),
+    PatternRule('sql_sqlite_exception', 'sql_injection_indicators', r'SQLite.Exception',
+                re.IGNORECASE, ('sqlite', 'exception'), 'SQLite'),
+    PatternRule('sql_sqlite_dotnet', 'sql_injection_indicators', r'System.Data.SQLite.SQLiteException',
+                re.IGNORECASE, ('system', 'sqliteexception'), 'SQLite'),
+    PatternRule('sql_sqlite_python', 'sql_injection_indicators', r'sqlite3.OperationalError',
+                re.IGNORECASE, ('sqlite3', 'operationalerror'), 'SQLite'),
+    PatternRule('sql_sqlstate', 'sql_injection_indicators', r'SQLSTATE\[\d+\]',
+                re.IGNORECASE, ('sqlstate[',), 'Generic SQL'),
+    PatternRule('sql_syntax_error', 'sql_injection_indicators', r'syntax error.*?SQL',
+                re.IGNORECASE, ('syntax error', 'sql'), 'Generic SQL'),
+
+    # Directory listings
+    PatternRule('dir_index_title', 'directory_listing', r'<title>Index of /', re.IGNORECASE, ('<title>index of /',)),
+    PatternRule('dir_index_heading', 'directory_listing', r'<h1>Index of /', re.IGNORECASE, ('<h1>index of /',)),
+    PatternRule('dir_listing_for', 'directory_listing', r'Directory Listing For', re.IGNORECASE, ('directory listing for',)),
+    PatternRule('dir_parent_link', 'directory_listing', r'Parent Directory</a>', re.IGNORECASE, ('parent directory</a>',)),
+    PatternRule('dir_parent_iis', 'directory_listing', r'\[To Parent Directory\]', re.IGNORECASE, ('[to parent directory]',)),
+
+    # Stack traces and verbose errors
+    PatternRule('error_stack_trace', 'error_disclosure', r'at\s+[\w\.]+\([\w\.\:]+:\d+\)',
+                re.IGNORECASE, ('at', '(', ':', ')'), 'Stack Trace'),
+    PatternRule('error_python_traceback', 'error_disclosure', r'Traceback \(most recent call last\)',
+                re.IGNORECASE, ('traceback (most recent call last)',), 'Python Stack Trace'),
+    PatternRule('error_java_thread', 'error_disclosure', r'Exception in thread',
+                re.IGNORECASE, ('exception in thread',), 'Java Stack Trace'),
+    PatternRule('error_php_line', 'error_disclosure', r'\.php on line \d+',
+                re.IGNORECASE, ('.php on line ',), 'PHP Error'),
+    PatternRule('error_php_warning', 'error_disclosure', r'Warning: .+ in .+\.php',
+                re.IGNORECASE, ('warning: ', ' in ', '.php'), 'PHP Warning'),
+    PatternRule('error_php_fatal', 'error_disclosure', r'Fatal error:',
+                re.IGNORECASE, ('fatal error:',), 'PHP Fatal Error'),
+    PatternRule('error_dotnet_exception', 'error_disclosure', r'System\..*?Exception',
+                re.IGNORECASE, ('system.', 'exception'), '.NET Exception'),
+]
+
+API_KEY_RULES = ('api_key', 'secret_key', 'bearer_token', 'access_token')
+PRIVATE_KEY_RULES = ('private_key_rsa', 'private_key', 'private_key_ec')
+
+BODY_CHECKS = ('sensitive_data', 'sql_injection_indicators', 'directory_listing', 'error_disclosure')
+
+# Response body scan limits (None disables a limit). Sizes are in bytes for
+# byte streams and in characters for text. SecurityScanner applies no time
+# budget by default, so a scan reports the same findings however busy the
+# machine is; batch scans and the app's scans (which run on the UI thread)
+# pass DEFAULT_TIME_BUDGET.
+DEFAULT_MAX_BODY_SIZE = 10 * 1024 * 1024
+DEFAULT_TIME_BUDGET = 2.0  # seconds
+BODY_CHUNK_SIZE = 256 * 1024
+# Leading part of the body kept for the Content-Type check
+CONTENT_SNIFF_SIZE = 1000
+
+# Shared by all scanners: rules and combined patterns are compiled once
+BODY_SCANNER = PatternScanner(BODY_RULES)
+
+
+@lru_cache(maxsize=16)
+def _body_scanner_for(rule_packs: Tuple[RulePack, ...]) -> PatternScanner:
+    """Get the scanner for the built-in body rules plus those of some rule packs."""
+    pack_rules = [rule.to_pattern_rule() for pack in rule_packs for rule in pack.rules_for(TARGET_BODY)]
+    if not pack_rules:
+        return BODY_SCANNER
+    return PatternScanner(BODY_RULES + pack_rules)
+
 
 class SecurityFinding:
     """Represents a single security vulnerability or issue."""
@@ -57,14 +186,60 @@ class SecurityFinding:
         }
 
 
+class BodyCoverage:
+    """How much of a response body a scan covered."""
+    
+    REASON_SIZE = "size"
+    REASON_TIME = "time"
+    
+    def __init__(self, scanned: int, total: Optional[int] = None, reason: Optional[str] = None):
+        """
+        Args:
+            scanned: Bytes (characters for text) scanned
+            total: Size of the whole body, if known
+            reason: REASON_SIZE or REASON_TIME if the scan stopped early
+        """
+        self.scanned = scanned
+        self.total = total
+        self.reason = reason
+    
+    @property
+    def complete(self) -> bool:
+        """Whether the whole body was scanned."""
+        return self.reason is None
+
+
 class SecurityScanner:
     """
     Performs security checks on API requests and responses.
     All checks are performed locally with no external network calls.
     """
     
-    def __init__(self):
-        """Initialize the security scanner with all check modules."""
+    PARTIAL_SCAN_CHECK_ID = 'SEC026'
+    
+    def __init__(
+        self,
+        max_body_size: Optional[int] = DEFAULT_MAX_BODY_SIZE,
+        time_budget: Optional[float] = None,
+        rule_packs: Iterable[RulePack] = ()
+    ):
+        """
+        Initialize the security scanner with all check modules.
+        
+        Args:
+            max_body_size: Scan at most this much of a response body (None: no limit)
+            time_budget: Stop scanning a response body after this many seconds (None: no limit)
+            rule_packs: Additional declarative rules (see security_rules)
+        
+        Raises:
+            RulePackError: If rule ids are duplicated across the packs
+        """
+        self.max_body_size = max_body_size
+        self.time_budget = time_budget
+        self.rule_packs = tuple(rule_packs)
+        self.pack_rules: List[SecurityRule] = [rule for pack in self.rule_packs for rule in pack.rules]
+        check_unique_ids(self.pack_rules, "the loaded rule packs")
+        self.body_scanner = _body_scanner_for(self.rule_packs)
         self.checks_enabled = {
             'security_headers': True,
             'insecure_cookies': True,
@@ -76,6 +251,7 @@ class SecurityScanner:
             'http_methods': True,
             'cors_misconfig': True,
             'content_type': True,
+            RULE_PACK_CHECK: True,
         }
     
     def scan_response(
@@ -100,6 +276,52 @@ class SecurityScanner:
             response_body: Response body content
             request_secure: Whether request was made over HTTPS
         
+        Returns:
+            List of security findings
+        """
+        return self.scan_response_stream(
+            method=method,
+            url=url,
+            request_headers=request_headers,
+            response_status=response_status,
+            response_headers=response_headers,
+            body_chunks=(response_body[i:i + BODY_CHUNK_SIZE] for i in range(0, len(response_body or ''), BODY_CHUNK_SIZE)),
+            request_secure=request_secure,
+            body_size=len(response_body or '')
+        )
+    
+    def scan_response_stream(
+        self,
+        method: str,
+        url: str,
+        request_headers: Dict[str, str],
+        response_status: int,
+        response_headers: Dict[str, str],
+        body_chunks: Iterable[Union[str, bytes]],
+        request_secure: bool = True,
+        body_size: Optional[int] = None,
+        encoding: Optional[str] = None
+    ) -> List[SecurityFinding]:
+        """
+        Perform a security scan on an API response whose body arrives in chunks.
+        
+        The body is scanned chunk by chunk and never joined. Scanning stops
+        once max_body_size or time_budget is exceeded; the remaining chunks
+        are not read and an informational finding reports the partial
+        coverage.
+        
+        Args:
+            method: HTTP method used
+            url: Request URL
+            request_headers: Request headers sent
+            response_status: HTTP status code
+            response_headers: Response headers received
+            body_chunks: Response body as str chunks, or bytes chunks (e.g. from
+                requests' iter_content()) decoded with `encoding`
+            request_secure: Whether request was made over HTTPS
+            body_size: Size of the whole body, if known (for coverage reporting)
+            encoding: Encoding of bytes chunks (default: UTF-8)
+        
         Returns:
             List of security findings
         """
@@ -108,6 +330,14 @@ class SecurityScanner:
         # Normalize header keys to lowercase for case-insensitive lookup
         response_headers_lower = {k.lower(): v for k, v in response_headers.items()}
         
+        # Search the body once for the patterns of all enabled body checks
+        body_checks = [check for check in BODY_CHECKS if self.checks_enabled.get(check)]
+        if self.body_scanner is not BODY_SCANNER and self.checks_enabled.get(RULE_PACK_CHECK):
+            body_checks.append(RULE_PACK_CHECK)
+        if response_status != 200 and 'directory_listing' in body_checks:
+            body_checks.remove('directory_listing')
+        body_matches, body_head, coverage = self._scan_body(body_chunks, body_checks, body_size, encoding)
+        
         # Run all enabled checks
         if self.checks_enabled.get('security_headers'):
             findings.extend(self._check_security_headers(url, response_headers_lower, request_secure))
@@ -116,19 +346,19 @@ class SecurityScanner:
             findings.extend(self._check_insecure_cookies(url, response_headers_lower, request_secure))
         
         if self.checks_enabled.get('sensitive_data'):
-            findings.extend(self._check_sensitive_data(response_body))
+            findings.extend(self._check_sensitive_data(body_head, body_matches))
         
         if self.checks_enabled.get('sql_injection_indicators'):
-            findings.extend(self._check_sql_injection_indicators(response_body))
+            findings.extend(self._check_sql_injection_indicators(body_head, body_matches))
         
         if self.checks_enabled.get('server_disclosure'):
             findings.extend(self._check_server_disclosure(response_headers_lower))
         
         if self.checks_enabled.get('directory_listing'):
-            findings.extend(self._check_directory_listing(response_body, response_status))
+            findings.extend(self._check_directory_listing(body_head, response_status, body_matches))
         
         if self.checks_enabled.get('error_disclosure'):
-            findings.extend(self._check_error_disclosure(response_body, response_status))
+            findings.extend(self._check_error_disclosure(body_head, response_status, body_matches))
         
         if self.checks_enabled.get('http_methods'):
             findings.extend(self._check_http_methods(response_headers_lower))
@@ -137,10 +367,121 @@ class SecurityScanner:
             findings.extend(self._check_cors_misconfig(response_headers_lower))
         
         if self.checks_enabled.get('content_type'):
-            findings.extend(self._check_content_type(response_headers_lower, response_body))
+            findings.extend(self._check_content_type(response_headers_lower, body_head))
+        
+        if self.checks_enabled.get(RULE_PACK_CHECK) and self.pack_rules:
+            findings.extend(self._check_rule_packs(response_headers_lower, body_matches))
+        
+        if not coverage.complete:
+            findings.append(self._partial_scan_finding(coverage))
         
         return findings
     
+    def _scan_body(
+        self,
+        body_chunks: Iterable[Union[str, bytes]],
+        checks: List[str],
+        body_size: Optional[int],
+        encoding: Optional[str]
+    ) -> Tuple[Dict[str, RuleMatches], str, BodyCoverage]:
+        """
+        Scan a response body within the size and time budget.
+        
+        Returns:
+            Tuple of (rule matches, first CONTENT_SNIFF_SIZE characters, coverage)
+        """
+        stream = self.body_scanner.stream(checks) if checks else None
+        decoder = None
+        head = ''
+        scanned = 0
+        reason = None
+        deadline = time.monotonic() + self.time_budget if self.time_budget is not None else None
+        
+        for chunk in body_chunks:
+            if deadline is not None and time.monotonic() > deadline:
+                reason = BodyCoverage.REASON_TIME
+                break
+            if self.max_body_size is not None and scanned + len(chunk) > self.max_body_size:
+                chunk = chunk[:self.max_body_size - scanned]
+                reason = BodyCoverage.REASON_SIZE
+            scanned += len(chunk)
+            
+            if isinstance(chunk, bytes):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+                text = decoder.decode(chunk, final=reason is not None)
+            else:
+                text = chunk
+            
+            if len(head) < CONTENT_SNIFF_SIZE:
+                head += text[:CONTENT_SNIFF_SIZE - len(head)]
+            if stream is not None:
+                stream.feed(text)
+            elif len(head) >= CONTENT_SNIFF_SIZE:
+                break  # Only the head is needed
+            if reason is not None:
+                break
+        
+        if decoder is not None and reason is None and stream is not None:
+            stream.feed(decoder.decode(b'', final=True))
+        matches = stream.finish() if stream is not None else {}
+        if stream is None:
+            reason = None  # No body check was cut short
+        return matches, head, BodyCoverage(scanned, body_size, reason)
+    
+    def _partial_scan_finding(self, coverage: BodyCoverage) -> SecurityFinding:
+        """Report that a scan budget stopped the body scan early."""
+        limit = 'size limit' if coverage.reason == BodyCoverage.REASON_SIZE else 'time limit'
+        scanned = _format_size(coverage.scanned)
+        of_total = f' of {_format_size(coverage.total)}' if coverage.total is not None else ''
+        return SecurityFinding(
+            check_id=self.PARTIAL_SCAN_CHECK_ID,
+            title='Response Body Partially Scanned',
+            severity=SecurityFinding.SEVERITY_INFO,
+            description=f'Only the first {scanned}{of_total} of the response body were scanned because the scan {limit} was reached. Sensitive data and error messages in the rest of the body were not checked.',
+            recommendation='Raise the security scan size or time limit, or scan a smaller response.',
+            evidence=f'Scanned {scanned}{of_total} ({limit})'
+        )
+    
+    def _check_rule_packs(
+        self,
+        headers: Dict[str, str],
+        body_matches: Dict[str, RuleMatches]
+    ) -> List[SecurityFinding]:
+        """Evaluate the rules of the loaded rule packs."""
+        findings = []
+        
+        for rule in self.pack_rules:
+            if rule.target == TARGET_BODY:
+                found = body_matches.get(rule.pattern_rule_id)
+                if found:
+                    findings.append(self._rule_finding(
+                        rule, found.first.group()[:100], f'Found {found.count} match(es) in the response body.'
+                    ))
+            elif rule.target == TARGET_HEADER:
+                evidence = rule.check_headers(headers)
+                if evidence is not None:
+                    findings.append(self._rule_finding(rule, evidence))
+            elif rule.target == TARGET_COOKIE and 'set-cookie' in headers:
+                evidence = rule.check_cookie(headers['set-cookie'])
+                if evidence is not None:
+                    findings.append(self._rule_finding(rule, evidence))
+        
+        return findings
+    
+    def _rule_finding(self, rule: SecurityRule, evidence: str, detail: Optional[str] = None) -> SecurityFinding:
+        """Create the finding of a rule-pack rule."""
+        return SecurityFinding(
+            check_id=rule.rule_id,
+            title=rule.title,
+            severity=rule.severity,
+            description=f'{rule.description} {detail}' if detail else rule.description,
+            recommendation=rule.recommendation,
+            evidence=evidence,
+            cwe_id=rule.cwe_id,
+            owasp_category=rule.owasp_category
+        )
+    
     def _check_security_headers(
         self,
         url: str,
@@ -289,83 +630,80 @@ class SecurityScanner:
         
         return findings
     
-    def _check_sensitive_data(self, response_body: str) -> List[SecurityFinding]:
+    def _check_sensitive_data(
+        self,
+        response_body: str,
+        matches: Optional[Dict[str, RuleMatches]] = None
+    ) -> List[SecurityFinding]:
         """Check for sensitive data exposure in response."""
         findings = []
         
         if not response_body:
             return findings
         
+        if matches is None:
+            matches = BODY_SCANNER.scan(response_body, ['sensitive_data'])
+        
         # Credit card pattern (simple check for card-like numbers)
-        cc_pattern = r'\b(?:\d[ -]*?){13,19}\b'
-        cc_matches = re.findall(cc_pattern, response_body)
+        cc_matches = matches.get('credit_card')
         if cc_matches:
             findings.append(SecurityFinding(
                 check_id='SEC010',
                 title='Potential Credit Card Number in Response',
                 severity=SecurityFinding.SEVERITY_CRITICAL,
-                description=f'Found {len(cc_matches)} potential credit card number(s) in the response body.',
+                description=f'Found {cc_matches.count} potential credit card number(s) in the response body.',
                 recommendation='Remove sensitive payment information from API responses. Use tokenization or masking.',
-                evidence=cc_matches[0][:20] + '...' if cc_matches else None,
+                evidence=cc_matches.first.group()[:20] + '...',
                 cwe_id='CWE-359',
                 owasp_category='A02:2021 – Cryptographic Failures'
             ))
         
         # Social Security Number pattern (US)
-        ssn_pattern = r'\b\d{3}[-\s]?\d{2}[-\s]?\d{4}\b'
-        ssn_matches = re.findall(ssn_pattern, response_body)
+        ssn_matches = matches.get('ssn')
         if ssn_matches:
             findings.append(SecurityFinding(
                 check_id='SEC011',
                 title='Potential Social Security Number in Response',
                 severity=SecurityFinding.SEVERITY_CRITICAL,
-                description=f'Found {len(ssn_matches)} potential SSN(s) in the response body.',
+                description=f'Found {ssn_matches.count} potential SSN(s) in the response body.',
                 recommendation='Remove PII (Personally Identifiable Information) from API responses.',
-                evidence=ssn_matches[0][:5] + '...' if ssn_matches else None,
+                evidence=ssn_matches.first.group()[:5] + '...',
                 cwe_id='CWE-359',
                 owasp_category='A02:2021 – Cryptographic Failures'
             ))
         
         # API key patterns (common formats)
-        api_key_patterns = [
-            (r'["\']?api[_-]?key["\']?\s*[:=]\s*["\']([a-zA-Z0-9_\-]{20,})["\']', 'API Key'),
-            (r'["\']?secret[_-]?key["\']?\s*[:=]\s*["\']([a-zA-Z0-9_\-]{20,})["\']', 'Secret Key'),
-            (r'Bearer\s+([a-zA-Z0-9_\-\.]{20,})', 'Bearer Token'),
-            (r'["\']?access[_-]?token["\']?\s*[:=]\s*["\']([a-zA-Z0-9_\-]{20,})["\']', 'Access Token'),
-        ]
-        
-        for pattern, key_type in api_key_patterns:
-            matches = re.findall(pattern, response_body, re.IGNORECASE)
-            if matches:
+        for rule_id in API_KEY_RULES:
+            key_matches = matches.get(rule_id)
+            if key_matches:
+                key_type = BODY_SCANNER.rule(rule_id).label
                 findings.append(SecurityFinding(
                     check_id='SEC012',
                     title=f'Potential {key_type} Exposed in Response',
                     severity=SecurityFinding.SEVERITY_HIGH,
                     description=f'Found potential {key_type}(s) in the response body. Exposing API keys can lead to unauthorized access.',
                     recommendation='Never return API keys or secrets in responses. Use secure key management.',
-                    evidence=matches[0][:15] + '...' if matches and isinstance(matches[0], str) else None,
+                    evidence=key_matches.first.group(1)[:15] + '...',
                     cwe_id='CWE-798',
                     owasp_category='A02:2021 – Cryptographic Failures'
                 ))
         
         # Email addresses (might indicate PII leak)
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        email_matches = re.findall(email_pattern, response_body)
-        if len(email_matches) > 5:  # Only flag if many emails found
+        email_matches = matches.get('email')
+        if email_matches and email_matches.count > 5:  # Only flag if many emails found
             findings.append(SecurityFinding(
                 check_id='SEC013',
                 title='Multiple Email Addresses in Response',
                 severity=SecurityFinding.SEVERITY_LOW,
-                description=f'Found {len(email_matches)} email addresses in the response. This may indicate PII exposure.',
+                description=f'Found {email_matches.count} email addresses in the response. This may indicate PII exposure.',
                 recommendation='Verify that email addresses should be exposed. Consider pagination or filtering.',
-                evidence=f'{len(email_matches)} emails found',
+                evidence=f'{email_matches.count} emails found',
                 cwe_id='CWE-359',
                 owasp_category='A02:2021 – Cryptographic Failures'
             ))
         
         # AWS Access Key pattern
-        aws_key_pattern = r'AKIA[0-9A-Z]{16}'
-        aws_matches = re.findall(aws_key_pattern, response_body)
+        aws_matches = matches.get('aws_access_key')
         if aws_matches:
             findings.append(SecurityFinding(
                 check_id='SEC014',
@@ -373,15 +711,15 @@ class SecurityScanner:
                 severity=SecurityFinding.SEVERITY_CRITICAL,
                 description='Found AWS access key in the response body. This can lead to complete AWS account compromise.',
                 recommendation='Immediately rotate the exposed AWS key. Never include credentials in responses.',
-                evidence=aws_matches[0][:10] + '...',
+                evidence=aws_matches.first.group()[:10] + '...',
                 cwe_id='CWE-798',
                 owasp_category='A02:2021 – Cryptographic Failures'
             ))
         
         # Private key patterns
-        private_key_indicators = ['BEGIN RSA PRIVATE KEY', 'BEGIN PRIVATE KEY', 'BEGIN EC PRIVATE KEY']
-        for indicator in private_key_indicators:
-            if indicator in response_body:
+        for rule_id in PRIVATE_KEY_RULES:
+            if rule_id in matches:
+                indicator = BODY_SCANNER.rule(rule_id).label
                 findings.append(SecurityFinding(
                     check_id='SEC015',
                     title='Private Key Exposed in Response',
@@ -395,47 +733,31 @@ class SecurityScanner:
         
         return findings
     
-    def _check_sql_injection_indicators(self, response_body: str) -> List[SecurityFinding]:
+    def _check_sql_injection_indicators(
+        self,
+        response_body: str,
+        matches: Optional[Dict[str, RuleMatches]] = None
+    ) -> List[SecurityFinding]:
         """Check for SQL error messages indicating possible injection vulnerability."""
         findings = []
         
         if not response_body:
             return findings
         
+        if matches is None:
+            matches = BODY_SCANNER.scan(response_body, ['sql_injection_indicators'])
+        
         # Common SQL error patterns
-        sql_error_patterns = [
-            (r'SQL syntax.*?MySQL', 'MySQL'),
-            (r'Warning.*?\Wmysqli?_', 'MySQL'),
-            (r'MySQLSyntaxErrorException', 'MySQL'),
-            (r'valid MySQL result', 'MySQL'),
-            (r'PostgreSQL.*?ERROR', 'PostgreSQL'),
-            (r'Warning.*?\Wpg_', 'PostgreSQL'),
-            (r'valid PostgreSQL result', 'PostgreSQL'),
-            (r'Npgsql\.', 'PostgreSQL'),
-            (r'Driver.*? SQL[\-\_\ ]*Server', 'SQL Server'),
-            (r'OLE DB.*? SQL Server', 'SQL Server'),
-            (r'SQLServer JDBC Driver', 'SQL Server'),
-            (r'\bORA-\d{5}', 'Oracle'),
-            (r'Oracle error', 'Oracle'),
-            (r'Oracle.*?Driver', 'Oracle'),
-            (r'Warning.*?\Woci_', 'Oracle'),
-            (r'SQLite/JDBCDriver', 'SQLite'),
-            (r'SQLite.Exception', 'SQLite'),
-            (r'System.Data.SQLite.SQLiteException', 'SQLite'),
-            (r'sqlite3.OperationalError', 'SQLite'),
-            (r'SQLSTATE\[\d+\]', 'Generic SQL'),
-            (r'syntax error.*?SQL', 'Generic SQL'),
-        ]
-        
-        for pattern, db_type in sql_error_patterns:
-            if re.search(pattern, response_body, re.IGNORECASE):
+        for rule in BODY_SCANNER.rules_for('sql_injection_indicators'):
+            if rule.rule_id in matches:
+                db_type = rule.label
                 findings.append(SecurityFinding(
                     check_id='SEC016',
                     title=f'SQL Error Message Detected ({db_type})',
                     severity=SecurityFinding.SEVERITY_HIGH,
                     description=f'The response contains a {db_type} error message. This may indicate a SQL injection vulnerability and reveals database information.',
                     recommendation='Implement proper input validation, use parameterized queries, and suppress detailed error messages in production.',
-                    evidence=re.search(pattern, response_body, re.IGNORECASE).group()[:100] if re.search(pattern, response_body, re.IGNORECASE) else None,
+                    evidence=matches[rule.rule_id].first.group()[:100],
                     cwe_id='CWE-89',
                     owasp_category='A03:2021 – Injection'
                 ))
@@ -493,31 +815,31 @@ class SecurityScanner:
         
         return findings
     
-    def _check_directory_listing(self, response_body: str, status_code: int) -> List[SecurityFinding]:
+    def _check_directory_listing(
+        self,
+        response_body: str,
+        status_code: int,
+        matches: Optional[Dict[str, RuleMatches]] = None
+    ) -> List[SecurityFinding]:
         """Check for directory listing exposure."""
         findings = []
         
         if not response_body or status_code != 200:
             return findings
         
+        if matches is None:
+            matches = BODY_SCANNER.scan(response_body, ['directory_listing'])
+        
         # Common directory listing indicators
-        directory_patterns = [
-            r'<title>Index of /',
-            r'<h1>Index of /',
-            r'Directory Listing For',
-            r'Parent Directory</a>',
-            r'\[To Parent Directory\]',
-        ]
-        
-        for pattern in directory_patterns:
-            if re.search(pattern, response_body, re.IGNORECASE):
+        for rule in BODY_SCANNER.rules_for('directory_listing'):
+            if rule.rule_id in matches:
                 findings.append(SecurityFinding(
                     check_id='SEC020',
                     title='Directory Listing Enabled',
                     severity=SecurityFinding.SEVERITY_MEDIUM,
                     description='The server is configured to display directory listings, which can reveal sensitive file and directory structure.',
                     recommendation='Disable directory listing on the web server. Add index files or configure proper access controls.',
-                    evidence=re.search(pattern, response_body, re.IGNORECASE).group()[:100] if re.search(pattern, response_body, re.IGNORECASE) else None,
+                    evidence=matches[rule.rule_id].first.group()[:100],
                     cwe_id='CWE-548',
                     owasp_category='A05:2021 – Security Misconfiguration'
                 ))
@@ -525,33 +847,31 @@ class SecurityScanner:
         
         return findings
     
-    def _check_error_disclosure(self, response_body: str, status_code: int) -> List[SecurityFinding]:
+    def _check_error_disclosure(
+        self,
+        response_body: str,
+        status_code: int,
+        matches: Optional[Dict[str, RuleMatches]] = None
+    ) -> List[SecurityFinding]:
         """Check for detailed error message disclosure."""
         findings = []
         
         if not response_body:
             return findings
         
+        if matches is None:
+            matches = BODY_SCANNER.scan(response_body, ['error_disclosure'])
+        
         # Stack trace patterns
-        stack_trace_patterns = [
-            (r'at\s+[\w\.]+\([\w\.\:]+:\d+\)', 'Stack Trace'),
-            (r'Traceback \(most recent call last\)', 'Python Stack Trace'),
-            (r'Exception in thread', 'Java Stack Trace'),
-            (r'\.php on line \d+', 'PHP Error'),
-            (r'Warning: .+ in .+\.php', 'PHP Warning'),
-            (r'Fatal error:', 'PHP Fatal Error'),
-            (r'System\..*?Exception', '.NET Exception'),
-        ]
-        
-        for pattern, error_type in stack_trace_patterns:
-            if re.search(pattern, response_body, re.IGNORECASE):
+        for rule in BODY_SCANNER.rules_for('error_disclosure'):
+            if rule.rule_id in matches:
                 findings.append(SecurityFinding(
                     check_id='SEC021',
-                    title=f'Verbose Error Messages ({error_type})',
+                    title=f'Verbose Error Messages ({rule.label})',
                     severity=SecurityFinding.SEVERITY_MEDIUM,
                     description='The response contains detailed error messages or stack traces that reveal internal implementation details.',
                     recommendation='Configure the application to display generic error messages in production. Log detailed errors server-side.',
-                    evidence=re.search(pattern, response_body, re.IGNORECASE).group()[:150] if re.search(pattern, response_body, re.IGNORECASE) else None,
+                    evidence=matches[rule.rule_id].first.group()[:150],
                     cwe_id='CWE-209',
                     owasp_category='A05:2021 – Security Misconfiguration'
                 ))
@@ -657,3 +977,12 @@ class SecurityScanner:
             stats[finding.severity] = stats.get(finding.severity, 0) + 1
         
         return stats
+
+
+def _format_size(size: int) -> str:
+    """Format a size in bytes for display."""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size < 1024.0:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024.0
+    return f"{size:.1f} TB"
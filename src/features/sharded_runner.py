@@ -0,0 +1,213 @@
+"""
+Sharded Collection Runner
+
+Runs a collection on a pool of worker processes, for runs whose scripts make
+them CPU bound: pre-request and post-response scripts run in JavaScript
+contexts driven from Python, and worker threads of one process serialize on
+the GIL however many CPUs there are.
+
+The run is split into shards, each run by a CollectionRunner in a worker
+process with its own API client and script engines:
+
+- Iterations are split into consecutive ranges, one per process; each range
+  reads its own rows of the data file.
+- When there are fewer iterations than processes, the requests of an
+  iteration are also split, into groups of requests that share no variables
+  (see request_graph.components()); requests that depend on each other stay
+  in the same shard.
+
+The collection is loaded once by the caller and sent to the workers as plain
+dictionaries, so workers don't open the database. Their results are merged
+into a single summary, in the same order as CollectionRunner.run().
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from queue import Empty
+from typing import Dict, List, Optional, Tuple
+
+from src.features import request_graph
+from src.features.collection_runner import CollectionRunner, merge_changes
+
+# (first iteration, number of iterations, indexes of the shard's requests)
+Shard = Tuple[int, int, List[int]]
+
+# Seconds between checks for progress events of the workers
+EVENT_POLL_INTERVAL = 0.1
+
+EVENT_STARTED = "started"
+EVENT_COMPLETED = "completed"
+
+
+def plan_shards(iterations: int, dependencies: List[set], processes: int) -> List[Shard]:
+    """
+    Split a run into at most `processes` shards of about equal size.
+
+    Args:
+        iterations: Number of iterations of the run
+        dependencies: Dependencies of the requests of an iteration (see
+            request_graph.build_dependencies())
+        processes: Number of worker processes
+    """
+    ranges = min(iterations, processes)
+    groups = [list(range(len(dependencies)))]
+    if ranges < processes:
+        # Fill the processes left by splitting independent requests, largest
+        # groups first into the emptiest shard
+        count = processes // ranges
+        groups = [[] for _ in range(count)]
+        for component in sorted(request_graph.components(dependencies), key=len, reverse=True):
+            min(groups, key=len).extend(component)
+        groups = [sorted(group) for group in groups if group]
+
+    shards = []
+    for shard in range(ranges):
+        first = iterations * shard // ranges
+        last = iterations * (shard + 1) // ranges
+        shards.extend((first, last - first, group) for group in groups)
+    return shards
+
+
+def _run_shard(options: Dict, client: Dict, requests: List[Dict], first_iteration: int, iterations: int,
+               events, stop_event, report_progress: bool, report_requests: bool) -> Dict:
+    """Run one shard in a worker process and return its summary."""
+    from src.core.api_client import ApiClient
+
+    api_client = ApiClient(**client)
+    runner = CollectionRunner(api_client, first_iteration=first_iteration, iterations=iterations, **options)
+
+    def on_started(current: int, total: int, message: str):
+        if stop_event.is_set():
+            runner.stop()
+        elif report_progress:
+            events.put((EVENT_STARTED, message))
+
+    runner.progress_callback = on_started
+    if report_requests:
+        runner.request_callback = lambda entry: events.put((EVENT_COMPLETED, entry))
+    try:
+        return runner.run(requests)
+    finally:
+        api_client.close()
+
+
+class ShardedCollectionRunner(CollectionRunner):
+    """
+    CollectionRunner that splits the run across worker processes.
+
+    Takes the options of CollectionRunner plus the number of processes;
+    `concurrency` is the number of threads of each process. Callbacks are
+    called from the thread calling run(). Checkpoints are not supported.
+    """
+
+    def __init__(self, api_client, processes: Optional[int] = None, **kwargs):
+        """
+        Initialize the runner.
+
+        Args:
+            api_client: ApiClient whose settings (timeout, SSL verification)
+                the workers' clients use; it sends the requests itself when
+                the run isn't split
+            processes: Number of worker processes (default: one per CPU)
+            **kwargs: Options of CollectionRunner
+        """
+        if kwargs.get('checkpoint'):
+            raise ValueError("Sharded runs can't be checkpointed")
+        super().__init__(api_client, **kwargs)
+        self.processes = max(1, processes or multiprocessing.cpu_count())
+        self._stop_event = None
+
+    def stop(self):
+        """Request to stop; requests already sent are completed."""
+        super().stop()
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    def run(self, requests: List[Dict]) -> Dict:
+        """
+        Run requests like CollectionRunner.run(), on worker processes.
+
+        Runs in-process when the run can't be split, or worker processes
+        can't be started.
+        """
+        runnable = [request for request in requests if self._is_runnable(request)]
+        iterations = self._iteration_count()
+        dependencies = request_graph.build_dependencies(runnable, self.run_scripts, self.serial)
+        shards = plan_shards(iterations, dependencies, self.processes) if runnable else []
+        if len(shards) < 2:
+            return super().run(requests)
+
+        try:
+            summaries = self._run_shards(runnable, shards, iterations)
+        except (BrokenProcessPool, OSError) as e:
+            print(f"[Runner] Worker processes unavailable, running in-process: {e}")
+            return super().run(requests)
+
+        # Same order as an in-process run: by iteration, then collection order
+        positions = {request['id']: index for index, request in enumerate(runnable)}
+        results = [entry for summary in summaries for entry in summary['results']]
+        results.sort(key=lambda entry: (entry['iteration'], positions[entry['request_id']]))
+        summary = self._summarize(results, iterations)
+        # Shards are planned by iteration, so their changes apply in that order
+        summary['variable_changes'] = merge_changes(shard['variable_changes'] for shard in summaries)
+        return summary
+
+    def _run_shards(self, runnable: List[Dict], shards: List[Shard], iterations: int) -> List[Dict]:
+        """Run the shards on a process pool; returns their summaries, in shard order."""
+        options = {
+            'environment': self.environment,
+            'collection_variables': self.collection_variables,
+            'extracted_variables': self.extracted_variables,
+            'run_scripts': self.run_scripts,
+            'script_timeout_ms': self.script_timeout_ms,
+            'concurrency': self.concurrency,
+            'data_file': self.data_file,
+            'data_format': self.data_format,
+            'keep_responses': self.keep_responses,
+            'serial': self.serial
+        }
+        client = {'timeout': self.api_client.timeout, 'verify_ssl': self.api_client.verify_ssl}
+        self._started = 0
+        self._total = len(runnable) * iterations
+        summaries: List[Optional[Dict]] = [None] * len(shards)
+
+        # Fresh interpreters rather than fork(), as in security_batch: the
+        # caller may be a thread of the GUI process
+        context = multiprocessing.get_context('spawn')
+        with context.Manager() as manager:
+            events = manager.Queue()
+            self._stop_event = manager.Event()
+            if self._stop_requested:
+                self._stop_event.set()
+            try:
+                with ProcessPoolExecutor(max_workers=min(self.processes, len(shards)), mp_context=context) as pool:
+                    positions = {
+                        pool.submit(_run_shard, options, client, [runnable[index] for index in indexes],
+                                    first, count, events, self._stop_event,
+                                    self.progress_callback is not None, self.request_callback is not None): position
+                        for position, (first, count, indexes) in enumerate(shards)
+                    }
+                    pending = set(positions)
+                    while pending:
+                        done, pending = wait(pending, timeout=EVENT_POLL_INTERVAL)
+                        self._dispatch_events(events)
+                        for future in done:
+                            summaries[positions[future]] = future.result()
+                self._dispatch_events(events)
+            finally:
+                self._stop_event = None
+        return summaries
+
+    def _dispatch_events(self, events):
+        """Call the callbacks for the progress events sent by the workers."""
+        while True:
+            try:
+                kind, data = events.get_nowait()
+            except Empty:
+                return
+            if kind == EVENT_STARTED:
+                self._started += 1
+                self.progress_callback(self._started, self._total, data)
+            else:
+                self.request_callback(data)
@@ -0,0 +1,249 @@
+"""
+Split Collection Layout Module
+
+Stores a collection as a directory instead of one monolithic JSON file:
+
+    <Collection>/
+        collection.json      Index: name, order_index, variables and the
+                             ordered lists of folder and request files
+        folders/<name>.json  One file per folder
+        requests/<name>.json One file per request (with its tests)
+
+Editing one request then rewrites, re-hashes and re-parses a single small
+file and produces a focused git diff. The layout maps 1:1 onto the internal
+export format of CollectionExporter, so both layouts import the same way.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.features.sync_manifest import content_hash
+
+
+INDEX_FILE = "collection.json"
+FOLDERS_DIR = "folders"
+REQUESTS_DIR = "requests"
+LAYOUT_SINGLE = "single"
+LAYOUT_SPLIT = "split"
+
+INVALID_FILENAME_CHARS = '<>:"/\\|?*'
+
+
+def is_split_collection(path) -> bool:
+    """Check whether a path is a split collection directory."""
+    return os.path.isfile(os.path.join(str(path), INDEX_FILE))
+
+
+def _file_stem(name: str, used: set) -> str:
+    """Make a safe file name stem, unique (case-insensitively) within `used`."""
+    stem = name or "untitled"
+    for char in INVALID_FILENAME_CHARS:
+        stem = stem.replace(char, '_')
+    stem = stem.strip(' .')[:100] or "untitled"
+
+    candidate = stem
+    counter = 2
+    while candidate.lower() in used:
+        candidate = f"{stem} ({counter})"
+        counter += 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def split_collection(export_data: Dict) -> Dict[str, Dict]:
+    """
+    Split an internal-format collection export into per-file documents.
+
+    File names are derived from folder paths and request names; duplicates
+    are numbered in export order, so unchanged items keep their file.
+
+    Args:
+        export_data: Export from CollectionExporter.export_collection()
+
+    Returns:
+        Dictionary mapping relative file path ('/' separated) to its content
+    """
+    collection = export_data['collection']
+    parts = {}
+
+    used = set()
+    folder_files = []
+    for folder in collection.get('folders', []):
+        path = folder.get('full_path') or [folder['name']]
+        filename = _file_stem(" - ".join(path), used) + ".json"
+        folder_files.append(filename)
+        parts[f"{FOLDERS_DIR}/{filename}"] = folder
+
+    used = set()
+    request_files = []
+    for request in collection.get('requests', []):
+        filename = _file_stem(request['name'], used) + ".json"
+        request_files.append(filename)
+        parts[f"{REQUESTS_DIR}/{filename}"] = request
+
+    parts[INDEX_FILE] = {
+        "export_version": export_data.get('export_version'),
+        "layout": LAYOUT_SPLIT,
+        "collection": {
+            "name": collection['name'],
+            "order_index": collection.get('order_index'),
+            "variables": collection.get('variables', []),
+            "folders": folder_files,
+            "requests": request_files
+        }
+    }
+    return parts
+
+
+def part_hashes(parts: Dict[str, Dict]) -> Dict[str, str]:
+    """Hash each part of a split collection."""
+    return {rel_path: content_hash(data) for rel_path, data in parts.items()}
+
+
+def list_files(directory) -> Dict[str, os.stat_result]:
+    """
+    Stat the files of a split collection directory (nothing is read).
+
+    Returns:
+        Dictionary mapping relative file path to its os.stat() result
+    """
+    directory = str(directory)
+    stats = {}
+    try:
+        stats[INDEX_FILE] = os.stat(os.path.join(directory, INDEX_FILE))
+    except OSError:
+        return stats
+    for sub_dir in (FOLDERS_DIR, REQUESTS_DIR):
+        try:
+            with os.scandir(os.path.join(directory, sub_dir)) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        stats[f"{sub_dir}/{entry.name}"] = entry.stat()
+        except OSError:
+            continue
+    return stats
+
+
+def read_file(directory, rel_path: str) -> Dict:
+    """Read one file of a split collection."""
+    with open(os.path.join(str(directory), *rel_path.split('/')), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def read_split_collection(directory) -> Dict:
+    """
+    Read a split collection directory back into the internal export format.
+
+    Args:
+        directory: Split collection directory
+
+    Returns:
+        Export dictionary accepted by CollectionImporter.import_collection()
+
+    Raises:
+        OSError, ValueError, KeyError: If the index or a listed file is
+        missing or invalid
+    """
+    index = read_file(directory, INDEX_FILE)
+    collection = index['collection']
+    return {
+        "export_version": index.get('export_version'),
+        "collection": {
+            "name": collection['name'],
+            "order_index": collection.get('order_index'),
+            "folders": [read_file(directory, f"{FOLDERS_DIR}/{name}") for name in collection.get('folders', [])],
+            "variables": collection.get('variables', []),
+            "requests": [read_file(directory, f"{REQUESTS_DIR}/{name}") for name in collection.get('requests', [])]
+        }
+    }
+
+
+def write_split_collection(parts: Dict[str, Dict], directory,
+                           known_hashes: Optional[Dict[str, str]] = None) -> Tuple[int, int]:
+    """
+    Write a split collection, touching only files whose content changed and
+    removing files that are no longer part of it.
+
+    Args:
+        parts: Output of split_collection()
+        directory: Target directory (created if needed)
+        known_hashes: Hashes of the files currently on disk, if known (e.g.
+            from the sync manifest); files not listed are compared by content
+
+    Returns:
+        Tuple of (files_written, files_removed)
+    """
+    directory = Path(directory)
+    for sub_dir in (FOLDERS_DIR, REQUESTS_DIR):
+        (directory / sub_dir).mkdir(parents=True, exist_ok=True)
+
+    existing = list_files(directory)
+    known_hashes = known_hashes or {}
+    written = 0
+
+    for rel_path, data in parts.items():
+        file_path = directory.joinpath(*rel_path.split('/'))
+        if rel_path in existing:
+            if rel_path in known_hashes:
+                unchanged = known_hashes[rel_path] == content_hash(data)
+            else:
+                try:
+                    unchanged = content_hash(read_file(directory, rel_path)) == content_hash(data)
+                except (OSError, ValueError):
+                    unchanged = False
+            if unchanged:
+                continue
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        written += 1
+
+    removed = 0
+    for rel_path in existing:
+        if rel_path not in parts:
+            try:
+                directory.joinpath(*rel_path.split('/')).unlink()
+                removed += 1
+            except OSError:
+                pass
+
+    return written, removed
+
+
+def remove_split_collection(directory) -> bool:
+    """
+    Remove a split collection directory. Returns True if it existed.
+
+    Directories without an index file are not split collections and are
+    left alone.
+    """
+    if not is_split_collection(directory):
+        return False
+    shutil.rmtree(str(directory))
+    return True
+
+
+def find_collections(collections_path) -> List[Path]:
+    """
+    List the collections stored in a workspace directory, in either layout.
+
+    Returns:
+        Paths of monolithic *.json files and split collection directories
+    """
+    collections_path = Path(collections_path)
+    if not collections_path.exists():
+        return []
+    found = []
+    for path in sorted(collections_path.iterdir()):
+        if path.is_file() and path.suffix == ".json":
+            found.append(path)
+        elif path.is_dir() and is_split_collection(path):
+            found.append(path)
+    return found
+
+
+def stat_signature(stats: Dict[str, os.stat_result]) -> Dict[str, List[int]]:
+    """Reduce file stats to the [mtime_ns, size] pairs stored in the sync manifest."""
+    return {rel_path: [stat.st_mtime_ns, stat.st_size] for rel_path, stat in stats.items()}
@@ -0,0 +1,236 @@
+"""
+Git Sync Manifest Module
+
+Persists what Git sync last saw of each workspace file (mtime, size and
+content hash) together with the database revision it was compared against.
+Change detection uses it to skip unchanged files and collections in O(1)
+instead of re-parsing every file and re-exporting every collection.
+
+The manifest is machine-local (it refers to local database ids and
+revisions), so it is stored in the app settings table rather than in the
+workspace.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.core.database import DatabaseManager
+
+
+def content_hash(data: Any) -> str:
+    """Hash JSON-serializable data independently of key order."""
+    json_str = json.dumps(data, sort_keys=True)
+    return hashlib.sha256(json_str.encode()).hexdigest()
+
+
+class SyncManifest:
+    """
+    Per-workspace record of file state and DB comparison results.
+
+    Entries are grouped by kind ('collections', 'environments') and keyed by
+    file name (or directory name for split collections). Each entry holds:
+        mtime_ns, size: File stat when it was last parsed
+        files:          Split collections: {relative path: [mtime_ns, size]}
+        file_hashes:    Split collections: {relative path: content_hash()}
+        name:           Item name read from the file
+        hash:           content_hash() of the item data in the file (of
+                        file_hashes for split collections)
+        db_id, db_revision, in_sync: Result of the last file/DB comparison
+        exported_hash:  hash of the content last exported to the file
+
+    Every entry is validated against the current file stat and DB revision
+    before use, so a stale manifest only costs a re-check, never a wrong
+    result.
+    """
+
+    SETTING_PREFIX = "git_sync_manifest:"
+
+    def __init__(self, db: DatabaseManager, project_path: str):
+        """
+        Initialize the manifest.
+
+        Args:
+            db: DatabaseManager used for persistence
+            project_path: Workspace root (manifests are stored per workspace)
+        """
+        self.db = db
+        self.setting_key = self.SETTING_PREFIX + str(project_path)
+        self.entries: Dict[str, Dict[str, Dict]] = {}
+        self._dirty = False
+        self._loaded = '{}'  # Stored manifest the entries were loaded from
+
+    def load(self):
+        """Load the persisted manifest (a missing or corrupt manifest is treated as empty)."""
+        self._loaded = self.db.get_setting(self.setting_key, '{}')
+        try:
+            self.entries = json.loads(self._loaded)
+        except (TypeError, ValueError):
+            self.entries = {}
+        self._dirty = False
+
+    def save(self):
+        """Persist the manifest if it changed since it was loaded."""
+        if self._dirty:
+            self.db.set_setting(self.setting_key, json.dumps(self.entries))
+            self._dirty = False
+
+    def pending_update(self) -> Optional[Tuple[str, str]]:
+        """
+        Get the changes of a manifest that can't save itself (read-only
+        connection), for save_update() of a manifest on another connection.
+
+        Returns:
+            (stored manifest it was loaded from, manifest to store), or None
+            if it didn't change
+        """
+        if not self._dirty:
+            return None
+        return self._loaded, json.dumps(self.entries)
+
+    def save_update(self, update: Tuple[str, str]) -> bool:
+        """
+        Store a pending_update() of another connection, unless the stored
+        manifest changed since that manifest was loaded (e.g. by an export),
+        in which case the update is dropped as stale.
+
+        Returns:
+            True if the update was stored
+        """
+        loaded, data = update
+        if self.db.get_setting(self.setting_key, '{}') != loaded:
+            return False
+        self.db.set_setting(self.setting_key, data)
+        return True
+
+    def get_entry(self, kind: str, filename: str, stat: os.stat_result) -> Optional[Dict]:
+        """
+        Get a file's entry if the file is unchanged since it was recorded.
+
+        Args:
+            kind: 'collections' or 'environments'
+            filename: File name within the kind's directory
+            stat: Current os.stat() result of the file
+
+        Returns:
+            The entry, or None if the file is unknown or changed
+        """
+        entry = self.entries.get(kind, {}).get(filename)
+        if entry and entry.get('mtime_ns') == stat.st_mtime_ns and entry.get('size') == stat.st_size:
+            return entry
+        return None
+
+    def recorded_entry(self, kind: str, filename: str) -> Optional[Dict]:
+        """
+        Get a file's entry without checking the file, for callers that know
+        it is unchanged (e.g. from file system events).
+
+        Returns:
+            The entry, or None if the file is unknown
+        """
+        return self.entries.get(kind, {}).get(filename)
+
+    def record_file(self, kind: str, filename: str, stat: os.stat_result,
+                    name: str, data_hash: str) -> Dict:
+        """
+        Record a freshly parsed file. Keeps the last comparison result only
+        if the file content is unchanged.
+
+        Returns:
+            The new entry
+        """
+        entry = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'name': name, 'hash': data_hash}
+        return self._record(kind, filename, entry)
+
+    def get_dir_entry(self, kind: str, dirname: str, files: Dict[str, List[int]]) -> Optional[Dict]:
+        """
+        Get a split collection's entry if none of its files changed since it
+        was recorded.
+
+        Args:
+            kind: 'collections'
+            dirname: Directory name within the kind's directory
+            files: Current {relative path: [mtime_ns, size]} of its files
+
+        Returns:
+            The entry, or None if the directory is unknown or changed
+        """
+        entry = self.entries.get(kind, {}).get(dirname)
+        if entry and entry.get('files') == files:
+            return entry
+        return None
+
+    def cached_file_hashes(self, kind: str, dirname: str, files: Dict[str, List[int]]) -> Dict[str, str]:
+        """
+        Get the recorded hashes of a split collection's files that are
+        unchanged, so only modified files need to be read.
+
+        Returns:
+            {relative path: hash} for files whose stat still matches
+        """
+        entry = self.entries.get(kind, {}).get(dirname) or {}
+        recorded = entry.get('files', {})
+        hashes = entry.get('file_hashes', {})
+        return {
+            rel_path: hashes[rel_path]
+            for rel_path, stat in files.items()
+            if rel_path in hashes and recorded.get(rel_path) == stat
+        }
+
+    def record_dir(self, kind: str, dirname: str, files: Dict[str, List[int]],
+                   name: str, file_hashes: Dict[str, str]) -> Dict:
+        """
+        Record a freshly scanned split collection directory.
+
+        Returns:
+            The new entry
+        """
+        entry = {'files': files, 'file_hashes': file_hashes, 'name': name, 'hash': content_hash(file_hashes)}
+        return self._record(kind, dirname, entry)
+
+    def _record(self, kind: str, key: str, entry: Dict) -> Dict:
+        """Store a new entry, carrying over what is still valid from the previous one."""
+        previous = self.entries.get(kind, {}).get(key) or {}
+        if previous.get('hash') == entry['hash'] and 'in_sync' in previous:
+            entry.update({field: previous[field] for field in ('db_id', 'db_revision', 'in_sync')})
+        if 'exported_hash' in previous:
+            entry['exported_hash'] = previous['exported_hash']
+        self.entries.setdefault(kind, {})[key] = entry
+        self._dirty = True
+        return entry
+
+    @staticmethod
+    def cached_comparison(entry: Dict, db_id: int, db_revision: int) -> Optional[bool]:
+        """
+        Get the last comparison result if neither side changed since.
+
+        Returns:
+            True/False for in sync/modified, or None if a re-check is needed
+        """
+        if entry.get('db_id') == db_id and entry.get('db_revision') == db_revision:
+            return entry.get('in_sync')
+        return None
+
+    def record_comparison(self, entry: Dict, db_id: int, db_revision: int, in_sync: bool):
+        """Store the result of comparing a file with its DB item."""
+        entry.update({'db_id': db_id, 'db_revision': db_revision, 'in_sync': in_sync})
+        self._dirty = True
+
+    def record_export(self, entry: Dict):
+        """Mark the entry's current content as written by an export."""
+        entry['exported_hash'] = entry['hash']
+        self._dirty = True
+
+    @staticmethod
+    def changed_since_export(entry: Dict) -> bool:
+        """Check whether the file content differs from what was last exported to it."""
+        return entry.get('exported_hash') != entry.get('hash')
+
+    def prune(self, kind: str, filenames: Iterable[str]):
+        """Drop entries for files that no longer exist."""
+        existing = set(filenames)
+        entries = self.entries.get(kind, {})
+        for filename in [f for f in entries if f not in existing]:
+            del entries[filename]
+            self._dirty = True
@@ -0,0 +1,223 @@
+"""
+Tab Hibernation Module
+
+Offloads large response payloads of background request tabs to temporary
+files so that many open tabs do not keep every response body in memory.
+Hibernated payloads are rehydrated transparently when a tab is activated.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+
+# Keys of a tab's captured UI state that hold response-side payloads
+HIBERNATED_KEYS = ('response', 'test_results')
+
+
+class TabHibernator:
+    """
+    Hibernation policy for request tabs.
+
+    A tab is hibernated when it has not been viewed for ``idle_seconds``, or
+    when more than ``max_awake`` background tabs hold payloads in memory
+    (least recently viewed tabs go first). Only the keys in HIBERNATED_KEYS
+    are offloaded; a small stub with status, size and timing stays in memory
+    so the tab can still be inspected without touching the disk.
+
+    Tab states are the dicts stored in ``MainWindow.tab_states``; the view
+    timestamp is kept in the state itself (``last_viewed``) so it survives
+    tab re-indexing.
+    """
+
+    STUB_FIELDS = ('status_code', 'size', 'elapsed_time')
+
+    def __init__(self, idle_seconds: float = 600, max_awake: int = 10,
+                 min_payload_bytes: int = 64 * 1024, temp_dir: Optional[str] = None):
+        """
+        Initialize the hibernator.
+
+        Args:
+            idle_seconds: Hibernate tabs not viewed for this long (0 disables)
+            max_awake: Maximum background tabs kept in memory (LRU budget)
+            min_payload_bytes: Payloads smaller than this are not worth offloading
+            temp_dir: Directory for offloaded payloads (created lazily if None)
+        """
+        self.idle_seconds = idle_seconds
+        self.max_awake = max_awake
+        self.min_payload_bytes = min_payload_bytes
+        self._temp_dir = temp_dir
+        self._owns_temp_dir = temp_dir is None
+
+    @property
+    def temp_dir(self) -> str:
+        """Directory holding offloaded payloads."""
+        if self._temp_dir is None:
+            self._temp_dir = tempfile.mkdtemp(prefix='postmini_tabs_')
+        return self._temp_dir
+
+    @staticmethod
+    def touch(tab_state: Dict):
+        """Mark a tab as viewed now."""
+        tab_state['last_viewed'] = time.monotonic()
+
+    @staticmethod
+    def is_hibernated(tab_state: Dict) -> bool:
+        """Check whether a tab's payloads are currently offloaded."""
+        return bool(tab_state.get('hibernated_path'))
+
+    @staticmethod
+    def _payload_size(ui_state: Dict) -> int:
+        """Approximate in-memory size of the offloadable payloads."""
+        size = 0
+        response = ui_state.get('response')
+        if response:
+            size += len(response.get('text') or '')
+            size += sum(len(str(k)) + len(str(v)) for k, v in (response.get('headers') or {}).items())
+        if ui_state.get('test_results'):
+            size += len(str(ui_state['test_results']))
+        return size
+
+    def hibernate(self, tab_state: Dict) -> bool:
+        """
+        Offload a tab's response payloads to disk.
+
+        Args:
+            tab_state: Tab state dict (with 'ui_state' captured)
+
+        Returns:
+            True if the payloads were offloaded, False otherwise
+        """
+        ui_state = tab_state.get('ui_state')
+        if not ui_state or self.is_hibernated(tab_state):
+            return False
+        if self._payload_size(ui_state) < self.min_payload_bytes:
+            return False
+
+        payload = {key: ui_state.get(key) for key in HIBERNATED_KEYS}
+        fd, path = tempfile.mkstemp(suffix='.json', dir=self.temp_dir)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, default=str)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"[WARNING] Could not hibernate tab: {e}")
+            self._remove_file(path)
+            return False
+
+        # Keep a small stub so status/size stay available without rehydrating
+        response = ui_state.get('response')
+        if response:
+            ui_state['response'] = {field: response.get(field) for field in self.STUB_FIELDS}
+            ui_state['response']['hibernated'] = True
+        ui_state['test_results'] = None
+        tab_state['hibernated_path'] = path
+        return True
+
+    def rehydrate(self, tab_state: Dict) -> bool:
+        """
+        Load a tab's offloaded payloads back into memory.
+
+        Args:
+            tab_state: Tab state dict
+
+        Returns:
+            True if the payloads were restored, False if nothing to do or failed
+        """
+        path = tab_state.pop('hibernated_path', None)
+        if not path:
+            return False
+
+        ui_state = tab_state.get('ui_state') or {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as e:
+            # The stub is still consistent; the tab just loses its old response
+            print(f"[WARNING] Could not rehydrate tab: {e}")
+            ui_state['response'] = None
+            return False
+        finally:
+            self._remove_file(path)
+
+        for key in HIBERNATED_KEYS:
+            ui_state[key] = payload.get(key)
+        return True
+
+    def discard(self, tab_state: Dict):
+        """Drop a tab's offloaded payloads (e.g. when the tab is closed)."""
+        path = tab_state.pop('hibernated_path', None)
+        if path:
+            self._remove_file(path)
+
+    def select_for_hibernation(self, tab_states: Dict[int, Dict], active_index: int) -> List[int]:
+        """
+        Pick background tabs that should be hibernated.
+
+        Args:
+            tab_states: Mapping of tab index to tab state
+            active_index: Index of the tab currently shown (never hibernated)
+
+        Returns:
+            List of tab indices to hibernate
+        """
+        now = time.monotonic()
+        awake = [
+            (state.get('last_viewed', 0), index)
+            for index, state in tab_states.items()
+            if index != active_index and state.get('ui_state') and not self.is_hibernated(state)
+        ]
+        awake.sort(reverse=True)  # Most recently viewed first
+
+        selected = []
+        for position, (last_viewed, index) in enumerate(awake):
+            over_budget = position >= self.max_awake
+            idle = self.idle_seconds and now - last_viewed >= self.idle_seconds
+            if over_budget or idle:
+                selected.append(index)
+        return selected
+
+    def hibernate_idle(self, tab_states: Dict[int, Dict], active_index: int) -> int:
+        """
+        Apply the hibernation policy to all tabs.
+
+        Also removes offloaded files no longer referenced by any open tab.
+
+        Args:
+            tab_states: Mapping of tab index to tab state
+            active_index: Index of the tab currently shown
+
+        Returns:
+            Number of tabs hibernated
+        """
+        count = 0
+        for index in self.select_for_hibernation(tab_states, active_index):
+            if self.hibernate(tab_states[index]):
+                count += 1
+        self._collect_garbage(tab_states)
+        return count
+
+    def _collect_garbage(self, tab_states: Dict[int, Dict]):
+        """Remove offloaded files whose tabs were closed."""
+        if self._temp_dir is None or not os.path.isdir(self._temp_dir):
+            return
+        live = {os.path.basename(state['hibernated_path'])
+                for state in tab_states.values() if state.get('hibernated_path')}
+        for name in os.listdir(self._temp_dir):
+            if name not in live:
+                self._remove_file(os.path.join(self._temp_dir, name))
+
+    def cleanup(self):
+        """Remove all offloaded payloads (call on application exit)."""
+        if self._temp_dir and self._owns_temp_dir:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            self._temp_dir = None
+
+    @staticmethod
+    def _remove_file(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
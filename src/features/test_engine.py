@@ -6,8 +6,14 @@ This module evaluates test assertions against API responses.
 
 import json
 import re
-from typing import Dict, List, Optional, Any, Tuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple, Pattern
 from src.core.api_client import ApiResponse
+from src.features.json_path import JSONPathError, compile_path
+from src.features.schema_validator import SchemaError, get_validator
+
+# Number of compiled assertion plans kept in memory
+PLAN_CACHE_SIZE = 256
 
 
 class TestAssertion:
@@ -47,6 +53,11 @@ class TestAssertion:
         self.expected_value = expected_value
         self.enabled = enabled
     
+    @property
+    def revision(self) -> Tuple:
+        """Everything that affects evaluation; compiled plans are cached by it."""
+        return (self.id, self.type, self.operator, self.field, self.expected_value, self.enabled)
+    
     def __repr__(self):
         return f"TestAssertion({self.type}, {self.operator}, {self.field}, {self.expected_value})"
 
@@ -67,9 +78,156 @@ class TestResult:
         return f"TestResult({status}, {self.assertion.type})"
 
 
+class ResponseBody:
+    """
+    Response body shared by all assertions evaluated against one response.
+    
+    The text is read once and parsed as JSON at most once, on first use.
+    """
+    
+    INVALID_JSON = object()
+    _UNPARSED = object()
+    
+    def __init__(self, response: ApiResponse):
+        """Initialize from an API response."""
+        self.text = response.text
+        self._data = ResponseBody._UNPARSED
+    
+    @property
+    def data(self) -> Any:
+        """Parsed JSON body, or INVALID_JSON if the body is not valid JSON."""
+        if self._data is ResponseBody._UNPARSED:
+            try:
+                self._data = json.loads(self.text)
+            except json.JSONDecodeError:
+                self._data = ResponseBody.INVALID_JSON
+        return self._data
+
+
+class CompiledAssertion:
+    """
+    An assertion with everything that does not depend on the response
+    resolved up front: the check to run, the typed expected value, the
+    compiled JSON path, the compiled schema validator and the regex for
+    matches_regex.
+    
+    Errors found while compiling are kept and reported when the assertion
+    is evaluated, with the same messages as before.
+    """
+    
+    def __init__(self, revision: Tuple):
+        """Compile an assertion from its revision (see TestAssertion.revision)."""
+        _, self.type, self.operator, self.field, self.expected_value, self.enabled = revision
+        self.check = TestEngine.CHECKS.get(self.type)
+        self.expected = self.expected_value
+        self.typed_expected = None  # JSON path: expected value per type of actual value
+        self.regex = None
+        self.path = None
+        self.schema = None
+        self.error = None  # Reported as "Error evaluating assertion: ..."
+        self.path_error = None
+        self.schema_error = None
+        
+        try:
+            self._compile()
+        except Exception as e:
+            self.error = f"Error evaluating assertion: {str(e)}"
+    
+    def _compile(self):
+        """Pre-parse the expected value, path and schema for the assertion type."""
+        if self.type in (TestAssertion.TYPE_STATUS_CODE, TestAssertion.TYPE_RESPONSE_SIZE):
+            self.expected = int(self.expected_value) if self.expected_value else None
+        elif self.type == TestAssertion.TYPE_RESPONSE_TIME:
+            self.expected = float(self.expected_value) if self.expected_value else None
+        elif self.type == TestAssertion.TYPE_JSON_PATH:
+            self._compile_json_path()
+        elif self.type == TestAssertion.TYPE_JSON_SCHEMA and self.expected_value:
+            try:
+                self.schema = get_validator(json.loads(self.expected_value))
+            except json.JSONDecodeError:
+                self.schema_error = "Invalid JSON schema"
+            except SchemaError as e:
+                self.schema_error = f"Invalid JSON schema: {str(e)}"
+            except Exception as e:
+                self.schema_error = f"Schema validation error: {str(e)}"
+        
+        if self.operator == TestAssertion.OP_MATCHES_REGEX:
+            self.regex = TestEngine._compile_regex(str(self.expected))
+    
+    def _compile_json_path(self):
+        """Compile the JSON path and convert the expected value to each JSON type."""
+        if self.field:
+            try:
+                self.path = compile_path(self.field)
+            except JSONPathError as e:
+                self.path_error = f"Failed to extract path '{self.field}': {str(e)}"
+        
+        expected = self.expected_value
+        if expected:
+            self.typed_expected = {}
+            for kind, convert in ((bool, lambda value: value.lower() == 'true'), (int, int), (float, float)):
+                try:
+                    self.typed_expected[kind] = convert(expected)
+                except (ValueError, AttributeError):
+                    self.typed_expected[kind] = expected
+    
+    def evaluate(self, assertion: TestAssertion, response: ApiResponse, body: ResponseBody) -> TestResult:
+        """Evaluate against a response; body is shared with the other assertions."""
+        if not self.enabled:
+            return TestResult(assertion, True, None, "Assertion disabled")
+        
+        if self.error:
+            return TestResult(assertion, False, None, self.error)
+        
+        if self.check is None:
+            return TestResult(assertion, False, None, f"Unknown assertion type: {self.type}")
+        
+        try:
+            return self.check(assertion, self, response, body)
+        except Exception as e:
+            return TestResult(assertion, False, None, f"Error evaluating assertion: {str(e)}")
+
+
+class AssertionPlan:
+    """
+    A list of assertions compiled once, for evaluation against any number
+    of responses. Plans are cached by assertion revision (see
+    TestEngine.get_plan), so re-running a request reuses its plan until one
+    of its assertions changes.
+    """
+    
+    def __init__(self, revisions: Tuple[Tuple, ...]):
+        """Compile the assertions with the given revisions."""
+        self.revisions = revisions
+        self.steps = [CompiledAssertion(revision) for revision in revisions]
+    
+    def evaluate(self, assertions: List[TestAssertion], response: ApiResponse) -> List[TestResult]:
+        """
+        Evaluate the plan against a response.
+        
+        Args:
+            assertions: The assertions the plan was compiled from (used in the results)
+            response: API response to test
+            
+        Returns:
+            List of test results, in assertion order
+        """
+        body = ResponseBody(response)
+        return [step.evaluate(assertion, response, body) for step, assertion in zip(self.steps, assertions)]
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _plan_for(revisions: Tuple[Tuple, ...]) -> AssertionPlan:
+    """Compile (or reuse) the plan for a list of assertion revisions."""
+    return AssertionPlan(revisions)
+
+
 class TestEngine:
     """
     Engine for evaluating test assertions against API responses.
+    
+    Assertions are compiled into an AssertionPlan before evaluation; see
+    get_plan().
     """
     
     @staticmethod
@@ -84,89 +242,77 @@ class TestEngine:
         Returns:
             TestResult with pass/fail status
         """
-        if not assertion.enabled:
-            return TestResult(assertion, True, None, "Assertion disabled")
+        return TestEngine.get_plan([assertion]).evaluate([assertion], response)[0]
+    
+    @staticmethod
+    def get_plan(assertions: List[TestAssertion]) -> AssertionPlan:
+        """
+        Get the compiled plan for a list of assertions.
         
-        try:
-            if assertion.type == TestAssertion.TYPE_STATUS_CODE:
-                return TestEngine._check_status_code(assertion, response)
-            
-            elif assertion.type == TestAssertion.TYPE_RESPONSE_TIME:
-                return TestEngine._check_response_time(assertion, response)
-            
-            elif assertion.type == TestAssertion.TYPE_RESPONSE_SIZE:
-                return TestEngine._check_response_size(assertion, response)
-            
-            elif assertion.type == TestAssertion.TYPE_HEADER:
-                return TestEngine._check_header(assertion, response)
-            
-            elif assertion.type == TestAssertion.TYPE_BODY_CONTAINS:
-                return TestEngine._check_body_contains(assertion, response)
-            
-            elif assertion.type == TestAssertion.TYPE_BODY_EQUALS:
-                return TestEngine._check_body_equals(assertion, response)
-            
-            elif assertion.type == TestAssertion.TYPE_JSON_PATH:
-                return TestEngine._check_json_path(assertion, response)
-            
-            elif assertion.type == TestAssertion.TYPE_JSON_SCHEMA:
-                return TestEngine._check_json_schema(assertion, response)
-            
-            else:
-                return TestResult(assertion, False, None, f"Unknown assertion type: {assertion.type}")
+        Plans are cached by the assertions' revisions, so they are compiled
+        once and recompiled only when an assertion changes.
         
-        except Exception as e:
-            return TestResult(assertion, False, None, f"Error evaluating assertion: {str(e)}")
+        Args:
+            assertions: List of test assertions
+            
+        Returns:
+            AssertionPlan for the assertions
+        """
+        return _plan_for(tuple(assertion.revision for assertion in assertions))
     
     @staticmethod
-    def _check_status_code(assertion: TestAssertion, response: ApiResponse) -> TestResult:
+    def _check_status_code(assertion: TestAssertion, step: CompiledAssertion,
+                           response: ApiResponse, body: ResponseBody) -> TestResult:
         """Check status code assertion."""
         actual = response.status_code
-        expected = int(assertion.expected_value) if assertion.expected_value else None
+        expected = step.expected
         
-        passed = TestEngine._compare_values(actual, expected, assertion.operator)
+        passed = TestEngine._compare_values(actual, expected, step.operator, step.regex)
         
         return TestResult(assertion, passed, actual,
-                         None if passed else f"Expected {assertion.operator} {expected}, got {actual}")
+                         None if passed else f"Expected {step.operator} {expected}, got {actual}")
     
     @staticmethod
-    def _check_response_time(assertion: TestAssertion, response: ApiResponse) -> TestResult:
+    def _check_response_time(assertion: TestAssertion, step: CompiledAssertion,
+                             response: ApiResponse, body: ResponseBody) -> TestResult:
         """Check response time assertion (in milliseconds)."""
         actual = response.elapsed_time * 1000  # Convert to ms
-        expected = float(assertion.expected_value) if assertion.expected_value else None
+        expected = step.expected
         
-        passed = TestEngine._compare_values(actual, expected, assertion.operator)
+        passed = TestEngine._compare_values(actual, expected, step.operator, step.regex)
         
         return TestResult(assertion, passed, f"{actual:.2f}ms",
-                         None if passed else f"Expected {assertion.operator} {expected}ms, got {actual:.2f}ms")
+                         None if passed else f"Expected {step.operator} {expected}ms, got {actual:.2f}ms")
     
     @staticmethod
-    def _check_response_size(assertion: TestAssertion, response: ApiResponse) -> TestResult:
+    def _check_response_size(assertion: TestAssertion, step: CompiledAssertion,
+                             response: ApiResponse, body: ResponseBody) -> TestResult:
         """Check response size assertion (in bytes)."""
         actual = response.size
-        expected = int(assertion.expected_value) if assertion.expected_value else None
+        expected = step.expected
         
-        passed = TestEngine._compare_values(actual, expected, assertion.operator)
+        passed = TestEngine._compare_values(actual, expected, step.operator, step.regex)
         
         return TestResult(assertion, passed, f"{actual} bytes",
-                         None if passed else f"Expected {assertion.operator} {expected} bytes, got {actual} bytes")
+                         None if passed else f"Expected {step.operator} {expected} bytes, got {actual} bytes")
     
     @staticmethod
-    def _check_header(assertion: TestAssertion, response: ApiResponse) -> TestResult:
+    def _check_header(assertion: TestAssertion, step: CompiledAssertion,
+                      response: ApiResponse, body: ResponseBody) -> TestResult:
         """Check response header assertion."""
-        header_name = assertion.field
+        header_name = step.field
         if not header_name:
             return TestResult(assertion, False, None, "Header name not specified")
         
         actual = response.headers.get(header_name)
-        expected = assertion.expected_value
+        expected = step.expected
         
-        if assertion.operator == TestAssertion.OP_EXISTS:
+        if step.operator == TestAssertion.OP_EXISTS:
             passed = actual is not None
             return TestResult(assertion, passed, actual,
                              None if passed else f"Header '{header_name}' does not exist")
         
-        elif assertion.operator == TestAssertion.OP_NOT_EXISTS:
+        elif step.operator == TestAssertion.OP_NOT_EXISTS:
             passed = actual is None
             return TestResult(assertion, passed, actual,
                              None if passed else f"Header '{header_name}' exists")
@@ -175,118 +321,136 @@ class TestEngine:
             if actual is None:
                 return TestResult(assertion, False, None, f"Header '{header_name}' does not exist")
             
-            passed = TestEngine._compare_values(actual, expected, assertion.operator)
+            passed = TestEngine._compare_values(actual, expected, step.operator, step.regex)
             return TestResult(assertion, passed, actual,
-                             None if passed else f"Expected {assertion.operator} '{expected}', got '{actual}'")
+                             None if passed else f"Expected {step.operator} '{expected}', got '{actual}'")
     
     @staticmethod
-    def _check_body_contains(assertion: TestAssertion, response: ApiResponse) -> TestResult:
+    def _check_body_contains(assertion: TestAssertion, step: CompiledAssertion,
+                             response: ApiResponse, body: ResponseBody) -> TestResult:
         """Check if response body contains expected text."""
-        actual = response.text
-        expected = assertion.expected_value
+        actual = body.text
+        expected = step.expected
         
-        if assertion.operator == TestAssertion.OP_CONTAINS:
+        if step.operator == TestAssertion.OP_CONTAINS:
             passed = expected in actual if expected else False
             return TestResult(assertion, passed, f"Body length: {len(actual)}",
                              None if passed else f"Body does not contain '{expected}'")
         
-        elif assertion.operator == TestAssertion.OP_NOT_CONTAINS:
+        elif step.operator == TestAssertion.OP_NOT_CONTAINS:
             passed = expected not in actual if expected else True
             return TestResult(assertion, passed, f"Body length: {len(actual)}",
                              None if passed else f"Body contains '{expected}'")
         
         else:
-            return TestResult(assertion, False, actual, f"Invalid operator for body_contains: {assertion.operator}")
+            return TestResult(assertion, False, actual, f"Invalid operator for body_contains: {step.operator}")
     
     @staticmethod
-    def _check_body_equals(assertion: TestAssertion, response: ApiResponse) -> TestResult:
+    def _check_body_equals(assertion: TestAssertion, step: CompiledAssertion,
+                           response: ApiResponse, body: ResponseBody) -> TestResult:
         """Check if response body equals expected text."""
-        actual = response.text
-        expected = assertion.expected_value
+        actual = body.text
+        expected = step.expected
         
-        passed = TestEngine._compare_values(actual, expected, assertion.operator)
+        passed = TestEngine._compare_values(actual, expected, step.operator, step.regex)
         
         return TestResult(assertion, passed, f"{actual[:100]}..." if len(actual) > 100 else actual,
                          None if passed else f"Body does not equal expected value")
     
     @staticmethod
-    def _check_json_path(assertion: TestAssertion, response: ApiResponse) -> TestResult:
+    def _check_json_path(assertion: TestAssertion, step: CompiledAssertion,
+                         response: ApiResponse, body: ResponseBody) -> TestResult:
         """Check JSON path value in response."""
-        try:
-            data = json.loads(response.text)
-        except json.JSONDecodeError:
+        data = body.data
+        if data is ResponseBody.INVALID_JSON:
             return TestResult(assertion, False, None, "Response is not valid JSON")
         
-        path = assertion.field
+        path = step.field
         if not path:
             return TestResult(assertion, False, None, "JSON path not specified")
         
-        # Extract value using simple path notation (e.g., "user.name", "items[0].id")
+        if step.path_error:
+            return TestResult(assertion, False, None, step.path_error)
+        
+        # Extract value using JSONPath (e.g., "user.name", "$.items[?(@.id > 1)].name");
+        # existence only needs the first match
         try:
-            actual = TestEngine._extract_json_value(data, path)
+            if step.operator in (TestAssertion.OP_EXISTS, TestAssertion.OP_NOT_EXISTS):
+                actual = step.path.first(data)
+            else:
+                actual = step.path.value(data)
         except Exception as e:
             return TestResult(assertion, False, None, f"Failed to extract path '{path}': {str(e)}")
         
-        expected = assertion.expected_value
+        expected = step.expected
         
-        if assertion.operator == TestAssertion.OP_EXISTS:
+        if step.operator == TestAssertion.OP_EXISTS:
             passed = actual is not None
             return TestResult(assertion, passed, actual,
                              None if passed else f"Path '{path}' does not exist")
         
-        elif assertion.operator == TestAssertion.OP_NOT_EXISTS:
+        elif step.operator == TestAssertion.OP_NOT_EXISTS:
             passed = actual is None
             return TestResult(assertion, passed, actual,
                              None if passed else f"Path '{path}' exists")
         
         else:
-            # Convert expected value to same type as actual if possible
-            if expected and actual is not None:
-                try:
-                    if isinstance(actual, bool):
-                        expected = expected.lower() == 'true'
-                    elif isinstance(actual, int):
-                        expected = int(expected)
-                    elif isinstance(actual, float):
-                        expected = float(expected)
-                except (ValueError, AttributeError):
-                    pass
+            # Use the expected value converted to the type of actual (if possible)
+            regex = step.regex
+            if step.typed_expected and actual is not None:
+                for kind in (bool, int, float):
+                    if isinstance(actual, kind):
+                        expected = step.typed_expected[kind]
+                        if expected is not step.expected:
+                            regex = None
+                        break
             
-            passed = TestEngine._compare_values(actual, expected, assertion.operator)
+            passed = TestEngine._compare_values(actual, expected, step.operator, regex)
             return TestResult(assertion, passed, str(actual),
-                             None if passed else f"Expected {assertion.operator} '{expected}', got '{actual}'")
+                             None if passed else f"Expected {step.operator} '{expected}', got '{actual}'")
     
     @staticmethod
-    def _check_json_schema(assertion: TestAssertion, response: ApiResponse) -> TestResult:
+    def _check_json_schema(assertion: TestAssertion, step: CompiledAssertion,
+                           response: ApiResponse, body: ResponseBody) -> TestResult:
         """Check if response matches JSON schema."""
-        try:
-            data = json.loads(response.text)
-        except json.JSONDecodeError:
+        data = body.data
+        if data is ResponseBody.INVALID_JSON:
             return TestResult(assertion, False, None, "Response is not valid JSON")
         
-        # Simple schema validation (can be enhanced with jsonschema library)
-        # For now, just check if expected fields exist
-        expected_schema = assertion.expected_value
-        if not expected_schema:
+        if not step.expected_value:
             return TestResult(assertion, False, None, "Schema not specified")
         
+        if step.schema_error:
+            return TestResult(assertion, False, None, step.schema_error)
+        
         try:
-            schema = json.loads(expected_schema)
-            errors = TestEngine._validate_simple_schema(data, schema)
+            errors = step.schema.validate(data)
             
             if errors:
                 return TestResult(assertion, False, None, f"Schema validation failed: {', '.join(errors)}")
             else:
                 return TestResult(assertion, True, "Schema valid")
         
-        except json.JSONDecodeError:
-            return TestResult(assertion, False, None, "Invalid JSON schema")
         except Exception as e:
             return TestResult(assertion, False, None, f"Schema validation error: {str(e)}")
     
     @staticmethod
-    def _compare_values(actual: Any, expected: Any, operator: str) -> bool:
-        """Compare two values using the specified operator."""
+    @lru_cache(maxsize=PLAN_CACHE_SIZE)
+    def _compile_regex(pattern: str) -> Optional[Pattern]:
+        """Compile a matches_regex pattern; None if it is not a valid regex."""
+        try:
+            return re.compile(pattern)
+        except re.error:
+            return None
+    
+    @staticmethod
+    def _compare_values(actual: Any, expected: Any, operator: str, regex: Optional[Pattern] = None) -> bool:
+        """
+        Compare two values using the specified operator.
+        
+        For matches_regex, regex is the pre-compiled form of str(expected);
+        it is compiled here if not given.
+        """
         if operator == TestAssertion.OP_EQUALS:
             return actual == expected
         
@@ -312,79 +476,13 @@ class TestEngine:
             return expected not in str(actual) if expected else True
         
         elif operator == TestAssertion.OP_MATCHES_REGEX:
-            try:
-                return bool(re.search(str(expected), str(actual)))
-            except re.error:
-                return False
+            if regex is None:
+                regex = TestEngine._compile_regex(str(expected))
+            return bool(regex.search(str(actual))) if regex is not None else False
         
         else:
             return False
     
-    @staticmethod
-    def _extract_json_value(data: Any, path: str) -> Any:
-        """Extract value from JSON using dot notation path."""
-        parts = path.split('.')
-        current = data
-        
-        for part in parts:
-            # Handle array indexing (e.g., "items[0]")
-            if '[' in part and ']' in part:
-                field = part[:part.index('[')]
-                index = int(part[part.index('[') + 1:part.index(']')])
-                
-                if field:
-                    current = current[field]
-                
-                if isinstance(current, list) and 0 <= index < len(current):
-                    current = current[index]
-                else:
-                    return None
-            else:
-                if isinstance(current, dict):
-                    current = current.get(part)
-                else:
-                    return None
-                
-                if current is None:
-                    return None
-        
-        return current
-    
-    @staticmethod
-    def _validate_simple_schema(data: Any, schema: Dict) -> List[str]:
-        """Simple JSON schema validation."""
-        errors = []
-        
-        if 'type' in schema:
-            expected_type = schema['type']
-            actual_type = type(data).__name__
-            
-            type_map = {
-                'string': 'str',
-                'number': ('int', 'float'),
-                'integer': 'int',
-                'boolean': 'bool',
-                'array': 'list',
-                'object': 'dict',
-                'null': 'NoneType'
-            }
-            
-            expected = type_map.get(expected_type, expected_type)
-            if isinstance(expected, tuple):
-                if actual_type not in expected:
-                    errors.append(f"Type mismatch: expected {expected_type}, got {actual_type}")
-            else:
-                if actual_type != expected:
-                    errors.append(f"Type mismatch: expected {expected_type}, got {actual_type}")
-        
-        if 'properties' in schema and isinstance(data, dict):
-            for prop, prop_schema in schema['properties'].items():
-                if 'required' in schema and prop in schema['required']:
-                    if prop not in data:
-                        errors.append(f"Required property '{prop}' is missing")
-        
-        return errors
-    
     @staticmethod
     def evaluate_all(assertions: List[TestAssertion], response: ApiResponse) -> List[TestResult]:
         """
@@ -397,11 +495,7 @@ class TestEngine:
         Returns:
             List of test results
         """
-        results = []
-        for assertion in assertions:
-            result = TestEngine.evaluate_assertion(assertion, response)
-            results.append(result)
-        return results
+        return TestEngine.get_plan(assertions).evaluate(assertions, response)
     
     @staticmethod
     def get_summary(results: List[TestResult]) -> Dict:
@@ -426,3 +520,16 @@ class TestEngine:
             'pass_rate': pass_rate
         }
 
+
+
+# Check per assertion type, used by CompiledAssertion
+TestEngine.CHECKS = {
+    TestAssertion.TYPE_STATUS_CODE: TestEngine._check_status_code,
+    TestAssertion.TYPE_RESPONSE_TIME: TestEngine._check_response_time,
+    TestAssertion.TYPE_RESPONSE_SIZE: TestEngine._check_response_size,
+    TestAssertion.TYPE_HEADER: TestEngine._check_header,
+    TestAssertion.TYPE_BODY_CONTAINS: TestEngine._check_body_contains,
+    TestAssertion.TYPE_BODY_EQUALS: TestEngine._check_body_equals,
+    TestAssertion.TYPE_JSON_PATH: TestEngine._check_json_path,
+    TestAssertion.TYPE_JSON_SCHEMA: TestEngine._check_json_schema,
+}
@@ -6,11 +6,14 @@ This module provides functionality to export test results in various formats:
 - JUnit XML (CI/CD integration)
 - JSON (machine-readable)
 - CSV (spreadsheet-friendly)
+
+and HTML / JSON reports of load tests.
 """
 
 import json
 import csv
 from datetime import datetime
+from html import escape
 from typing import List, Dict, Optional
 from xml.etree import ElementTree as ET
 from src.features.test_engine import TestResult, TestAssertion
@@ -582,3 +585,174 @@ class CSVReportGenerator(TestReportGenerator):
         
         return output.getvalue()
 
+
+class LoadTestJSONReportGenerator:
+    """Generate JSON reports of load tests (see load_test.LoadTest.snapshot())."""
+    
+    @staticmethod
+    def generate(result: Dict, metadata: Optional[Dict] = None) -> str:
+        """
+        Generate JSON load test report.
+        
+        Args:
+            result: Final snapshot of the load test
+            metadata: Optional metadata (name, environment)
+        
+        Returns:
+            JSON string
+        """
+        metadata = metadata or {}
+        report = {
+            'metadata': {
+                'name': metadata.get('name', ''),
+                'environment': metadata.get('environment', ''),
+                'timestamp': datetime.now().isoformat()
+            },
+            'profile': {key: result[key] for key in ('mode', 'duration', 'concurrency', 'target_rps', 'ramp_up')},
+            'summary': {
+                key: result[key] for key in (
+                    'elapsed', 'total_requests', 'errors', 'failed', 'error_rate', 'throughput', 'stopped'
+                )
+            },
+            'latency_ms': result['latency'],
+            'status_codes': {str(code): count for code, count in result['status_codes'].items()},
+            'error_messages': result['error_messages'],
+            'requests': [
+                dict({key: value for key, value in request.items() if key != 'latency'}, latency_ms=request['latency'])
+                for request in result['requests']
+            ],
+            'timeline': result['timeline']
+        }
+        return json.dumps(report, indent=2)
+
+
+class LoadTestHTMLReportGenerator:
+    """Generate HTML reports of load tests (see load_test.LoadTest.snapshot())."""
+    
+    LATENCY_COLUMNS = (('min', 'Min'), ('p50', 'p50'), ('p90', 'p90'), ('p99', 'p99'), ('p999', 'p99.9'), ('max', 'Max'))
+    
+    @staticmethod
+    def generate(result: Dict, metadata: Optional[Dict] = None) -> str:
+        """
+        Generate HTML load test report.
+        
+        Args:
+            result: Final snapshot of the load test
+            metadata: Optional metadata (name, environment)
+        
+        Returns:
+            HTML string
+        """
+        metadata = metadata or {}
+        name = escape(metadata.get('name') or 'Load Test')
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        latency = result['latency']
+        columns = LoadTestHTMLReportGenerator.LATENCY_COLUMNS
+        
+        if result['mode'] == 'rps':
+            profile = f"{result['target_rps']:g} requests/s with up to {result['concurrency']} in flight"
+        else:
+            profile = f"{result['concurrency']} concurrent workers"
+        profile += f", {result['duration']:g}s"
+        if result['ramp_up']:
+            profile += f" ({result['ramp_up']:g}s ramp-up)"
+        if metadata.get('environment'):
+            profile += f" &middot; Environment: {escape(metadata['environment'])}"
+        if result['stopped']:
+            profile += " &middot; Stopped early"
+        
+        request_rows = ''.join(
+            f"<tr><td>{escape(request['method'])} {escape(request['name'])}</td>"
+            f"<td>{request['requests']}</td><td>{request['errors'] + request['failed']}</td>"
+            + ''.join(f"<td>{request['latency'][key]:.1f}</td>" for key, _ in columns)
+            + "</tr>"
+            for request in result['requests']
+        )
+        total_row = (
+            f"<tr class=\"total\"><td>All requests</td><td>{result['total_requests']}</td>"
+            f"<td>{result['errors'] + result['failed']}</td>"
+            + ''.join(f"<td>{latency[key]:.1f}</td>" for key, _ in columns)
+            + "</tr>"
+        )
+        status_rows = ''.join(
+            f"<tr><td>{code}</td><td>{count}</td></tr>" for code, count in result['status_codes'].items()
+        ) + ''.join(
+            f"<tr class=\"error\"><td>{escape(message)}</td><td>{count}</td></tr>"
+            for message, count in result['error_messages'].items()
+        )
+        peak_rps = max([point['rps'] for point in result['timeline']] or [0]) or 1
+        timeline_rows = ''.join(
+            f"<tr><td>{point['time']:.1f}s</td><td>{point['rps']:.1f}"
+            f"<div class=\"bar\" style=\"width: {point['rps'] / peak_rps * 100:.0f}%\"></div></td>"
+            f"<td>{point['p50']:.1f}</td><td>{point['p99']:.1f}</td><td>{point['errors']}</td></tr>"
+            for point in result['timeline']
+        )
+        
+        return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Load Test Report - {name}</title>
+    <style>
+        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background: #F5F7FA; padding: 20px; color: #333; margin: 0; }}
+        .container {{ max-width: 1200px; margin: 0 auto; background: white; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1); overflow: hidden; }}
+        .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; }}
+        .header h1 {{ font-size: 28px; margin: 0 0 10px; }}
+        .header .subtitle {{ opacity: 0.9; font-size: 14px; }}
+        .summary {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(160px, 1fr)); gap: 20px; padding: 30px; background: #F8F9FA; }}
+        .stat-card {{ background: white; padding: 20px; border-radius: 8px; box-shadow: 0 1px 3px rgba(0,0,0,0.1); text-align: center; }}
+        .stat-value {{ font-size: 28px; font-weight: bold; color: #667eea; margin-bottom: 5px; }}
+        .stat-card.errors .stat-value {{ color: {'#F44336' if result['error_rate'] else '#4CAF50'}; }}
+        .stat-label {{ color: #666; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px; }}
+        .section {{ padding: 0 30px 30px; }}
+        .section-title {{ font-size: 22px; font-weight: 600; margin: 10px 0 20px; padding-bottom: 10px; border-bottom: 2px solid #E0E0E0; }}
+        table {{ width: 100%; border-collapse: collapse; font-size: 14px; }}
+        th, td {{ text-align: left; padding: 8px 10px; border-bottom: 1px solid #EEE; }}
+        th {{ background: #F8F9FA; font-weight: 600; }}
+        tr.total td {{ font-weight: 600; }}
+        tr.error td {{ color: #F44336; }}
+        .bar {{ height: 6px; background: #667eea; border-radius: 3px; margin-top: 4px; }}
+        .footer {{ padding: 20px 30px; text-align: center; color: #999; font-size: 12px; border-top: 1px solid #E0E0E0; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>📈 Load Test Report: {name}</h1>
+            <div class="subtitle">{profile} &middot; Generated on {timestamp}</div>
+        </div>
+        <div class="summary">
+            <div class="stat-card"><div class="stat-value">{result['total_requests']}</div><div class="stat-label">Requests</div></div>
+            <div class="stat-card"><div class="stat-value">{result['throughput']:.1f}/s</div><div class="stat-label">Throughput</div></div>
+            <div class="stat-card errors"><div class="stat-value">{result['error_rate'] * 100:.2f}%</div><div class="stat-label">Error Rate</div></div>
+            <div class="stat-card"><div class="stat-value">{latency['p50']:.1f} ms</div><div class="stat-label">p50</div></div>
+            <div class="stat-card"><div class="stat-value">{latency['p99']:.1f} ms</div><div class="stat-label">p99</div></div>
+            <div class="stat-card"><div class="stat-value">{latency['p999']:.1f} ms</div><div class="stat-label">p99.9</div></div>
+        </div>
+        <div class="section">
+            <div class="section-title">Latency (ms)</div>
+            <table>
+                <tr><th>Request</th><th>Requests</th><th>Errors</th>{''.join(f"<th>{label}</th>" for _, label in columns)}</tr>
+                {request_rows}{total_row}
+            </table>
+        </div>
+        <div class="section">
+            <div class="section-title">Responses</div>
+            <table>
+                <tr><th>Status / Error</th><th>Count</th></tr>
+                {status_rows}
+            </table>
+        </div>
+        <div class="section">
+            <div class="section-title">Timeline</div>
+            <table>
+                <tr><th>Time</th><th>Requests/s</th><th>p50 (ms)</th><th>p99 (ms)</th><th>Errors</th></tr>
+                {timeline_rows}
+            </table>
+        </div>
+        <div class="footer">Generated by PostMini</div>
+    </div>
+</body>
+</html>
+"""
@@ -9,6 +9,7 @@ import json
 import re
 from typing import Any, Optional, Dict, List
 from src.core.api_client import ApiResponse
+from src.features.json_path import JSONPathError, compile_path
 
 
 class VariableExtractor:
@@ -19,27 +20,28 @@ class VariableExtractor:
     @staticmethod
     def extract_from_json_path(response: ApiResponse, json_path: str) -> Optional[Any]:
         """
-        Extract value from JSON response using simple dot notation path.
+        Extract value from JSON response using a JSONPath expression.
         
         Args:
             response: API response object
-            json_path: Path like "data.user.id" or "items[0].name"
+            json_path: Path like "data.user.id", "items[0].name" or "$..id"
             
         Returns:
-            Extracted value or None if not found/error
+            Extracted value (a list of all matches for paths with wildcards,
+            filters, slices or "..") or None if not found/error
             
         Examples:
             "data.token" -> response.data.token
             "user.id" -> response.user.id
             "items[0].name" -> response.items[0].name
-            "meta.pagination.total" -> response.meta.pagination.total
+            "items[-1].name" -> name of the last item
+            "items[?(@.active)].id" -> ids of all active items
         """
         try:
             data = json.loads(response.text)
-        except json.JSONDecodeError:
+            return compile_path(json_path).value(data)
+        except (json.JSONDecodeError, JSONPathError):
             return None
-        
-        return VariableExtractor._extract_json_value(data, json_path)
     
     @staticmethod
     def extract_from_header(response: ApiResponse, header_name: str) -> Optional[str]:
@@ -88,48 +90,6 @@ class VariableExtractor:
             pass
         return None
     
-    @staticmethod
-    def _extract_json_value(data: Any, path: str) -> Any:
-        """
-        Extract value from JSON using dot notation path.
-        
-        Args:
-            data: JSON data (dict or list)
-            path: Dot notation path (e.g., "user.profile.email")
-            
-        Returns:
-            Extracted value or None if path doesn't exist
-        """
-        parts = path.split('.')
-        current = data
-        
-        for part in parts:
-            # Handle array indexing (e.g., "items[0]")
-            if '[' in part and ']' in part:
-                field = part[:part.index('[')]
-                index = int(part[part.index('[') + 1:part.index(']')])
-                
-                if field:
-                    if isinstance(current, dict):
-                        current = current.get(field)
-                    else:
-                        return None
-                
-                if isinstance(current, list) and 0 <= index < len(current):
-                    current = current[index]
-                else:
-                    return None
-            else:
-                if isinstance(current, dict):
-                    current = current.get(part)
-                else:
-                    return None
-                
-                if current is None:
-                    return None
-        
-        return current
-    
     @staticmethod
     def get_suggested_variables(response: ApiResponse) -> List[Dict[str, str]]:
         """
@@ -0,0 +1,204 @@
+"""
+Variable Index Module
+
+Maintains a sorted, incrementally updated index over variable names from all
+scopes (environment, collection, extracted, dynamic) so autocomplete can look
+up completions by prefix without rebuilding the candidate list on every
+keystroke.
+"""
+
+import re
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+
+# Placeholder shown by the UI for unresolved values - never offered as a completion
+UNDEFINED_MARKER = '❌ Undefined'
+
+# Order in which scopes are listed for names that appear in several of them
+SCOPE_ORDER = ('ext', 'col', 'env', 'dynamic')
+
+# Splits camelCase / snake_case / kebab-case names into searchable segments
+_SEGMENT_PATTERN = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+
+# Dynamic variables offered by autocomplete
+DEFAULT_DYNAMIC_VARIABLES = {
+    'guid': 'Generates a UUID v4',
+    'timestamp': 'Current Unix timestamp',
+    'isoTimestamp': 'Current ISO 8601 timestamp',
+    'randomInt': 'Random integer (0-1000)',
+}
+
+
+class VariableIndex:
+    """
+    Sorted prefix index over variable names.
+
+    Every variable is stored under its lowercased name and under each
+    camelCase/snake_case segment suffix (e.g. "apiKey" is reachable from
+    "api" and "key"). Name keys and segment keys live in two sorted lists,
+    so a prefix query is a binary search in each followed by a scan of the
+    matching range that stops once the limit is reached.
+
+    Scopes are updated with set_scope(), which diffs against the current
+    contents and only touches keys that actually changed.
+    """
+
+    def __init__(self):
+        self._scopes: Dict[str, Dict[str, str]] = {scope: {} for scope in SCOPE_ORDER}
+        # (search_key, scope_rank, name) entries
+        self._name_keys: List[Tuple[str, int, str]] = []
+        self._segment_keys: List[Tuple[str, int, str]] = []
+
+    def __len__(self) -> int:
+        return sum(len(variables) for variables in self._scopes.values())
+
+    def __bool__(self) -> bool:
+        return any(self._scopes.values())
+
+    @staticmethod
+    def _is_completable(value) -> bool:
+        """Check whether a value should be offered as a completion."""
+        return bool(value) and value != UNDEFINED_MARKER
+
+    @staticmethod
+    def _search_keys(name: str) -> List[str]:
+        """Get all lowercased keys a variable name is reachable from."""
+        keys = [name.lower()]
+        segments = [m.start() for m in _SEGMENT_PATTERN.finditer(name)]
+        for start in segments[1:]:
+            key = name[start:].lower()
+            if key not in keys:
+                keys.append(key)
+        return keys
+
+    def _key_entries(self, scope: str, name: str) -> Iterator[Tuple[List[Tuple[str, int, str]], Tuple[str, int, str]]]:
+        """Yield (sorted key list, entry) for every key of a variable."""
+        rank = SCOPE_ORDER.index(scope)
+        keys = self._search_keys(name)
+        yield self._name_keys, (keys[0], rank, name)
+        for key in keys[1:]:
+            yield self._segment_keys, (key, rank, name)
+
+    def _add_keys(self, scope: str, name: str):
+        for keys, entry in self._key_entries(scope, name):
+            insort(keys, entry)
+
+    def _remove_keys(self, scope: str, name: str):
+        for keys, entry in self._key_entries(scope, name):
+            pos = bisect_left(keys, entry)
+            if pos < len(keys) and keys[pos] == entry:
+                del keys[pos]
+
+    def set_variable(self, scope: str, name: str, value):
+        """
+        Add or update a single variable.
+
+        Args:
+            scope: One of 'env', 'col', 'ext', 'dynamic'
+            name: Variable name
+            value: Variable value (empty or undefined values remove the entry)
+        """
+        variables = self._scopes[scope]
+        if not self._is_completable(value):
+            self.remove_variable(scope, name)
+            return
+
+        if name not in variables:
+            self._add_keys(scope, name)
+        variables[name] = str(value)
+
+    def remove_variable(self, scope: str, name: str):
+        """Remove a single variable from a scope (no-op if absent)."""
+        variables = self._scopes[scope]
+        if name in variables:
+            del variables[name]
+            self._remove_keys(scope, name)
+
+    def set_scope(self, scope: str, variables: Optional[Dict[str, str]]):
+        """
+        Replace the contents of a scope, touching only changed names.
+
+        Args:
+            scope: One of 'env', 'col', 'ext', 'dynamic'
+            variables: New name -> value mapping (None clears the scope)
+        """
+        variables = variables or {}
+        current = self._scopes[scope]
+
+        for name in [n for n in current if n not in variables]:
+            self.remove_variable(scope, name)
+
+        for name, value in variables.items():
+            if current.get(name) != value:
+                self.set_variable(scope, name, value)
+
+    def clear_scope(self, scope: str):
+        """Remove every variable from a scope."""
+        self.set_scope(scope, None)
+
+    def get_scope(self, scope: str) -> Dict[str, str]:
+        """Get a copy of the variables currently indexed for a scope."""
+        return self._scopes[scope].copy()
+
+    def search(self, prefix: str = "", limit: Optional[int] = None) -> List[Tuple[str, str, str]]:
+        """
+        Find variables whose name (or a name segment) starts with prefix.
+
+        Args:
+            prefix: Case-insensitive prefix; empty returns every variable
+            limit: Maximum number of results (None for all)
+
+        Returns:
+            List of (var_name, var_value, scope) tuples: names starting with
+            prefix first, then names with a segment starting with it, each
+            sorted by the matched name or segment, then scope
+        """
+        if not prefix:
+            return self.all_variables(limit)
+
+        prefix = prefix.lower()
+        seen: Set[Tuple[int, str]] = set()
+        # Whole-name matches first, so segment matches never crowd them out
+        matches = (
+            match
+            for keys in (self._name_keys, self._segment_keys)
+            for match in self._prefix_range(keys, prefix, seen)
+        )
+        return list(islice(matches, limit))
+
+    def _prefix_range(self, keys: List[Tuple[str, int, str]], prefix: str,
+                      seen: Set[Tuple[int, str]]) -> Iterator[Tuple[str, str, str]]:
+        """Yield the variables of the keys starting with prefix, skipping those in `seen`."""
+        pos = bisect_left(keys, (prefix,))
+        while pos < len(keys):
+            key, rank, name = keys[pos]
+            if not key.startswith(prefix):
+                return
+            pos += 1
+
+            if (rank, name) in seen:
+                continue
+            seen.add((rank, name))
+
+            scope = SCOPE_ORDER[rank]
+            yield name, self._scopes[scope][name], scope
+
+    def all_variables(self, limit: Optional[int] = None) -> List[Tuple[str, str, str]]:
+        """
+        Get every indexed variable in scope order.
+
+        Args:
+            limit: Maximum number of results (None for all)
+
+        Returns:
+            List of (var_name, var_value, scope) tuples
+        """
+        results = []
+        for scope in SCOPE_ORDER:
+            for name, value in self._scopes[scope].items():
+                results.append((name, value, scope))
+                if limit is not None and len(results) >= limit:
+                    return results
+        return results
@@ -12,8 +12,9 @@ For backward compatibility, {{variable}} without prefix will check all scopes.
 """
 
 import re
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Optional
 from .dynamic_variables import resolve_dynamic_variable
+from .variable_index import VariableIndex, DEFAULT_DYNAMIC_VARIABLES
 
 
 class VariableSubstitution:
@@ -41,7 +42,8 @@ class VariableSubstitution:
     def substitute(text: str, env_variables: Dict[str, str] = None, 
                    collection_variables: Dict[str, str] = None,
                    extracted_variables: Dict[str, str] = None,
-                   max_depth: int = 10) -> Tuple[str, List[str]]:
+                   max_depth: int = 10,
+                   iteration_variables: Dict[str, str] = None) -> Tuple[str, List[str]]:
         """
         Replace all variable occurrences in text with their values using new prefix syntax.
         Supports nested variables (variables within variable values) with recursive resolution.
@@ -51,7 +53,7 @@ class VariableSubstitution:
         - {{col.variable}} - Collection variables (explicit)
         - {{ext.variable}} - Extracted variables (explicit)
         - {{$variable}} - Dynamic variables (explicit)
-        - {{variable}} - Any scope (checks all in priority: extracted > collection > environment)
+        - {{variable}} - Any scope (checks all in priority: iteration data > extracted > collection > environment)
         
         Nested variables example:
         - env.protocol = "https"
@@ -65,6 +67,7 @@ class VariableSubstitution:
             collection_variables: Dictionary of collection variable names to values
             extracted_variables: Dictionary of extracted variable names to values
             max_depth: Maximum recursion depth to prevent infinite loops (default: 10)
+            iteration_variables: Row of the data file of a collection run (optional)
             
         Returns:
             Tuple of (substituted_text, list_of_unresolved_variables)
@@ -85,6 +88,8 @@ class VariableSubstitution:
             collection_variables = {}
         if extracted_variables is None:
             extracted_variables = {}
+        if iteration_variables is None:
+            iteration_variables = {}
         
         unresolved = []
         result = text
@@ -139,9 +144,12 @@ class VariableSubstitution:
                         iteration_unresolved.append(f'{{{{ext.{var_name}}}}}')
                         return match.group(0)  # Keep original if not found
                 
-                # No prefix - backward compatibility: check all scopes (priority: extracted > collection > environment)
+                # No prefix - backward compatibility: check all scopes
+                # (priority: iteration data > extracted > collection > environment)
                 else:
-                    if var_name in extracted_variables:
+                    if var_name in iteration_variables:
+                        return str(iteration_variables[var_name])
+                    elif var_name in extracted_variables:
                         return str(extracted_variables[var_name])
                     elif var_name in collection_variables:
                         return str(collection_variables[var_name])
@@ -165,7 +173,8 @@ class VariableSubstitution:
     @staticmethod
     def substitute_dict(data: Dict, env_variables: Dict[str, str] = None,
                        collection_variables: Dict[str, str] = None,
-                       extracted_variables: Dict[str, str] = None) -> Tuple[Dict, List[str]]:
+                       extracted_variables: Dict[str, str] = None,
+                       iteration_variables: Dict[str, str] = None) -> Tuple[Dict, List[str]]:
         """
         Substitute variables in all values of a dictionary.
         
@@ -174,6 +183,7 @@ class VariableSubstitution:
             env_variables: Dictionary of environment variable names to values
             collection_variables: Dictionary of collection variable names to values
             extracted_variables: Dictionary of extracted variable names to values
+            iteration_variables: Row of the data file of a collection run (optional)
             
         Returns:
             Tuple of (substituted_dict, list_of_unresolved_variables)
@@ -187,10 +197,12 @@ class VariableSubstitution:
         for key, value in data.items():
             # Substitute in both key and value
             new_key, unresolved_key = VariableSubstitution.substitute(
-                str(key), env_variables, collection_variables, extracted_variables
+                str(key), env_variables, collection_variables, extracted_variables,
+                iteration_variables=iteration_variables
             )
             new_value, unresolved_value = VariableSubstitution.substitute(
-                str(value), env_variables, collection_variables, extracted_variables
+                str(value), env_variables, collection_variables, extracted_variables,
+                iteration_variables=iteration_variables
             )
             
             result[new_key] = new_value
@@ -205,11 +217,12 @@ class VariableSubstitution:
     @staticmethod
     def substitute_path_params(url: str, env_variables: Dict[str, str] = None,
                                collection_variables: Dict[str, str] = None,
-                               extracted_variables: Dict[str, str] = None) -> Tuple[str, List[str]]:
+                               extracted_variables: Dict[str, str] = None,
+                               iteration_variables: Dict[str, str] = None) -> Tuple[str, List[str]]:
         """
         Substitute path parameters in URL using Postman-style :paramName syntax.
         Path parameters are resolved from variables in priority order:
-        extracted > collection > environment
+        iteration data > extracted > collection > environment
         
         Example:
             URL: https://api.example.com/users/:userId/posts/:postId
@@ -221,6 +234,7 @@ class VariableSubstitution:
             env_variables: Dictionary of environment variable names to values
             collection_variables: Dictionary of collection variable names to values
             extracted_variables: Dictionary of extracted variable names to values
+            iteration_variables: Row of the data file of a collection run (optional)
             
         Returns:
             Tuple of (substituted_url, list_of_unresolved_path_params)
@@ -234,6 +248,8 @@ class VariableSubstitution:
             collection_variables = {}
         if extracted_variables is None:
             extracted_variables = {}
+        if iteration_variables is None:
+            iteration_variables = {}
         
         unresolved = []
         result = url
@@ -241,8 +257,10 @@ class VariableSubstitution:
         def replace_path_param(match):
             param_name = match.group(1)
             
-            # Check all scopes in priority order: extracted > collection > environment
-            if param_name in extracted_variables:
+            # Check all scopes in priority order: iteration data > extracted > collection > environment
+            if param_name in iteration_variables:
+                return str(iteration_variables[param_name])
+            elif param_name in extracted_variables:
                 return str(extracted_variables[param_name])
             elif param_name in collection_variables:
                 return str(collection_variables[param_name])
@@ -256,6 +274,85 @@ class VariableSubstitution:
         
         return result, unresolved
     
+    @staticmethod
+    def substitute_request(url: str, params: Dict, headers: Dict, body: str, auth_token: str,
+                           env_variables: Dict[str, str] = None,
+                           collection_variables: Dict[str, str] = None,
+                           extracted_variables: Dict[str, str] = None,
+                           iteration_variables: Dict[str, str] = None) -> Tuple[Dict, List[str]]:
+        """
+        Substitute variables in all components of a request.
+        
+        Used by EnvironmentManager for the active environment and by the
+        collection runner, which keeps its own variables per iteration.
+        
+        Args:
+            url: Request URL
+            params: Query parameters
+            headers: Request headers
+            body: Request body
+            auth_token: Authentication token
+            env_variables: Dictionary of environment variable names to values
+            collection_variables: Dictionary of collection variable names to values
+            extracted_variables: Dictionary of extracted variable names to values
+            iteration_variables: Row of the data file of a collection run (optional)
+            
+        Returns:
+            Tuple of (substituted_data_dict, unresolved_variables_list), see
+            EnvironmentManager.substitute_in_request()
+        """
+        all_unresolved = []
+        
+        # Substitute URL (first regular {{variables}}, then :pathParams)
+        new_url, unresolved = VariableSubstitution.substitute(
+            url, env_variables, collection_variables, extracted_variables,
+            iteration_variables=iteration_variables
+        )
+        all_unresolved.extend(unresolved)
+        
+        # Substitute path parameters (:paramName syntax) in URL
+        new_url, unresolved_path = VariableSubstitution.substitute_path_params(
+            new_url, env_variables, collection_variables, extracted_variables, iteration_variables
+        )
+        all_unresolved.extend(unresolved_path)
+        
+        # Substitute params
+        new_params, unresolved = VariableSubstitution.substitute_dict(
+            params, env_variables, collection_variables, extracted_variables, iteration_variables
+        ) if params else ({}, [])
+        all_unresolved.extend(unresolved)
+        
+        # Substitute headers
+        new_headers, unresolved = VariableSubstitution.substitute_dict(
+            headers, env_variables, collection_variables, extracted_variables, iteration_variables
+        ) if headers else ({}, [])
+        all_unresolved.extend(unresolved)
+        
+        # Substitute body
+        new_body, unresolved = VariableSubstitution.substitute(
+            body, env_variables, collection_variables, extracted_variables,
+            iteration_variables=iteration_variables
+        ) if body else ('', [])
+        all_unresolved.extend(unresolved)
+        
+        # Substitute auth token
+        new_auth_token, unresolved = VariableSubstitution.substitute(
+            auth_token, env_variables, collection_variables, extracted_variables,
+            iteration_variables=iteration_variables
+        ) if auth_token else ('', [])
+        all_unresolved.extend(unresolved)
+        
+        # Remove duplicates from unresolved list
+        all_unresolved = list(set(all_unresolved))
+        
+        return {
+            'url': new_url,
+            'params': new_params,
+            'headers': new_headers,
+            'body': new_body,
+            'auth_token': new_auth_token
+        }, all_unresolved
+    
     @staticmethod
     def find_variables(text: str) -> List[str]:
         """
@@ -344,6 +441,11 @@ class EnvironmentManager:
         self.active_variables = {}
         self.extracted_variables = {}  # For extracted variables from responses
         self.db = db  # Database manager for persisting environment variable changes
+        
+        # Prefix index used by autocomplete, kept in sync with every scope change
+        self.variable_index = VariableIndex()
+        self.variable_index.set_scope('dynamic', DEFAULT_DYNAMIC_VARIABLES)
+        self._indexed_collection_id = None
     
     def set_extracted_variables(self, extracted_vars: Dict[str, str]):
         """
@@ -352,7 +454,42 @@ class EnvironmentManager:
         Args:
             extracted_vars: Dictionary of extracted variable names to values
         """
-        self.extracted_variables = extracted_vars
+        self.extracted_variables = dict(extracted_vars or {})
+        self.variable_index.set_scope('ext', self.extracted_variables)
+    
+    def set_collection_variables(self, collection_id, collection_vars: Dict[str, str]):
+        """
+        Update the collection scope of the variable index.
+        
+        Args:
+            collection_id: ID of the collection the variables belong to (None clears)
+            collection_vars: Dictionary of collection variable names to values
+        """
+        self._indexed_collection_id = collection_id
+        self.variable_index.set_scope('col', collection_vars if collection_id else None)
+    
+    def get_variable_index(self, collection_id=None) -> VariableIndex:
+        """
+        Get the autocomplete index, refreshing the collection scope if needed.
+        
+        Collection variables are stored in the database and may be edited from
+        several places, so they are re-read here. set_scope() only touches the
+        names that changed, so an unchanged collection costs a single query.
+        
+        Args:
+            collection_id: ID of the collection currently in use (optional)
+            
+        Returns:
+            The shared VariableIndex
+        """
+        if collection_id and self.db:
+            try:
+                self.set_collection_variables(collection_id, self.db.get_collection_variables(collection_id))
+            except Exception:
+                pass
+        elif not collection_id and self._indexed_collection_id:
+            self.set_collection_variables(None, None)
+        return self.variable_index
     
     def get_extracted_variables(self) -> Dict[str, str]:
         """Get the extracted variables."""
@@ -367,11 +504,13 @@ class EnvironmentManager:
         """
         self.active_environment = environment
         self.active_variables = environment.get('variables', {}) if environment else {}
+        self.variable_index.set_scope('env', self.active_variables)
     
     def clear_active_environment(self):
         """Clear the active environment."""
         self.active_environment = None
         self.active_variables = {}
+        self.variable_index.clear_scope('env')
     
     def get_active_environment_name(self) -> str:
         """Get the name of the active environment."""
@@ -395,24 +534,31 @@ class EnvironmentManager:
             key: Variable name
             value: Variable value
         """
-        if not self.has_active_environment():
+        self.update_variables({key: value})
+    
+    def update_variables(self, changes: Dict[str, Optional[str]]):
+        """
+        Set and remove several environment variables with a single database write.
+        
+        Args:
+            changes: Variable names to new values; None removes the variable
+        """
+        if not self.has_active_environment() or not changes:
             return
         
-        # Update in-memory
-        self.active_variables[key] = value
+        for key, value in changes.items():
+            if value is None:
+                self.active_variables.pop(key, None)
+                self.variable_index.remove_variable('env', key)
+            else:
+                self.active_variables[key] = value
+                self.variable_index.set_variable('env', key, value)
         
-        # Update in database if we have a db reference
         if self.db and self.active_environment:
             env_id = self.active_environment.get('id')
             if env_id:
-                # Get current environment from database
-                env = self.db.get_environment(env_id)
-                if env:
-                    # Update the variables dict
-                    variables = env.get('variables', {})
-                    variables[key] = value
-                    # Save back to database
-                    self.db.update_environment(env_id, env['name'], variables)
+                variables = self.db.update_environment_variables(env_id, changes)
+                if variables is not None:
                     # Update our cached environment data
                     self.active_environment['variables'] = variables
     
@@ -439,56 +585,9 @@ class EnvironmentManager:
             - body: Substituted body
             - auth_token: Substituted auth token
         """
-        if collection_variables is None:
-            collection_variables = {}
-        
-        all_unresolved = []
-        
-        # Substitute URL (first regular {{variables}}, then :pathParams)
-        new_url, unresolved = VariableSubstitution.substitute(
-            url, self.active_variables, collection_variables, self.extracted_variables
+        return VariableSubstitution.substitute_request(
+            url, params, headers, body, auth_token,
+            self.active_variables, collection_variables, self.extracted_variables
         )
-        all_unresolved.extend(unresolved)
-        
-        # Substitute path parameters (:paramName syntax) in URL
-        new_url, unresolved_path = VariableSubstitution.substitute_path_params(
-            new_url, self.active_variables, collection_variables, self.extracted_variables
-        )
-        all_unresolved.extend(unresolved_path)
-        
-        # Substitute params
-        new_params, unresolved = VariableSubstitution.substitute_dict(
-            params, self.active_variables, collection_variables, self.extracted_variables
-        ) if params else ({}, [])
-        all_unresolved.extend(unresolved)
-        
-        # Substitute headers
-        new_headers, unresolved = VariableSubstitution.substitute_dict(
-            headers, self.active_variables, collection_variables, self.extracted_variables
-        ) if headers else ({}, [])
-        all_unresolved.extend(unresolved)
-        
-        # Substitute body
-        new_body, unresolved = VariableSubstitution.substitute(
-            body, self.active_variables, collection_variables, self.extracted_variables
-        ) if body else ('', [])
-        all_unresolved.extend(unresolved)
-        
-        # Substitute auth token
-        new_auth_token, unresolved = VariableSubstitution.substitute(
-            auth_token, self.active_variables, collection_variables, self.extracted_variables
-        ) if auth_token else ('', [])
-        all_unresolved.extend(unresolved)
-        
-        # Remove duplicates from unresolved list
-        all_unresolved = list(set(all_unresolved))
-        
-        return {
-            'url': new_url,
-            'params': new_params,
-            'headers': new_headers,
-            'body': new_body,
-            'auth_token': new_auth_token
-        }, all_unresolved
 
 
@@ -0,0 +1,217 @@
+"""
+Workspace Watcher Module
+
+Watches the Git sync workspace directories (.postmini/collections and
+.postmini/environments) for changes and reports the touched files in
+debounced batches, so bursts such as a `git checkout` rewriting hundreds of
+files result in a single status refresh.
+"""
+
+import os
+from typing import Dict, Iterable, List, Set, Tuple
+
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+
+class WorkspaceWatcher(QObject):
+    """
+    Debounced file system watcher for workspace directories.
+
+    Directories are watched for added/removed/renamed files and each file is
+    watched for in-place modifications. Directories that do not exist yet are
+    picked up once their parent reports a change. With `recursive`,
+    subdirectories (e.g. split collections) are watched the same way.
+    """
+
+    files_changed = pyqtSignal(list)  # Emits sorted list of touched file paths
+
+    DEBOUNCE_MS = 500
+
+    def __init__(self, directories: Iterable[str], debounce_ms: int = DEBOUNCE_MS,
+                 suffix: str = ".json", recursive: bool = False, parent=None):
+        """
+        Initialize and start the watcher.
+
+        Args:
+            directories: Directories to watch
+            debounce_ms: Quiet period after the last event before reporting
+            suffix: Only files with this suffix are reported
+            recursive: Also watch subdirectories
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.directories = [os.path.abspath(str(d)) for d in directories]
+        self.suffix = suffix
+        self.recursive = recursive
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._emit_pending)
+
+        self._pending: Set[str] = set()
+        self._snapshots: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        self._subdirectories: Set[str] = set()
+
+        self._watch_directories()
+
+    def is_watching(self) -> bool:
+        """Check whether at least one workspace directory is being watched."""
+        watched = set(self._watcher.directories())
+        return any(d in watched for d in self.directories)
+
+    def stop(self):
+        """Stop watching and drop pending events."""
+        self._timer.stop()
+        self._pending.clear()
+        paths = self._watcher.directories() + self._watcher.files()
+        if paths:
+            self._watcher.removePaths(paths)
+        self._snapshots.clear()
+        self._subdirectories.clear()
+
+    # ==================== Internals ====================
+
+    def _watch_directories(self):
+        """Watch workspace directories that exist (or the parent of those that don't)."""
+        watched = set(self._watcher.directories())
+        for directory in self.directories:
+            if os.path.isdir(directory):
+                if directory not in watched:
+                    self._watch_tree(directory)
+            else:
+                parent = os.path.dirname(directory)
+                if os.path.isdir(parent) and parent not in watched:
+                    self._watcher.addPath(parent)
+
+    def _watch_tree(self, directory: str) -> List[str]:
+        """
+        Watch a directory, its files and (if recursive) its subdirectories.
+
+        Returns:
+            Paths of the matching files found
+        """
+        self._watcher.addPath(directory)
+        self._snapshots[directory] = self._scan(directory)
+        self._watch_files(directory, self._snapshots[directory])
+        found = [os.path.join(directory, name) for name in self._snapshots[directory]]
+        if self.recursive:
+            for subdirectory in self._scan_subdirectories(directory):
+                if subdirectory not in self._snapshots:
+                    self._subdirectories.add(subdirectory)
+                    found.extend(self._watch_tree(subdirectory))
+        return found
+
+    def _drop_tree(self, directory: str) -> List[str]:
+        """
+        Forget a removed subdirectory and everything below it.
+
+        Returns:
+            Paths of the files it contained
+        """
+        removed = []
+        prefix = directory + os.sep
+        for path in [d for d in self._subdirectories if d == directory or d.startswith(prefix)]:
+            self._subdirectories.discard(path)
+            removed.extend(os.path.join(path, name) for name in self._snapshots.pop(path, {}))
+        stale = [p for p in self._watcher.directories() + self._watcher.files()
+                 if p == directory or p.startswith(prefix)]
+        if stale:
+            self._watcher.removePaths(stale)
+        return removed
+
+    def _watch_files(self, directory: str, names: Iterable[str]):
+        """Watch individual files for in-place modifications."""
+        watched = set(self._watcher.files())
+        paths = [os.path.join(directory, name) for name in names]
+        paths = [p for p in paths if p not in watched]
+        if paths:
+            self._watcher.addPaths(paths)
+
+    def _scan(self, directory: str) -> Dict[str, Tuple[int, int]]:
+        """Stat all matching files of a directory (no file is read)."""
+        snapshot = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(self.suffix) and entry.is_file():
+                        stat = entry.stat()
+                        snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            pass
+        return snapshot
+
+    def _scan_subdirectories(self, directory: str) -> List[str]:
+        """List the subdirectories of a directory."""
+        try:
+            with os.scandir(directory) as entries:
+                return [entry.path for entry in entries if entry.is_dir(follow_symlinks=False)]
+        except OSError:
+            return []
+
+    def _on_directory_changed(self, path: str):
+        """Find the files added, removed or replaced in a directory."""
+        if path not in self.directories and path not in self._subdirectories:
+            # A parent directory changed - a workspace directory may have appeared
+            self._watch_directories()
+            return
+
+        if not os.path.isdir(path) and path in self._subdirectories:
+            self._schedule(self._drop_tree(path))
+            return
+
+        old = self._snapshots.get(path, {})
+        new = self._scan(path)
+        self._snapshots[path] = new
+
+        touched = {name for name in old.keys() | new.keys() if old.get(name) != new.get(name)}
+        touched_paths = [os.path.join(path, name) for name in touched]
+        if not os.path.isdir(path):
+            # Directory itself was removed; watch for it to come back
+            self._snapshots.pop(path, None)
+            for subdirectory in [d for d in self._subdirectories if os.path.dirname(d) == path]:
+                touched_paths.extend(self._drop_tree(subdirectory))
+            self._watch_directories()
+        elif self.recursive:
+            current = set(self._scan_subdirectories(path))
+            for subdirectory in [d for d in self._subdirectories if os.path.dirname(d) == path]:
+                if subdirectory not in current:
+                    touched_paths.extend(self._drop_tree(subdirectory))
+            for subdirectory in current - self._subdirectories:
+                self._subdirectories.add(subdirectory)
+                touched_paths.extend(self._watch_tree(subdirectory))
+
+        self._watch_files(path, [name for name in touched if name in new])
+        self._schedule(touched_paths)
+
+    def _on_file_changed(self, path: str):
+        """Record an in-place modification (or removal) of a watched file."""
+        directory = os.path.dirname(path)
+        if os.path.exists(path):
+            # Editors and git often replace files, which drops the watch
+            if path not in self._watcher.files():
+                self._watcher.addPath(path)
+            try:
+                stat = os.stat(path)
+                self._snapshots.setdefault(directory, {})[os.path.basename(path)] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                pass
+        self._schedule([path])
+
+    def _schedule(self, paths: Iterable[str]):
+        """Add touched paths and restart the debounce window."""
+        paths = [p for p in paths if p.endswith(self.suffix)]
+        if paths:
+            self._pending.update(paths)
+            self._timer.start()
+
+    def _emit_pending(self):
+        """Report the touched files collected during the debounce window."""
+        paths: List[str] = sorted(self._pending)
+        self._pending.clear()
+        if paths:
+            self.files_changed.emit(paths)
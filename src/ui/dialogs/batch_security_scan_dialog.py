@@ -0,0 +1,251 @@
+"""
+Batch Security Scan Dialog
+
+Scans the whole request history or the responses of a collection run in the
+background and shows the findings per endpoint.
+"""
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QProgressBar,
+    QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog, QMessageBox
+)
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtGui import QFont
+from typing import Dict, List, Optional
+from datetime import datetime
+import webbrowser
+import os
+
+from src.core.database import DatabaseManager
+from src.features.security_batch import BatchSecurityScanner, BatchScanResult, SEVERITIES
+from src.features.security_rules import load_installed_rule_packs
+from src.features.security_report_generator import SecurityReportGenerator
+
+
+class BatchSecurityScanThread(QThread):
+    """Runs a batch security scan in the background."""
+    
+    progress = pyqtSignal(int, int, str)  # done, total, message
+    scan_finished = pyqtSignal(object, str)  # BatchScanResult (or None), error message
+    
+    def __init__(self, db_path: str, targets: Optional[List[Dict]] = None, scan_name: Optional[str] = None):
+        """
+        Args:
+            db_path: Database path (the thread opens its own connection)
+            targets: Responses to scan; None scans the whole request history
+            scan_name: Name stored with the security scans
+        """
+        super().__init__()
+        self.db_path = db_path
+        self.targets = targets
+        self.scan_name = scan_name
+        self._stop_requested = False
+    
+    def run(self):
+        """Scan using a database connection owned by this thread."""
+        db = DatabaseManager(self.db_path)
+        try:
+            scanner = BatchSecurityScanner(db, rule_packs=load_installed_rule_packs())
+            if self.targets is not None:
+                result = scanner.scan(self.targets, self.scan_name, self.progress.emit, self.is_cancelled)
+            else:
+                result = scanner.scan(scanner.history_targets(), self.scan_name, self.progress.emit,
+                                      self.is_cancelled, total=scanner.history_count())
+            error = ""
+        except Exception as e:
+            result, error = None, f"Security scan failed: {str(e)}"
+        finally:
+            db.close()
+        self.scan_finished.emit(result, error)
+    
+    def cancel(self):
+        """Stop scanning; nothing is saved."""
+        self._stop_requested = True
+    
+    def is_cancelled(self) -> bool:
+        """Check whether cancellation was requested."""
+        return self._stop_requested
+
+
+class BatchSecurityScanDialog(QDialog):
+    """Dialog that runs a batch security scan and exports the aggregated report."""
+    
+    def __init__(self, db: DatabaseManager, targets: Optional[List[Dict]] = None,
+                 scan_name: Optional[str] = None, parent=None):
+        """
+        Args:
+            db: DatabaseManager instance
+            targets: Responses to scan (see BatchSecurityScanner.run_targets());
+                None scans the whole request history
+            scan_name: Name stored with the security scans
+        """
+        super().__init__(parent)
+        self.db = db
+        self.scan_name = scan_name or f"Batch scan {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+        self.scan_thread = None
+        self.result: Optional[BatchScanResult] = None
+        
+        self.setWindowTitle("Security Scan")
+        self.setGeometry(200, 200, 800, 500)
+        
+        self._init_ui()
+        self._start_scan(targets)
+    
+    def _init_ui(self):
+        """Initialize the user interface."""
+        layout = QVBoxLayout(self)
+        
+        title = QLabel(f"🔒 {self.scan_name}")
+        title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
+        layout.addWidget(title)
+        
+        self.progress_label = QLabel("Preparing scan...")
+        layout.addWidget(self.progress_label)
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMaximum(0)
+        layout.addWidget(self.progress_bar)
+        
+        # Findings per endpoint
+        self.endpoints_table = QTableWidget()
+        self.endpoints_table.setColumnCount(2 + len(SEVERITIES))
+        self.endpoints_table.setHorizontalHeaderLabels(
+            ['METHOD', 'ENDPOINT'] + [severity.upper() for severity in SEVERITIES]
+        )
+        self.endpoints_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.endpoints_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.endpoints_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        layout.addWidget(self.endpoints_table)
+        
+        self.summary_label = QLabel("")
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+        
+        # Buttons
+        button_layout = QHBoxLayout()
+        
+        self.export_html_btn = QPushButton("📄 Export HTML")
+        self.export_html_btn.clicked.connect(lambda: self._export_report('html'))
+        self.export_html_btn.setEnabled(False)
+        button_layout.addWidget(self.export_html_btn)
+        
+        self.export_json_btn = QPushButton("🔧 Export JSON")
+        self.export_json_btn.clicked.connect(lambda: self._export_report('json'))
+        self.export_json_btn.setEnabled(False)
+        button_layout.addWidget(self.export_json_btn)
+        
+        button_layout.addStretch()
+        
+        self.stop_btn = QPushButton("⏹️ Stop")
+        self.stop_btn.clicked.connect(self._stop_scan)
+        button_layout.addWidget(self.stop_btn)
+        
+        self.close_btn = QPushButton("Close")
+        self.close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(self.close_btn)
+        
+        layout.addLayout(button_layout)
+    
+    def _start_scan(self, targets: Optional[List[Dict]]):
+        """Start scanning in the background."""
+        self.scan_thread = BatchSecurityScanThread(self.db.db_path, targets, self.scan_name)
+        self.scan_thread.progress.connect(self._on_progress)
+        self.scan_thread.scan_finished.connect(self._on_finished)
+        self.scan_thread.start()
+    
+    def _stop_scan(self):
+        """Cancel the running scan."""
+        if self.scan_thread:
+            self.progress_label.setText("Stopping...")
+            self.scan_thread.cancel()
+    
+    def _on_progress(self, done: int, total: int, message: str):
+        """Show the progress of the running scan."""
+        self.progress_bar.setMaximum(total)
+        self.progress_bar.setValue(done)
+        self.progress_label.setText(f"Scanned {done}/{total} responses: {message}")
+    
+    def _on_finished(self, result: Optional[BatchScanResult], error: str):
+        """Show the findings per endpoint."""
+        if self.scan_thread:
+            self.scan_thread.wait()
+            self.scan_thread = None
+        self.stop_btn.setEnabled(False)
+        self.progress_bar.setMaximum(1)
+        self.progress_bar.setValue(1)
+        
+        if result is None:
+            self.progress_label.setText(error)
+            return
+        if result.cancelled:
+            self.progress_label.setText("Scan cancelled, no findings were saved.")
+            return
+        
+        self.result = result
+        self.progress_label.setText("Scan complete.")
+        
+        self.endpoints_table.setRowCount(len(result.scan_ids))
+        for row, scan_id in enumerate(result.scan_ids):
+            scan = self.db.get_security_scan(scan_id)
+            self.endpoints_table.setItem(row, 0, QTableWidgetItem(scan['method']))
+            self.endpoints_table.setItem(row, 1, QTableWidgetItem(scan['url']))
+            for column, severity in enumerate(SEVERITIES, 2):
+                count = scan[f'{severity}_count']
+                self.endpoints_table.setItem(row, column, QTableWidgetItem(str(count) if count else ""))
+        
+        self.summary_label.setText(
+            f"{result.responses} responses ({result.scanned} distinct) across "
+            f"{len(result.scan_ids)} endpoints: {result.findings} findings "
+            f"({result.duplicates} repeated findings merged, {result.shared} shared by several endpoints)"
+        )
+        has_endpoints = bool(result.scan_ids)
+        self.export_html_btn.setEnabled(has_endpoints)
+        self.export_json_btn.setEnabled(has_endpoints)
+    
+    def _export_report(self, format_type: str):
+        """Export the aggregated report of the batch."""
+        if not self.result or not self.result.scan_ids:
+            return
+        
+        extension = 'html' if format_type == 'html' else 'json'
+        filename, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Security Report",
+            f"security_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}",
+            "HTML Files (*.html)" if format_type == 'html' else "JSON Files (*.json)"
+        )
+        if not filename:
+            return
+        
+        try:
+            generator = SecurityReportGenerator(self.db)
+            if format_type == 'html':
+                content = generator.generate_batch_html_report(self.result.scan_ids)
+            else:
+                content = generator.generate_batch_json_report(self.result.scan_ids)
+            
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(content)
+            
+            if format_type == 'html':
+                reply = QMessageBox.question(
+                    self,
+                    "Export Successful",
+                    "Security report saved successfully!\n\nWould you like to open it in your browser?",
+                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+                )
+                if reply == QMessageBox.StandardButton.Yes:
+                    webbrowser.open('file://' + os.path.abspath(filename))
+            else:
+                QMessageBox.information(self, "Export Successful", f"Security report saved successfully!\n\n{filename}")
+        
+        except Exception as e:
+            QMessageBox.critical(self, "Export Error", f"Failed to export report:\n{str(e)}")
+    
+    def done(self, result: int):
+        """Cancel a running scan when the dialog closes."""
+        if self.scan_thread:
+            self.scan_thread.cancel()
+            self.scan_thread.wait()
+            self.scan_thread = None
+        super().done(result)
@@ -6,22 +6,29 @@ Runs tests for all requests in a collection.
 
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
-    QLabel, QProgressBar, QTextEdit, QGroupBox, QFileDialog, QMessageBox
+    QLabel, QProgressBar, QTextEdit, QGroupBox, QFileDialog, QMessageBox, QCheckBox
 )
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from PyQt6.QtGui import QFont
-from typing import Dict, List
+from typing import Dict, List, Optional
 import webbrowser
 import os
 
 from src.core.database import DatabaseManager
 from src.core.api_client import ApiClient
-from src.features.test_engine import TestEngine, TestAssertion, TestResult
+from src.features.test_engine import TestResult
+from src.features.collection_runner import (
+    CollectionRunner, RunCheckpoint, RESUMABLE_STATUSES, load_collection
+)
+from src.features.security_batch import BatchSecurityScanner
 from src.features.variable_substitution import EnvironmentManager
 from src.features.test_report_generator import (
     HTMLReportGenerator, JUnitXMLGenerator, JSONReportGenerator, CSVReportGenerator
 )
 
+# Requests in flight when independent requests are sent in parallel
+PARALLEL_CONCURRENCY = 4
+
 
 class CollectionTestThread(QThread):
     """Thread for running collection tests."""
@@ -31,148 +38,99 @@ class CollectionTestThread(QThread):
     finished_all = pyqtSignal(dict)  # summary
     
     def __init__(self, db_path: str, api_client: ApiClient,
-                 collection_id: int, env_manager: EnvironmentManager = None):
+                 collection_id: int, env_manager: EnvironmentManager = None,
+                 data_file: str = None, resume_run_id: int = None, concurrency: int = 1):
         super().__init__()
         self.db_path = db_path
         self.api_client = api_client
         self.collection_id = collection_id
         self.env_manager = env_manager
+        self.data_file = data_file
+        self.resume_run_id = resume_run_id  # Checkpointed run to resume instead of starting one
+        self.concurrency = concurrency  # 1 sends requests in collection order
+        self._runner = None
         self._stop_requested = False
     
     def run(self):
         """Run tests for all requests in the collection."""
+        db = None
         try:
             # Create a new database connection for this thread
             db = DatabaseManager(self.db_path)
+            collection = load_collection(db, self.collection_id)
             
-            # Get all requests in collection
-            requests = db.get_requests_by_collection(self.collection_id)
-            total = len(requests)
-            
-            if total == 0:
-                self.finished_all.emit({
-                    'total_requests': 0,
-                    'total_tests': 0,
-                    'passed': 0,
-                    'failed': 0
-                })
-                return
-            
-            results = []
-            total_tests = 0
-            total_passed = 0
-            total_failed = 0
-            
-            for idx, request in enumerate(requests, 1):
-                if self._stop_requested:
-                    break
-                
-                request_name = request['name']
-                self.progress.emit(idx, total, f"Testing: {request_name}")
-                
-                # Get assertions for this request
-                assertions = db.get_test_assertions(request['id'])
-                if not assertions:
-                    continue
-                
-                # Execute request
-                try:
-                    # Apply environment variable substitution if active
-                    url = request['url']
-                    params = request.get('params', {})
-                    headers = request.get('headers', {})
-                    body = request.get('body')
-                    auth_token = request.get('auth_token', '')
-                    
-                    if self.env_manager and self.env_manager.has_active_environment():
-                        substituted, _ = self.env_manager.substitute_in_request(
-                            url, params, headers, body, auth_token
-                        )
-                        url = substituted['url']
-                        params = substituted['params']
-                        headers = substituted['headers']
-                        body = substituted['body']
-                        auth_token = substituted['auth_token']
-                    
-                    response = self.api_client.execute_request(
-                        method=request['method'],
-                        url=url,
-                        params=params,
-                        headers=headers,
-                        body=body,
-                        auth_type=request.get('auth_type', 'None'),
-                        auth_token=auth_token
-                    )
-                    
-                    # Convert assertions to TestAssertion objects
-                    test_assertions = []
-                    for a in assertions:
-                        if a.get('enabled', True):
-                            test_assertions.append(TestAssertion(
-                                assertion_id=a['id'],
-                                assertion_type=a['assertion_type'],
-                                operator=a['operator'],
-                                field=a.get('field'),
-                                expected_value=a.get('expected_value'),
-                                enabled=a.get('enabled', True)
-                            ))
-                    
-                    # Run tests
-                    test_results = TestEngine.evaluate_all(test_assertions, response)
-                    
-                    # Count results
-                    for result in test_results:
-                        total_tests += 1
-                        if result.passed:
-                            total_passed += 1
-                        else:
-                            total_failed += 1
-                    
-                    # Store results
-                    results.append({
-                        'request_id': request['id'],
-                        'request_name': request_name,
-                        'results': test_results,
-                        'success': True
-                    })
-                    
-                    self.test_completed.emit({
-                        'request_name': request_name,
-                        'test_count': len(test_results),
-                        'passed': sum(1 for r in test_results if r.passed),
-                        'failed': sum(1 for r in test_results if not r.passed)
-                    })
+            # The run is saved as each request completes, so it can be
+            # resumed if it's stopped or the app exits
+            if self.resume_run_id:
+                self._runner = CollectionRunner.resume(
+                    self.api_client,
+                    RunCheckpoint.load(db, self.resume_run_id),
+                    progress_callback=self.progress.emit,
+                    request_callback=self._on_request_completed
+                )
+            else:
+                environment = {}
+                extracted_variables = {}
+                if self.env_manager:
+                    if self.env_manager.has_active_environment():
+                        environment = self.env_manager.get_active_variables()
+                    extracted_variables = self.env_manager.get_extracted_variables()
                 
-                except Exception as e:
-                    results.append({
-                        'request_id': request['id'],
-                        'request_name': request_name,
-                        'error': str(e),
-                        'success': False
-                    })
-                    
-                    self.test_completed.emit({
-                        'request_name': request_name,
-                        'error': str(e)
-                    })
+                # Scripts change the run's own copy of the variables; the
+                # dialog commits the changes when the run ends. They take
+                # turns with the scripts of interactive sends on the UI
+                # thread (script_engine serializes all V8 use)
+                self._runner = CollectionRunner(
+                    self.api_client,
+                    environment=environment,
+                    collection_variables=collection['variables'],
+                    extracted_variables=extracted_variables,
+                    data_file=self.data_file,
+                    concurrency=self.concurrency,
+                    checkpoint=RunCheckpoint(db, self.collection_id, collection['name']),
+                    progress_callback=self.progress.emit,
+                    request_callback=self._on_request_completed
+                )
+            if self._stop_requested:
+                self._runner.stop()
             
-            # Send summary
-            self.finished_all.emit({
-                'total_requests': len(results),
-                'total_tests': total_tests,
-                'passed': total_passed,
-                'failed': total_failed,
-                'results': results
-            })
+            summary = self._runner.run(collection['requests'])
+            self.finished_all.emit(summary)
         
         except Exception as e:
             self.finished_all.emit({
                 'error': str(e)
             })
+        finally:
+            if db:
+                db.close()
+    
+    def _on_request_completed(self, entry: Dict):
+        """Report a completed request (called from the runner's worker thread)."""
+        request_name = entry['request_name']
+        if self._runner.data_file:
+            request_name = f"{request_name} (iteration {entry['iteration']})"
+        
+        if not entry['success']:
+            self.test_completed.emit({
+                'request_name': request_name,
+                'error': entry['error']
+            })
+            return
+        
+        test_results = entry['results']
+        self.test_completed.emit({
+            'request_name': request_name,
+            'test_count': len(test_results),
+            'passed': sum(1 for r in test_results if r.passed),
+            'failed': sum(1 for r in test_results if not r.passed)
+        })
     
     def stop(self):
         """Request to stop test execution."""
         self._stop_requested = True
+        if self._runner:
+            self._runner.stop()
 
 
 class CollectionTestRunnerDialog(QDialog):
@@ -187,6 +145,7 @@ class CollectionTestRunnerDialog(QDialog):
         self.collection_id = collection_id
         self.collection_name = collection_name
         self.env_manager = env_manager
+        self.data_file = None  # CSV/JSON file with one row of variables per iteration
         self.test_thread = None
         self.test_results = []  # Store all test results for export
         self.test_summary = {}  # Store summary for export
@@ -212,6 +171,10 @@ class CollectionTestRunnerDialog(QDialog):
         self.progress_label = QLabel("Ready to start...")
         progress_layout.addWidget(self.progress_label)
         
+        self.data_file_label = QLabel("Data file: none (one iteration)")
+        self.data_file_label.setProperty("class", "secondary-text")
+        progress_layout.addWidget(self.data_file_label)
+        
         self.progress_bar = QProgressBar()
         self.progress_bar.setValue(0)
         progress_layout.addWidget(self.progress_bar)
@@ -259,8 +222,31 @@ class CollectionTestRunnerDialog(QDialog):
         self.export_json_btn.setToolTip("Export as JSON for automation")
         button_layout.addWidget(self.export_json_btn)
         
+        self.security_scan_btn = QPushButton("🔒 Security Scan")
+        self.security_scan_btn.clicked.connect(self._scan_responses)
+        self.security_scan_btn.setEnabled(False)
+        self.security_scan_btn.setToolTip("Scan the responses of this run and report findings per endpoint")
+        button_layout.addWidget(self.security_scan_btn)
+        
         button_layout.addStretch()
         
+        self.resume_btn = QPushButton("⏯️ Resume")
+        self.resume_btn.clicked.connect(self._resume_tests)
+        button_layout.addWidget(self.resume_btn)
+        
+        self.parallel_check = QCheckBox("⚡ Parallel")
+        self.parallel_check.setToolTip(
+            "Send requests that share no variables at the same time.\n"
+            "Unchecked, requests are sent one by one in collection order, for collections\n"
+            "that rely on server-side effects of earlier requests (create, list, delete)."
+        )
+        button_layout.addWidget(self.parallel_check)
+        
+        self.data_file_btn = QPushButton("📂 Data File...")
+        self.data_file_btn.clicked.connect(self._choose_data_file)
+        self.data_file_btn.setToolTip("Run one iteration per row of a CSV or JSON data file")
+        button_layout.addWidget(self.data_file_btn)
+        
         self.run_btn = QPushButton("▶️ Run Tests")
         self.run_btn.clicked.connect(self._run_tests)
         self.run_btn.setProperty("class", "primary")
@@ -276,23 +262,80 @@ class CollectionTestRunnerDialog(QDialog):
         button_layout.addWidget(self.close_btn)
         
         layout.addLayout(button_layout)
+        
+        self._update_resume_button()
+    
+    def _resumable_run(self) -> Optional[Dict]:
+        """The last run of the collection, if it was stopped or interrupted."""
+        runs = self.db.get_collection_runs(self.collection_id, limit=1)
+        if runs and runs[0]['status'] in RESUMABLE_STATUSES:
+            return runs[0]
+        return None
+    
+    def _update_resume_button(self):
+        """Offer to resume the last run if it didn't complete."""
+        run = self._resumable_run()
+        self.resume_btn.setEnabled(run is not None)
+        if run:
+            self.resume_btn.setToolTip(
+                f"Resume run #{run['id']} of {run['started_at'][:19].replace('T', ' ')}: "
+                f"{run['completed_requests']}/{run['total_requests']} requests completed"
+            )
+        else:
+            self.resume_btn.setToolTip("No stopped or interrupted run to resume")
+    
+    def _choose_data_file(self):
+        """Choose (or clear) the data file of data-driven runs."""
+        filename, _ = QFileDialog.getOpenFileName(
+            self,
+            "Choose Data File",
+            "",
+            "Data Files (*.csv *.json *.jsonl *.ndjson);;All Files (*)"
+        )
+        self.data_file = filename or None
+        if self.data_file:
+            self.data_file_label.setText(f"Data file: {os.path.basename(self.data_file)} (one iteration per row)")
+        else:
+            self.data_file_label.setText("Data file: none (one iteration)")
     
     def _run_tests(self):
         """Start running tests."""
+        self._start_run()
+    
+    def _resume_tests(self):
+        """Resume the last run where it stopped."""
+        run = self._resumable_run()
+        if run:
+            self._start_run(run)
+    
+    def _start_run(self, resumed_run: Optional[Dict] = None):
+        """Start a test run, or resume a checkpointed one."""
         self.run_btn.setEnabled(False)
+        self.resume_btn.setEnabled(False)
+        self.data_file_btn.setEnabled(False)
+        self.parallel_check.setEnabled(False)
         self.stop_btn.setEnabled(True)
         self.close_btn.setEnabled(False)
         
         self.log_text.clear()
         self.summary_label.clear()
         self.progress_bar.setValue(0)
+        self.security_scan_btn.setEnabled(False)
         
-        self._log("Starting test run...\n")
+        if resumed_run:
+            self._log(
+                f"Resuming run #{resumed_run['id']}: {resumed_run['completed_requests']}/"
+                f"{resumed_run['total_requests']} requests already completed...\n"
+            )
+        else:
+            self._log("Starting test run...\n")
         
         # Create and start thread
         # Pass database path instead of database object for thread safety
         self.test_thread = CollectionTestThread(
-            self.db.db_path, self.api_client, self.collection_id, self.env_manager
+            self.db.db_path, self.api_client, self.collection_id, self.env_manager, self.data_file,
+            resume_run_id=resumed_run['id'] if resumed_run else None,
+            concurrency=PARALLEL_CONCURRENCY if self.parallel_check.isChecked() else 1
         )
         self.test_thread.progress.connect(self._on_progress)
         self.test_thread.test_completed.connect(self._on_test_completed)
@@ -330,8 +373,14 @@ class CollectionTestRunnerDialog(QDialog):
     def _on_finished(self, summary: Dict):
         """Handle test run completion."""
         self.run_btn.setEnabled(True)
+        self.data_file_btn.setEnabled(True)
+        self.parallel_check.setEnabled(True)
         self.stop_btn.setEnabled(False)
         self.close_btn.setEnabled(True)
+        self._update_resume_button()
+        
+        if 'error' not in summary:
+            self._commit_variable_changes(summary.get('variable_changes') or {})
         
         # Store results for export
         self.test_summary = summary
@@ -360,9 +409,15 @@ class CollectionTestRunnerDialog(QDialog):
             self.export_html_btn.setEnabled(True)
             self.export_junit_btn.setEnabled(True)
             self.export_json_btn.setEnabled(True)
+        self.security_scan_btn.setEnabled(
+            bool(BatchSecurityScanner.run_targets(summary.get('results', [])))
+        )
         
         self._log(f"\n{'='*50}\n")
-        self._log(f"Test Run Complete!\n")
+        if summary.get('stopped'):
+            self._log(f"Test Run Stopped! Use Resume to run the remaining requests.\n")
+        else:
+            self._log(f"Test Run Complete!\n")
         self._log(f"Requests tested: {total_requests}\n")
         self._log(f"Total assertions: {total_tests}\n")
         self._log(f"✓ Passed: {passed}\n")
@@ -386,6 +441,29 @@ class CollectionTestRunnerDialog(QDialog):
             self.summary_label.style().unpolish(self.summary_label)
             self.summary_label.style().polish(self.summary_label)
     
+    def _commit_variable_changes(self, changes: Dict[str, Dict]):
+        """
+        Write the variables the run's scripts set or unset back, once the run
+        has ended: the environment and the collection variables are each
+        updated with a single write.
+        """
+        environment = changes.get('environment') or {}
+        collection_variables = changes.get('collection_variables') or {}
+        saved = 0
+        try:
+            if environment and self.env_manager and self.env_manager.has_active_environment():
+                self.env_manager.update_variables(environment)
+                saved += len(environment)
+            if collection_variables:
+                self.db.update_collection_variables(self.collection_id, collection_variables)
+                saved += len(collection_variables)
+        except Exception as e:
+            self._log(f"\n❌ Failed to save variable changes: {e}\n")
+            return
+        
+        if saved:
+            self._log(f"\nSaved {saved} variable change(s) made by scripts\n")
+    
     def _log(self, message: str):
         """Add message to log."""
         self.log_text.append(message.rstrip())
@@ -510,6 +588,20 @@ class CollectionTestRunnerDialog(QDialog):
         except Exception as e:
             QMessageBox.critical(self, "Export Error", f"Failed to export JSON:\n{str(e)}")
     
+    def _scan_responses(self):
+        """Run a security scan over the responses of the last run."""
+        from src.ui.dialogs.batch_security_scan_dialog import BatchSecurityScanDialog
+        
+        targets = BatchSecurityScanner.run_targets(self.test_summary.get('results', []), self.collection_id)
+        if not targets:
+            QMessageBox.warning(self, "No Responses", "No responses to scan!")
+            return
+        
+        dialog = BatchSecurityScanDialog(
+            self.db, targets, scan_name=f"Collection run: {self.collection_name}", parent=self
+        )
+        dialog.exec()
+    
     def closeEvent(self, event):
         """Handle dialog close event - clean up test thread."""
         if self.test_thread and self.test_thread.isRunning():
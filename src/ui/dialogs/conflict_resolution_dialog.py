@@ -144,6 +144,7 @@ class ConflictResolutionDialog(QDialog):
         new_files = self.conflicts.get('new_files', [])
         modified_files = self.conflicts.get('modified_files', [])
         new_db_items = self.conflicts.get('new_db_items', [])
+        modified_db_items = self.conflicts.get('modified_db_items', [])
         
         if new_files:
             html += f"<b>New/Updated Files in Filesystem ({len(new_files)}):</b><br>"
@@ -169,6 +170,14 @@ class ConflictResolutionDialog(QDialog):
                 html += f"  ... and {len(new_db_items) - 5} more<br>"
             html += "<br>"
         
+        if modified_db_items:
+            html += f"<b>Modified Items in Database ({len(modified_db_items)}):</b><br>"
+            for item in modified_db_items[:5]:
+                html += f"  • {item.get('name', 'Unknown')} ({item.get('type', 'unknown')})<br>"
+            if len(modified_db_items) > 5:
+                html += f"  ... and {len(modified_db_items) - 5} more<br>"
+            html += "<br>"
+        
         return html
     
     def _apply_resolution(self):
@@ -8,15 +8,59 @@ from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
     QLineEdit, QCheckBox, QGroupBox, QTextEdit, QFileDialog,
     QMessageBox, QTabWidget, QWidget, QTableWidget, QTableWidgetItem,
-    QHeaderView
+    QHeaderView, QProgressDialog
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
 
 from src.core.database import DatabaseManager
 from src.features.git_sync_manager import GitSyncManager, GitSyncConfig, SyncStatus
+from src.features.split_collection import LAYOUT_SINGLE, LAYOUT_SPLIT
 from src.features.secrets_manager import SecretsManager
 
 
+class GitSyncThread(QThread):
+    """Runs a push to or pull from the workspace files in the background."""
+    
+    progress = pyqtSignal(int, int, str)  # done, total, message
+    sync_finished = pyqtSignal(bool, str)  # success, message
+    
+    DIRECTION_PUSH = "push"
+    DIRECTION_PULL = "pull"
+    
+    def __init__(self, db_path: str, project_path: str, direction: str, update_existing: bool = True):
+        super().__init__()
+        self.db_path = db_path
+        self.project_path = project_path
+        self.direction = direction
+        self.update_existing = update_existing
+        self._stop_requested = False
+    
+    def run(self):
+        """Sync using a database connection owned by this thread."""
+        db = DatabaseManager(self.db_path)
+        try:
+            manager = GitSyncManager(db, GitSyncConfig(self.project_path))
+            if self.direction == self.DIRECTION_PUSH:
+                success, message = manager.sync_to_filesystem(self.progress.emit, self.is_cancelled)
+            else:
+                success, message = manager.sync_from_filesystem(
+                    self.update_existing, self.progress.emit, self.is_cancelled
+                )
+        except Exception as e:
+            success, message = False, f"Sync failed: {str(e)}"
+        finally:
+            db.close()
+        self.sync_finished.emit(success, message)
+    
+    def cancel(self):
+        """Stop after the item currently being processed."""
+        self._stop_requested = True
+    
+    def is_cancelled(self) -> bool:
+        """Check whether cancellation was requested."""
+        return self._stop_requested
+
+
 class GitSyncDialog(QDialog):
     """Dialog for Git sync configuration and management."""
     
@@ -37,6 +81,8 @@ class GitSyncDialog(QDialog):
         self.git_sync_manager = None
         self.secrets_manager = None
         self.current_workspace = None
+        self.sync_thread = None
+        self.sync_progress = None
         
         self.setWindowTitle("Git Sync Settings")
         self.setMinimumSize(700, 500)
@@ -112,6 +158,14 @@ class GitSyncDialog(QDialog):
         self.create_gitignore_checkbox.setChecked(True)
         config_layout.addWidget(self.create_gitignore_checkbox)
         
+        self.split_layout_checkbox = QCheckBox("Store each request in its own file (recommended for large collections)")
+        self.split_layout_checkbox.setToolTip(
+            "Saves every collection as a folder with one file per request and folder,\n"
+            "so editing a request only rewrites that file and keeps Git diffs small."
+        )
+        self.split_layout_checkbox.toggled.connect(self._on_split_layout_toggled)
+        config_layout.addWidget(self.split_layout_checkbox)
+        
         config_group.setLayout(config_layout)
         layout.addWidget(config_group)
         
@@ -320,9 +374,29 @@ class GitSyncDialog(QDialog):
             # Update auto-sync checkbox
             self.auto_sync_checkbox.setChecked(self.current_workspace.get('auto_sync', True))
             
+            # Reflect the workspace's collection layout without converting it
+            self.split_layout_checkbox.blockSignals(True)
+            self.split_layout_checkbox.setChecked(self.git_sync_manager.get_collection_layout() == LAYOUT_SPLIT)
+            self.split_layout_checkbox.blockSignals(False)
+            
             # Refresh status
             self._refresh_status()
     
+    def _on_split_layout_toggled(self, checked: bool):
+        """Convert the active workspace's collection files to the selected layout."""
+        if not self.current_workspace or not self.git_sync_manager:
+            # Applied when Git sync is enabled
+            return
+        
+        layout = LAYOUT_SPLIT if checked else LAYOUT_SINGLE
+        success, message = self.git_sync_manager.set_collection_layout(layout)
+        if success:
+            QMessageBox.information(self, "Collection Layout Changed",
+                                    f"{message}\n\nDon't forget to commit the converted files to Git!")
+            self._refresh_status()
+        else:
+            QMessageBox.warning(self, "Layout Change Failed", message)
+    
     def _browse_directory(self):
         """Browse for project directory."""
         directory = QFileDialog.getExistingDirectory(
@@ -376,7 +450,8 @@ class GitSyncDialog(QDialog):
         else:
             # Initialize new workspace
             create_gitignore = self.create_gitignore_checkbox.isChecked()
-            success, message = self.git_sync_manager.initialize_workspace(create_gitignore)
+            layout = LAYOUT_SPLIT if self.split_layout_checkbox.isChecked() else LAYOUT_SINGLE
+            success, message = self.git_sync_manager.initialize_workspace(create_gitignore, layout)
             
             if not success:
                 QMessageBox.warning(self, "Initialization Failed", message)
@@ -513,7 +588,14 @@ class GitSyncDialog(QDialog):
                 changes_html += f"  • {item['name']} ({item['type']})<br>"
             changes_html += "<br>"
         
-        if not any([changes.get('new_files'), changes.get('modified_files'), changes.get('new_db_items')]):
+        if changes.get('modified_db_items'):
+            changes_html += "<b>Modified items in database:</b><br>"
+            for item in changes['modified_db_items']:
+                changes_html += f"  • {item['name']} ({item['type']})<br>"
+            changes_html += "<br>"
+        
+        if not any([changes.get('new_files'), changes.get('modified_files'), changes.get('new_db_items'),
+                    changes.get('modified_db_items')]):
             changes_html += "No changes detected"
         
         self.changes_text.setHtml(changes_html)
@@ -523,8 +605,10 @@ class GitSyncDialog(QDialog):
         if not self.git_sync_manager:
             return
         
-        success, message = self.git_sync_manager.sync_to_filesystem()
-        
+        self._start_sync_thread(GitSyncThread.DIRECTION_PUSH, "Exporting to .postmini/...")
+    
+    def _on_sync_to_filesystem_finished(self, success: bool, message: str):
+        """Report the result of an export."""
         if success:
             # Update workspace timestamp
             if self.current_workspace:
@@ -564,23 +648,75 @@ class GitSyncDialog(QDialog):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            success, message = self.git_sync_manager.sync_from_filesystem(update_existing=True)
+            self._start_sync_thread(GitSyncThread.DIRECTION_PULL, "Importing from .postmini/...")
+    
+    def _on_sync_from_filesystem_finished(self, success: bool, message: str):
+        """Report the result of an import."""
+        if success:
+            # Update workspace timestamp
+            if self.current_workspace:
+                self.db.update_git_workspace_sync_timestamp(self.current_workspace['id'])
             
-            if success:
-                # Update workspace timestamp
-                if self.current_workspace:
-                    self.db.update_git_workspace_sync_timestamp(self.current_workspace['id'])
-                
-                self._refresh_status()
-                self.sync_performed.emit(message)
-                QMessageBox.information(
-                    self, 
-                    "Import Successful", 
-                    f"{message}\n\n"
-                    "✅ Collections imported from .postmini/ folder"
-                )
-            else:
-                QMessageBox.warning(self, "Import Failed", message)
+            self._refresh_status()
+            self.sync_performed.emit(message)
+            QMessageBox.information(
+                self, 
+                "Import Successful", 
+                f"{message}\n\n"
+                "✅ Collections imported from .postmini/ folder"
+            )
+        else:
+            # Items imported before a cancellation are kept
+            self._refresh_status()
+            self.sync_performed.emit(message)
+            QMessageBox.warning(self, "Import Failed", message)
+    
+    def _start_sync_thread(self, direction: str, label: str):
+        """Run a push or pull in the background with a cancellable progress dialog."""
+        if self.sync_thread and self.sync_thread.isRunning():
+            return
+        
+        self.sync_to_fs_button.setEnabled(False)
+        self.sync_from_fs_button.setEnabled(False)
+        
+        self.sync_progress = QProgressDialog(label, "Cancel", 0, 0, self)
+        self.sync_progress.setWindowTitle("Git Sync")
+        self.sync_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.sync_progress.setMinimumDuration(300)
+        self.sync_progress.setAutoClose(False)
+        self.sync_progress.setAutoReset(False)
+        
+        self.sync_thread = GitSyncThread(self.db.db_path, str(self.git_sync_manager.config.project_path), direction)
+        self.sync_thread.progress.connect(self._on_sync_progress)
+        self.sync_thread.sync_finished.connect(self._on_sync_thread_finished)
+        self.sync_progress.canceled.connect(self.sync_thread.cancel)
+        self.sync_thread.start()
+    
+    def _on_sync_progress(self, done: int, total: int, message: str):
+        """Show the progress of the running sync."""
+        if self.sync_progress:
+            self.sync_progress.setMaximum(total)
+            self.sync_progress.setValue(done)
+            self.sync_progress.setLabelText(message)
+    
+    def _on_sync_thread_finished(self, success: bool, message: str):
+        """Close the progress dialog and report the result."""
+        direction = self.sync_thread.direction
+        self.sync_thread.wait()
+        self.sync_thread = None
+        
+        if self.sync_progress:
+            self.sync_progress.canceled.disconnect()
+            self.sync_progress.close()
+            self.sync_progress = None
+        
+        self.sync_to_fs_button.setEnabled(self.current_workspace is not None)
+        self.sync_from_fs_button.setEnabled(self.current_workspace is not None)
+        
+        if direction == GitSyncThread.DIRECTION_PUSH:
+            self._on_sync_to_filesystem_finished(success, message)
+        else:
+            self._on_sync_from_filesystem_finished(success, message)
     
     def _show_git_commands(self):
         """Show Git commands dialog with copy functionality."""
@@ -744,3 +880,15 @@ git pull
         if self.git_sync_manager:
             self._refresh_status()
 
+    
+    def done(self, result: int):
+        """Stop a running sync before the dialog closes."""
+        if self.sync_thread and self.sync_thread.isRunning():
+            self.sync_thread.sync_finished.disconnect()
+            self.sync_thread.cancel()
+            self.sync_thread.wait()
+            self.sync_thread = None
+        if self.sync_progress:
+            self.sync_progress.close()
+            self.sync_progress = None
+        super().done(result)
@@ -0,0 +1,377 @@
+"""
+Load Test Dialog
+
+Load tests a collection or a single request in the background, shows
+throughput, error rate and latency percentiles live and exports the results
+as HTML or JSON reports.
+"""
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QGridLayout, QPushButton, QLabel,
+    QComboBox, QSpinBox, QDoubleSpinBox, QGroupBox, QTableWidget, QTableWidgetItem,
+    QHeaderView, QFileDialog, QMessageBox
+)
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtGui import QFont
+from typing import Dict, Optional
+from datetime import datetime
+import webbrowser
+import os
+
+from src.core.database import DatabaseManager
+from src.core.api_client import ApiClient
+from src.features.collection_runner import load_collection
+from src.features.load_test import LoadTest, MODE_CONCURRENCY, MODE_RATE
+from src.features.variable_substitution import EnvironmentManager
+from src.features.test_report_generator import LoadTestHTMLReportGenerator, LoadTestJSONReportGenerator
+
+
+class LoadTestThread(QThread):
+    """Runs a load test in the background."""
+    
+    progress = pyqtSignal(dict)  # snapshot of the results so far
+    load_finished = pyqtSignal(object, str)  # final snapshot (or None), error message
+    
+    def __init__(self, db_path: str, collection_id: int, request_id: Optional[int],
+                 environment: Dict[str, str], extracted_variables: Dict[str, str],
+                 profile: Dict, timeout: int = 30, verify_ssl: bool = True):
+        """
+        Args:
+            db_path: Database path (the thread opens its own connection)
+            collection_id: Collection to load test
+            request_id: Only load test this request of the collection (optional)
+            environment: Variables of the active environment
+            extracted_variables: Extracted variables
+            profile: LoadTest arguments: duration, concurrency, target_rps, ramp_up
+            timeout: Request timeout in seconds
+            verify_ssl: Whether to verify SSL certificates
+        """
+        super().__init__()
+        self.db_path = db_path
+        self.collection_id = collection_id
+        self.request_id = request_id
+        self.environment = environment
+        self.extracted_variables = extracted_variables
+        self.profile = profile
+        self.timeout = timeout
+        self.verify_ssl = verify_ssl
+        self._load_test = None
+        self._stop_requested = False
+    
+    def run(self):
+        """Load test with a database connection and HTTP session owned by this thread."""
+        db = DatabaseManager(self.db_path)
+        # A session of its own, so the load doesn't share the app's connection pool
+        api_client = ApiClient(timeout=self.timeout, verify_ssl=self.verify_ssl)
+        try:
+            collection = load_collection(db, self.collection_id)
+            requests = collection['requests']
+            if self.request_id is not None:
+                requests = [r for r in requests if r['id'] == self.request_id]
+            
+            self._load_test = LoadTest(
+                api_client,
+                requests,
+                environment=self.environment,
+                collection_variables=collection['variables'],
+                extracted_variables=self.extracted_variables,
+                progress_callback=self.progress.emit,
+                **self.profile
+            )
+            if self._stop_requested:
+                self._load_test.stop()
+            result, error = self._load_test.run(), ""
+        except Exception as e:
+            result, error = None, f"Load test failed: {str(e)}"
+        finally:
+            api_client.close()
+            db.close()
+        self.load_finished.emit(result, error)
+    
+    def stop(self):
+        """Stop sending; requests in flight are completed."""
+        self._stop_requested = True
+        if self._load_test:
+            self._load_test.stop()
+
+
+class LoadTestDialog(QDialog):
+    """Dialog that configures and runs a load test and exports its report."""
+    
+    LATENCY_COLUMNS = (('p50', 'p50'), ('p90', 'p90'), ('p99', 'p99'), ('p999', 'p99.9'), ('max', 'Max'))
+    
+    def __init__(self, db: DatabaseManager, api_client: ApiClient, collection_id: int,
+                 name: str, request_id: Optional[int] = None,
+                 env_manager: EnvironmentManager = None, parent=None):
+        """
+        Args:
+            db: DatabaseManager instance
+            api_client: The app's ApiClient (for its timeout and SSL settings)
+            collection_id: Collection to load test
+            name: Name of the collection or request, shown in the title
+            request_id: Only load test this request of the collection (optional)
+            env_manager: Environment manager for the active environment's variables
+        """
+        super().__init__(parent)
+        self.db = db
+        self.api_client = api_client
+        self.collection_id = collection_id
+        self.name = name
+        self.request_id = request_id
+        self.env_manager = env_manager
+        self.load_thread = None
+        self.result: Optional[Dict] = None
+        
+        self.setWindowTitle(f"Load Test: {name}")
+        self.setGeometry(200, 200, 850, 600)
+        
+        self._init_ui()
+    
+    def _init_ui(self):
+        """Initialize the user interface."""
+        layout = QVBoxLayout(self)
+        
+        title = QLabel(f"📈 Load Test: {self.name}")
+        title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
+        layout.addWidget(title)
+        
+        # Load profile
+        profile_group = QGroupBox("Load Profile")
+        form = QFormLayout(profile_group)
+        
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItem("Concurrency (workers send back to back)", MODE_CONCURRENCY)
+        self.mode_combo.addItem("Target rate (requests per second)", MODE_RATE)
+        self.mode_combo.currentIndexChanged.connect(self._update_mode)
+        form.addRow("Mode:", self.mode_combo)
+        
+        self.concurrency_spin = QSpinBox()
+        self.concurrency_spin.setRange(1, 1000)
+        self.concurrency_spin.setValue(10)
+        self.concurrency_spin.setToolTip("Number of workers, i.e. requests in flight at once")
+        form.addRow("Workers:", self.concurrency_spin)
+        
+        self.rps_spin = QDoubleSpinBox()
+        self.rps_spin.setRange(0.1, 100000)
+        self.rps_spin.setValue(50)
+        self.rps_spin.setSuffix(" req/s")
+        form.addRow("Target rate:", self.rps_spin)
+        
+        self.ramp_up_spin = QSpinBox()
+        self.ramp_up_spin.setRange(0, 3600)
+        self.ramp_up_spin.setSuffix(" s")
+        self.ramp_up_spin.setToolTip("Seconds over which the workers start, or the rate rises from zero")
+        form.addRow("Ramp-up:", self.ramp_up_spin)
+        
+        self.duration_spin = QSpinBox()
+        self.duration_spin.setRange(1, 86400)
+        self.duration_spin.setValue(30)
+        self.duration_spin.setSuffix(" s")
+        form.addRow("Duration:", self.duration_spin)
+        
+        layout.addWidget(profile_group)
+        self._update_mode()
+        
+        # Live results
+        stats_group = QGroupBox("Results")
+        stats_layout = QGridLayout(stats_group)
+        self.stat_labels = {}
+        stats = [
+            ('elapsed', "Elapsed"), ('total_requests', "Requests"), ('current_rps', "Requests/s"),
+            ('error_rate', "Error rate"), ('p50', "p50"), ('p90', "p90"), ('p99', "p99"), ('p999', "p99.9")
+        ]
+        for position, (key, label) in enumerate(stats):
+            caption = QLabel(label)
+            caption.setStyleSheet("color: #888;")
+            value = QLabel("-")
+            value.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+            stats_layout.addWidget(caption, (position // 4) * 2, position % 4)
+            stats_layout.addWidget(value, (position // 4) * 2 + 1, position % 4)
+            self.stat_labels[key] = value
+        layout.addWidget(stats_group)
+        
+        # Latency per request
+        self.requests_table = QTableWidget()
+        self.requests_table.setColumnCount(3 + len(self.LATENCY_COLUMNS))
+        self.requests_table.setHorizontalHeaderLabels(
+            ['REQUEST', 'COUNT', 'ERRORS'] + [f"{label} (ms)" for _, label in self.LATENCY_COLUMNS]
+        )
+        self.requests_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.requests_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.requests_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        layout.addWidget(self.requests_table)
+        
+        self.status_label = QLabel("Configure the load profile and press Start.")
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+        
+        # Buttons
+        button_layout = QHBoxLayout()
+        
+        self.export_html_btn = QPushButton("📄 Export HTML")
+        self.export_html_btn.clicked.connect(lambda: self._export_report('html'))
+        self.export_html_btn.setEnabled(False)
+        button_layout.addWidget(self.export_html_btn)
+        
+        self.export_json_btn = QPushButton("🔧 Export JSON")
+        self.export_json_btn.clicked.connect(lambda: self._export_report('json'))
+        self.export_json_btn.setEnabled(False)
+        button_layout.addWidget(self.export_json_btn)
+        
+        button_layout.addStretch()
+        
+        self.start_btn = QPushButton("▶️ Start")
+        self.start_btn.clicked.connect(self._start_load_test)
+        button_layout.addWidget(self.start_btn)
+        
+        self.stop_btn = QPushButton("⏹️ Stop")
+        self.stop_btn.clicked.connect(self._stop_load_test)
+        self.stop_btn.setEnabled(False)
+        button_layout.addWidget(self.stop_btn)
+        
+        self.close_btn = QPushButton("Close")
+        self.close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(self.close_btn)
+        
+        layout.addLayout(button_layout)
+    
+    def _update_mode(self):
+        """Enable the target rate in rate mode only."""
+        self.rps_spin.setEnabled(self.mode_combo.currentData() == MODE_RATE)
+    
+    def _profile(self) -> Dict:
+        """The LoadTest arguments set in the form."""
+        return {
+            'duration': float(self.duration_spin.value()),
+            'concurrency': self.concurrency_spin.value(),
+            'target_rps': self.rps_spin.value() if self.mode_combo.currentData() == MODE_RATE else None,
+            'ramp_up': float(min(self.ramp_up_spin.value(), self.duration_spin.value()))
+        }
+    
+    def _start_load_test(self):
+        """Start the load test in the background."""
+        environment = {}
+        extracted_variables = {}
+        if self.env_manager:
+            if self.env_manager.has_active_environment():
+                environment = self.env_manager.get_active_variables()
+            extracted_variables = self.env_manager.get_extracted_variables()
+        
+        self.result = None
+        self.export_html_btn.setEnabled(False)
+        self.export_json_btn.setEnabled(False)
+        self.start_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self.status_label.setText("Running...")
+        
+        self.load_thread = LoadTestThread(
+            self.db.db_path, self.collection_id, self.request_id, environment, extracted_variables,
+            self._profile(), timeout=self.api_client.timeout, verify_ssl=self.api_client.verify_ssl
+        )
+        self.load_thread.progress.connect(self._show_snapshot)
+        self.load_thread.load_finished.connect(self._on_finished)
+        self.load_thread.start()
+    
+    def _stop_load_test(self):
+        """Stop the running load test."""
+        if self.load_thread:
+            self.status_label.setText("Stopping...")
+            self.load_thread.stop()
+    
+    def _show_snapshot(self, snapshot: Dict):
+        """Show the results so far."""
+        latency = snapshot['latency']
+        self.stat_labels['elapsed'].setText(f"{snapshot['elapsed']:.0f} / {snapshot['duration']:.0f} s")
+        self.stat_labels['total_requests'].setText(str(snapshot['total_requests']))
+        self.stat_labels['current_rps'].setText(f"{snapshot['current_rps']:.1f}")
+        self.stat_labels['error_rate'].setText(f"{snapshot['error_rate'] * 100:.2f}%")
+        for key in ('p50', 'p90', 'p99', 'p999'):
+            self.stat_labels[key].setText(f"{latency[key]:.1f} ms")
+        
+        self.requests_table.setRowCount(len(snapshot['requests']))
+        for row, request in enumerate(snapshot['requests']):
+            self.requests_table.setItem(row, 0, QTableWidgetItem(f"{request['method']} {request['name']}"))
+            self.requests_table.setItem(row, 1, QTableWidgetItem(str(request['requests'])))
+            self.requests_table.setItem(row, 2, QTableWidgetItem(str(request['errors'] + request['failed'])))
+            for column, (key, _) in enumerate(self.LATENCY_COLUMNS, 3):
+                self.requests_table.setItem(row, column, QTableWidgetItem(f"{request['latency'][key]:.1f}"))
+    
+    def _on_finished(self, result: Optional[Dict], error: str):
+        """Show the final results."""
+        if self.load_thread:
+            self.load_thread.wait()
+            self.load_thread = None
+        self.start_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        
+        if result is None:
+            self.status_label.setText(error)
+            return
+        
+        self.result = result
+        self._show_snapshot(result)
+        # The live value is of the last second; the final one is the average
+        self.stat_labels['current_rps'].setText(f"{result['throughput']:.1f}")
+        
+        status = "Load test stopped." if result['stopped'] else "Load test complete."
+        codes = ', '.join(f"{code}: {count}" for code, count in result['status_codes'].items())
+        status += f" {result['total_requests']} requests at {result['throughput']:.1f} req/s"
+        if codes:
+            status += f" (HTTP {codes})"
+        if result['errors']:
+            status += f", {result['errors']} failed to send: " + '; '.join(list(result['error_messages'])[:3])
+        self.status_label.setText(status)
+        
+        has_requests = result['total_requests'] > 0
+        self.export_html_btn.setEnabled(has_requests)
+        self.export_json_btn.setEnabled(has_requests)
+    
+    def _export_report(self, format_type: str):
+        """Export the report of the load test."""
+        if not self.result:
+            return
+        
+        extension = 'html' if format_type == 'html' else 'json'
+        filename, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Load Test Report",
+            f"load_test_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}",
+            "HTML Files (*.html)" if format_type == 'html' else "JSON Files (*.json)"
+        )
+        if not filename:
+            return
+        
+        try:
+            metadata = {'name': self.name}
+            if self.env_manager and self.env_manager.has_active_environment():
+                metadata['environment'] = self.env_manager.get_active_environment_name()
+            if format_type == 'html':
+                content = LoadTestHTMLReportGenerator.generate(self.result, metadata)
+            else:
+                content = LoadTestJSONReportGenerator.generate(self.result, metadata)
+            
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(content)
+            
+            if format_type == 'html':
+                reply = QMessageBox.question(
+                    self,
+                    "Export Successful",
+                    "Load test report saved successfully!\n\nWould you like to open it in your browser?",
+                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+                )
+                if reply == QMessageBox.StandardButton.Yes:
+                    webbrowser.open('file://' + os.path.abspath(filename))
+            else:
+                QMessageBox.information(self, "Export Successful", f"Load test report saved successfully!\n\n{filename}")
+        
+        except Exception as e:
+            QMessageBox.critical(self, "Export Error", f"Failed to export report:\n{str(e)}")
+    
+    def done(self, result: int):
+        """Stop a running load test when the dialog closes."""
+        if self.load_thread:
+            self.load_thread.stop()
+            self.load_thread.wait()
+            self.load_thread = None
+        super().done(result)
@@ -14,10 +14,10 @@ from PyQt6.QtWidgets import (
     QSizePolicy, QDialog, QStyledItemDelegate, QMenu, QGroupBox, QTabBar, QTreeWidgetItemIterator,
     QDialogButtonBox, QAbstractItemView
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSize
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSize, QTimer
 from PyQt6.QtGui import QFont, QAction, QKeySequence, QShortcut, QBrush, QColor, QPalette, QPainter, QPen
 import json
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, TYPE_CHECKING
 
 from src.core.database import DatabaseManager
 from src.core.api_client import ApiClient, ApiResponse
@@ -25,12 +25,7 @@ from src.core.app_paths import AppPaths
 from src.features.variable_substitution import EnvironmentManager
 from src.features.collection_io import CollectionExporter, CollectionImporter, get_safe_filename
 from src.features.script_engine import ScriptEngine, ScriptExecutionError, ScriptTimeoutError
-from src.ui.dialogs.code_snippet_dialog import CodeSnippetDialog
 from src.ui.widgets.history_panel_widget import HistoryPanelWidget
-from src.ui.dialogs.oauth_dialog import OAuthConfigDialog
-from src.ui.dialogs.update_dialog import UpdateAvailableDialog, UpdateProgressDialog, NoUpdateDialog
-from src.features.oauth_manager import OAuthManager
-from src.features.auto_updater import UpdateChecker, UpdateDownloader, UpdateInstaller
 from src.ui.widgets.test_tab_widget import TestTabWidget
 from src.ui.widgets.test_results_viewer import TestResultsViewer
 from src.ui.widgets.script_tab_widget import ScriptTabWidget
@@ -39,7 +34,6 @@ from src.ui.widgets.syntax_highlighter import apply_syntax_highlighting
 from src.ui.widgets.recent_requests_widget import RecentRequestsWidget
 from src.ui.widgets.method_badge import MethodBadge, StatusBadge
 from src.ui.widgets.variable_extraction_widget import VariableExtractionWidget
-from src.ui.widgets.security_scan_tab import SecurityScanTab
 from src.ui.widgets.variable_inspector_widget import VariableInspectorDialog
 from src.ui.widgets.settings_panel import SettingsPanel
 from src.ui.widgets.git_sync_panel import GitSyncPanel
@@ -49,18 +43,28 @@ from src.ui.widgets.variable_library_widget import VariableLibraryWidget
 from src.ui.widgets.variable_highlight_delegate import VariableSyntaxHighlighter, VariableHighlightDelegate, HighlightedLineEdit
 from src.ui.widgets.empty_state import NoRequestEmptyState, NoResponseEmptyState, NoCollectionsEmptyState
 from src.features.test_engine import TestEngine, TestAssertion
-from src.features.security_scanner import SecurityScanner
-from src.features.security_report_generator import SecurityReportGenerator
-from src.ui.dialogs.collection_test_runner import CollectionTestRunnerDialog
-from src.ui.dialogs.git_sync_dialog import GitSyncDialog
-from src.ui.dialogs.conflict_resolution_dialog import ConflictResolutionDialog
-from src.ui.dialogs.curl_import_dialog import CurlImportDialog
+from src.features.security_scanner import BODY_CHUNK_SIZE, DEFAULT_TIME_BUDGET, SecurityScanner
+from src.features.security_rules import load_installed_rule_packs
 from src.features.git_sync_manager import GitSyncManager, GitSyncConfig, SyncStatus
 from src.features.secrets_manager import SecretsManager
+from src.features.workspace_watcher import WorkspaceWatcher
 from src.features.curl_converter import CurlConverter
+from src.features.tab_hibernation import TabHibernator
+from src.features.param_sync import (
+    PARAM_SYNC_DEBOUNCE_MS, parse_query_params, build_url_with_params, diff_param_rows
+)
+from src.ui.widgets.lazy_panel import LazyPanel
+from src.core.startup_trace import startup_trace
+
+# Dialogs and subsystems that are only needed on demand (OAuth, updates,
+# collection runner, Git sync, security reports, ...) are imported where they
+# are first used to keep them off the startup path.
+# See tests/test_import_time.py.
+if TYPE_CHECKING:
+    from src.ui.widgets.security_scan_tab import SecurityScanTab
+    from src.ui.dialogs.update_dialog import UpdateProgressDialog
 from datetime import datetime
 import requests
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
 
 class ReorderableTreeWidget(QTreeWidget):
@@ -452,6 +456,47 @@ class RequestThread(QThread):
             self.error.emit(str(e))
 
 
+class GitSyncStatusThread(QThread):
+    """
+    Thread for computing the Git sync status without blocking the UI.
+    
+    Uses its own database connection since SQLite connections cannot be
+    shared across threads. The connection is read-only, so checks never
+    compete with writes of the UI thread: the updated sync manifest is sent
+    back with the status for the UI thread to save.
+    """
+    status_ready = pyqtSignal(object, object)  # Emits SyncStatus, manifest update (or None)
+    
+    def __init__(self, db_path: str, project_path: str, changed_paths: Optional[List[str]] = None):
+        """
+        Args:
+            db_path: Database path (the thread opens its own connection)
+            project_path: Git sync workspace
+            changed_paths: Only re-check the collections of these files
+                (None checks everything)
+        """
+        super().__init__()
+        self.db_path = db_path
+        self.project_path = project_path
+        self.changed_paths = changed_paths
+    
+    def run(self):
+        """Detect changes in a separate thread."""
+        db = None
+        manifest_update = None
+        try:
+            db = DatabaseManager(self.db_path, read_only=True)
+            manager = GitSyncManager(db, GitSyncConfig(self.project_path))
+            status = manager.get_sync_status(save_manifest=False, changed_paths=self.changed_paths)
+            manifest_update = manager.manifest.pending_update()
+        except Exception as e:
+            status = SyncStatus(SyncStatus.STATUS_ERROR, f"Status check failed: {e}")
+        finally:
+            if db:
+                db.close()
+        self.status_ready.emit(status, manifest_update)
+
+
 class NoPaddingDelegate(QStyledItemDelegate):
     """Custom delegate to remove padding from table cell editors and highlight variables."""
     
@@ -775,15 +820,19 @@ class MainWindow(QMainWindow):
         super().__init__()
         
         # Initialize database and API client
-        self.db = DatabaseManager(db_path=db_path)
+        with startup_trace.section("database"):
+            self.db = DatabaseManager(db_path=db_path)
         self.api_client = ApiClient()
         
         # Initialize script engine
-        self.script_engine = ScriptEngine(timeout_ms=5000)
+        with startup_trace.section("script_engine"):
+            self.script_engine = ScriptEngine(timeout_ms=5000)
         
-        # Initialize security scanner
-        self.security_scanner = SecurityScanner()
-        self.security_report_generator = SecurityReportGenerator(self.db)
+        # Initialize security scanner with the user's rule packs
+        # Scans run on the UI thread, so they are bounded in time as well as size
+        self.security_scanner = SecurityScanner(
+            time_budget=DEFAULT_TIME_BUDGET, rule_packs=load_installed_rule_packs()
+        )
         
         # Initialize environment manager with database reference for variable persistence
         self.env_manager = EnvironmentManager(db=self.db)
@@ -797,11 +846,23 @@ class MainWindow(QMainWindow):
         self.secrets_manager = None
         self.git_workspace = None
         
+        # Git sync status is computed on a background thread
+        self.git_sync_status_thread = None
+        self._git_sync_status_stale = False  # Re-check requested while a check was running
+        self._git_sync_stale_paths = None  # Files changed for that re-check (None: check everything)
+        self._git_sync_full_check = True  # The stored manifest may miss file changes
+        self._git_sync_prompt_pull = False  # Offer to import changes found by the startup check
+        
+        # Workspace file changes are watched; the timer only checks the cheap
+        # DB fingerprint (or does a full refresh if the watcher is unavailable)
+        self.git_sync_watcher = None
+        self._git_sync_fingerprint = None
+        
         # Git sync status refresh timer
         from PyQt6.QtCore import QTimer
         self.git_sync_timer = QTimer()
-        self.git_sync_timer.timeout.connect(self._update_git_sync_status)
-        self.git_sync_timer.setInterval(30000)  # Refresh every 30 seconds
+        self.git_sync_timer.timeout.connect(self._on_git_sync_timer)
+        self.git_sync_timer.setInterval(5000)  # DB fingerprint check every 5 seconds
         
         # Theme management
         self.current_theme = theme  # Initialize with provided theme
@@ -821,6 +882,14 @@ class MainWindow(QMainWindow):
         # URL-Params sync flag (prevent infinite loop)
         self._syncing_params = False
         
+        # Debounced URL-Params sync: bursts of edits are coalesced and the
+        # side edited last ('url' or 'params') wins when the timer fires
+        self._pending_param_sync = None
+        self.param_sync_timer = QTimer()
+        self.param_sync_timer.setSingleShot(True)
+        self.param_sync_timer.setInterval(PARAM_SYNC_DEBOUNCE_MS)
+        self.param_sync_timer.timeout.connect(self._flush_param_sync)
+        
         # Track active threads
         self.request_thread = None
         self.update_checker_thread = None
@@ -828,6 +897,7 @@ class MainWindow(QMainWindow):
         
         # UI state tracking
         self.response_panel_collapsed = False
+        self._closed = False  # Set by closeEvent; timers must not touch the closed DB
         
         # Search tracking
         self.search_matches = []
@@ -837,7 +907,8 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("PostMini - Desktop API Client")
         self.setGeometry(100, 100, 1400, 750)  # Reduced height for better fit on 1920x1080 screens
         
-        self._init_ui()
+        with startup_trace.section("init_ui"):
+            self._init_ui()
         
         # Connect environment manager to URL input for variable highlighting
         self.url_input.set_environment_manager(self.env_manager)
@@ -857,10 +928,13 @@ class MainWindow(QMainWindow):
             self.test_tab.set_main_window(self)
         
         self._setup_shortcuts()
-        self._load_collections()
-        self._load_environments()
-        self._load_extracted_variables()  # Load extracted variables into env_manager
-        self._init_git_sync()
+        with startup_trace.section("load_collections"):
+            self._load_collections()
+        with startup_trace.section("load_environments"):
+            self._load_environments()
+            self._load_extracted_variables()  # Load extracted variables into env_manager
+        with startup_trace.section("init_git_sync"):
+            self._init_git_sync()
         
         # Initialize button styles for current theme (must be after UI is created)
         self._update_collection_header_button_styles()
@@ -877,9 +951,70 @@ class MainWindow(QMainWindow):
         QTimer.singleShot(0, self._fix_splitter_sizes)
         
         # Check for updates on startup (after 5 seconds) if enabled
-        if self.settings_pane.should_auto_check_updates():
+        if self.db.get_setting('auto_check_updates', 'true').lower() == 'true':
             QTimer.singleShot(5000, lambda: self._check_for_updates(silent=True))
     
+    # ==================== LAZY PANEL BUILDERS ====================
+    
+    def _build_settings_pane(self) -> SettingsPanel:
+        """Build the settings panel (called on first show)."""
+        settings_pane = SettingsPanel(self.db)
+        settings_pane.check_updates_requested.connect(self._check_for_updates)
+        return settings_pane
+    
+    def _build_git_sync_pane(self) -> GitSyncPanel:
+        """Build the Git sync panel (called on first show)."""
+        git_sync_pane = GitSyncPanel(self.db, self)
+        git_sync_pane.sync_enabled.connect(self._on_git_sync_enabled)
+        git_sync_pane.sync_disabled.connect(self._on_git_sync_disabled)
+        git_sync_pane.sync_performed.connect(self._on_sync_performed)
+        return git_sync_pane
+    
+    def _build_variable_inspector_pane(self) -> VariableInspectorPanel:
+        """Build the variable inspector panel (called on first show)."""
+        pane = VariableInspectorPanel(self)
+        pane.db = self.db  # Set database reference
+        pane.set_db_manager(self.db)  # Set database manager for secret tracking
+        pane.set_theme(self.current_theme)
+        
+        pane.refresh_requested.connect(self._refresh_variable_inspector_panel)
+        pane.variable_edited.connect(self._on_variable_edited)
+        pane.variable_deleted.connect(
+            lambda scope, name: self._handle_variable_deleted(scope, name)
+        )
+        pane.variable_added.connect(self._on_variable_added)
+        pane.collection_variable_added.connect(self._on_collection_variable_added)
+        
+        # Variable changes also update the environments panel variable counts
+        pane.variable_added.connect(self._update_environments_var_counts)
+        pane.collection_variable_added.connect(lambda c, n, v: self._update_environments_var_counts())
+        pane.variable_edited.connect(lambda s, n, v: self._update_environments_var_counts())
+        pane.variable_deleted.connect(lambda s, n: self._update_environments_var_counts())
+        return pane
+    
+    def _build_environments_pane(self) -> EnvironmentsPanel:
+        """Build the environments panel (called on first show)."""
+        pane = EnvironmentsPanel(self.db, self)
+        pane.set_theme(self.current_theme)
+        pane.environment_created.connect(self._on_environment_changed_refresh)
+        pane.environment_deleted.connect(self._on_environment_changed_refresh)
+        pane.environment_updated.connect(self._on_environment_changed_refresh)
+        return pane
+    
+    def _build_history_panel(self) -> HistoryPanelWidget:
+        """Build the history overlay panel (called on first show)."""
+        history_panel = HistoryPanelWidget(self.db)
+        history_panel.replay_requested.connect(self._replay_from_history)
+        history_panel.close_btn.clicked.connect(self._toggle_history_panel)  # Connect close button
+        return history_panel
+    
+    def _build_security_scan_tab(self) -> 'SecurityScanTab':
+        """Build the security scan response tab (called on first show)."""
+        from src.ui.widgets.security_scan_tab import SecurityScanTab
+        security_scan_tab = SecurityScanTab()
+        security_scan_tab.export_requested.connect(self._on_security_report_export)
+        return security_scan_tab
+    
     def _fix_splitter_sizes(self):
         """Fix splitter sizes after window is shown."""
         print(f"[DEBUG] _fix_splitter_sizes called after window shown")
@@ -1080,81 +1215,31 @@ class MainWindow(QMainWindow):
         main_splitter.setHandleWidth(1)  # Thin splitter handle
         
         # ==================== LEFT PANE: Collections ====================
-        self.collections_pane = self._create_collections_pane()
+        with startup_trace.section("collections_pane"):
+            self.collections_pane = self._create_collections_pane()
         main_splitter.addWidget(self.collections_pane)
         
+        # Secondary left panes are built on first show (see _build_*_pane)
         # ==================== LEFT PANE: Settings ====================
-        self.settings_pane = SettingsPanel(self.db)
+        self.settings_pane = LazyPanel('settings_pane', self._build_settings_pane)
         self.settings_pane.setVisible(False)  # Hidden by default
-        self.settings_pane.check_updates_requested.connect(self._check_for_updates)
         main_splitter.addWidget(self.settings_pane)
         
         # ==================== LEFT PANE: Git Sync ====================
-        self.git_sync_pane = GitSyncPanel(self.db, self)
+        self.git_sync_pane = LazyPanel('git_sync_pane', self._build_git_sync_pane)
         self.git_sync_pane.setVisible(False)  # Hidden by default
         main_splitter.addWidget(self.git_sync_pane)
         
-        # Connect Git sync panel signals
-        self.git_sync_pane.sync_enabled.connect(self._on_git_sync_enabled)
-        self.git_sync_pane.sync_disabled.connect(self._on_git_sync_disabled)
-        self.git_sync_pane.sync_performed.connect(self._on_sync_performed)
-        
         # ==================== LEFT PANE: Variable Inspector ====================
-        self.variable_inspector_pane = VariableInspectorPanel(self)
+        self.variable_inspector_pane = LazyPanel('variable_inspector_pane', self._build_variable_inspector_pane)
         self.variable_inspector_pane.setVisible(False)  # Hidden by default
-        self.variable_inspector_pane.db = self.db  # Set database reference
-        self.variable_inspector_pane.set_db_manager(self.db)  # Set database manager for secret tracking
-        self.variable_inspector_pane.set_theme(self.current_theme)  # Set initial theme
         main_splitter.addWidget(self.variable_inspector_pane)
         
-        # Connect variable inspector panel signals
-        print(f"[DEBUG] About to connect variable inspector signals")
-        self.variable_inspector_pane.refresh_requested.connect(self._refresh_variable_inspector_panel)
-        print(f"[DEBUG] refresh_requested connected")
-        self.variable_inspector_pane.variable_edited.connect(self._on_variable_edited)
-        print(f"[DEBUG] variable_edited connected")
-        
-        # Connect variable_deleted signal
-        print(f"[DEBUG] Attempting to connect variable_deleted signal...")
-        print(f"[DEBUG] Signal signature: variable_deleted(str, str)")
-        print(f"[DEBUG] Handler signature: _on_variable_deleted(scope: str, name: str)")
-        
-        # Try using lambda to ensure proper connection
-        self.variable_inspector_pane.variable_deleted.connect(
-            lambda scope, name: self._handle_variable_deleted(scope, name)
-        )
-        print(f"[DEBUG] variable_deleted connected via lambda wrapper")
-        
-        # Test the connection immediately (status bar is now available)
-        print(f"[DEBUG] Testing connection by emitting test signal")
-        self.variable_inspector_pane.variable_deleted.emit("test_scope", "test_name")
-        print(f"[DEBUG] Test signal emitted")
-        
-        self.variable_inspector_pane.variable_added.connect(self._on_variable_added)
-        print(f"[DEBUG] variable_added connected")
-        self.variable_inspector_pane.collection_variable_added.connect(self._on_collection_variable_added)
-        print(f"[DEBUG] collection_variable_added connected")
-        
-        # Connect variable changes to update environments panel variable counts
-        self.variable_inspector_pane.variable_added.connect(self._update_environments_var_counts)
-        self.variable_inspector_pane.collection_variable_added.connect(lambda c, n, v: self._update_environments_var_counts())
-        self.variable_inspector_pane.variable_edited.connect(lambda s, n, v: self._update_environments_var_counts())
-        self.variable_inspector_pane.variable_deleted.connect(lambda s, n: self._update_environments_var_counts())
-        print(f"[DEBUG] Variable inspector signals connected to environments panel updates")
-        
-        print(f"[DEBUG] Variable inspector signals connected successfully")
-        
         # ==================== LEFT PANE: Environments ====================
-        self.environments_pane = EnvironmentsPanel(self.db, self)
+        self.environments_pane = LazyPanel('environments_pane', self._build_environments_pane)
         self.environments_pane.setVisible(False)  # Hidden by default
-        self.environments_pane.set_theme(self.current_theme)  # Set initial theme
         main_splitter.addWidget(self.environments_pane)
         
-        # Connect environment panel signals
-        self.environments_pane.environment_created.connect(self._on_environment_changed_refresh)
-        self.environments_pane.environment_deleted.connect(self._on_environment_changed_refresh)
-        self.environments_pane.environment_updated.connect(self._on_environment_changed_refresh)
-        
         # Track current left panel
         self.current_left_panel = 'collections'
         
@@ -1239,6 +1324,16 @@ class MainWindow(QMainWindow):
         self._last_single_click_request_id = None
         self.temporary_tab_index = None  # Track the current temporary tab (only one can exist)
         
+        # Tab hibernation: offload responses of tabs not viewed recently to disk
+        self.tab_hibernator = TabHibernator(
+            idle_seconds=self._get_int_setting('tab_hibernation_idle_minutes', 10) * 60,
+            max_awake=self._get_int_setting('tab_hibernation_max_tabs', 10)
+        )
+        self.tab_hibernation_timer = QTimer()
+        self.tab_hibernation_timer.timeout.connect(self._hibernate_idle_tabs)
+        self.tab_hibernation_timer.setInterval(60000)  # Check once a minute
+        self.tab_hibernation_timer.start()
+        
         # Don't create any initial tab - start with empty state
         # Tabs will be created when user opens a request
         
@@ -1304,9 +1399,7 @@ class MainWindow(QMainWindow):
         
         # ==================== RIGHT PANE: History Panel (OVERLAY) ====================
         # Create the history panel widget as an overlay on top of center_container
-        self.history_panel_widget = HistoryPanelWidget(self.db)
-        self.history_panel_widget.replay_requested.connect(self._replay_from_history)
-        self.history_panel_widget.close_btn.clicked.connect(self._toggle_history_panel)  # Connect close button
+        self.history_panel_widget = LazyPanel('history_panel', self._build_history_panel)
         
         # Set parent to center_container to make it an overlay
         self.history_panel_widget.setParent(center_container)
@@ -1317,7 +1410,7 @@ class MainWindow(QMainWindow):
         
         # Apply styling for overlay appearance with shadow effect
         self.history_panel_widget.setStyleSheet("""
-            HistoryPanelWidget {
+            LazyPanel {
                 background: #1E1E1E;
                 border-left: 2px solid rgba(33, 150, 243, 0.3);
                 border-radius: 0px;
@@ -1499,6 +1592,7 @@ class MainWindow(QMainWindow):
     
     def _capture_current_tab_state(self) -> Dict:
         """Capture the current UI state for saving to a tab."""
+        self._flush_param_sync()  # Make sure URL and params agree
         # Capture response data if available
         response_data = None
         if hasattr(self, 'current_response') and self.current_response:
@@ -1782,6 +1876,7 @@ class MainWindow(QMainWindow):
             print(f"[DEBUG] Saving state for tab {self.previous_tab_index}")
             self.tab_states[self.previous_tab_index]['ui_state'] = self._capture_current_tab_state()
             self.tab_states[self.previous_tab_index]['has_changes'] = self.has_unsaved_changes
+            self.tab_hibernator.touch(self.tab_states[self.previous_tab_index])
         
         # Update the previous tab index for next time
         self.previous_tab_index = index
@@ -1791,6 +1886,11 @@ class MainWindow(QMainWindow):
             tab_state = self.tab_states[index]
             print(f"[DEBUG] Tab {index} state: request_id={tab_state.get('request_id')}, has_ui_state={bool(tab_state.get('ui_state'))}")
             
+            # Bring back offloaded response data before restoring the UI
+            if self.tab_hibernator.rehydrate(tab_state):
+                print(f"[DEBUG] Rehydrated hibernated tab {index}")
+            self.tab_hibernator.touch(tab_state)
+            
             # Check if we have a UI state already
             if 'ui_state' in tab_state and tab_state['ui_state']:
                 # UI state exists - restore it
@@ -1820,9 +1920,25 @@ class MainWindow(QMainWindow):
             
             # Refresh variable inspector panel to show correct collection variables
             self._refresh_variable_inspector_panel()
+            
+            # Enforce the in-memory tab budget now that another tab was left
+            self._hibernate_idle_tabs()
         else:
             print(f"[DEBUG] WARNING: Tab {index} not found in tab_states!")
     
+    def _hibernate_idle_tabs(self):
+        """Offload responses of background tabs that are idle or over the LRU budget."""
+        count = self.tab_hibernator.hibernate_idle(self.tab_states, self.request_tabs.currentIndex())
+        if count:
+            print(f"[DEBUG] Hibernated {count} background tab(s)")
+    
+    def _get_int_setting(self, key: str, default: int) -> int:
+        """Read an integer app setting, falling back to default if missing or invalid."""
+        try:
+            return int(self.db.get_setting(key, str(default)))
+        except (TypeError, ValueError):
+            return default
+    
     def _close_tab(self, index: int):
         """Handle tab close request."""
         # Check for unsaved changes
@@ -1844,6 +1960,7 @@ class MainWindow(QMainWindow):
         
         # Remove from state storage
         if index in self.tab_states:
+            self.tab_hibernator.discard(self.tab_states[index])
             del self.tab_states[index]
         
         # Reindex remaining tabs
@@ -2575,7 +2692,7 @@ class MainWindow(QMainWindow):
         self.url_input = HighlightedLineEdit(theme=self.current_theme)
         self.url_input.setPlaceholderText("Enter request URL or paste text")
         self.url_input.returnPressed.connect(self._send_request)  # Enter key sends request
-        self.url_input.textChanged.connect(self._sync_url_to_params)  # Live sync URL to params
+        self.url_input.textChanged.connect(lambda: self._schedule_param_sync('url'))  # Live sync URL to params
         self.url_input.setMinimumHeight(32)  # Reduced for compact layout
         self.url_input.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         
@@ -2727,7 +2844,7 @@ class MainWindow(QMainWindow):
         self.params_table = self._create_key_value_table()
         self.params_table.itemChanged.connect(self._update_tab_counts)
         self.params_table.itemChanged.connect(lambda: self._auto_add_table_rows(self.params_table))
-        self.params_table.itemChanged.connect(self._sync_params_to_url)  # Live sync params to URL
+        self.params_table.itemChanged.connect(lambda: self._schedule_param_sync('params'))  # Live sync params to URL
         self.inner_tabs.addTab(self.params_table, "Params")
         
         # Headers tab
@@ -3033,8 +3150,7 @@ class MainWindow(QMainWindow):
         self.response_tabs.addTab(self.variable_extraction_widget, "Extract Variables from Response")
         
         # Security Scan tab
-        self.security_scan_tab = SecurityScanTab()
-        self.security_scan_tab.export_requested.connect(self._on_security_report_export)
+        self.security_scan_tab = LazyPanel('security_scan_tab', self._build_security_scan_tab)
         self.security_scan_tab_index = self.response_tabs.addTab(self.security_scan_tab, "Security Scan")
         # Security scan tab visible by default - shows empty state until scan is run
         
@@ -4199,6 +4315,10 @@ class MainWindow(QMainWindow):
             run_tests_action.triggered.connect(lambda: self._run_collection_tests_from_menu(data['id']))
             menu.addAction(run_tests_action)
             
+            load_test_action = QAction("📈 Load Test...", self)
+            load_test_action.triggered.connect(lambda: self._open_load_test(data['id'], data['name']))
+            menu.addAction(load_test_action)
+            
             menu.addSeparator()
             
             rename_action = QAction("✏️ Rename", self)
@@ -4281,6 +4401,12 @@ class MainWindow(QMainWindow):
             copy_curl_action.triggered.connect(lambda checked=False, rid=request_id: self._copy_request_as_curl(rid))
             menu.addAction(copy_curl_action)
             
+            load_test_action = QAction("📈 Load Test...", self)
+            load_test_action.triggered.connect(
+                lambda checked=False, rid=request_id, cid=collection_id: self._open_load_test(cid, request_id=rid)
+            )
+            menu.addAction(load_test_action)
+            
             menu.addSeparator()
             
             rename_action = QAction("✏️ Rename", self)
@@ -4965,6 +5091,8 @@ class MainWindow(QMainWindow):
         # Handle None or empty data
         if not data:
             table.setRowCount(1)  # Reset to 1 empty row
+            if table is self.params_table:
+                self._flush_param_sync()
             return
         
         # Set exact number of rows needed: data rows + 1 empty row
@@ -4976,6 +5104,10 @@ class MainWindow(QMainWindow):
         
         # Update tab counts after loading
         self._update_tab_counts()
+        
+        if table is self.params_table:
+            # Apply the coalesced sync right away so loaded state is consistent
+            self._flush_param_sync()
     
     def _get_method_icon(self, method: str) -> str:
         """Get text badge for HTTP method."""
@@ -5009,105 +5141,94 @@ class MainWindow(QMainWindow):
         
         return result
     
+    def _schedule_param_sync(self, source: str):
+        """
+        Schedule a debounced URL <-> params sync.
+        
+        Args:
+            source: Side that was edited ('url' or 'params')
+        """
+        if self._syncing_params:
+            return
+        self._pending_param_sync = source
+        self.param_sync_timer.start()  # Restarts the debounce window
+    
+    def _flush_param_sync(self):
+        """Run a pending URL <-> params sync now (call before reading the request state)."""
+        self.param_sync_timer.stop()
+        source, self._pending_param_sync = self._pending_param_sync, None
+        if source == 'url':
+            self._sync_url_to_params()
+        elif source == 'params':
+            self._sync_params_to_url()
+    
     def _sync_url_to_params(self):
         """Sync query parameters from URL to params table (Postman-style live sync)."""
         # Prevent infinite loop
-        if getattr(self, '_syncing_params', False):
+        if self._syncing_params:
+            return
+        
+        url = self.url_input.text().strip()
+        if not url:
+            return
+        
+        params_dict = parse_query_params(url)
+        if params_dict is None:
+            # Invalid URL - silently ignore
+            return
+        
+        # Only touch the cells that differ from the parsed query
+        current_rows = []
+        for row in range(self.params_table.rowCount()):
+            key_item = self.params_table.item(row, 0)
+            value_item = self.params_table.item(row, 1)
+            current_rows.append((key_item.text() if key_item else None,
+                                 value_item.text() if value_item else None))
+        updates, row_count = diff_param_rows(current_rows, params_dict)
+        if not updates and row_count == len(current_rows):
             return
         
         self._syncing_params = True
+        self.params_table.blockSignals(True)
         try:
-            url = self.url_input.text().strip()
-            if not url:
-                self._syncing_params = False
-                return
-            
-            # Parse URL to extract query parameters
-            try:
-                parsed = urlparse(url)
-                query_params = parse_qs(parsed.query, keep_blank_values=True)
-                
-                # Convert parse_qs result (lists) to simple key-value dict
-                params_dict = {}
-                for key, values in query_params.items():
-                    # parse_qs returns lists, take first value
-                    params_dict[key] = values[0] if values else ''
-                
-                # Update params table
-                self.params_table.blockSignals(True)
-                self.params_table.setRowCount(0)  # Clear existing
-                
-                # Add parsed params
-                for key, value in params_dict.items():
-                    row = self.params_table.rowCount()
-                    self.params_table.insertRow(row)
-                    self.params_table.setItem(row, 0, QTableWidgetItem(key))
-                    self.params_table.setItem(row, 1, QTableWidgetItem(value))
-                
-                # Add one empty row for adding new params
-                row = self.params_table.rowCount()
-                self.params_table.insertRow(row)
-                self.params_table.setItem(row, 0, QTableWidgetItem(''))
-                self.params_table.setItem(row, 1, QTableWidgetItem(''))
-                
-                self.params_table.blockSignals(False)
-                self._update_tab_counts()
-                
-            except Exception as e:
-                # Invalid URL or parsing error - silently ignore
-                pass
+            self.params_table.setRowCount(row_count)
+            for row, column, text in updates:
+                item = self.params_table.item(row, column)
+                if item:
+                    item.setText(text)
+                else:
+                    self.params_table.setItem(row, column, QTableWidgetItem(text))
         finally:
+            self.params_table.blockSignals(False)
             self._syncing_params = False
+        self._update_tab_counts()
     
     def _sync_params_to_url(self):
         """Sync params table to URL query string (Postman-style live sync)."""
         # Prevent infinite loop
-        if getattr(self, '_syncing_params', False):
+        if self._syncing_params:
+            return
+        
+        url = self.url_input.text().strip()
+        if not url:
+            return
+        
+        new_url = build_url_with_params(url, self._get_table_as_dict(self.params_table))
+        if new_url is None or new_url == url:
+            # Invalid URL or already in sync - no need to re-highlight the URL
             return
         
         self._syncing_params = True
+        self.url_input.blockSignals(True)
         try:
-            url = self.url_input.text().strip()
-            if not url:
-                self._syncing_params = False
-                return
-            
-            # Get params from table
-            params_dict = self._get_table_as_dict(self.params_table)
-            
-            # Parse current URL
-            try:
-                parsed = urlparse(url)
-                
-                # Build new query string
-                if params_dict:
-                    new_query = urlencode(params_dict)
-                else:
-                    new_query = ''
-                
-                # Reconstruct URL with new query
-                new_url = urlunparse((
-                    parsed.scheme,
-                    parsed.netloc,
-                    parsed.path,
-                    parsed.params,
-                    new_query,
-                    parsed.fragment
-                ))
-                
-                # Update URL input
-                self.url_input.blockSignals(True)
-                self.url_input.setText(new_url)
-                self.url_input.blockSignals(False)
-                
-            except Exception as e:
-                # Invalid URL - silently ignore
-                pass
+            self.url_input.setText(new_url)
         finally:
+            self.url_input.blockSignals(False)
             self._syncing_params = False
     
     def _store_original_request_data(self):
         """Store the current request data for change detection."""
+        self._flush_param_sync()  # Make sure URL and params agree
         self.original_request_data = {
             'method': self.method_combo.currentText(),
             'url': self.url_input.text(),
@@ -5474,6 +5595,7 @@ class MainWindow(QMainWindow):
     
     def _save_request(self):
         """Save the current request to the database."""
+        self._flush_param_sync()  # Make sure URL and params agree
         # Check if this is a new unsaved request
         current_tab_index = self.request_tabs.currentIndex()
         is_new_request = False
@@ -5554,6 +5676,7 @@ class MainWindow(QMainWindow):
     
     def _save_new_request(self):
         """Save a new unsaved request by prompting for collection."""
+        self._flush_param_sync()  # Make sure URL and params agree
         try:
             print("[DEBUG] _save_new_request called")
             
@@ -5723,6 +5846,7 @@ class MainWindow(QMainWindow):
     
     def _send_request(self):
         """Execute the HTTP request and display the response."""
+        self._flush_param_sync()  # Make sure URL and params agree
         # Convert temporary tab to persistent when sending request
         self._convert_temporary_to_persistent()
         
@@ -5977,25 +6101,23 @@ class MainWindow(QMainWindow):
                 
                 # Update environment and collection variables
                 if self.env_manager.has_active_environment():
-                    for key, value in script_result['environment'].items():
-                        if key not in env_variables or env_variables[key] != value:
-                            self.env_manager.set_variable(key, value)
+                    self.env_manager.update_variables({
+                        key: value for key, value in script_result['environment'].items()
+                        if key not in env_variables or env_variables[key] != value
+                    })
                 
                 # Track if collection variables were updated
                 collection_vars_updated = False
                 
                 if self.current_collection_id:
-                    for key, value in script_result['collection_variables'].items():
-                        if key not in coll_variables or coll_variables[key] != value:
-                            # Update collection variable in database
-                            existing_vars = self.db.get_collection_variables_with_metadata(self.current_collection_id)
-                            var_exists = any(v['key'] == key for v in existing_vars)
-                            if var_exists:
-                                var_id = next(v['id'] for v in existing_vars if v['key'] == key)
-                                self.db.update_collection_variable(var_id, value=value)
-                            else:
-                                self.db.create_collection_variable(self.current_collection_id, key, value)
-                            collection_vars_updated = True
+                    collection_changes = {
+                        key: value for key, value in script_result['collection_variables'].items()
+                        if key not in coll_variables or coll_variables[key] != value
+                    }
+                    if collection_changes:
+                        # Update collection variables in database, with one commit
+                        self.db.update_collection_variables(self.current_collection_id, collection_changes)
+                        collection_vars_updated = True
                 
                 # Always reload collection variables after pre-request script
                 # (script may have set new values that need to be substituted)
@@ -6288,21 +6410,19 @@ class MainWindow(QMainWindow):
                 
                 # Update environment variables
                 if self.env_manager.has_active_environment():
-                    for key, value in script_result['environment'].items():
-                        if key not in env_variables or env_variables[key] != value:
-                            self.env_manager.set_variable(key, value)
+                    self.env_manager.update_variables({
+                        key: value for key, value in script_result['environment'].items()
+                        if key not in env_variables or env_variables[key] != value
+                    })
                 
                 # Update collection variables
                 if self.current_collection_id:
-                    for key, value in script_result['collection_variables'].items():
-                        if key not in collection_variables or collection_variables[key] != value:
-                            existing_vars = self.db.get_collection_variables_with_metadata(self.current_collection_id)
-                            var_exists = any(v['key'] == key for v in existing_vars)
-                            if var_exists:
-                                var_id = next(v['id'] for v in existing_vars if v['key'] == key)
-                                self.db.update_collection_variable(var_id, value=value)
-                            else:
-                                self.db.create_collection_variable(self.current_collection_id, key, value)
+                    collection_changes = {
+                        key: value for key, value in script_result['collection_variables'].items()
+                        if key not in collection_variables or collection_variables[key] != value
+                    }
+                    if collection_changes:
+                        self.db.update_collection_variables(self.current_collection_id, collection_changes)
                 
                 # Display console logs
                 self.scripts_tab.append_console_output(script_result['console_logs'])
@@ -7765,7 +7885,7 @@ class MainWindow(QMainWindow):
             collection, summary = import_openapi_spec(file_path)
             
             # Show import summary dialog
-            from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QDialogButtonBox
+            from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QDialogButtonBox, QCheckBox
             
             dialog = QDialog(self)
             dialog.setWindowTitle("OpenAPI Import Summary")
@@ -7789,6 +7909,13 @@ class MainWindow(QMainWindow):
             info_label.setTextFormat(Qt.TextFormat.RichText)
             layout.addWidget(info_label)
             
+            # Offer contract tests for endpoints with a response schema
+            schema_count = sum(1 for request in collection['requests'] if request.get('response_schema'))
+            schema_checkbox = QCheckBox(f"Add JSON Schema tests for {schema_count} endpoints with a response schema")
+            schema_checkbox.setChecked(True)
+            schema_checkbox.setVisible(schema_count > 0)
+            layout.addWidget(schema_checkbox)
+            
             buttons = QDialogButtonBox(
                 QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
             )
@@ -7866,6 +7993,14 @@ class MainWindow(QMainWindow):
                         body_type='raw'
                     )
                     
+                    if schema_checkbox.isChecked() and request.get('response_schema'):
+                        self.db.create_test_assertion(
+                            request_id=request_id,
+                            assertion_type=TestAssertion.TYPE_JSON_SCHEMA,
+                            operator=TestAssertion.OP_EQUALS,
+                            expected_value=json.dumps(request['response_schema'], indent=2)
+                        )
+                    
                     created_count += 1
                     
                 except Exception as e:
@@ -8075,6 +8210,10 @@ class MainWindow(QMainWindow):
     
     def _refresh_variable_inspector_panel(self):
         """Refresh the variable inspector panel with current data."""
+        # Nothing to refresh until the panel is first shown (it refreshes on open)
+        if not self.variable_inspector_pane.is_built():
+            return
+        
         print(f"[DEBUG] === Refreshing Variable Inspector Panel ===")
         # Get environment variables
         environment_vars = {}
@@ -8357,7 +8496,7 @@ class MainWindow(QMainWindow):
     
     def _update_environments_var_counts(self):
         """Update variable counts in the environments panel without full refresh."""
-        if hasattr(self, 'environments_pane'):
+        if hasattr(self, 'environments_pane') and self.environments_pane.is_built():
             self.environments_pane.update_variable_counts()
         
         # Also refresh variable highlighting since variables changed
@@ -8484,6 +8623,7 @@ class MainWindow(QMainWindow):
                 return
             
             # Generate and save report
+            from src.features.security_report_generator import SecurityReportGenerator
             report_generator = SecurityReportGenerator()
             if format_type == "html":
                 report_content = report_generator.generate_html_report(scan_results)
@@ -8502,6 +8642,30 @@ class MainWindow(QMainWindow):
                 f"Failed to export security report: {str(e)}"
             )
     
+    def _scan_api_response(self, method: str, url: str, request_headers: Dict[str, str],
+                           response: ApiResponse, request_secure: bool = True) -> list:
+        """
+        Security-scan a response, streaming its raw body to the scanner.
+        
+        The body is read chunk by chunk and the scanner stops reading at its
+        size or time limit, so large responses are neither decoded nor copied
+        as a whole; a partial scan is reported as an SEC026 finding.
+        
+        Returns:
+            List of SecurityFinding
+        """
+        return self.security_scanner.scan_response_stream(
+            method=method,
+            url=url,
+            request_headers=request_headers,
+            response_status=response.status_code,
+            response_headers=dict(response.headers),
+            body_chunks=response.iter_content(BODY_CHUNK_SIZE),
+            request_secure=request_secure,
+            body_size=response.size,
+            encoding=response.response.encoding
+        )
+    
     def _auto_run_security_scan(self, response: ApiResponse) -> Optional[int]:
         """
         Automatically run security scan on response if auto-scan is enabled.
@@ -8518,20 +8682,8 @@ class MainWindow(QMainWindow):
             method = self.method_combo.currentText()
             request_headers = self._get_table_as_dict(self.headers_table)
             
-            # Get response data
-            response_headers = dict(response.headers) if hasattr(response, 'headers') else dict(response.response.headers)
-            response_body = response.text if hasattr(response, 'text') else str(response.response.text)
-            response_status = response.status_code if hasattr(response, 'status_code') else response.response.status_code
-            
             # Perform security scan
-            scan_results = self.security_scanner.scan_response(
-                url=url,
-                method=method,
-                response_headers=response_headers,
-                response_body=response_body,
-                response_status=response_status,
-                request_headers=request_headers
-            )
+            scan_results = self._scan_api_response(method, url, request_headers, response)
             
             # Save to database
             scan_id = self.db.create_security_scan(
@@ -8748,6 +8900,7 @@ class MainWindow(QMainWindow):
     
     def _copy_as_curl(self):
         """Copy the current request as a cURL command to clipboard."""
+        self._flush_param_sync()  # Make sure URL and params agree
         try:
             # Get current request data
             method = self.method_combo.currentText()
@@ -8798,6 +8951,7 @@ class MainWindow(QMainWindow):
     
     def _generate_code(self):
         """Generate code snippet for the current request."""
+        self._flush_param_sync()  # Make sure URL and params agree
         try:
             # Get current request data
             method = self.method_combo.currentText()
@@ -8822,6 +8976,7 @@ class MainWindow(QMainWindow):
                 auth_type = 'Bearer Token'  # For code generation
             
             # Open code snippet dialog
+            from src.ui.dialogs.code_snippet_dialog import CodeSnippetDialog
             dialog = CodeSnippetDialog(
                 method=method,
                 url=url,
@@ -8842,6 +8997,7 @@ class MainWindow(QMainWindow):
     def _configure_oauth(self):
         """Open OAuth configuration dialog."""
         try:
+            from src.ui.dialogs.oauth_dialog import OAuthConfigDialog
             dialog = OAuthConfigDialog(self.db, self)
             dialog.config_selected.connect(self._on_oauth_configured)
             dialog.exec()
@@ -8891,6 +9047,7 @@ class MainWindow(QMainWindow):
                                   "No refresh token available. Please re-authorize.")
                 return
             
+            from src.features.oauth_manager import OAuthManager
             oauth_manager = OAuthManager()
             
             # Refresh token
@@ -8955,6 +9112,7 @@ class MainWindow(QMainWindow):
                 return f"Bearer {token}"
         elif auth_type == 'OAuth 2.0' and self.current_oauth_token:
             # Check if token is expired
+            from src.features.oauth_manager import OAuthManager
             if OAuthManager.is_token_expired(self.current_oauth_token.get('expires_at')):
                 QMessageBox.warning(
                     self, "Token Expired",
@@ -9029,12 +9187,17 @@ class MainWindow(QMainWindow):
             collection_name = data['name']
             
             # Open test runner dialog
+            from src.ui.dialogs.collection_test_runner import CollectionTestRunnerDialog
             dialog = CollectionTestRunnerDialog(
                 self.db, self.api_client, collection_id, collection_name,
                 self.env_manager, self
             )
             dialog.exec()
             
+            # Scripts of the run may have changed variables
+            if hasattr(self, 'variable_inspector_pane') and self.variable_inspector_pane.isVisible():
+                self._refresh_variable_inspector_panel()
+            
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to run tests: {str(e)}")
     
@@ -9135,23 +9298,27 @@ class MainWindow(QMainWindow):
             
             if active:
                 self._setup_git_sync(active['project_path'])
-                self._update_git_sync_status()
                 
-                # Check for changes on startup
-                if self.git_sync_manager:
-                    status = self.git_sync_manager.get_sync_status()
-                    if status.status == SyncStatus.STATUS_NEEDS_PULL:
-                        # Ask user if they want to pull changes
-                        reply = QMessageBox.question(
-                            self,
-                            "Git Sync: Changes Detected",
-                            f"Found {len(status.changes.get('new_files', [])) + len(status.changes.get('modified_files', []))} updated file(s) in .postmini/\n\n"
-                            "Would you like to import these changes?",
-                            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-                        )
-                        
-                        if reply == QMessageBox.StandardButton.Yes:
-                            self._auto_sync_from_filesystem()
+                # Check for changes on startup (the result is handled in _on_git_sync_status_ready)
+                self._git_sync_prompt_pull = True
+                self._update_git_sync_status()
+    
+    def _prompt_git_sync_pull(self, status: SyncStatus):
+        """Offer to import changes found in .postmini/ on startup."""
+        if status.status != SyncStatus.STATUS_NEEDS_PULL:
+            return
+        
+        # Ask user if they want to pull changes
+        reply = QMessageBox.question(
+            self,
+            "Git Sync: Changes Detected",
+            f"Found {len(status.changes.get('new_files', [])) + len(status.changes.get('modified_files', []))} updated file(s) in .postmini/\n\n"
+            "Would you like to import these changes?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        
+        if reply == QMessageBox.StandardButton.Yes:
+            self._auto_sync_from_filesystem()
     
     def _setup_git_sync(self, project_path: str):
         """Setup Git sync manager for a project path."""
@@ -9159,13 +9326,42 @@ class MainWindow(QMainWindow):
         self.git_sync_manager = GitSyncManager(self.db, config)
         self.secrets_manager = SecretsManager(str(config.secrets_path))
         self.git_workspace = self.db.get_git_workspace_by_path(project_path)
+        self._git_sync_full_check = True
+        
+        # Refresh status as soon as workspace files change
+        self._stop_git_sync_watcher()
+        self.git_sync_watcher = WorkspaceWatcher(
+            [config.collections_path, config.environments_path], recursive=True, parent=self
+        )
+        self.git_sync_watcher.files_changed.connect(self._on_workspace_files_changed)
         
         # Start periodic status refresh
         if not self.git_sync_timer.isActive():
             self.git_sync_timer.start()
     
+    def _stop_git_sync_watcher(self):
+        """Stop watching the Git sync workspace."""
+        if self.git_sync_watcher:
+            self.git_sync_watcher.stop()
+            self.git_sync_watcher.deleteLater()
+            self.git_sync_watcher = None
+    
+    def _on_workspace_files_changed(self, paths: list):
+        """Re-check the collections of workspace files that changed on disk."""
+        print(f"[Git Sync] {len(paths)} workspace file(s) changed")
+        self._update_git_sync_status(changed_paths=paths)
+    
+    def _on_git_sync_timer(self):
+        """Periodic check: refresh the status only if public DB items changed."""
+        if not self.git_sync_watcher or not self.git_sync_watcher.is_watching():
+            # No file events available - fall back to a full refresh
+            self._update_git_sync_status()
+        elif self.db.get_sync_fingerprint() != self._git_sync_fingerprint:
+            self._update_git_sync_status()
+    
     def _open_git_sync_dialog(self):
         """Open the Git sync configuration dialog."""
+        from src.ui.dialogs.git_sync_dialog import GitSyncDialog
         dialog = GitSyncDialog(self.db, self)
         
         # Connect signals
@@ -9190,6 +9386,7 @@ class MainWindow(QMainWindow):
     
     def _on_git_sync_disabled(self):
         """Handle Git sync being disabled."""
+        self._stop_git_sync_watcher()
         self.git_sync_manager = None
         self.secrets_manager = None
         self.git_workspace = None
@@ -9207,17 +9404,82 @@ class MainWindow(QMainWindow):
         self._load_environments()
         self._update_git_sync_status()
     
-    def _update_git_sync_status(self):
-        """Update the Git sync status indicator in toolbar."""
+    def _update_git_sync_status(self, changed_paths: Optional[Iterable[str]] = None):
+        """
+        Update the Git sync status indicator in toolbar (the check runs on a background thread).
+        
+        Args:
+            changed_paths: Workspace files that changed; only their collections
+                are re-checked on disk (None checks everything)
+        """
         if not self.git_sync_manager or not self.git_workspace:
             self.git_sync_status_label.setText("Files: Not Synced")
             self.git_sync_status_label.setStyleSheet("color: #999; font-size: 11px; padding: 0 10px;")
             self.git_sync_status_label.setToolTip("File sync not enabled - collections not saved to filesystem")
             return
         
-        # Get sync status
-        status = self.git_sync_manager.get_sync_status()
+        if self.git_sync_status_thread and self.git_sync_status_thread.isRunning():
+            # Coalesce: check again once the running check has finished,
+            # covering the changed files of every request in between
+            if not self._git_sync_status_stale:
+                self._git_sync_stale_paths = set(changed_paths) if changed_paths is not None else None
+            elif self._git_sync_stale_paths is not None:
+                if changed_paths is None:
+                    self._git_sync_stale_paths = None
+                else:
+                    self._git_sync_stale_paths.update(changed_paths)
+            self._git_sync_status_stale = True
+            return
+        
+        if self._git_sync_full_check:
+            changed_paths = None
+        self._git_sync_full_check = False
+        
+        # DB state this check covers (see _on_git_sync_timer)
+        self._git_sync_fingerprint = self.db.get_sync_fingerprint()
+        
+        self.git_sync_status_thread = GitSyncStatusThread(
+            self.db.db_path, str(self.git_sync_manager.config.project_path),
+            sorted(changed_paths) if changed_paths is not None else None
+        )
+        self.git_sync_status_thread.status_ready.connect(self._on_git_sync_status_ready)
+        self.git_sync_status_thread.finished.connect(self._on_git_sync_status_thread_finished)
+        self.git_sync_status_thread.start()
+    
+    def _on_git_sync_status_thread_finished(self):
+        """Run a status check that was requested while the previous one was running."""
+        if self._git_sync_status_stale:
+            self._git_sync_status_stale = False
+            changed_paths, self._git_sync_stale_paths = self._git_sync_stale_paths, None
+            self._update_git_sync_status(changed_paths)
+    
+    def _on_git_sync_status_ready(self, status: SyncStatus, manifest_update=None):
+        """Apply a status computed by GitSyncStatusThread."""
+        if not self.git_sync_manager or not self.git_workspace:
+            # Sync was disabled while the check was running
+            return
+        
+        if manifest_update:
+            try:
+                if not self.git_sync_manager.manifest.save_update(manifest_update):
+                    # Dropped as stale: the stored manifest lacks this check's
+                    # file changes, so checks of changed files alone could miss them
+                    self._git_sync_full_check = True
+            except Exception as e:
+                # The manifest is only a cache - the next check rebuilds it
+                print(f"[GitSync] Could not save sync manifest: {e}")
+                self._git_sync_full_check = True
+        if status.status == SyncStatus.STATUS_ERROR:
+            self._git_sync_full_check = True
+        
+        self._apply_git_sync_status(status)
         
+        if self._git_sync_prompt_pull:
+            self._git_sync_prompt_pull = False
+            self._prompt_git_sync_pull(status)
+    
+    def _apply_git_sync_status(self, status: SyncStatus):
+        """Update the Git sync status label for a sync status."""
         # Update label style (dark-mode friendly)
         if status.status == SyncStatus.STATUS_SYNCED:
             self.git_sync_status_label.setText("Files: ✅ Synced")
@@ -9395,11 +9657,12 @@ class MainWindow(QMainWindow):
                 self.scripts_tab.set_theme(new_theme)
             
             # Update environments panel
-            if hasattr(self, 'environments_pane'):
+            # Unbuilt lazy panels pick up the current theme when they are built
+            if hasattr(self, 'environments_pane') and self.environments_pane.is_built():
                 self.environments_pane.set_theme(new_theme)
             
             # Update variable inspector panel
-            if hasattr(self, 'variable_inspector_pane'):
+            if hasattr(self, 'variable_inspector_pane') and self.variable_inspector_pane.is_built():
                 self.variable_inspector_pane.set_theme(new_theme)
             
             # Update table delegates
@@ -9797,6 +10060,24 @@ class MainWindow(QMainWindow):
         self.current_collection_id = collection_id
         self._run_collection_tests()
     
+    def _open_load_test(self, collection_id: int, name: str = '', request_id: Optional[int] = None):
+        """Open the load test dialog for a collection or one of its requests."""
+        try:
+            if request_id is not None:
+                request = self.db.get_request(request_id)
+                if not request:
+                    return
+                name = request['name']
+            
+            from src.ui.dialogs.load_test_dialog import LoadTestDialog
+            dialog = LoadTestDialog(
+                self.db, self.api_client, collection_id, name,
+                request_id=request_id, env_manager=self.env_manager, parent=self
+            )
+            dialog.exec()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to open load test: {str(e)}")
+    
     def _rename_collection(self, collection_id: int):
         """Rename a collection."""
         collection = self.db.get_collection(collection_id)
@@ -10583,32 +10864,44 @@ class MainWindow(QMainWindow):
     
     def _check_for_updates(self, silent=False):
         """Check for application updates."""
-        # Don't check if already checking
+        # Don't check after the window closed or if already checking
+        if self._closed:
+            return
         if self.update_checker_thread and self.update_checker_thread.isRunning():
             return
         
-        # Update UI
-        if not silent:
+        # Update UI (the startup check must not build the settings panel)
+        if not silent and self.settings_pane.is_built():
             self.settings_pane.set_checking_updates(True)
         
         # Create and start update checker thread
+        from src.features.auto_updater import UpdateChecker
         self.update_checker_thread = UpdateChecker(silent=silent)
         self.update_checker_thread.update_available.connect(self._on_update_available)
         self.update_checker_thread.no_update.connect(self._on_no_update)
         self.update_checker_thread.check_error.connect(self._on_update_check_error)
-        self.update_checker_thread.finished.connect(lambda: self.settings_pane.set_checking_updates(False))
+        self.update_checker_thread.finished.connect(self._on_update_check_finished)
         self.update_checker_thread.start()
     
+    def _on_update_check_finished(self):
+        """Re-enable the settings panel's update button."""
+        if self.settings_pane.is_built():
+            self.settings_pane.set_checking_updates(False)
+    
+    def _set_update_status(self, text: str, color: str):
+        """Show the update check result in the settings panel, if it was built."""
+        if self.settings_pane.is_built():
+            self.settings_pane.set_update_status(text, color=color)
+    
     def _on_update_available(self, update_info: dict):
         """Handle update available."""
+        from src.features.auto_updater import UpdateChecker
+        from src.ui.dialogs.update_dialog import UpdateAvailableDialog
         current_version = UpdateChecker.CURRENT_VERSION
         
         # Update settings panel status
         latest_version = update_info.get('latest_version', 'Unknown')
-        self.settings_pane.set_update_status(
-            f"✨ Version {latest_version} available!",
-            color="#4CAF50"
-        )
+        self._set_update_status(f"✨ Version {latest_version} available!", color="#4CAF50")
         
         # Show update dialog
         dialog = UpdateAvailableDialog(update_info, current_version, self)
@@ -10619,23 +10912,18 @@ class MainWindow(QMainWindow):
     def _on_no_update(self, current_version: str):
         """Handle no update available."""
         # Update settings panel status
-        self.settings_pane.set_update_status(
-            f"✅ You're up to date!",
-            color="#4CAF50"
-        )
+        self._set_update_status("✅ You're up to date!", color="#4CAF50")
         
         # Show dialog (only if user manually checked)
         if not self.update_checker_thread.silent:
+            from src.ui.dialogs.update_dialog import NoUpdateDialog
             dialog = NoUpdateDialog(current_version, self)
             dialog.exec()
     
     def _on_update_check_error(self, error_msg: str):
         """Handle update check error."""
         # Update settings panel status
-        self.settings_pane.set_update_status(
-            f"❌ Check failed: {error_msg}",
-            color="#F44336"
-        )
+        self._set_update_status(f"❌ Check failed: {error_msg}", color="#F44336")
         
         # Show error dialog
         QMessageBox.warning(
@@ -10647,6 +10935,9 @@ class MainWindow(QMainWindow):
     
     def _start_update_download(self, update_info: dict):
         """Start downloading the update."""
+        from src.features.auto_updater import UpdateDownloader
+        from src.ui.dialogs.update_dialog import UpdateProgressDialog
+        
         # Show progress dialog
         progress_dialog = UpdateProgressDialog(self)
         progress_dialog.show()
@@ -10669,7 +10960,7 @@ class MainWindow(QMainWindow):
         
         self.update_downloader_thread.start()
     
-    def _on_download_complete(self, installer_path: str, progress_dialog: UpdateProgressDialog):
+    def _on_download_complete(self, installer_path: str, progress_dialog: 'UpdateProgressDialog'):
         """Update downloaded successfully."""
         progress_dialog.close()
         
@@ -10684,6 +10975,7 @@ class MainWindow(QMainWindow):
         
         if reply == QMessageBox.StandardButton.Yes:
             try:
+                from src.features.auto_updater import UpdateInstaller
                 UpdateInstaller.install_update(installer_path)
             except Exception as e:
                 QMessageBox.critical(
@@ -10692,7 +10984,7 @@ class MainWindow(QMainWindow):
                     f"Failed to start installer:\n{str(e)}"
                 )
     
-    def _on_download_error(self, error_msg: str, progress_dialog: UpdateProgressDialog):
+    def _on_download_error(self, error_msg: str, progress_dialog: 'UpdateProgressDialog'):
         """Download failed."""
         progress_dialog.close()
         
@@ -10729,13 +11021,11 @@ class MainWindow(QMainWindow):
         
         try:
             # Perform security scan
-            findings = self.security_scanner.scan_response(
-                method=details['method'],
-                url=details['url'],
-                request_headers=details.get('headers', {}),
-                response_status=response.status_code,
-                response_headers=dict(response.headers),
-                response_body=response.text,
+            findings = self._scan_api_response(
+                details['method'],
+                details['url'],
+                details.get('headers', {}),
+                response,
                 request_secure=details['url'].startswith('https://')
             )
             
@@ -10858,10 +11148,12 @@ class MainWindow(QMainWindow):
                 return
             
             # Generate and save report
+            from src.features.security_report_generator import SecurityReportGenerator
+            report_generator = SecurityReportGenerator(self.db)
             if format_type == "html":
-                report_content = self.security_report_generator.generate_html_report(scan_id)
+                report_content = report_generator.generate_html_report(scan_id)
             else:
-                report_content = self.security_report_generator.generate_json_report(scan_id)
+                report_content = report_generator.generate_json_report(scan_id)
             
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write(report_content)
@@ -10892,10 +11184,18 @@ class MainWindow(QMainWindow):
     
     def closeEvent(self, event):
         """Handle application close event."""
+        self._closed = True
+        
         # Stop any running request thread
         if self.request_thread and self.request_thread.isRunning():
             self.request_thread.wait(1000)  # Wait up to 1 second
         
+        # Let a running Git sync status check finish (it holds its own DB connection)
+        self.git_sync_timer.stop()
+        self._stop_git_sync_watcher()
+        if self.git_sync_status_thread and self.git_sync_status_thread.isRunning():
+            self.git_sync_status_thread.wait(2000)
+        
         # Stop any running update threads
         if self.update_checker_thread and self.update_checker_thread.isRunning():
             self.update_checker_thread.wait(1000)
@@ -10904,6 +11204,8 @@ class MainWindow(QMainWindow):
             self.update_downloader_thread.wait(1000)
 
         # Clean up resources
+        self.tab_hibernation_timer.stop()
+        self.tab_hibernator.cleanup()
         self.db.close()
         self.api_client.close()
         event.accept()
@@ -493,7 +493,14 @@ class GitSyncPanel(QWidget):
                 changes_html += f"  • {item['name']} ({item['type']})<br>"
             changes_html += "<br>"
         
-        if not any([changes.get('new_files'), changes.get('modified_files'), changes.get('new_db_items')]):
+        if changes.get('modified_db_items'):
+            changes_html += "<b>Modified items in database:</b><br>"
+            for item in changes['modified_db_items']:
+                changes_html += f"  • {item['name']} ({item['type']})<br>"
+            changes_html += "<br>"
+        
+        if not any([changes.get('new_files'), changes.get('modified_files'), changes.get('new_db_items'),
+                    changes.get('modified_db_items')]):
             changes_html += "No changes detected"
         
         self.changes_text.setHtml(changes_html)
@@ -104,6 +104,11 @@ class HistoryPanelWidget(QWidget):
         refresh_btn.clicked.connect(self._load_history)
         filter_layout.addWidget(refresh_btn)
         
+        scan_btn = QPushButton("Security Scan")
+        scan_btn.setToolTip("Scan all responses in the history and report findings per endpoint")
+        scan_btn.clicked.connect(self._scan_history)
+        filter_layout.addWidget(scan_btn)
+        
         clear_btn = QPushButton("Clear History")
         clear_btn.clicked.connect(self._clear_history)
         filter_layout.addWidget(clear_btn)
@@ -545,6 +550,15 @@ class HistoryPanelWidget(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to replay request: {str(e)}")
     
+    def _scan_history(self):
+        """Run a security scan over all responses in the history."""
+        from src.ui.dialogs.batch_security_scan_dialog import BatchSecurityScanDialog
+        
+        dialog = BatchSecurityScanDialog(self.db, scan_name=f"History scan {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+                                         parent=self)
+        dialog.exec()
+        self._load_history()
+    
     def _clear_history(self):
         """Clear request history."""
         reply = QMessageBox.question(
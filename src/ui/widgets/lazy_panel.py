@@ -0,0 +1,79 @@
+"""
+Lazy Panel Widget
+
+Placeholder widget that defers construction of a secondary panel until it
+is first shown, keeping rarely used panels out of the startup path.
+"""
+
+import time
+from typing import Callable
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+
+from src.core.startup_trace import startup_trace
+
+
+class LazyPanel(QWidget):
+    """
+    Stand-in for a panel that is built on first show.
+
+    The placeholder takes the panel's place in layouts, splitters and tab
+    widgets. Visibility calls (setVisible, isVisible, setGeometry, ...) act
+    on the placeholder itself and never build the panel. Any other attribute
+    (e.g. ``refresh()``, ``set_theme()``, signals) is forwarded to the real
+    panel, building it on demand, so callers that need the panel keep
+    working unchanged. Callers that only want to update an already visible
+    panel should check ``is_built()`` first.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], QWidget], parent=None):
+        """
+        Initialize the placeholder.
+
+        Args:
+            name: Component name used in the startup trace
+            factory: Callable returning the fully configured panel
+            parent: Parent widget
+        """
+        super().__init__(parent)
+        self._name = name
+        self._factory = factory
+        self._panel = None
+        # Plain QWidget subclasses ignore stylesheet backgrounds without this,
+        # and callers style the placeholder in place of the panel
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
+
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._layout.setSpacing(0)
+
+    def is_built(self) -> bool:
+        """Check whether the real panel has been constructed."""
+        return self._panel is not None
+
+    def panel(self) -> QWidget:
+        """Get the real panel, building it if needed."""
+        if self._panel is None:
+            start = time.perf_counter()
+            self._panel = self._factory()
+            self._layout.addWidget(self._panel)
+            startup_trace.record(f"lazy:{self._name}", time.perf_counter() - start)
+        return self._panel
+
+    def setVisible(self, visible: bool):
+        """Build the panel before it is made visible (even if the window is not shown yet)."""
+        if visible:
+            self.panel()
+        super().setVisible(visible)
+
+    def showEvent(self, event):
+        """Build the panel the first time the placeholder becomes visible."""
+        self.panel()
+        super().showEvent(event)
+
+    def __getattr__(self, name):
+        # Only called for attributes the placeholder does not have itself
+        if name.startswith('__') or '_panel' not in self.__dict__:
+            raise AttributeError(name)
+        return getattr(self.panel(), name)
@@ -13,6 +13,8 @@ from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont, QColor, QBrush
 from typing import List, Dict, Optional
 
+from src.features.security_scanner import SecurityScanner
+
 
 class SecurityScanTab(QWidget):
     """Widget for displaying security scan results in response panel."""
@@ -41,6 +43,12 @@ class SecurityScanTab(QWidget):
         self.summary_label.setStyleSheet("font-weight: 600; color: #ECF0F1;")
         header_layout.addWidget(self.summary_label)
         
+        # Shown when a scan limit stopped the body scan early
+        self.coverage_label = QLabel()
+        self.coverage_label.setStyleSheet("font-size: 11px; color: #F1C40F; margin-left: 12px;")
+        self.coverage_label.hide()
+        header_layout.addWidget(self.coverage_label)
+        
         header_layout.addStretch()
         
         self.export_button = QPushButton("Export Report")
@@ -125,6 +133,14 @@ class SecurityScanTab(QWidget):
         else:
             self.summary_label.setText("✅ No security issues found")
         
+        # Report partial coverage (SEC026 evidence reads e.g. "Scanned 10.0 MB of 50.0 MB (size limit)")
+        partial = next((f for f in findings if f.get('check_id') == SecurityScanner.PARTIAL_SCAN_CHECK_ID), None)
+        if partial:
+            self.coverage_label.setText(f"⚠️ Partial scan: {partial.get('evidence') or 'scan limit reached'}")
+            self.coverage_label.show()
+        else:
+            self.coverage_label.hide()
+        
         # Enable export button
         self.export_button.setEnabled(True)
         
@@ -240,6 +256,7 @@ class SecurityScanTab(QWidget):
         self.findings_table.setRowCount(0)
         self.details_text.clear()
         self.summary_label.setText("No security scan performed yet")
+        self.coverage_label.hide()
         self.export_button.setEnabled(False)
     
     def show_no_scan_message(self):
@@ -215,6 +215,10 @@ class TestTabWidget(QWidget):
         ]
         self.field_input.setVisible(needs_field)
         self.field_label.setVisible(needs_field)
+        if internal_type == TestAssertion.TYPE_JSON_PATH:
+            self.field_input.setPlaceholderText("e.g., $.items[?(@.id > 1)].name")
+        else:
+            self.field_input.setPlaceholderText("e.g., Content-Type")
         
         # Set appropriate operators
         if internal_type in [TestAssertion.TYPE_STATUS_CODE, TestAssertion.TYPE_RESPONSE_TIME, TestAssertion.TYPE_RESPONSE_SIZE]:
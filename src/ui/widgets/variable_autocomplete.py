@@ -10,6 +10,7 @@ from PyQt6.QtWidgets import (QListWidget, QListWidgetItem, QWidget, QLabel,
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QPoint, QRect, QSize
 from PyQt6.QtGui import QFont, QColor, QTextCursor, QPalette
 import re
+from src.features.variable_index import VariableIndex
 
 
 class VariableAutocompleteItem(QWidget):
@@ -79,12 +80,15 @@ class VariableAutocompleteWidget(QListWidget):
     
     variableSelected = pyqtSignal(str)  # Emits the variable syntax to insert
     
+    # Maximum number of rows built per query (each row is a full widget)
+    MAX_RESULTS = 50
+    
     def __init__(self, parent=None, theme='dark'):
         super().__init__(parent)
         self.theme = theme
         self.trigger_text = ""  # The text that triggered autocomplete ("{{" or ":")
         self.filter_text = ""  # Text typed after trigger for filtering
-        self.all_variables = []  # Store all available variables
+        self.all_variables = []  # Available variables (list of tuples or a VariableIndex)
         
         # Setup appearance
         self._setup_ui()
@@ -176,7 +180,8 @@ class VariableAutocompleteWidget(QListWidget):
         Show autocomplete dropdown with filtered variables.
         
         Args:
-            variables: List of tuples (var_name, var_value, scope)
+            variables: List of tuples (var_name, var_value, scope), or a
+                VariableIndex queried by prefix
             trigger: The trigger text ("{{" or ":")
             position: Global position to show the dropdown
             filter_text: Optional text to filter variables by
@@ -213,10 +218,14 @@ class VariableAutocompleteWidget(QListWidget):
         self.show()
         self.raise_()
     
-    def _filter_variables(self, variables: list, filter_text: str) -> list:
+    def _filter_variables(self, variables, filter_text: str) -> list:
         """Filter variables based on filter text."""
+        if isinstance(variables, VariableIndex):
+            # Prefix lookup on the index - cost depends on matches, not on total size
+            return variables.search(filter_text, limit=self.MAX_RESULTS)
+        
         if not filter_text:
-            return variables
+            return variables[:self.MAX_RESULTS]
         
         filter_lower = filter_text.lower()
         filtered = []
@@ -225,6 +234,8 @@ class VariableAutocompleteWidget(QListWidget):
             # Match by variable name or value
             if filter_lower in var_name.lower() or filter_lower in var_value.lower():
                 filtered.append((var_name, var_value, scope))
+                if len(filtered) >= self.MAX_RESULTS:
+                    break
         
         return filtered
     
@@ -466,8 +477,8 @@ class AutocompleteTextEdit(QTextEdit):
         self._autocomplete_start_pos = pos
         self._autocomplete_trigger = trigger
         
-        # Get all available variables
-        variables = self._get_all_variables()
+        # Get the index of all available variables
+        variables = self._get_variable_index()
         
         if not variables:
             return
@@ -499,53 +510,16 @@ class AutocompleteTextEdit(QTextEdit):
         # Update filter
         self.autocomplete_widget.update_filter(filter_text)
     
-    def _get_all_variables(self) -> list:
-        """Get all available variables from all scopes."""
-        variables = []
-        
+    def _get_variable_index(self):
+        """Get the variable index covering all scopes."""
         if not self.environment_manager:
-            return variables
-        
-        # Get extracted variables
-        try:
-            extracted_vars = self.environment_manager.get_extracted_variables()
-            for name, value in extracted_vars.items():
-                if value and value != '❌ Undefined':
-                    variables.append((name, str(value), 'ext'))
-        except:
-            pass
-        
-        # Get collection variables
-        try:
-            if self.main_window and hasattr(self.main_window, 'current_collection_id'):
-                if self.main_window.current_collection_id:
-                    col_vars = self.main_window.db.get_collection_variables(self.main_window.current_collection_id)
-                    for name, value in col_vars.items():
-                        if value and value != '❌ Undefined':
-                            variables.append((name, str(value), 'col'))
-        except:
-            pass
-        
-        # Get environment variables
-        try:
-            if self.environment_manager.has_active_environment():
-                env_vars = self.environment_manager.get_active_variables()
-                for name, value in env_vars.items():
-                    if value and value != '❌ Undefined':
-                        variables.append((name, str(value), 'env'))
-        except:
-            pass
-        
-        # Add dynamic variables
-        dynamic_vars = [
-            ('guid', 'Generates a UUID v4', 'dynamic'),
-            ('timestamp', 'Current Unix timestamp', 'dynamic'),
-            ('isoTimestamp', 'Current ISO 8601 timestamp', 'dynamic'),
-            ('randomInt', 'Random integer (0-1000)', 'dynamic'),
-        ]
-        variables.extend(dynamic_vars)
-        
-        return variables
+            return None
+        
+        collection_id = None
+        if self.main_window and hasattr(self.main_window, 'current_collection_id'):
+            collection_id = self.main_window.current_collection_id
+        
+        return self.environment_manager.get_variable_index(collection_id)
     
     def _insert_variable(self, var_syntax: str):
         """Insert the selected variable at cursor position."""
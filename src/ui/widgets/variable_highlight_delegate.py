@@ -772,8 +772,8 @@ class HighlightedLineEdit(QLineEdit):
         self._autocomplete_start_pos = pos
         self._autocomplete_trigger = trigger
         
-        # Get all available variables
-        variables = self._get_all_variables()
+        # Get the index of all available variables
+        variables = self._get_variable_index()
         
         if not variables:
             return
@@ -802,58 +802,21 @@ class HighlightedLineEdit(QLineEdit):
         # Update filter
         self.autocomplete_widget.update_filter(filter_text)
     
-    def _get_all_variables(self) -> list:
-        """Get all available variables from all scopes."""
-        variables = []
-        
+    def _get_variable_index(self):
+        """Get the variable index covering all scopes."""
         if not self.environment_manager:
-            return variables
-        
-        # Get extracted variables
-        try:
-            extracted_vars = self.environment_manager.get_extracted_variables()
-            for name, value in extracted_vars.items():
-                if value and value != '❌ Undefined':
-                    variables.append((name, str(value), 'ext'))
-        except:
-            pass
-        
-        # Get collection variables
-        try:
-            from PyQt6.QtWidgets import QWidget
-            parent = self.parent()
-            while parent:
-                if hasattr(parent, 'current_collection_id') and parent.current_collection_id:
-                    if hasattr(parent, 'db'):
-                        col_vars = parent.db.get_collection_variables(parent.current_collection_id)
-                        for name, value in col_vars.items():
-                            if value and value != '❌ Undefined':
-                                variables.append((name, str(value), 'col'))
-                        break
-                parent = parent.parent()
-        except:
-            pass
-        
-        # Get environment variables
-        try:
-            if self.environment_manager.has_active_environment():
-                env_vars = self.environment_manager.get_active_variables()
-                for name, value in env_vars.items():
-                    if value and value != '❌ Undefined':
-                        variables.append((name, str(value), 'env'))
-        except:
-            pass
-        
-        # Add dynamic variables
-        dynamic_vars = [
-            ('guid', 'Generates a UUID v4', 'dynamic'),
-            ('timestamp', 'Current Unix timestamp', 'dynamic'),
-            ('isoTimestamp', 'Current ISO 8601 timestamp', 'dynamic'),
-            ('randomInt', 'Random integer (0-1000)', 'dynamic'),
-        ]
-        variables.extend(dynamic_vars)
-        
-        return variables
+            return None
+        
+        # Find the current collection by walking up to the main window
+        collection_id = None
+        parent = self.parent()
+        while parent:
+            if hasattr(parent, 'current_collection_id') and parent.current_collection_id:
+                collection_id = parent.current_collection_id
+                break
+            parent = parent.parent()
+        
+        return self.environment_manager.get_variable_index(collection_id)
     
     def _insert_variable(self, var_syntax: str):
         """Insert the selected variable at cursor position."""
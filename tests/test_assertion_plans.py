@@ -0,0 +1,104 @@
+"""
+Tests for compiled assertion plans in TestEngine:
+- Plans are cached by assertion revision
+- One parsed response body is shared by all assertions
+- Pre-parsed paths, regexes, schemas and typed expected values
+- Compile-time errors are reported like evaluation errors
+"""
+
+import json
+
+from src.features import test_engine
+from src.features.test_engine import AssertionPlan, TestAssertion, TestEngine
+
+from tests.test_api_testing import create_mock_response
+
+
+BODY = json.dumps({'user': {'name': 'Alice', 'age': 30, 'active': True}, 'items': [{'id': 1}, {'id': 2}]})
+
+
+def assertion(assertion_id, assertion_type, operator, field=None, expected_value=None, enabled=True):
+    return TestAssertion(assertion_id, assertion_type, operator, field, expected_value, enabled)
+
+
+def messages(results):
+    return [(r.passed, r.error_message) for r in results]
+
+
+def test_plans_are_cached_by_revision():
+    """Test an unchanged assertion list reuses its plan and a change recompiles it."""
+    first = [assertion(1, TestAssertion.TYPE_STATUS_CODE, TestAssertion.OP_EQUALS, expected_value='200')]
+    again = [assertion(1, TestAssertion.TYPE_STATUS_CODE, TestAssertion.OP_EQUALS, expected_value='200')]
+    changed = [assertion(1, TestAssertion.TYPE_STATUS_CODE, TestAssertion.OP_EQUALS, expected_value='201')]
+
+    plan = TestEngine.get_plan(first)
+    assert isinstance(plan, AssertionPlan)
+    assert TestEngine.get_plan(again) is plan
+    assert TestEngine.get_plan(changed) is not plan
+    assert TestEngine.get_plan(changed).steps[0].expected == 201
+
+
+def test_body_is_parsed_once(monkeypatch):
+    """Test all JSON assertions of a plan share one parsed body."""
+    calls = []
+    original = json.loads
+    monkeypatch.setattr(test_engine.json, 'loads', lambda text, *args, **kwargs: calls.append(text) or original(text))
+
+    assertions = [
+        assertion(1, TestAssertion.TYPE_JSON_PATH, TestAssertion.OP_EQUALS, 'user.name', 'Alice'),
+        assertion(2, TestAssertion.TYPE_JSON_PATH, TestAssertion.OP_EQUALS, 'items[1].id', '2'),
+        assertion(3, TestAssertion.TYPE_JSON_SCHEMA, TestAssertion.OP_EQUALS, None, '{"type": "object"}'),
+    ]
+    plan = TestEngine.get_plan(assertions)
+    calls.clear()  # The schema is parsed when compiling
+
+    results = plan.evaluate(assertions, create_mock_response(text=BODY))
+    assert all(r.passed for r in results)
+    assert calls == [BODY]
+
+
+def test_typed_expected_values():
+    """Test the expected value is converted to the type of the actual value."""
+    response = create_mock_response(text=BODY)
+    assertions = [
+        assertion(1, TestAssertion.TYPE_JSON_PATH, TestAssertion.OP_GREATER_THAN, 'user.age', '18'),
+        assertion(2, TestAssertion.TYPE_JSON_PATH, TestAssertion.OP_EQUALS, 'user.active', 'TRUE'),
+        assertion(3, TestAssertion.TYPE_JSON_PATH, TestAssertion.OP_MATCHES_REGEX, 'user.name', '^Al'),
+        assertion(4, TestAssertion.TYPE_JSON_PATH, TestAssertion.OP_MATCHES_REGEX, 'user.age', '^30$'),
+        assertion(5, TestAssertion.TYPE_RESPONSE_TIME, TestAssertion.OP_LESS_THAN, None, '1000'),
+    ]
+    assert all(r.passed for r in TestEngine.evaluate_all(assertions, response))
+
+
+def test_compile_errors_keep_messages():
+    """Test invalid expected values, paths and schemas report the usual errors."""
+    response = create_mock_response(text=BODY)
+    assertions = [
+        assertion(1, TestAssertion.TYPE_STATUS_CODE, TestAssertion.OP_EQUALS, expected_value='ok'),
+        assertion(2, TestAssertion.TYPE_JSON_PATH, TestAssertion.OP_EXISTS, 'items[x]'),
+        assertion(3, TestAssertion.TYPE_JSON_SCHEMA, TestAssertion.OP_EQUALS, None, '{bad'),
+        assertion(4, TestAssertion.TYPE_HEADER, TestAssertion.OP_MATCHES_REGEX, 'Content-Type', '('),
+        assertion(5, 'unknown', TestAssertion.OP_EQUALS),
+        assertion(6, TestAssertion.TYPE_STATUS_CODE, TestAssertion.OP_EQUALS, expected_value='ok', enabled=False),
+    ]
+    assert messages(TestEngine.evaluate_all(assertions, response)) == [
+        (False, "Error evaluating assertion: invalid literal for int() with base 10: 'ok'"),
+        (False, "Failed to extract path 'items[x]': Expected an index, slice, name or filter at position 6 in 'items[x]'"),
+        (False, "Invalid JSON schema"),
+        (False, "Expected matches_regex '(', got 'application/json'"),
+        (False, "Unknown assertion type: unknown"),
+        (True, "Assertion disabled"),
+    ]
+
+    # JSON checks report an invalid body before problems with the assertion
+    results = TestEngine.evaluate_all(assertions[1:3], create_mock_response(text='not json'))
+    assert messages(results) == [(False, "Response is not valid JSON")] * 2
+
+
+def test_plan_results_use_current_assertions():
+    """Test results of a cached plan refer to the assertions passed in."""
+    response = create_mock_response()
+    first = [assertion(1, TestAssertion.TYPE_STATUS_CODE, TestAssertion.OP_EQUALS, expected_value='200')]
+    second = [assertion(1, TestAssertion.TYPE_STATUS_CODE, TestAssertion.OP_EQUALS, expected_value='200')]
+    TestEngine.evaluate_all(first, response)
+    assert TestEngine.evaluate_all(second, response)[0].assertion is second[0]
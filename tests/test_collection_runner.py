@@ -0,0 +1,260 @@
+"""
+Tests for the headless collection runner and `postmini run`:
+- Running a collection from the database or a git-sync export
+- Pre-request / post-response scripts with per-iteration variables
+- Iterations run concurrently
+- Command line reporters and exit codes, without importing PyQt6
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src import cli
+from src.core.api_client import ApiClient
+from src.core.database import DatabaseManager
+from src.features import split_collection
+from src.features.collection_io import CollectionExporter
+from src.features.collection_runner import CollectionRunner, load_collection, read_collection
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Answers /status/<code> with that status and echoes the request as JSON."""
+
+    def do_GET(self):
+        status = int(self.path.split('/')[2].split('?')[0]) if self.path.startswith('/status/') else 200
+        body = json.dumps({'path': self.path, 'token': self.headers.get('Authorization')}).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), EchoHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def db():
+    test_dir = tempfile.mkdtemp()
+    database = DatabaseManager(os.path.join(test_dir, 'test.db'))
+    yield database
+    database.close()
+
+
+def add_request(db, collection_id, name, url, tests=(), **kwargs):
+    request_id = db.create_request(name=name, url=url, method='GET', collection_id=collection_id, **kwargs)
+    for assertion_type, operator, field, expected in tests:
+        db.create_test_assertion(request_id, assertion_type, operator, field, expected)
+    return request_id
+
+
+@pytest.fixture
+def collection_id(db):
+    collection_id = db.create_collection("Users")
+    db.create_collection_variable(collection_id, 'userId', '7')
+    add_request(db, collection_id, "Get user", "{{baseUrl}}/users/{{userId}}",
+                tests=[('status_code', 'equals', None, '200'), ('json_path', 'equals', 'path', '/users/7')])
+    add_request(db, collection_id, "Broken", "{{baseUrl}}/status/500",
+                tests=[('status_code', 'equals', None, '200')])
+    add_request(db, collection_id, "Untested", "{{baseUrl}}/untested")
+    return collection_id
+
+
+def run(collection, **kwargs):
+    runner = CollectionRunner(ApiClient(timeout=5), collection_variables=collection['variables'], **kwargs)
+    return runner.run(collection['requests'])
+
+
+def test_run_from_database(db, collection_id, server):
+    """Test requests are substituted, sent and tested; untested ones are skipped."""
+    completed = []
+    summary = run(load_collection(db, collection_id), environment={'baseUrl': server},
+                  request_callback=completed.append)
+
+    assert [entry['request_name'] for entry in summary['results']] == ["Get user", "Broken"]
+    assert (summary['total_tests'], summary['passed'], summary['failed'], summary['errors']) == (3, 2, 1, 0)
+    assert summary['results'][0]['response']['url'] == f"{server}/users/7"
+    assert len(completed) == 2
+
+
+def test_export_matches_database(db, collection_id, server, tmp_path):
+    """Test a git-sync export (single file or split directory) runs like the database collection."""
+    export = CollectionExporter(db).export_collection(collection_id)
+    export_file = tmp_path / "Users.json"
+    export_file.write_text(json.dumps(export))
+    split_collection.write_split_collection(split_collection.split_collection(export), tmp_path / "Users")
+
+    expected = run(load_collection(db, collection_id), environment={'baseUrl': server})
+    for path in (export_file, tmp_path / "Users"):
+        summary = run(read_collection(path), environment={'baseUrl': server})
+        assert [(r['request_name'], [t.passed for t in r['results']]) for r in summary['results']] == \
+            [(r['request_name'], [t.passed for t in r['results']]) for r in expected['results']]
+
+
+def test_request_errors_are_reported(db, server):
+    """Test a request that cannot be sent is an error, not a crash."""
+    collection_id = db.create_collection("Down")
+    add_request(db, collection_id, "Nowhere", "http://127.0.0.1:9/x", tests=[('status_code', 'equals', None, '200')])
+    summary = run(load_collection(db, collection_id))
+    assert summary['errors'] == 1
+    assert not summary['results'][0]['success']
+
+
+def test_scripts_share_variables_within_an_iteration(db, server):
+    """Test scripts set variables for later requests and report pm.test() results."""
+    collection_id = db.create_collection("Scripts")
+    add_request(db, collection_id, "Login", "{{baseUrl}}/login",
+                pre_request_script="pm.environment.set('count', String(Number(pm.environment.get('count')) + 1));",
+                post_response_script="pm.environment.set('token', 'abc' + pm.environment.get('count'));\n"
+                                     "pm.test('logged in', function () { pm.response.to.have.status(200); });")
+    add_request(db, collection_id, "Me", "{{baseUrl}}/me", auth_type='Bearer Token', auth_token='{{token}}',
+                post_response_script="pm.test('token sent', function () {\n"
+                                     "  pm.expect(pm.response.json().token).to.equal('Bearer abc1');\n});")
+
+    summary = run(load_collection(db, collection_id), environment={'baseUrl': server, 'count': '0'},
+                  iterations=3, concurrency=3)
+    assert summary['total_requests'] == 6
+    assert [entry['iteration'] for entry in summary['results']] == [1, 1, 2, 2, 3, 3]
+    # Each iteration starts from the same variables
+    assert summary['passed'] == 6, [(t.assertion.field, t.error_message) for e in summary['results'] for t in e['results']]
+
+    # Changes are reported for the caller to commit, the last iteration's winning
+    assert summary['variable_changes'] == {'environment': {'count': '1', 'token': 'abc1'},
+                                           'collection_variables': {}, 'extracted': {}}
+
+    summary = run(load_collection(db, collection_id), environment={'baseUrl': server, 'count': '0'},
+                  run_scripts=False)
+    assert summary['total_requests'] == 0
+
+
+@pytest.fixture
+def v8_contexts(monkeypatch):
+    """Track the V8 contexts alive at the same time; returns [alive, most alive]."""
+    from src.features import script_engine
+
+    lock = threading.Lock()
+    counts = [0, 0]
+    create_context = script_engine._create_js_context
+
+    class TrackedContext:
+        def __init__(self):
+            self.context = create_context()
+            with lock:
+                counts[0] += 1
+                counts[1] = max(counts[1], counts[0])
+
+        def __getattr__(self, name):
+            return getattr(self.context, name)
+
+        def __del__(self):
+            with lock:
+                counts[0] -= 1
+
+    monkeypatch.setattr(script_engine, '_create_js_context', TrackedContext)
+    return counts
+
+
+def add_script_requests(db, names):
+    collection_id = db.create_collection("Stress")
+    for name in names:
+        add_request(db, collection_id, name, f"{{{{baseUrl}}}}/{name}",
+                    pre_request_script=f"pm.environment.set('{name}', String(Math.random()));",
+                    post_response_script=f"pm.test('{name} ok', function () {{ pm.response.to.have.status(200); }});")
+    return collection_id
+
+
+def test_concurrent_scripts_run_one_at_a_time(db, server, v8_contexts):
+    """Test scripts of concurrent requests never use V8 at the same time, over many iterations."""
+    collection_id = add_script_requests(db, ("A", "B", "C", "D"))
+    summary = run(load_collection(db, collection_id), environment={'baseUrl': server},
+                  iterations=25, concurrency=4)
+    assert summary['total_requests'] == 100
+    assert summary['passed'] == 100
+    assert v8_contexts[1] == 1
+
+
+def test_run_and_interactive_scripts_run_one_at_a_time(db, server, v8_contexts):
+    """Test a run in a background thread and scripts of interactive sends don't use V8 at once."""
+    from src.features.script_engine import ScriptEngine
+
+    collection_id = add_script_requests(db, ("A", "B"))
+    collection = load_collection(db, collection_id)
+    summaries = []
+    thread = threading.Thread(target=lambda: summaries.append(
+        run(collection, environment={'baseUrl': server}, iterations=20, concurrency=2)))
+    thread.start()
+    engine = ScriptEngine()
+    while thread.is_alive():
+        result = engine.execute_pre_request_script("pm.environment.set('sent', '1');", 'http://x', 'GET',
+                                                   {}, '', {}, {}, {})
+        assert result['environment'] == {'sent': '1'}
+    thread.join()
+    assert summaries[0]['passed'] == 40
+    assert v8_contexts[1] == 1
+
+
+def test_stop(db, collection_id, server):
+    """Test a stopped runner sends no further requests."""
+    runner = CollectionRunner(ApiClient(timeout=5), environment={'baseUrl': server})
+    runner.progress_callback = lambda current, total, message: runner.stop()
+    summary = runner.run(load_collection(db, collection_id)['requests'])
+    assert summary['stopped']
+    assert summary['total_requests'] == 1
+
+
+def test_cli_exit_codes_and_reports(db, collection_id, server, tmp_path, capsys):
+    """Test the exit code reflects failures and reports are written."""
+    env_file = tmp_path / "env.json"
+    env_file.write_text(json.dumps({'environment': {'name': 'Local', 'variables': {'baseUrl': server}}}))
+    junit = tmp_path / "report.xml"
+
+    code = cli.main(['run', 'Users', '--db', db.db_path, '-e', str(env_file),
+                     '-r', 'cli', '-r', f'junit:{junit}', '-n', '2', '-c', '2'])
+    assert code == cli.EXIT_FAILED
+    output = capsys.readouterr().out
+    assert "[FAIL] Broken (iteration 2): 0/1 tests passed" in output
+    assert "Passed: 4  Failed: 2" in output
+    assert 'failures="2"' in junit.read_text()
+
+    db.delete_request(db.get_requests_by_collection(collection_id)[1]['id'])
+    assert cli.main(['run', str(collection_id), '--db', db.db_path, '--env-var', f'baseUrl={server}']) == cli.EXIT_OK
+
+    assert cli.main(['run', 'Missing', '--db', db.db_path]) == cli.EXIT_ERROR
+    assert cli.main(['run', 'Users', '--db', db.db_path, '-r', 'pdf']) == cli.EXIT_ERROR
+    assert cli.main(['run']) == cli.EXIT_ERROR
+
+
+def test_cli_does_not_import_qt(db, collection_id, server, tmp_path):
+    """Test `main.py run` works without loading PyQt6."""
+    export_file = tmp_path / "Users.json"
+    export_file.write_text(json.dumps(CollectionExporter(db).export_collection(collection_id)))
+    check = (
+        "import sys, runpy\n"
+        f"sys.argv = ['main.py', 'run', {str(export_file)!r}, '--env-var', 'baseUrl={server}', '-r', 'json:' + {str(tmp_path / 'r.json')!r}]\n"
+        "try:\n"
+        "    runpy.run_path('main.py', run_name='__main__')\n"
+        "except SystemExit as e:\n"
+        "    print('exit', e.code, any(m.startswith('PyQt6') for m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', check], cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=120)
+    assert result.stdout.strip().splitlines()[-1] == 'exit 1 False', result.stderr[-2000:]
+    assert json.loads((tmp_path / 'r.json').read_text())['summary']['failed'] == 1
@@ -0,0 +1,152 @@
+"""
+Tests for last exported revision tracking in Git sync:
+- Exported revisions per sync target
+- Exports skip items unchanged since their last export
+- DB-side edits are reported as changes to push
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.core.database import DatabaseManager
+from src.features.git_sync_manager import GitSyncManager, GitSyncConfig, SyncStatus
+
+
+class TestExportedRevisions(unittest.TestCase):
+    """Test the sync_export_revisions table."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db = DatabaseManager(os.path.join(self.test_dir, 'test.db'))
+        self.coll_id = self.db.create_collection("API")
+        self.db.set_collection_sync_status(self.coll_id, 1)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_exported_revisions(self):
+        """Test exported revisions are recorded per target and item type."""
+        self.assertEqual(self.db.get_last_exported_revisions('/ws', 'collection'), {})
+
+        revision = self.db.get_collection(self.coll_id)['revision']
+        self.db.set_last_exported_revision('/ws', 'collection', self.coll_id, revision)
+        self.assertEqual(self.db.get_last_exported_revisions('/ws', 'collection'), {self.coll_id: revision})
+
+        # Targets and item types are tracked independently
+        self.assertEqual(self.db.get_last_exported_revisions('/other', 'collection'), {})
+        self.assertEqual(self.db.get_last_exported_revisions('/ws', 'environment'), {})
+
+        # Editing the collection moves it past the exported revision
+        self.db.create_request("R", "https://example.com", "GET", self.coll_id)
+        self.assertGreater(self.db.get_collection(self.coll_id)['revision'], revision)
+
+    def test_delete_clears_exported_revision(self):
+        """Test deleting an item drops its exported revisions."""
+        self.db.set_last_exported_revision('/ws', 'collection', self.coll_id, 1)
+        self.db.delete_collection(self.coll_id)
+        self.assertEqual(self.db.get_last_exported_revisions('/ws', 'collection'), {})
+
+
+class TestIncrementalExport(unittest.TestCase):
+    """Test exports only write changed items."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db = DatabaseManager(os.path.join(self.test_dir, 'test.db'))
+        self.config = GitSyncConfig(self.test_dir)
+        self.manager = GitSyncManager(self.db, self.config)
+        self.manager.initialize_workspace(create_gitignore=False)
+
+        self.coll_ids = []
+        for name in ("Users", "Orders"):
+            coll_id = self.db.create_collection(name)
+            self.db.set_collection_sync_status(coll_id, 1)
+            self.db.create_request("List", f"https://example.com/{name.lower()}", "GET", coll_id)
+            self.coll_ids.append(coll_id)
+        self.env_id = self.db.create_environment("Dev", {"host": "localhost"})
+        self.db.set_environment_sync_status(self.env_id, 1)
+
+        self.manager.sync_to_filesystem()
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def mtimes(self):
+        paths = list(self.config.collections_path.glob("*.json")) + \
+            list(self.config.environments_path.glob("*.json")) + [self.config.workspace_file]
+        return {p.name: p.stat().st_mtime_ns for p in paths}
+
+    def test_second_export_skips_unchanged(self):
+        """Test re-exporting without changes writes no file."""
+        before = self.mtimes()
+        success, message, files = self.manager.export_all_collections()
+        self.assertTrue(success)
+        self.assertEqual(len(files), 2)
+        self.assertIn("(2 unchanged)", message)
+
+        success, message, files = self.manager.export_all_environments()
+        self.assertEqual(len(files), 1)
+        self.assertIn("(1 unchanged)", message)
+
+        self.assertTrue(self.manager.sync_to_filesystem()[0])
+        self.assertEqual(self.mtimes(), before)
+
+    def test_changed_item_is_exported(self):
+        """Test only the collection changed in the DB is rewritten."""
+        before = self.mtimes()
+        self.db.create_request("Create", "https://example.com/orders", "POST", self.coll_ids[1])
+
+        success, message, files = self.manager.export_all_collections()
+        self.assertIn("(1 unchanged)", message)
+        after = self.mtimes()
+        self.assertEqual(after['Users.json'], before['Users.json'])
+
+        with open(self.config.collections_path / "Orders.json", 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.assertEqual(len(data['collection']['requests']), 2)
+
+    def test_external_edit_forces_export(self):
+        """Test a file edited outside the app is rewritten from the DB."""
+        file_path = self.config.collections_path / "Users.json"
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data['collection']['requests'][0]['url'] = "https://example.com/changed"
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        stat = file_path.stat()
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        # Seen on disk first, so the manifest knows the new content
+        self.assertEqual([c['name'] for c in self.manager.detect_changes()['modified_files']], ['Users'])
+
+        self.manager.export_all_collections()
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.assertEqual(data['collection']['requests'][0]['url'], "https://example.com/users")
+
+    def test_deleted_file_is_exported(self):
+        """Test a missing file is exported even if its revision is current."""
+        os.remove(self.config.collections_path / "Users.json")
+        self.manager.export_all_collections()
+        self.assertTrue((self.config.collections_path / "Users.json").exists())
+
+    def test_db_edit_needs_push(self):
+        """Test a DB edit of an exported collection is reported as a push."""
+        self.db.create_collection_variable(self.coll_ids[0], "token", "abc")
+        status = self.manager.get_sync_status()
+
+        self.assertEqual(status.status, SyncStatus.STATUS_NEEDS_PUSH)
+        self.assertEqual([c['name'] for c in status.changes['modified_db_items']], ['Users'])
+        self.assertEqual(status.changes['modified_files'], [])
+
+        self.manager.sync_to_filesystem()
+        self.assertEqual(self.manager.get_sync_status().status, SyncStatus.STATUS_SYNCED)
+
+
+if __name__ == '__main__':
+    unittest.main()
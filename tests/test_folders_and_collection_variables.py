@@ -343,6 +343,16 @@ class TestCollectionVariables:
         # Try to create duplicate - should raise error
         with pytest.raises(Exception):
             db.create_collection_variable(collection_id, "api_key", "value2")
+    
+    def test_update_collection_variables(self, db):
+        """Test setting, creating and removing several variables at once."""
+        collection_id = db.create_collection("Test Collection")
+        db.create_collection_variable(collection_id, "api_key", "old_value")
+        db.create_collection_variable(collection_id, "stale", "x")
+        
+        db.update_collection_variables(collection_id, {"api_key": "new_value", "cart": "c1", "stale": None})
+        
+        assert db.get_collection_variables(collection_id) == {"api_key": "new_value", "cart": "c1"}
 
 
 class TestUIIntegration:
@@ -0,0 +1,94 @@
+"""
+Import-time benchmark for the main window module.
+
+Runs ``python -X importtime -c "import src.ui.main_window"`` in a fresh
+interpreter and checks that heavy, on-demand subsystems stay off the startup
+path. Set POSTMINI_IMPORT_BUDGET_MS to also enforce a cumulative time budget
+(off by default since timings depend on the machine).
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be imported on first use
+DEFERRED_MODULES = [
+    'py_mini_racer',                            # V8 for pre/post scripts
+    'yaml',                                     # OpenAPI importer
+    'http.server',                              # OAuth callback server
+    'src.features.oauth_manager',
+    'src.ui.dialogs.oauth_dialog',
+    'src.features.auto_updater',
+    'src.ui.dialogs.update_dialog',
+    'src.ui.widgets.security_scan_tab',
+    'src.features.security_report_generator',
+    'src.ui.dialogs.collection_test_runner',
+    'src.ui.dialogs.load_test_dialog',
+    'src.ui.dialogs.git_sync_dialog',
+    'src.ui.dialogs.conflict_resolution_dialog',
+    'src.ui.dialogs.code_snippet_dialog',
+    'src.features.openapi_importer',
+]
+
+
+def measure_import(module: str) -> dict:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Returns:
+        Mapping of imported module name to cumulative import time in microseconds
+    """
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # Format: "import time: <self us> | <cumulative us> | <indented module name>"
+        _, cumulative_us, name = line.split(':', 1)[1].split('|')
+        timings[name.strip()] = int(cumulative_us)
+    return timings
+
+
+@pytest.fixture(scope='module')
+def main_window_imports():
+    """Import timings of src.ui.main_window."""
+    return measure_import('src.ui.main_window')
+
+
+def test_main_window_imports(main_window_imports):
+    """Test the main window module was actually measured."""
+    assert 'src.ui.main_window' in main_window_imports
+
+
+@pytest.mark.parametrize('module', DEFERRED_MODULES)
+def test_heavy_module_deferred(main_window_imports, module):
+    """Test on-demand subsystems are not imported with the main window."""
+    assert module not in main_window_imports, f"{module} is imported at startup"
+
+
+def test_import_time_budget(main_window_imports):
+    """Test the cumulative import time stays within the configured budget."""
+    total_ms = main_window_imports['src.ui.main_window'] / 1000
+    print(f"\nsrc.ui.main_window import time: {total_ms:.1f} ms")
+
+    budget = os.environ.get('POSTMINI_IMPORT_BUDGET_MS')
+    if not budget:
+        pytest.skip("Set POSTMINI_IMPORT_BUDGET_MS to enforce an import-time budget")
+    assert total_ms <= float(budget)
+
+
+def test_script_engine_defers_v8():
+    """Test importing the script engine does not load py_mini_racer."""
+    timings = measure_import('src.features.script_engine')
+    assert 'src.features.script_engine' in timings
+    assert 'py_mini_racer' not in timings
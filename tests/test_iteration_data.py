@@ -0,0 +1,178 @@
+"""
+Tests for data-driven collection runs:
+- Streaming CSV, JSON lines and JSON array data files
+- The iteration data variable scope in VariableSubstitution
+- pm.iterationData in scripts
+- One iteration per row, run concurrently
+"""
+
+import json
+import tracemalloc
+
+import pytest
+
+from src.core.api_client import ApiClient
+from src.features import iteration_data
+from src.features.collection_runner import CollectionRunner
+from src.features.iteration_data import DataFileError, count_rows, detect_format, iter_rows, to_variables
+from src.features.script_engine import ScriptEngine
+from src.features.variable_substitution import VariableSubstitution
+
+from tests.test_collection_runner import server  # noqa: F401 (fixture)
+
+
+ROWS = [{'id': 1, 'name': 'Ann', 'admin': True}, {'id': 2, 'name': 'Bo, Jr.', 'admin': False}]
+
+
+@pytest.fixture
+def data_files(tmp_path):
+    csv_file = tmp_path / "users.csv"
+    csv_file.write_text('id,name,admin\n1,Ann,true\n2,"Bo, Jr.",false\n', encoding='utf-8')
+    jsonl_file = tmp_path / "users.jsonl"
+    jsonl_file.write_text('\n'.join(json.dumps(row) for row in ROWS) + '\n\n', encoding='utf-8')
+    json_file = tmp_path / "users.json"
+    json_file.write_text(json.dumps(ROWS, indent=2), encoding='utf-8')
+    return csv_file, jsonl_file, json_file
+
+
+def test_formats(data_files, tmp_path):
+    """Test each format yields one dictionary per row."""
+    csv_file, jsonl_file, json_file = data_files
+    assert [detect_format(path) for path in data_files] == ['csv', 'jsonl', 'json']
+    assert list(iter_rows(csv_file)) == [{'id': '1', 'name': 'Ann', 'admin': 'true'},
+                                         {'id': '2', 'name': 'Bo, Jr.', 'admin': 'false'}]
+    assert list(iter_rows(jsonl_file)) == ROWS
+    assert list(iter_rows(json_file)) == ROWS
+
+    lines_in_json = tmp_path / "lines.json"
+    lines_in_json.write_text(jsonl_file.read_text())
+    assert detect_format(lines_in_json) == 'jsonl'
+
+    empty = tmp_path / "empty.json"
+    empty.write_text('[ ]')
+    assert count_rows(empty) == 0
+
+
+def test_json_array_read_in_chunks(data_files, monkeypatch):
+    """Test elements split across read chunks are parsed correctly."""
+    monkeypatch.setattr(iteration_data, 'READ_CHUNK_SIZE', 3)
+    assert list(iter_rows(data_files[2])) == ROWS
+
+
+@pytest.mark.parametrize('content, data_format, message', [
+    ('{"a": 1}\n[1]\n', 'jsonl', "Line 2: expected a JSON object"),
+    ('{"a": 1}\n{oops\n', 'jsonl', "Line 2: "),
+    ('[{"a": 1} {"b": 2}]', 'json', "Expected ',' or ']' after item 1"),
+    ('[{"a": 1}, 2]', 'json', "Item 2: expected a JSON object"),
+    ('[{"a": 1},', 'json', "Unexpected end of JSON array"),
+    ('{"a": 1}', 'json', "Expected a JSON array of objects"),
+])
+def test_invalid_files(tmp_path, content, data_format, message):
+    """Test invalid rows are reported with their position."""
+    path = tmp_path / "data"
+    path.write_text(content)
+    with pytest.raises(DataFileError, match=message.replace('[', r'\[').replace(']', r'\]')):
+        count_rows(path, data_format)
+
+
+@pytest.mark.parametrize('data_format', ['csv', 'json'])
+def test_large_files_are_streamed(tmp_path, data_format):
+    """Test a 100k-row file is read without holding it in memory."""
+    path = tmp_path / f"big.{data_format}"
+    with open(path, 'w', encoding='utf-8') as f:
+        if data_format == 'csv':
+            f.write('id,email\n')
+            f.writelines(f"{i},user{i}@example.com\n" for i in range(100000))
+        else:
+            f.write('[' + ','.join(json.dumps({'id': i, 'email': f"user{i}@example.com"}) for i in range(100000)) + ']')
+    size = path.stat().st_size
+
+    tracemalloc.start()
+    try:
+        assert count_rows(path) == 100000
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < size / 4
+
+
+def test_substitution_scope():
+    """Test data row values take priority over other scopes."""
+    data = to_variables({'id': 7, 'admin': True, 'tags': ['a'], 'note': None, 'name': 'Ann'})
+    assert data == {'id': '7', 'admin': 'true', 'tags': '["a"]', 'note': 'null', 'name': 'Ann'}
+
+    text, unresolved = VariableSubstitution.substitute(
+        '{{name}} {{env.name}} {{id}} {{missing}}', {'name': 'env'}, {'id': 'col'}, {},
+        iteration_variables=data
+    )
+    assert text == 'Ann env 7 {{missing}}'
+    assert unresolved == ['{{missing}}']
+
+    substituted, _ = VariableSubstitution.substitute_request(
+        'http://x/users/:id', {'q': '{{name}}'}, {}, '', '', {}, {}, {}, data
+    )
+    assert substituted['url'] == 'http://x/users/7'
+    assert substituted['params'] == {'q': 'Ann'}
+
+
+def test_pm_iteration_data():
+    """Test scripts read the row through pm.iterationData and pm.variables."""
+    engine = ScriptEngine()
+    result = engine.execute_pre_request_script(
+        "pm.environment.set('out', [pm.iterationData.get('id'), pm.iterationData.has('x'),"
+        " pm.variables.get('name'), JSON.stringify(pm.iterationData.toObject())].join('|'));",
+        'http://x', 'GET', {}, '', {}, {'name': 'env'}, {}, iteration_data={'id': 3, 'name': 'Ann'}
+    )
+    assert result['environment']['out'] == '3|false|Ann|{"id":3,"name":"Ann"}'
+
+    result = engine.execute_post_response_script(
+        "pm.test('row ' + pm.iterationData.get('id'), function () {});", 200, {}, '{}', 1.0, {}, {},
+        iteration_data={'id': 9}
+    )
+    assert result['test_results'][0]['name'] == 'row 9'
+
+
+def make_requests(script=None):
+    return [{
+        'id': 1, 'name': "Get user", 'method': 'GET', 'url': '{{baseUrl}}/users/{{id}}',
+        'post_response_script': script,
+        'assertions': [{'id': 1, 'assertion_type': 'status_code', 'operator': 'equals', 'expected_value': '200'}],
+    }]
+
+
+def test_data_driven_run(server, tmp_path):  # noqa: F811
+    """Test one iteration runs per row, concurrently, with the row's variables."""
+    path = tmp_path / "ids.csv"
+    path.write_text('id\n' + '\n'.join(str(i) for i in range(20)) + '\n')
+    script = "pm.test('id', function () { pm.expect(pm.response.json().path).to.equal('/users/' + pm.iterationData.get('id')); });"
+
+    runner = CollectionRunner(ApiClient(timeout=5), environment={'baseUrl': server},
+                              data_file=str(path), concurrency=4)
+    summary = runner.run(make_requests(script))
+    assert summary['iterations'] == 20
+    assert [entry['iteration'] for entry in summary['results']] == list(range(1, 21))
+    assert (summary['passed'], summary['failed']) == (40, 0)
+
+    runner = CollectionRunner(ApiClient(timeout=5), environment={'baseUrl': server},
+                              data_file=str(path), iterations=25, run_scripts=False)
+    summary = runner.run(make_requests())
+    assert summary['total_requests'] == 25
+    assert summary['results'][-1]['response']['url'] == f"{server}/users/19"  # Last row reused
+
+
+def test_cli_iteration_data(server, tmp_path, capsys):  # noqa: F811
+    """Test `postmini run -d` runs one iteration per row of the data file."""
+    from src import cli
+
+    collection = tmp_path / "Users.json"
+    collection.write_text(json.dumps({'collection': {'name': "Users", 'requests': [{
+        'name': "Get user", 'method': 'GET', 'url': '{{baseUrl}}/status/{{status}}',
+        'tests': [{'type': 'status_code', 'operator': 'equals', 'expected_value': '200'}],
+    }]}}))
+    data = tmp_path / "statuses.jsonl"
+    data.write_text('{"status": 200}\n{"status": 404}\n')
+
+    code = cli.main(['run', str(collection), '--env-var', f'baseUrl={server}', '-d', str(data), '-c', '2'])
+    assert code == cli.EXIT_FAILED
+    assert "[FAIL] Get user (iteration 2)" in capsys.readouterr().out
+    assert cli.main(['run', str(collection), '-d', str(tmp_path / 'missing.csv')]) == cli.EXIT_ERROR
@@ -0,0 +1,123 @@
+"""
+Tests for the shared JSONPath engine:
+- Selectors: members, indexes, slices, wildcards, recursive descent, filters
+- Compatibility with the previous dot/bracket notation
+- Compiled expressions cached and evaluated lazily
+- Use in JSON path assertions and variable extraction
+"""
+
+import json
+
+import pytest
+
+from src.features.json_path import JSONPathError, compile_path
+from src.features.test_engine import TestAssertion, TestEngine
+from src.features.variable_extractor import VariableExtractor
+
+from tests.test_api_testing import create_mock_response
+
+
+STORE = {
+    'store': {
+        'book': [
+            {'category': 'reference', 'author': 'Nigel Rees', 'title': 'Sayings', 'price': 8.95},
+            {'category': 'fiction', 'author': 'Evelyn Waugh', 'title': 'Sword', 'price': 12.99},
+            {'category': 'fiction', 'author': 'Herman Melville', 'title': 'Moby Dick', 'isbn': '0-553', 'price': 8.99},
+            {'category': 'fiction', 'author': 'J. R. R. Tolkien', 'title': 'LOTR', 'isbn': '0-395', 'price': 22.99},
+        ],
+        'bicycle': {'color': 'red', 'price': 19.95, 'gears': None},
+    },
+    'expensive': 10,
+    'flags': [True, 1, 'true'],
+}
+
+
+@pytest.mark.parametrize('expression, expected', [
+    # Definite paths give the value itself
+    ('$.store.bicycle.color', 'red'),
+    ('store.bicycle.color', 'red'),
+    ("$['store']['bicycle']['color']", 'red'),
+    ('store.book[0].title', 'Sayings'),
+    ('$.store.book[-1].title', 'LOTR'),
+    ('store.book[9].title', None),
+    ('store.bicycle.gears', None),
+    ('$', STORE),
+    # Other paths give the list of matches
+    ('$.store.book[*].author', ['Nigel Rees', 'Evelyn Waugh', 'Herman Melville', 'J. R. R. Tolkien']),
+    ('$..price', [8.95, 12.99, 8.99, 22.99, 19.95]),
+    ('$.store.book[0, 2].title', ['Sayings', 'Moby Dick']),
+    ('$.store.book[1:3].title', ['Sword', 'Moby Dick']),
+    ('$.store.book[::-2].title', ['LOTR', 'Sword']),
+    ("$.store.bicycle['color', 'price']", ['red', 19.95]),
+    ('$..book[?(@.isbn)].title', ['Moby Dick', 'LOTR']),
+    ('$..book[?(@.price < 10)].title', ['Sayings', 'Moby Dick']),
+    ('$..book[?(@.price > $.expensive && @.category == "fiction")].title', ['Sword', 'LOTR']),
+    ('$..book[?(!@.isbn || @.price >= 22.99)].title', ['Sayings', 'Sword', 'LOTR']),
+    ('$..book[?(@.author =~ /^h/i)].title', ['Moby Dick']),
+    ("$..book[?(@.author =~ 'Rees$')].title", ['Sayings']),
+    ('$.flags[?(@ == true)]', [True]),
+    ('$.flags[?(@ == 1)]', [1]),
+    ('$..book[?(@.missing != 1)].title', ['Sayings', 'Sword', 'Moby Dick', 'LOTR']),
+    ('$..nothing', None),
+])
+def test_expressions(expression, expected):
+    """Test selectors and filters."""
+    assert compile_path(expression).value(STORE) == expected
+
+
+@pytest.mark.parametrize('expression', [
+    '', '$.', 'items[x]', '$[?(@.a == )]', '$.a[1:2:0]', "$['a", '$.a[?(@.b =~ /(/)]', '$.a]b[',
+])
+def test_invalid_expressions(expression):
+    """Test invalid expressions raise JSONPathError."""
+    with pytest.raises(JSONPathError):
+        compile_path(expression)
+
+
+def test_compiled_paths_are_cached():
+    """Test an expression is compiled once."""
+    assert compile_path('$.store.book[0]') is compile_path('$.store.book[0]')
+    assert compile_path('$.store.book[0]').definite
+    assert not compile_path('$.store.book[*]').definite
+
+
+def test_matches_stream_lazily():
+    """Test matches are produced one at a time, so first() stops early."""
+    visited = []
+
+    class Item(dict):
+        def __contains__(self, key):
+            visited.append(self['id'])
+            return super().__contains__(key)
+
+    data = {'items': [Item(id=i) for i in range(100000)]}
+    path = compile_path('$.items[*].id')
+    assert path.first(data) == 0
+    assert len(visited) == 1
+
+    matches = compile_path('$..id').find(data)
+    assert [next(matches) for _ in range(3)] == [0, 1, 2]
+
+
+def test_assertions_use_json_path():
+    """Test JSON path assertions accept full JSONPath."""
+    response = create_mock_response(text=json.dumps(STORE))
+
+    def result(field, operator, expected=None):
+        assertion = TestAssertion(1, TestAssertion.TYPE_JSON_PATH, operator, field, expected)
+        return TestEngine.evaluate_assertion(assertion, response)
+
+    assert result('$..book[?(@.price > 20)].title', TestAssertion.OP_CONTAINS, 'LOTR').passed
+    assert result('$.store.book[-1].price', TestAssertion.OP_GREATER_THAN, '20').passed
+    assert result('$..book[?(@.isbn)]', TestAssertion.OP_EXISTS).passed
+    assert result('$..book[?(@.price > 100)]', TestAssertion.OP_NOT_EXISTS).passed
+    assert not result('store.bicycle.gears', TestAssertion.OP_EXISTS).passed  # null counts as missing
+
+
+def test_variable_extraction_uses_json_path():
+    """Test variable extraction accepts full JSONPath."""
+    response = create_mock_response(text=json.dumps(STORE))
+    assert VariableExtractor.extract_from_json_path(response, 'store.book[0].author') == 'Nigel Rees'
+    assert VariableExtractor.extract_from_json_path(response, '$..book[?(@.isbn)].isbn') == ['0-553', '0-395']
+    assert VariableExtractor.extract_from_json_path(response, 'store.book[x]') is None
+    assert VariableExtractor.extract_from_json_path(create_mock_response(text='oops'), 'a') is None
@@ -0,0 +1,138 @@
+"""
+Test deferred construction of secondary panels:
+1. LazyPanel builds its panel only when shown or used
+2. MainWindow starts without building secondary panels
+3. Startup trace records per-component timings
+"""
+
+import pytest
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QLabel, QWidget
+from src.ui.main_window import MainWindow
+from src.ui.widgets.lazy_panel import LazyPanel
+from src.core.startup_trace import StartupTrace, startup_trace
+import os
+import tempfile
+
+
+@pytest.fixture
+def app(qtbot):
+    """Create application instance."""
+    db_path = tempfile.mktemp(suffix='.db')
+
+    window = MainWindow(db_path=db_path)
+    qtbot.addWidget(window)
+    window.show()
+
+    yield window
+
+    # Cleanup
+    window.close()
+    window.db.close()
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+
+def test_lazy_panel_builds_on_show(qtbot):
+    """Test the factory runs once, on first show."""
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return QLabel("panel")
+
+    panel = LazyPanel('test', factory)
+    qtbot.addWidget(panel)
+    panel.setVisible(False)
+    assert not panel.is_built()
+    assert calls == []
+
+    panel.setVisible(True)
+    panel.setVisible(False)
+    panel.setVisible(True)
+    assert panel.is_built()
+    assert calls == [1]
+    # The build time goes to the startup trace
+    assert 'lazy:test' in [name.strip() for name, _ in startup_trace.records]
+
+
+def test_lazy_panel_forwards_attributes(qtbot):
+    """Test panel API calls are forwarded and build the panel on demand."""
+    panel = LazyPanel('test', lambda: QLabel("hello"))
+    qtbot.addWidget(panel)
+
+    assert not panel.is_built()
+    assert panel.text() == "hello"
+    assert panel.is_built()
+
+    with pytest.raises(AttributeError):
+        panel.no_such_method()
+
+
+def test_lazy_panel_paints_stylesheet_background(qtbot):
+    """Test a stylesheet background set on the placeholder is painted."""
+    window = QWidget()
+    qtbot.addWidget(window)
+    window.setObjectName("window")
+    window.setStyleSheet("#window { background: #FFFFFF; } LazyPanel { background: #1E1E1E; }")
+    panel = LazyPanel('test', QWidget, window)
+    panel.setGeometry(0, 0, 40, 40)
+    window.resize(80, 80)
+    window.show()
+
+    assert window.grab().toImage().pixelColor(20, 20) == QColor('#1E1E1E')
+
+
+def test_secondary_panels_deferred(app):
+    """Test secondary panels are not built at startup."""
+    for pane in (app.settings_pane, app.git_sync_pane, app.variable_inspector_pane,
+                 app.environments_pane, app.history_panel_widget):
+        assert isinstance(pane, LazyPanel)
+        assert not pane.is_built()
+
+
+def test_switching_panel_builds_it(app):
+    """Test opening a left panel builds and shows it."""
+    app._switch_left_panel('environments')
+    assert app.environments_pane.is_built()
+    assert app.environments_pane.isVisible()
+    assert not app.variable_inspector_pane.is_built()
+
+
+def test_theme_applied_to_late_built_panel(app):
+    """Test a panel built after a theme switch uses the current theme."""
+    app.current_theme = 'light'
+    app._switch_left_panel('variable_inspector')
+    assert app.variable_inspector_pane.is_built()
+    assert app.variable_inspector_pane.current_theme == 'light'
+
+
+def test_update_check_leaves_settings_unbuilt(app, monkeypatch):
+    """Test the startup update check neither builds the settings panel nor runs after close."""
+    from src.features.auto_updater import UpdateChecker
+    monkeypatch.setattr(UpdateChecker, 'start', lambda self: None)
+
+    app._check_for_updates(silent=True)
+    app._on_no_update(UpdateChecker.CURRENT_VERSION)
+    app._on_update_check_finished()
+    assert not app.settings_pane.is_built()
+
+    checker = app.update_checker_thread
+    app.close()
+    app._check_for_updates(silent=True)
+    assert app.update_checker_thread is checker
+
+
+def test_startup_trace_sections():
+    """Test nested sections are recorded in order with indentation."""
+    trace = StartupTrace()
+    with trace.section("outer"):
+        with trace.section("inner"):
+            pass
+    trace.record("lazy:panel", 0.5)
+    trace.finish()
+
+    names = [name for name, _ in trace.records]
+    assert names == ["outer", "  inner", "lazy:panel"]
+    assert trace.records[0][1] >= trace.records[1][1]
+    assert "TOTAL" in trace.report()
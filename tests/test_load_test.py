@@ -0,0 +1,167 @@
+"""
+Tests for load testing:
+- HDR latency histogram accuracy and merging
+- Concurrency and target rate modes with ramp-up
+- Error rates, stopping, reports and `postmini load`
+"""
+
+import json
+import random
+
+import pytest
+
+from src import cli
+from src.core.api_client import ApiClient
+from src.features.load_test import LatencyHistogram, LoadTest, MODE_CONCURRENCY, MODE_RATE
+from src.features.test_report_generator import LoadTestHTMLReportGenerator, LoadTestJSONReportGenerator
+
+from tests.test_collection_runner import server  # noqa: F401 (fixture)
+
+
+def exact_percentile(values, percentile):
+    rank = min(max(1, int(percentile / 100.0 * len(values) + 0.5)), len(values))
+    return sorted(values)[rank - 1]
+
+
+def test_histogram_percentiles_have_three_significant_digits():
+    """Test percentiles are within 0.1% of the exact values over a wide range."""
+    rng = random.Random(42)
+    values = [int(rng.lognormvariate(9, 2)) for _ in range(50000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    assert histogram.count == len(values)
+    assert (histogram.min, histogram.max) == (min(values), max(values))
+    for percentile in (0, 50, 90, 99, 99.9, 100):
+        exact = exact_percentile(values, percentile)
+        assert exact <= histogram.percentile(percentile) <= exact * 1.001 + 1
+    # Fixed precision keeps the histogram small however many values are recorded
+    assert len(histogram.counts) < 25000
+
+    small = LatencyHistogram()
+    for value in range(1, 2001):
+        small.record(value)
+    assert small.percentile(50) == 1000  # Exact below 2048
+
+
+def test_histogram_merge():
+    """Test merged histograms equal one histogram of all values."""
+    parts = [LatencyHistogram() for _ in range(3)]
+    combined = LatencyHistogram()
+    for value in range(0, 300000, 7):
+        parts[value % 3].record(value)
+        combined.record(value)
+
+    merged = LatencyHistogram()
+    for part in parts + [LatencyHistogram()]:
+        merged.merge(part)
+    assert merged.counts == combined.counts
+    assert merged.summary() == combined.summary()
+    assert LatencyHistogram().summary()['p99'] == 0
+
+
+def make_requests():
+    return [
+        {'id': 1, 'name': "Users", 'method': 'GET', 'url': '{{baseUrl}}/users'},
+        {'id': 2, 'name': "Broken", 'method': 'GET', 'url': '{{baseUrl}}/status/500'},
+    ]
+
+
+def test_concurrency_mode(server):  # noqa: F811
+    """Test workers send back to back, round-robin over the requests."""
+    snapshots = []
+    load_test = LoadTest(ApiClient(timeout=5), make_requests(), environment={'baseUrl': server},
+                         duration=1.0, concurrency=3, ramp_up=0.5,
+                         progress_callback=snapshots.append, progress_interval=0.2)
+    result = load_test.run()
+
+    assert result['mode'] == MODE_CONCURRENCY
+    assert result['total_requests'] > 10
+    users, broken = result['requests']
+    assert abs(users['requests'] - broken['requests']) <= 3
+    assert result['status_codes'] == {200: users['requests'], 500: broken['requests']}
+    assert (result['failed'], result['errors']) == (broken['requests'], 0)
+    assert result['error_rate'] == pytest.approx(broken['requests'] / result['total_requests'])
+    assert 0 < result['latency']['p50'] <= result['latency']['p99'] <= result['latency']['max']
+    assert len(snapshots) >= 4 and snapshots[-1] == result
+    assert sum(point['requests'] for point in result['timeline']) == result['total_requests']
+
+
+def test_rate_mode_follows_the_ramp(server):  # noqa: F811
+    """Test the rate rises linearly during the ramp-up, then holds."""
+    load_test = LoadTest(ApiClient(timeout=5), make_requests()[:1], environment={'baseUrl': server},
+                         duration=1.5, concurrency=4, target_rps=40, ramp_up=1.0)
+    result = load_test.run()
+
+    # 20 sends during the ramp-up (half the target rate on average), 20 after
+    assert result['mode'] == MODE_RATE
+    assert result['total_requests'] == 40
+    assert result['error_rate'] == 0
+    assert [round(load_test._send_delay(send), 3) for send in (0, 5, 20, 30)] == [0, 0.5, 1.0, 1.25]
+
+
+def test_transport_errors_and_stop():
+    """Test unreachable servers count as errors and stop() ends the test early."""
+    load_test = LoadTest(ApiClient(timeout=1), [{'id': 1, 'name': "Down", 'url': 'http://127.0.0.1:9/'}],
+                         duration=30, concurrency=2, progress_interval=0.1)
+    load_test.progress_callback = lambda snapshot: load_test.stop()
+    result = load_test.run()
+
+    assert result['stopped']
+    assert result['elapsed'] < 10
+    assert result['errors'] == result['total_requests'] > 0
+    assert result['error_rate'] == 1.0
+    assert list(result['error_messages']) == ["Failed to connect to http://127.0.0.1:9/"]
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'duration': 0}, {'concurrency': 0}, {'target_rps': -1}, {'ramp_up': 5, 'duration': 1},
+])
+def test_invalid_profile(kwargs):
+    """Test invalid load profiles are rejected."""
+    with pytest.raises(ValueError):
+        LoadTest(ApiClient(), [{'id': 1, 'name': "A", 'url': 'http://x'}], **kwargs)
+    with pytest.raises(ValueError, match="No requests"):
+        LoadTest(ApiClient(), [])
+
+
+def test_reports(server):  # noqa: F811
+    """Test the JSON and HTML reports contain the summary, percentiles and timeline."""
+    result = LoadTest(ApiClient(timeout=5), make_requests(), environment={'baseUrl': server},
+                      duration=0.5, concurrency=2, progress_interval=0.1).run()
+    metadata = {'name': "Users <API>", 'environment': "Local"}
+
+    report = json.loads(LoadTestJSONReportGenerator.generate(result, metadata))
+    assert report['metadata']['name'] == "Users <API>"
+    assert report['profile']['concurrency'] == 2
+    assert report['summary']['total_requests'] == result['total_requests']
+    assert set(report['latency_ms']) == {'min', 'mean', 'p50', 'p90', 'p99', 'p999', 'max'}
+    assert report['status_codes']['500'] == result['requests'][1]['requests']
+    assert [r['name'] for r in report['requests']] == ["Users", "Broken"]
+
+    html = LoadTestHTMLReportGenerator.generate(result, metadata)
+    assert "Users &lt;API&gt;" in html
+    assert "p99.9" in html and "Timeline" in html
+
+
+def test_cli_load(server, tmp_path, capsys):  # noqa: F811
+    """Test `postmini load` prints progress, writes reports and checks the error rate."""
+    collection = tmp_path / "Users.json"
+    collection.write_text(json.dumps({'collection': {'name': "Users", 'requests': make_requests()}}))
+    report = tmp_path / "load.json"
+
+    code = cli.main(['load', str(collection), '--env-var', f'baseUrl={server}', '--request', 'Users',
+                     '--duration', '1', '-c', '2', '--rps', '20', '--max-error-rate', '0',
+                     '-r', 'cli', '-r', f'json:{report}'])
+    assert code == cli.EXIT_OK
+    output = capsys.readouterr().out
+    assert "GET Users" in output and "Broken" not in output
+    assert "Throughput:" in output
+    assert json.loads(report.read_text())['summary']['total_requests'] == 20
+
+    assert cli.main(['load', str(collection), '--env-var', f'baseUrl={server}', '--duration', '0.5',
+                     '--max-error-rate', '10']) == cli.EXIT_FAILED
+    assert cli.main(['load', str(collection), '--request', 'Missing']) == cli.EXIT_ERROR
+    assert cli.main(['load', str(collection), '--duration', '0']) == cli.EXIT_ERROR
+    assert cli.main(['load', str(collection), '-r', 'junit']) == cli.EXIT_ERROR
@@ -0,0 +1,205 @@
+"""
+Tests for parallel Git sync import/export:
+- Batched database transactions with per-item savepoints
+- Progress reporting and cancellation
+- Background sync thread used by the Git sync dialog
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.core.database import DatabaseManager
+from src.features.git_sync_manager import GitSyncManager, GitSyncConfig
+
+
+class TestTransaction(unittest.TestCase):
+    """Test DatabaseManager.transaction()."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.test_dir, 'test.db')
+        self.db = DatabaseManager(self.db_path)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def names(self, db=None):
+        return [c['name'] for c in (db or self.db).get_all_collections()]
+
+    def test_commits_once_at_end(self):
+        """Test writes become visible to other connections only after the block."""
+        other = DatabaseManager(self.db_path)
+        try:
+            with self.db.transaction():
+                self.db.create_collection("A")
+                self.db.create_collection("B")
+                self.assertEqual(self.names(other), [])
+            self.assertEqual(self.names(other), ["A", "B"])
+        finally:
+            other.close()
+
+    def test_rollback_on_error(self):
+        """Test an exception undoes all writes of the block."""
+        with self.assertRaises(ValueError):
+            with self.db.transaction():
+                self.db.create_collection("A")
+                raise ValueError("boom")
+        self.assertEqual(self.names(), [])
+        self.assertFalse(self.db.connection.in_transaction)
+
+    def test_nested_rollback(self):
+        """Test a failing nested block only undoes its own writes."""
+        with self.db.transaction():
+            self.db.create_collection("Kept")
+            try:
+                with self.db.transaction():
+                    self.db.create_collection("Dropped")
+                    raise ValueError("boom")
+            except ValueError:
+                pass
+        self.assertEqual(self.names(), ["Kept"])
+
+    def test_failing_operation_inside_transaction(self):
+        """Test an operation that rolls back and re-raises does not end the transaction."""
+        first = self.db.create_collection("First")
+        with self.db.transaction():
+            self.db.create_collection("A")
+            with self.assertRaises(Exception):
+                with self.db.transaction():
+                    self.db.create_collection("First")  # UNIQUE constraint
+            self.db.create_collection("B")
+        self.assertEqual(sorted(self.names()), ["A", "B", "First"])
+        self.assertIsNotNone(self.db.get_collection(first))
+
+    def test_operation_rollback_inside_transaction(self):
+        """Test an operation that fails halfway and rolls back undoes its own writes, and only those."""
+        first = self.db.create_collection("First")
+        second = self.db.create_collection("Second")
+        order = {c['id']: c['order_index'] for c in self.db.get_all_collections()}
+        with self.db.transaction():
+            self.db.create_collection("Kept")
+            with self.assertRaises(Exception):
+                # The first UPDATE succeeds, the second can't bind its id
+                self.db.reorder_collections([second, first, {'not': 'an id'}])
+        collections = {c['name']: c for c in self.db.get_all_collections()}
+        self.assertIn("Kept", collections)
+        self.assertEqual(collections["First"]['order_index'], order[first])
+        self.assertEqual(collections["Second"]['order_index'], order[second])
+
+
+class TestParallelSync(unittest.TestCase):
+    """Test bulk import/export with progress and cancellation."""
+
+    COUNT = 12
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db = DatabaseManager(os.path.join(self.test_dir, 'source.db'))
+        self.config = GitSyncConfig(self.test_dir)
+        self.manager = GitSyncManager(self.db, self.config)
+        self.manager.initialize_workspace(create_gitignore=False)
+
+        for i in range(self.COUNT):
+            coll_id = self.db.create_collection(f"Collection {i:02d}")
+            self.db.set_collection_sync_status(coll_id, 1)
+            for j in range(3):
+                self.db.create_request(f"Request {j}", f"https://example.com/{i}/{j}", "GET", coll_id)
+        env_id = self.db.create_environment("Dev", {"host": "localhost"})
+        self.db.set_environment_sync_status(env_id, 1)
+
+        self.target_db = DatabaseManager(os.path.join(self.test_dir, 'target.db'))
+        self.target = GitSyncManager(self.target_db, self.config)
+
+    def tearDown(self):
+        self.db.close()
+        self.target_db.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_export_progress(self):
+        """Test every exported collection is reported in order."""
+        progress = []
+        success, _, files = self.manager.export_all_collections(
+            progress_callback=lambda done, total, message: progress.append((done, total))
+        )
+        self.assertTrue(success)
+        self.assertEqual(len(files), self.COUNT)
+        self.assertEqual(progress, [(i, self.COUNT) for i in range(1, self.COUNT + 1)])
+        self.assertEqual(len(list(self.config.collections_path.glob("*.json"))), self.COUNT)
+
+    def test_import_roundtrip(self):
+        """Test a pull imports all collections, requests and environments."""
+        self.manager.sync_to_filesystem()
+        progress = []
+        success, message = self.target.sync_from_filesystem(
+            progress_callback=lambda done, total, msg: progress.append(msg)
+        )
+        self.assertTrue(success, message)
+
+        collections = self.target_db.get_all_collections()
+        self.assertEqual(len(collections), self.COUNT)
+        self.assertTrue(all(len(self.target_db.get_requests_by_collection(c['id'])) == 3 for c in collections))
+        self.assertEqual([e['name'] for e in self.target_db.get_all_environments()], ["Dev"])
+        self.assertEqual(len(progress), self.COUNT + 1)
+
+    def test_import_cancellation(self):
+        """Test cancelling keeps the collections imported so far."""
+        self.manager.sync_to_filesystem()
+        progress = []
+        success, message = self.target.sync_from_filesystem(
+            progress_callback=lambda done, total, msg: progress.append(done),
+            is_cancelled=lambda: len(progress) >= 5
+        )
+        self.assertFalse(success)
+        self.assertIn("cancelled", message)
+        self.assertEqual(len(self.target_db.get_all_collections()), 5)
+        self.assertEqual(self.target_db.get_all_environments(), [])
+
+    def test_failed_import_keeps_existing_collection(self):
+        """Test an invalid file does not delete the collection it would replace."""
+        self.manager.sync_to_filesystem()
+        self.target.sync_from_filesystem()
+
+        file_path = self.config.collections_path / "Collection 00.json"
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        del data['collection']['requests']
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+        success, _, imported = self.target.import_all_collections(update_existing=True)
+        self.assertEqual(len(imported), self.COUNT - 1)
+        kept = [c for c in self.target_db.get_all_collections() if c['name'] == "Collection 00"]
+        self.assertEqual(len(kept), 1)
+        self.assertEqual(len(self.target_db.get_requests_by_collection(kept[0]['id'])), 3)
+
+
+def test_sync_thread(qtbot):
+    """Test the dialog's background thread pushes with progress."""
+    from src.ui.dialogs.git_sync_dialog import GitSyncThread
+
+    test_dir = tempfile.mkdtemp()
+    db_path = os.path.join(test_dir, 'test.db')
+    db = DatabaseManager(db_path)
+    try:
+        config = GitSyncConfig(test_dir)
+        GitSyncManager(db, config).initialize_workspace(create_gitignore=False)
+        coll_id = db.create_collection("API")
+        db.set_collection_sync_status(coll_id, 1)
+
+        thread = GitSyncThread(db_path, test_dir, GitSyncThread.DIRECTION_PUSH)
+        progress = []
+        thread.progress.connect(lambda done, total, message: progress.append(message))
+        with qtbot.waitSignal(thread.sync_finished, timeout=10000) as blocker:
+            thread.start()
+        thread.wait()
+
+        assert blocker.args[0] is True
+        assert progress == ["Exported collection 'API'"]
+        assert (config.collections_path / "API.json").exists()
+    finally:
+        db.close()
+        shutil.rmtree(test_dir, ignore_errors=True)
@@ -0,0 +1,124 @@
+"""
+Test debounced, incremental URL <-> params synchronization:
+1. Query parsing and URL rebuilding helpers
+2. Minimal cell diffs for the params table
+3. MainWindow coalesces bursts of edits into a single sync
+"""
+
+import pytest
+from PyQt6.QtWidgets import QTableWidgetItem
+from src.ui.main_window import MainWindow
+from src.features.param_sync import (
+    PARAM_SYNC_DEBOUNCE_MS, parse_query_params, build_url_with_params, diff_param_rows
+)
+import os
+import tempfile
+
+
+@pytest.fixture
+def app(qtbot):
+    """Create application instance."""
+    db_path = tempfile.mktemp(suffix='.db')
+
+    window = MainWindow(db_path=db_path)
+    qtbot.addWidget(window)
+
+    yield window
+
+    # Cleanup
+    window.close()
+    window.db.close()
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+
+def table_rows(table):
+    """Read (key, value) text of every row."""
+    rows = []
+    for row in range(table.rowCount()):
+        key_item, value_item = table.item(row, 0), table.item(row, 1)
+        rows.append((key_item.text() if key_item else '', value_item.text() if value_item else ''))
+    return rows
+
+
+def test_parse_query_params():
+    """Test order is kept, repeated keys keep the first value and blanks survive."""
+    params = parse_query_params("https://api.example.com/items?b=2&a=1&b=3&empty=")
+    assert list(params.items()) == [('b', '2'), ('a', '1'), ('empty', '')]
+    assert parse_query_params("https://api.example.com/items") == {}
+    assert parse_query_params("http://[::1") is None
+
+
+def test_build_url_with_params():
+    """Test the query string is replaced, and left untouched when already in sync."""
+    url = "https://api.example.com/items?id={{itemId}}#top"
+    assert build_url_with_params(url, {'id': '{{itemId}}'}) == url
+
+    assert build_url_with_params(url, {'id': '1', 'q': 'x'}) == "https://api.example.com/items?id=1&q=x#top"
+    assert build_url_with_params(url, {}) == "https://api.example.com/items#top"
+
+
+def test_diff_param_rows_incremental():
+    """Test only changed cells are updated."""
+    current = [('a', '1'), ('b', '2'), ('', '')]
+
+    updates, row_count = diff_param_rows(current, {'a': '1', 'b': '2'})
+    assert updates == []
+    assert row_count == 3
+
+    updates, row_count = diff_param_rows(current, {'a': '1', 'b': '23'})
+    assert updates == [(1, 1, '23')]
+
+    updates, row_count = diff_param_rows(current, {'a': '1', 'b': '2', 'c': ''})
+    assert updates == [(2, 0, 'c'), (3, 0, ''), (3, 1, '')]
+    assert row_count == 4
+
+
+def test_diff_param_rows_creates_missing_cells():
+    """Test cells without items are filled in, even if the text is empty."""
+    updates, row_count = diff_param_rows([(None, None)], {})
+    assert updates == [(0, 0, ''), (0, 1, '')]
+    assert row_count == 1
+
+
+def test_url_edits_are_coalesced(app, qtbot):
+    """Test a burst of URL edits results in one table update."""
+    calls = []
+    original = app._sync_url_to_params
+
+    def counting_sync():
+        calls.append(1)
+        original()
+
+    app._sync_url_to_params = counting_sync
+
+    for url in ("https://api.example.com/items?p", "https://api.example.com/items?page=",
+                "https://api.example.com/items?page=1", "https://api.example.com/items?page=1&size=20"):
+        app.url_input.setText(url)
+
+    assert calls == []
+    qtbot.waitUntil(lambda: bool(calls), timeout=PARAM_SYNC_DEBOUNCE_MS * 20)
+    assert calls == [1]
+    assert table_rows(app.params_table) == [('page', '1'), ('size', '20'), ('', '')]
+
+
+def test_params_edit_updates_url(app):
+    """Test editing the params table rewrites the query string once flushed."""
+    app.url_input.setText("https://api.example.com/items?page=1")
+    app._flush_param_sync()
+
+    app.params_table.setItem(0, 1, QTableWidgetItem("2"))
+    app.params_table.setItem(1, 0, QTableWidgetItem("size"))
+    app.params_table.setItem(1, 1, QTableWidgetItem("20"))
+    app._flush_param_sync()
+
+    assert app.url_input.text() == "https://api.example.com/items?page=2&size=20"
+
+
+def test_loaded_params_are_synced_immediately(app):
+    """Test loading params programmatically leaves URL and table consistent."""
+    app.url_input.setText("https://api.example.com/items")
+    app._load_dict_to_table({'q': 'search'}, app.params_table)
+
+    assert app._pending_param_sync is None
+    assert app.url_input.text() == "https://api.example.com/items?q=search"
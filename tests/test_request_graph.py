@@ -0,0 +1,183 @@
+"""
+Tests for the request dependency graph of collection runs:
+- Variables read and written by requests, extraction rules and scripts
+- Opaque scripts and @reads / @writes / @serial annotations
+- Independent requests run in parallel, dependent ones in order
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.core.api_client import ApiClient
+from src.core.database import DatabaseManager
+from src.features.collection_runner import CollectionRunner, load_collection
+from src.features.request_graph import ANY, build_dependencies, dependents, request_accesses, script_accesses
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Answers after 0.3s, echoing the path, and counts requests in flight."""
+
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def do_GET(self):
+        with SlowHandler.lock:
+            SlowHandler.in_flight += 1
+            SlowHandler.max_in_flight = max(SlowHandler.max_in_flight, SlowHandler.in_flight)
+        time.sleep(0.3)
+        with SlowHandler.lock:
+            SlowHandler.in_flight -= 1
+        body = json.dumps({'path': self.path}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def slow_server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def request(name, url='{{baseUrl}}/x', **fields):
+    return dict({'id': name, 'name': name, 'method': 'GET', 'url': url,
+                 'assertions': [{'id': 1, 'assertion_type': 'status_code', 'operator': 'equals',
+                                 'expected_value': '200'}]}, **fields)
+
+
+def test_request_accesses():
+    """Test reads come from {{variables}} and :pathParams, writes from extraction rules."""
+    reads, writes = request_accesses(request(
+        'Get', url='{{baseUrl}}/orders/:orderId?u={{env.user}}&t={{$timestamp}}',
+        headers={'Authorization': 'Bearer {{ext.token}}'}, body='{"c": "{{col.cart}}"}',
+        extractions=[{'variable_name': 'itemId', 'extraction_type': 'json_path', 'json_path': 'id'}]
+    ))
+    assert reads == {(None, 'baseUrl'), (None, 'orderId'), ('env', 'user'), ('ext', 'token'), ('col', 'cart')}
+    assert writes == {('ext', 'itemId')}
+
+
+def test_script_accesses():
+    """Test literal pm calls are inferred, other calls are opaque and annotations override."""
+    reads, writes = script_accesses(
+        "const t = pm.environment.get('token');\n"
+        "pm.collectionVariables.set(\"cart\", t);\n"
+        "pm.environment.unset('old');\n"
+        "pm.variables.set('local', 1);\n"
+        "if (pm.variables.has('x')) {}\n"
+        "postman.setEnvironmentVariable('legacy', 1);"
+    )
+    assert reads == {('env', 'token'), (None, 'x')}
+    assert writes == {('col', 'cart'), ('env', 'old'), ('env', 'legacy')}
+
+    reads, writes = script_accesses("pm.environment.set(name, 1); pm.collectionVariables.toObject();")
+    assert (reads, writes) == ({('col', ANY)}, {('env', ANY)})
+
+    reads, writes = script_accesses("// @reads token, col.cart\n// @writes: orderId\npm.environment.set(k, v);")
+    assert (reads, writes) == ({(None, 'token'), ('col', 'cart')}, {(None, 'orderId')})
+    assert script_accesses("// @serial\n") == ({(None, ANY)}, {(None, ANY)})
+    assert script_accesses("pm.variables.set('a', 1);") == (set(), set())
+
+
+def test_build_dependencies():
+    """Test requests wait for writers of what they read, and for readers of what they write."""
+    login = request('Login', post_response_script="pm.environment.set('token', 'x');")
+    profile = request('Profile', headers={'Authorization': 'Bearer {{token}}'})
+    catalog = request('Catalog')
+    order = request('Order', url='{{baseUrl}}/orders/{{ext.orderId}}')
+    create = request('Create', extractions=[{'variable_name': 'orderId', 'extraction_type': 'json_path',
+                                             'json_path': 'id'}])
+    refresh = request('Refresh', pre_request_script="pm.environment.set('token', 'y');")
+    requests = [login, profile, catalog, order, create, refresh]
+
+    dependencies = build_dependencies(requests)
+    assert dependencies == [set(), {0}, set(), set(), {3}, {0, 1}]
+    assert dependents(dependencies) == [[1, 5], [5], [], [4], [], []]
+
+    # Without scripts only extraction rules write
+    assert build_dependencies(requests, run_scripts=False) == [set(), set(), set(), set(), {3}, set()]
+    assert build_dependencies(requests, serial=True) == [set(), {0}, {1}, {2}, {3}, {4}]
+
+    # A set() with a computed key may change any environment variable, e.g. {{baseUrl}}
+    opaque = request('Opaque', pre_request_script="pm.environment.set(key, 1);")
+    assert build_dependencies([catalog, login, opaque, profile, catalog]) == \
+        [set(), set(), {0, 1}, {1, 2}, {2}]
+    barrier = request('Barrier', pre_request_script="// @serial")
+    assert build_dependencies([catalog, barrier, catalog]) == [set(), {0}, {1}]
+
+
+def test_independent_requests_run_in_parallel(slow_server):
+    """Test requests that share no variables are sent at the same time, chained ones in order."""
+    SlowHandler.max_in_flight = 0
+    requests = [request(f'Item {i}', url=f'{{{{baseUrl}}}}/items/{i}') for i in range(4)]
+    runner = CollectionRunner(ApiClient(timeout=5), environment={'baseUrl': slow_server}, concurrency=4)
+    start = time.time()
+    summary = runner.run(requests)
+    assert time.time() - start < 1.0
+    assert SlowHandler.max_in_flight == 4
+    assert summary['passed'] == 4
+
+    chain = [
+        request('Login', post_response_script="pm.environment.set('token', pm.response.json().path);"),
+        request('Me', url='{{baseUrl}}/me{{token}}',
+                post_response_script="pm.test('chained', function () {"
+                                     " pm.expect(pm.response.json().path).to.equal('/me/login'); });"),
+        request('Other', url='{{baseUrl}}/other'),
+    ]
+    chain[0]['url'] = '{{baseUrl}}/login'
+    summary = CollectionRunner(ApiClient(timeout=5), environment={'baseUrl': slow_server},
+                               concurrency=3).run(chain)
+    assert [entry['request_name'] for entry in summary['results']] == ['Login', 'Me', 'Other']
+    assert summary['failed'] == 0, [t.error_message for e in summary['results'] for t in e['results']]
+
+
+def test_single_worker_keeps_collection_order(slow_server):
+    """Test a concurrency of 1 sends requests in collection order, one iteration after the other."""
+    requests = [
+        request('A', extractions=[{'variable_name': 'tok', 'extraction_type': 'json_path', 'json_path': 'path'}]),
+        request('B', url='{{baseUrl}}/b{{ext.tok}}'),
+        request('C', url='{{baseUrl}}/c', method='DELETE'),
+    ]
+    sent = []
+    CollectionRunner(ApiClient(timeout=5), environment={'baseUrl': slow_server}, iterations=2,
+                     request_callback=lambda entry: sent.append(entry['request_name'])).run(requests)
+    assert sent == ['A', 'B', 'C', 'A', 'B', 'C']
+
+
+def test_extraction_rules_chain_requests(slow_server):
+    """Test variables extracted from a request's response are used by later requests of the run."""
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(), 'test.db'))
+    try:
+        collection_id = db.create_collection("Orders")
+        create_id = db.create_request(name="Create", url="{{baseUrl}}/orders/42", method='GET',
+                                      collection_id=collection_id)
+        get_id = db.create_request(name="Get", url="{{baseUrl}}/echo{{ext.created}}", method='GET',
+                                   collection_id=collection_id)
+        db.create_test_assertion(get_id, 'json_path', 'equals', 'path', '/echo/orders/42')
+        db.create_extracted_variable('created', '/stale', source_request_id=create_id,
+                                     source_request_name="Create", json_path='path')
+
+        collection = load_collection(db, collection_id)
+        assert collection['requests'][0]['extractions'][0]['variable_name'] == 'created'
+        summary = CollectionRunner(ApiClient(timeout=5), environment={'baseUrl': slow_server},
+                                   extracted_variables={'created': '/stale'}, run_scripts=False,
+                                   iterations=2, concurrency=2).run(collection['requests'])
+        assert summary['total_requests'] == 4  # Create runs for its extraction rule
+        assert (summary['passed'], summary['failed']) == (2, 0)
+    finally:
+        db.close()
@@ -0,0 +1,149 @@
+"""
+Tests for checkpointed collection runs:
+- Each request is saved to the runs / run_results tables as it completes
+- Stopped and interrupted runs resume where they stopped, with their variables
+- Runs whose collection changed can't be resumed
+"""
+
+import os
+import tempfile
+
+import pytest
+
+from src.core.api_client import ApiClient
+from src.core.database import DatabaseManager
+from src.features.collection_runner import (
+    RUN_COMPLETED, RUN_RUNNING, RUN_STOPPED, CollectionRunner, RunCheckpoint, load_collection
+)
+
+from tests.test_collection_runner import add_request, server  # noqa: F401 (fixture)
+
+
+@pytest.fixture
+def db_path():
+    return os.path.join(tempfile.mkdtemp(), 'test.db')
+
+
+def create_collection(db):
+    collection_id = db.create_collection("Orders")
+    add_request(db, collection_id, "Login", "{{baseUrl}}/login",
+                tests=[('status_code', 'equals', None, '200')],
+                post_response_script="pm.environment.set('token', pm.response.json().path);")
+    add_request(db, collection_id, "Me", "{{baseUrl}}/me{{token}}",
+                tests=[('json_path', 'equals', 'path', '/me/login')])
+    add_request(db, collection_id, "Broken", "{{baseUrl}}/status/500",
+                tests=[('status_code', 'equals', None, '200')])
+    return collection_id
+
+
+def start_run(db, collection_id, server, **kwargs):  # noqa: F811
+    checkpoint = RunCheckpoint(db, collection_id, "Orders")
+    runner = CollectionRunner(ApiClient(timeout=5), environment={'baseUrl': server}, serial=True,
+                              checkpoint=checkpoint, **kwargs)
+    return runner, runner.run(load_collection(db, collection_id)['requests'])
+
+
+def test_each_request_is_saved(db_path, server):  # noqa: F811
+    """Test the run and the results of its requests are saved as they complete."""
+    db = DatabaseManager(db_path)
+    try:
+        collection_id = create_collection(db)
+        _, summary = start_run(db, collection_id, server)
+
+        run = db.get_collection_run(summary['run_id'])
+        assert run['status'] == RUN_COMPLETED and run['finished_at']
+        assert (run['total_requests'], run['completed_requests']) == (3, 3)
+        assert run['initial_scope']['environment'] == {'baseUrl': server}
+        assert run['options']['iterations'] == 1 and run['options']['serial']
+
+        results = db.get_collection_run_results(summary['run_id'])
+        assert [row['request_name'] for row in results] == ["Login", "Me", "Broken"]
+        assert results[0]['changes']['environment'] == {'token': '/login'}
+        assert results[2]['results'][0]['passed'] is False
+        assert db.get_collection_runs(collection_id)[0]['id'] == summary['run_id']
+
+        db.delete_collection(collection_id)
+        assert db.get_collection_run(summary['run_id']) is None
+        assert db.get_collection_run_results(summary['run_id']) == []
+    finally:
+        db.close()
+
+
+def test_resume_stopped_run(db_path, server):  # noqa: F811
+    """Test a stopped run resumes after a restart, with the variables its requests set."""
+    db = DatabaseManager(db_path)
+    collection_id = create_collection(db)
+    runner = CollectionRunner(ApiClient(timeout=5), environment={'baseUrl': server}, serial=True,
+                              iterations=2, checkpoint=RunCheckpoint(db, collection_id, "Orders"))
+    runner.request_callback = lambda entry: runner.stop()
+    summary = runner.run(load_collection(db, collection_id)['requests'])
+    run_id = summary['run_id']
+    assert summary['stopped'] and summary['total_requests'] == 1
+    assert db.get_collection_run(run_id)['status'] == RUN_STOPPED
+    db.close()
+
+    # A new connection, as after restarting the app
+    db = DatabaseManager(db_path)
+    try:
+        sent = []
+        progress = []
+        runner = CollectionRunner.resume(ApiClient(timeout=5), RunCheckpoint.load(db, run_id),
+                                         request_callback=lambda entry: sent.append(entry['request_name']),
+                                         progress_callback=lambda current, total, message: progress.append(current))
+        summary = runner.run(load_collection(db, collection_id)['requests'])
+
+        # Iterations run side by side, so only the order within one is fixed
+        assert sorted(sent) == ["Broken", "Broken", "Login", "Me", "Me"]
+        assert progress == [2, 3, 4, 5, 6]
+        assert (summary['run_id'], summary['iterations'], summary['total_requests']) == (run_id, 2, 6)
+        assert [entry['request_name'] for entry in summary['results']][:3] == ["Login", "Me", "Broken"]
+        # The token set by the first run's Login is used by the resumed Me
+        assert (summary['passed'], summary['failed']) == (4, 2)
+        assert db.get_collection_run(run_id)['status'] == RUN_COMPLETED
+        with pytest.raises(ValueError, match="completed"):
+            RunCheckpoint.load(db, run_id)
+    finally:
+        db.close()
+
+
+def test_interrupted_run_is_resumable(db_path, server):  # noqa: F811
+    """Test a run that never finished (e.g. the app crashed) resumes with its remaining requests."""
+    db = DatabaseManager(db_path)
+    try:
+        collection_id = create_collection(db)
+        _, summary = start_run(db, collection_id, server)
+        run_id = summary['run_id']
+        # Simulate a crash after the first request
+        db.update_collection_run_status(run_id, RUN_RUNNING)
+        for row in db.get_collection_run_results(run_id)[1:]:
+            db.connection.execute("DELETE FROM run_results WHERE id = ?", (row['id'],))
+        db.connection.commit()
+        assert db.get_collection_run(run_id)['completed_requests'] == 1
+
+        summary = CollectionRunner.resume(ApiClient(timeout=5), RunCheckpoint.load(db, run_id)).run(
+            load_collection(db, collection_id)['requests']
+        )
+        assert summary['total_requests'] == 3
+        assert summary['results'][1]['results'][0].passed
+        assert db.get_collection_run(run_id)['completed_requests'] == 3
+    finally:
+        db.close()
+
+
+def test_changed_collection_cannot_be_resumed(db_path, server):  # noqa: F811
+    """Test a run is not resumed against different requests, or when it's unknown."""
+    db = DatabaseManager(db_path)
+    try:
+        collection_id = create_collection(db)
+        _, summary = start_run(db, collection_id, server)
+        db.update_collection_run_status(summary['run_id'], RUN_STOPPED)
+
+        requests = load_collection(db, collection_id)['requests']
+        runner = CollectionRunner.resume(ApiClient(timeout=5), RunCheckpoint.load(db, summary['run_id']))
+        with pytest.raises(ValueError, match="changed"):
+            runner.run(requests[1:])
+        assert db.get_collection_run(summary['run_id'])['status'] == RUN_RUNNING
+        with pytest.raises(ValueError, match="not found"):
+            RunCheckpoint.load(db, 999)
+    finally:
+        db.close()
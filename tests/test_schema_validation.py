@@ -0,0 +1,195 @@
+"""
+Tests for JSON Schema validation of responses:
+- Draft 7 and 2020-12 validation through the json_schema assertion
+- Validators cached by schema hash
+- Error collection capped for large arrays
+- Standalone response schemas from OpenAPI specs
+"""
+
+import json
+import time
+
+import pytest
+
+from src.features import schema_validator
+from src.features.openapi_importer import OpenAPIImporter
+from src.features.schema_validator import SchemaError, get_validator, schema_hash
+from src.features.test_engine import TestAssertion, TestEngine
+
+from tests.test_api_testing import create_mock_response
+
+
+requires_jsonschema = pytest.mark.skipif(schema_validator.jsonschema is None, reason="jsonschema not installed")
+
+
+def schema_result(schema, body):
+    text = schema if isinstance(schema, str) else json.dumps(schema)
+    assertion = TestAssertion(1, TestAssertion.TYPE_JSON_SCHEMA, TestAssertion.OP_EQUALS, None, text)
+    return TestEngine.evaluate_assertion(assertion, create_mock_response(text=json.dumps(body)))
+
+
+USER_SCHEMA = {
+    'type': 'object',
+    'required': ['id', 'email'],
+    'properties': {
+        'id': {'type': 'integer', 'minimum': 1},
+        'email': {'type': 'string', 'format': 'email'},
+        'tags': {'type': 'array', 'items': {'type': 'string'}, 'uniqueItems': True},
+    },
+    'additionalProperties': False,
+}
+
+
+@requires_jsonschema
+def test_full_validation():
+    """Test keywords beyond type/required are validated."""
+    assert schema_result(USER_SCHEMA, {'id': 1, 'email': 'a@example.com', 'tags': ['x']}).passed
+
+    result = schema_result(USER_SCHEMA, {'id': 0, 'email': 'not-an-email', 'tags': ['x', 'x'], 'extra': 1})
+    assert not result.passed
+    assert result.error_message.startswith("Schema validation failed: ")
+    for expected in ("$.id: 0 is less than the minimum of 1", "$.email: 'not-an-email' is not a 'email'",
+                     "$.tags: ['x', 'x'] has non-unique elements", "'extra' was unexpected"):
+        assert expected in result.error_message
+
+
+@requires_jsonschema
+def test_draft_is_taken_from_schema():
+    """Test Draft 7 and 2020-12 schemas are validated by their own rules."""
+    body = [1, 'a', 'b']
+    draft7 = {'$schema': 'http://json-schema.org/draft-07/schema#', 'items': [{'type': 'integer'}], 'additionalItems': False}
+    draft2020 = {'$schema': 'https://json-schema.org/draft/2020-12/schema',
+                 'prefixItems': [{'type': 'integer'}], 'items': {'type': 'string'}}
+    assert not schema_result(draft7, body).passed
+    assert schema_result(draft2020, body).passed
+    assert schema_result({'prefixItems': [{'type': 'string'}]}, body).error_message == \
+        "Schema validation failed: $[0]: 1 is not of type 'string'"  # 2020-12 by default
+
+
+@requires_jsonschema
+def test_invalid_schema():
+    """Test schemas that are not valid JSON Schema are reported."""
+    assert schema_result({'type': 'objekt'}, {}).error_message.startswith("Invalid JSON schema: ")
+    assert schema_result('{bad', {}).error_message == "Invalid JSON schema"
+    with pytest.raises(SchemaError):
+        get_validator({'minimum': 'one'})
+
+
+def test_validators_cached_by_hash():
+    """Test equal schemas (in any key order) share one compiled validator."""
+    reordered = json.loads(json.dumps(USER_SCHEMA, sort_keys=True))
+    assert schema_hash(reordered) == schema_hash(USER_SCHEMA)
+    assert get_validator(reordered) is get_validator(USER_SCHEMA)
+    assert get_validator({'type': 'array'}) is not get_validator(USER_SCHEMA)
+
+
+@requires_jsonschema
+def test_errors_capped_for_large_arrays():
+    """Test validation of a huge invalid array stops after MAX_SCHEMA_ERRORS."""
+    validator = get_validator({'type': 'array', 'items': {'type': 'integer'}})
+    data = ['x' * 1000] * 200000
+
+    start = time.perf_counter()
+    errors = validator.validate(data)
+    assert time.perf_counter() - start < 1.0
+    assert len(errors) == schema_validator.MAX_SCHEMA_ERRORS + 1
+    assert errors[0].startswith("$[0]: 'xxx")
+    assert errors[0].endswith("...")  # Long messages are shortened
+    assert errors[-1] == f"(more than {schema_validator.MAX_SCHEMA_ERRORS} errors)"
+
+
+def test_basic_checks_without_jsonschema(monkeypatch):
+    """Test type/required checks still work when jsonschema is missing."""
+    monkeypatch.setattr(schema_validator, 'jsonschema', None)
+    validator = schema_validator.SchemaValidator(USER_SCHEMA)
+    assert validator.validate({'id': 0, 'email': 'x'}) == []
+    assert validator.validate([]) == ["Type mismatch: expected object, got list"]
+    assert validator.validate({'id': 1}) == ["Required property 'email' is missing"]
+
+
+OPENAPI_30 = {
+    'openapi': '3.0.3',
+    'info': {'title': 'Users', 'version': '1'},
+    'paths': {
+        '/users/{id}': {
+            'get': {
+                'responses': {
+                    '404': {'description': 'Not found'},
+                    '200': {'$ref': '#/components/responses/UserResponse'},
+                },
+            },
+            'delete': {'responses': {'204': {'description': 'Deleted'}}},
+        },
+    },
+    'components': {
+        'responses': {
+            'UserResponse': {
+                'description': 'A user',
+                'content': {'application/json; charset=utf-8': {'schema': {'$ref': '#/components/schemas/User'}}},
+            },
+        },
+        'schemas': {
+            'User': {
+                'type': 'object',
+                'required': ['id', 'name'],
+                'properties': {
+                    'id': {'type': 'integer', 'minimum': 0, 'exclusiveMinimum': True},
+                    'name': {'type': 'string', 'nullable': True},
+                    'manager': {'$ref': '#/components/schemas/User'},
+                },
+            },
+        },
+    },
+}
+
+
+@pytest.fixture
+def openapi_30(tmp_path):
+    spec_file = tmp_path / "users.json"
+    spec_file.write_text(json.dumps(OPENAPI_30))
+    return OpenAPIImporter(str(spec_file))
+
+
+def test_openapi_response_schema(openapi_30):
+    """Test response schemas are made standalone and converted from OpenAPI 3.0."""
+    operation = OPENAPI_30['paths']['/users/{id}']['get']
+    schema = openapi_30.get_response_schema(operation)
+    assert schema['$ref'] == '#/$defs/User'
+    assert schema['$schema'] == 'http://json-schema.org/draft-07/schema#'
+    user = schema['$defs']['User']
+    assert user['properties']['name']['type'] == ['string', 'null']
+    assert user['properties']['id'] == {'type': 'integer', 'exclusiveMinimum': 0}
+    assert user['properties']['manager'] == {'$ref': '#/$defs/User'}
+
+    assert openapi_30.get_response_schema(OPENAPI_30['paths']['/users/{id}']['delete']) is None
+
+    requests = openapi_30.import_to_collection()['requests']
+    assert [bool(r.get('response_schema')) for r in requests] == [True, False]
+
+
+@requires_jsonschema
+def test_openapi_schema_used_in_assertion(openapi_30):
+    """Test an imported schema works directly as a json_schema assertion."""
+    schema = openapi_30.get_response_schema(OPENAPI_30['paths']['/users/{id}']['get'])
+    assert schema_result(schema, {'id': 1, 'name': None, 'manager': {'id': 2, 'name': 'Bo'}}).passed
+
+    result = schema_result(schema, {'id': 1, 'name': 'Al', 'manager': {'id': 0, 'name': 'Bo'}})
+    assert result.error_message == "Schema validation failed: $.manager.id: 0 is less than or equal to the minimum of 0"
+
+
+def test_swagger_response_schema(tmp_path):
+    """Test Swagger 2.0 response schemas and definitions."""
+    spec = {
+        'swagger': '2.0',
+        'info': {'title': 'Pets', 'version': '1'},
+        'paths': {'/pets': {'get': {'responses': {200: {'schema': {
+            'type': 'array', 'items': {'$ref': '#/definitions/Pet'}}}}}}},
+        'definitions': {'Pet': {'type': 'object', 'properties': {'tag': {'type': 'string', 'x-nullable': True}}}},
+    }
+    spec_file = tmp_path / "pets.json"
+    spec_file.write_text(json.dumps(spec))
+    importer = OpenAPIImporter(str(spec_file))
+
+    schema = importer.get_response_schema(spec['paths']['/pets']['get'])
+    assert schema['items'] == {'$ref': '#/$defs/Pet'}
+    assert schema['$defs']['Pet']['properties']['tag']['type'] == ['string', 'null']
@@ -0,0 +1,200 @@
+"""
+Tests for batch security scanning of history and collection runs:
+- Scanning identical responses once
+- One scan per endpoint with repeated findings merged
+- Bulk insert of findings and linking of history entries
+- Process pool and in-process scans giving the same findings
+- Aggregated batch reports
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime
+
+import pytest
+
+from src.core.database import DatabaseManager
+from src.features import security_batch
+from src.features.security_batch import BatchSecurityScanner, capture_response, endpoint_key
+from src.features.security_report_generator import SecurityReportGenerator
+
+
+LEAKY_BODY = '{"user": "a.b@example.com", "api_key": "abcdefghijklmnopqrstuvwxyz"}'
+HEADERS = {'Content-Type': 'application/json', 'Server': 'nginx/1.18.0'}
+
+
+@pytest.fixture
+def db():
+    test_dir = tempfile.mkdtemp()
+    database = DatabaseManager(os.path.join(test_dir, 'test.db'))
+    yield database
+    database.close()
+
+
+def add_history(db, url, body=LEAKY_BODY, status=200, headers=HEADERS, method='GET', scan_id=None):
+    return db.save_request_history(
+        timestamp=datetime.now().isoformat(), method=method, url=url,
+        response_status=status, response_headers=headers, response_body=body, scan_id=scan_id
+    )
+
+
+def target(url, body=LEAKY_BODY, method='GET'):
+    return {
+        'method': method, 'url': url, 'response_status': 200,
+        'response_headers': HEADERS, 'response_body': body,
+    }
+
+
+def test_endpoint_key_ignores_query():
+    """Test requests differing only in query string share an endpoint."""
+    assert endpoint_key('get', 'https://api.example.com/users?page=2#top') == ('GET', 'https://api.example.com/users')
+
+
+def test_history_scan_merges_identical_responses(db):
+    """Test identical responses are scanned once and stored per endpoint."""
+    history_ids = [add_history(db, f"https://api.example.com/users?page={page}") for page in range(3)]
+    add_history(db, "https://api.example.com/orders", body='{"ok": true}')
+    db.save_request_history(timestamp=datetime.now().isoformat(), method='GET',
+                            url="https://api.example.com/down", error_message="Connection refused")
+
+    scanner = BatchSecurityScanner(db, use_processes=False)
+    assert scanner.history_count() == 4  # The failed request has no response
+
+    progress = []
+    result = scanner.scan(scanner.history_targets(), scan_name="History scan", total=scanner.history_count(),
+                          progress_callback=lambda done, total, message: progress.append((done, total)))
+    assert progress[-1] == (4, 4)
+    assert result.responses == 4
+    assert result.scanned == 2
+    assert len(result.scan_ids) == 2
+
+    scans = {db.get_security_scan(scan_id)['url']: db.get_security_scan(scan_id) for scan_id in result.scan_ids}
+    users = scans["https://api.example.com/users"]
+    findings = db.get_security_findings(users['id'])
+    assert len(findings) == users['findings_count'] > 0
+    assert users['scan_name'] == "History scan"
+    assert result.duplicates == 2 * len(findings)
+    assert result.findings == sum(scan['findings_count'] for scan in scans.values())
+    assert users['high_count'] >= 1  # The API key
+
+    for history_id in history_ids:
+        assert db.get_history_entry(history_id)['scan_id'] == users['id']
+
+
+def test_history_targets_page_by_id(db, monkeypatch):
+    """Test history is read a page at a time, newest first, skipping failed requests."""
+    monkeypatch.setattr(security_batch, 'HISTORY_PAGE_SIZE', 2)
+    history_ids = [add_history(db, f"https://api.example.com/items/{i}") for i in range(5)]
+    db.save_request_history(timestamp=datetime.now().isoformat(), method='GET',
+                            url="https://api.example.com/down", error_message="Connection refused")
+
+    pages = []
+    original = db.get_history_responses
+    db.get_history_responses = lambda **kwargs: pages.append(kwargs['before_id']) or original(**kwargs)
+
+    targets = BatchSecurityScanner(db).history_targets()
+    assert not isinstance(targets, list)
+    assert [t['history_id'] for t in targets] == history_ids[::-1]
+    assert pages == [None, history_ids[3], history_ids[1]]
+
+
+def test_existing_history_scans_are_kept(db):
+    """Test history entries already linked to a scan keep it."""
+    old_scan = db.create_security_scan("https://api.example.com/users", "GET", datetime.now().isoformat())
+    history_id = add_history(db, "https://api.example.com/users", scan_id=old_scan)
+
+    scanner = BatchSecurityScanner(db, use_processes=False)
+    scanner.scan(scanner.history_targets())
+    assert db.get_history_entry(history_id)['scan_id'] == old_scan
+
+
+def test_findings_use_bulk_insert(db):
+    """Test findings are written with one bulk insert instead of per row."""
+    calls = []
+    original = db.create_security_findings_bulk
+    db.create_security_finding = None  # Must not be used
+    db.create_security_findings_bulk = lambda rows: calls.append(len(rows)) or original(rows)
+
+    targets = [target(f"https://api.example.com/items/{i}") for i in range(5)]
+    result = BatchSecurityScanner(db, use_processes=False).scan(targets)
+    assert calls == [result.findings]
+    assert result.findings > 0
+
+
+def test_process_pool_matches_in_process(db, monkeypatch):
+    """Test scanning on worker processes gives the same findings."""
+    monkeypatch.setattr(security_batch, 'MIN_PROCESS_BATCH', 2)
+    monkeypatch.setattr(security_batch, 'SCAN_CHUNK_SIZE', 2)
+    targets = [target(f"https://api.example.com/items/{i}", body=LEAKY_BODY + ' ' * i) for i in range(5)]
+    targets.append(target("http://api.example.com/plain", body="<html>Index of /</html>"))
+
+    def findings(use_processes):
+        progress = []
+        result = BatchSecurityScanner(db, max_workers=2, use_processes=use_processes).scan(
+            targets, progress_callback=lambda done, total, message: progress.append((done, total))
+        )
+        assert progress[-1] == (6, 6)
+        return [
+            sorted((f['check_id'], f['title'], f['evidence']) for f in db.get_security_findings(scan_id))
+            for scan_id in result.scan_ids
+        ]
+
+    assert findings(True) == findings(False)
+
+
+def test_cancelled_scan_saves_nothing(db):
+    """Test a cancelled batch writes no scans."""
+    targets = [target(f"https://api.example.com/items/{i}", body=LEAKY_BODY + ' ' * i) for i in range(3)]
+    result = BatchSecurityScanner(db, use_processes=False).scan(targets, is_cancelled=lambda: True)
+    assert result.cancelled
+    assert result.scan_ids == []
+    assert db.get_security_scans() == []
+
+
+def test_run_targets():
+    """Test responses captured during a collection run become scan targets."""
+    class FakeResponse:
+        status_code = 200
+        headers = HEADERS
+        text = "x" * (security_batch.RUN_BODY_LIMIT + 10)
+
+    results = [
+        {'request_id': 1, 'success': True, 'response': capture_response('POST', "https://a.example.com/x", FakeResponse())},
+        {'request_id': 2, 'success': False, 'error': "timeout"},
+    ]
+    targets = BatchSecurityScanner.run_targets(results, collection_id=7)
+    assert len(targets) == 1
+    assert targets[0]['request_id'] == 1
+    assert targets[0]['collection_id'] == 7
+    assert len(targets[0]['response_body']) == security_batch.RUN_BODY_LIMIT
+
+
+def test_batch_reports(db):
+    """Test the batch reports list every endpoint and findings shared between them."""
+    targets = [target("https://api.example.com/users"), target("https://api.example.com/orders", method='POST')]
+    result = BatchSecurityScanner(db, use_processes=False).scan(targets, scan_name="Run <1>")
+    generator = SecurityReportGenerator(db)
+
+    report = json.loads(generator.generate_batch_json_report(result.scan_ids))
+    assert report['scan_info']['endpoints'] == 2
+    assert [e['url'] for e in report['endpoints']] == ["https://api.example.com/users", "https://api.example.com/orders"]
+    # Both endpoints return the same body, so all their findings are shared
+    # and listed once
+    shared = report['shared_findings']
+    assert shared
+    assert result.shared == len(shared)
+    assert result.findings == 2 * len(shared)
+    assert report['summary']['total_findings'] == len(shared)
+    assert all(len(group['endpoints']) == 2 for group in shared)
+    for endpoint in report['endpoints']:
+        assert endpoint['findings'] == []
+        assert endpoint['shared_findings'] == list(range(len(shared)))
+
+    html = generator.generate_batch_html_report(result.scan_ids)
+    assert "Findings Across Endpoints" in html
+    assert html.count("<div class='finding ") == len(shared)
+    assert 'id="endpoint-1"' in html
+    assert "Run &lt;1&gt;" in html
+
+    assert "Error" in generator.generate_batch_html_report([12345])
@@ -0,0 +1,169 @@
+"""
+Tests for declarative security rule packs:
+- Validation of rules and packs
+- Keyword derivation for the single-pass body scan
+- Body, header and cookie rules in SecurityScanner
+- Loading and caching of rule-pack files
+"""
+
+import json
+import os
+import random
+import shutil
+import tempfile
+
+import pytest
+
+from src.features.security_rules import (
+    RulePack, RulePackError, SecurityRule, load_rule_pack, load_rule_packs
+)
+from src.features.security_scanner import BODY_RULES, BODY_SCANNER, SecurityScanner
+
+from tests.test_pattern_scanner import FRAGMENTS, reference_scan
+
+
+EXAMPLE_PACK = os.path.join(os.path.dirname(__file__), '..', 'examples', 'security_rule_pack.json')
+
+
+def rule(**fields):
+    data = {'id': 'ORG100', 'title': 'Test rule', 'severity': 'low', 'target': 'body', 'pattern': 'secret'}
+    data.update(fields)
+    return SecurityRule.from_dict(data)
+
+
+def scan(scanner, body='', headers=None, url='https://api.example.com/x'):
+    findings = scanner.scan_response(
+        method='GET', url=url, request_headers={}, response_status=200,
+        response_headers=headers or {'Content-Type': 'application/json'}, response_body=body
+    )
+    return {finding.check_id: finding for finding in findings}
+
+
+@pytest.fixture
+def example_pack():
+    return load_rule_pack(EXAMPLE_PACK)
+
+
+@pytest.mark.parametrize('fields, message', [
+    ({'id': 'SEC010'}, 'reserved'),
+    ({'id': '1abc'}, 'Invalid rule id'),
+    ({'severity': 'urgent'}, 'severity'),
+    ({'target': 'query'}, 'target'),
+    ({'pattern': None}, 'needs a pattern'),
+    ({'pattern': '(unclosed'}, 'invalid pattern'),
+    ({'pattern': 'a*'}, 'empty text'),
+    ({'pattern': '(?m)^token'}, 'inline flags'),
+    ({'pattern': r'(["\'])token\1'}, 'backreferences'),
+    ({'pattern': '(?P<r0>token)'}, 'reserved'),
+    ({'target': 'header', 'pattern': None}, 'header name'),
+    ({'keywords': 'secret'}, 'keywords'),
+    ({'colour': 'red'}, 'unknown fields'),
+])
+def test_invalid_rules(fields, message):
+    """Test invalid rules are rejected with a helpful message."""
+    with pytest.raises(RulePackError, match=message):
+        rule(**fields)
+
+
+def test_duplicate_ids_rejected():
+    """Test rule ids must be unique in a pack and across a scanner's packs."""
+    with pytest.raises(RulePackError, match='Duplicate'):
+        RulePack.from_dict({'name': 'p', 'rules': [{'id': 'A1', 'title': 't', 'severity': 'low', 'pattern': 'x'}] * 2})
+    pack = RulePack('p', [rule()])
+    other = RulePack('q', [rule()])
+    with pytest.raises(RulePackError, match='Duplicate'):
+        SecurityScanner(rule_packs=[pack, other])
+
+
+def test_derive_keywords():
+    """Test the longest required literal becomes the keyword."""
+    assert rule(pattern=r'\b[a-z]+\.corp\.acme\.com\b').keywords == ('.corp.acme.com',)
+    assert rule(pattern='TOKEN-[0-9]+', ignore_case=True).keywords == ('token-',)
+    assert rule(pattern='ab(cdef|xyz)').keywords == ()  # Too short outside the alternation
+    assert rule(pattern='secret', keywords=['SeCrEt'], ignore_case=True).keywords == ('secret',)
+
+
+def test_pack_rules_keep_single_pass_results():
+    """Test adding pack rules leaves the built-in body matches unchanged."""
+    pack = RulePack('p', [rule(pattern=r'\d{3}-\d{2}'), rule(id='ORG101', pattern='at com', ignore_case=True)])
+    scanner = SecurityScanner(rule_packs=[pack]).body_scanner
+    rng = random.Random(5)
+    for _ in range(300):
+        text = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 30)))
+        results = scanner.scan(text)
+        expected = reference_scan(scanner.rules, text)
+        assert {k: (v.count, v.first.span(), v.first.group()) for k, v in results.items()} == expected
+        assert {k: v for k, v in expected.items() if ':' not in k} == reference_scan(BODY_RULES, text)
+
+
+def test_body_rules(example_pack):
+    """Test body rules report the first match and count."""
+    scanner = SecurityScanner(rule_packs=[example_pack])
+    body = '{"host": "db-01.INTERNAL.example.com", "other": "api.internal.example.com"}'
+    findings = scan(scanner, body)
+    assert findings['ORG001'].evidence == "db-01.INTERNAL.example.com"
+    assert 'Found 2 match(es)' in findings['ORG001'].description
+    assert findings['ORG001'].cwe_id == 'CWE-200'
+    assert 'ORG002' not in findings
+
+
+def test_header_and_cookie_rules(example_pack):
+    """Test header and cookie rules, including 'absent'."""
+    scanner = SecurityScanner(rule_packs=[example_pack])
+    findings = scan(scanner, headers={'Set-Cookie': 'session=abc; SameSite=Lax'})
+    assert findings['ORG003'].evidence == "X-Request-ID header not present"
+    assert findings['ORG004'].evidence == 'session=abc; SameSite=Lax'
+
+    findings = scan(scanner, headers={'x-request-id': '42', 'Set-Cookie': 'session=abc; SameSite=STRICT'})
+    assert 'ORG003' not in findings and 'ORG004' not in findings
+
+    findings = scan(scanner, headers={'Set-Cookie': 'theme=dark'})
+    assert 'ORG004' not in findings  # Only the session cookie is checked
+
+
+def test_disabling_rule_packs(example_pack):
+    """Test rule-pack rules can be switched off like built-in checks."""
+    scanner = SecurityScanner(rule_packs=[example_pack])
+    scanner.checks_enabled['rule_packs'] = False
+    assert not any(check_id.startswith('ORG') for check_id in scan(scanner, 'x.internal.example.com'))
+
+
+def test_scanners_share_compiled_rules(example_pack):
+    """Test scanners for equal packs reuse one PatternScanner, also after pickling."""
+    import pickle
+    first = SecurityScanner(rule_packs=[example_pack])
+    second = SecurityScanner(rule_packs=[pickle.loads(pickle.dumps(example_pack))])
+    assert first.body_scanner is second.body_scanner
+    assert SecurityScanner().body_scanner is BODY_SCANNER
+
+
+def test_load_rule_packs():
+    """Test loading a directory skips invalid packs and clashing ids."""
+    directory = tempfile.mkdtemp()
+    try:
+        shutil.copy(EXAMPLE_PACK, os.path.join(directory, 'a.json'))
+        shutil.copy(EXAMPLE_PACK, os.path.join(directory, 'b.json'))
+        with open(os.path.join(directory, 'c.json'), 'w', encoding='utf-8') as f:
+            json.dump({'name': 'broken', 'rules': [{'id': 'X1', 'title': 't', 'severity': 'bad', 'pattern': 'x'}]}, f)
+        with open(os.path.join(directory, 'notes.txt'), 'w', encoding='utf-8') as f:
+            f.write('not a pack')
+
+        packs, errors = load_rule_packs(directory)
+        assert [pack.name for pack in packs] == ['example-org']
+        assert len(errors) == 2
+        assert any('b.json' in error and 'already used' in error for error in errors)
+        assert any('c.json' in error and 'severity' in error for error in errors)
+
+        # Unchanged files are served from the cache
+        assert load_rule_pack(os.path.join(directory, 'a.json')) is packs[0]
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def test_disabled_rules_are_skipped():
+    """Test rules with "enabled": false are not loaded."""
+    pack = RulePack.from_dict({'name': 'p', 'rules': [
+        {'id': 'A1', 'title': 't', 'severity': 'low', 'pattern': 'x1', 'enabled': False},
+        {'id': 'A2', 'title': 't', 'severity': 'low', 'pattern': 'x2'},
+    ]})
+    assert [r.rule_id for r in pack.rules] == ['A2']
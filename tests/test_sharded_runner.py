@@ -0,0 +1,91 @@
+"""
+Tests for sharded collection runs on worker processes:
+- Iterations and independent requests are split into shards
+- Sharded runs give the same results as in-process runs
+- `postmini run --processes`
+"""
+
+import json
+
+from src import cli
+from src.core.api_client import ApiClient
+from src.features.collection_runner import CollectionRunner
+from src.features.sharded_runner import ShardedCollectionRunner, plan_shards
+
+from tests.test_collection_runner import server  # noqa: F401 (fixture)
+
+
+def test_plan_shards():
+    """Test iterations are split into ranges, and independent requests when iterations run out."""
+    dependencies = [set(), {0}, set(), set()]
+    assert plan_shards(10, dependencies, 3) == [(0, 3, [0, 1, 2, 3]), (3, 3, [0, 1, 2, 3]), (6, 4, [0, 1, 2, 3])]
+    assert plan_shards(1, dependencies, 4) == [(0, 1, [0, 1]), (0, 1, [2]), (0, 1, [3])]
+    assert plan_shards(2, dependencies, 4) == [(0, 1, [0, 1]), (0, 1, [2, 3]), (1, 1, [0, 1]), (1, 1, [2, 3])]
+    assert plan_shards(1, [set(), {0}], 4) == [(0, 1, [0, 1])]
+
+
+def make_requests():
+    return [
+        {'id': 1, 'name': "Login", 'method': 'GET', 'url': '{{baseUrl}}/login/{{user}}',
+         'post_response_script': "pm.environment.set('token', pm.response.json().path);\n"
+                                 "pm.test('row ' + pm.iterationData.get('user'), function () {});"},
+        {'id': 2, 'name': "Me", 'method': 'GET', 'url': '{{baseUrl}}/me{{token}}',
+         'assertions': [{'id': 1, 'assertion_type': 'status_code', 'operator': 'equals', 'expected_value': '200'}]},
+        {'id': 3, 'name': "Broken", 'method': 'GET', 'url': '{{baseUrl}}/status/500',
+         'assertions': [{'id': 2, 'assertion_type': 'status_code', 'operator': 'equals', 'expected_value': '200'}]},
+    ]
+
+
+def describe(summary):
+    return [
+        (entry['iteration'], entry['request_name'], [(t.assertion.field, t.passed) for t in entry['results']])
+        for entry in summary['results']
+    ]
+
+
+def test_sharded_run_matches_in_process_run(server, tmp_path):  # noqa: F811
+    """Test shards read their own data rows and merge into the in-process results."""
+    data_file = tmp_path / "users.csv"
+    data_file.write_text("user\n" + "\n".join(f"u{i}" for i in range(5)) + "\n")
+    options = {'environment': {'baseUrl': server}, 'data_file': str(data_file), 'concurrency': 2}
+
+    expected = CollectionRunner(ApiClient(timeout=5), **options).run(make_requests())
+    started, completed = [], []
+    sharded = ShardedCollectionRunner(ApiClient(timeout=5), processes=2,
+                                      progress_callback=lambda current, total, message: started.append(current),
+                                      request_callback=completed.append, **options)
+    summary = sharded.run(make_requests())
+
+    assert describe(summary) == describe(expected)
+    assert summary['variable_changes'] == expected['variable_changes']
+    assert summary['variable_changes']['environment'] == {'token': '/login/u4'}
+    assert [entry['iteration'] for entry in summary['results']][::3] == [1, 2, 3, 4, 5]
+    assert summary['results'][3]['results'][0].assertion.field == "row u1"
+    assert {key: summary[key] for key in ('total_requests', 'passed', 'failed', 'iterations')} == \
+        {'total_requests': 15, 'passed': 10, 'failed': 5, 'iterations': 5}
+    assert sorted(started) == list(range(1, 16))
+    assert len(completed) == 15
+
+
+def test_unsplittable_runs_stay_in_process(server):  # noqa: F811
+    """Test a single iteration of dependent requests runs in-process."""
+    requests = make_requests()[:2]
+    summary = ShardedCollectionRunner(ApiClient(timeout=5), processes=4,
+                                      environment={'baseUrl': server, 'user': 'x'}).run(requests)
+    assert summary['total_requests'] == 2 and summary['failed'] == 0
+
+
+def test_cli_processes(server, tmp_path, capsys):  # noqa: F811
+    """Test `postmini run --processes` runs and reports the whole collection."""
+    collection = tmp_path / "Users.json"
+    collection.write_text(json.dumps({'collection': {'name': "Users", 'requests': [
+        {'name': "Users", 'method': 'GET', 'url': '{{baseUrl}}/users',
+         'tests': [{'type': 'status_code', 'operator': 'equals', 'expected_value': '200'}]},
+    ]}}))
+    report = tmp_path / "report.json"
+
+    code = cli.main(['run', str(collection), '--env-var', f'baseUrl={server}', '-n', '4', '-p', '2',
+                     '-r', f'json:{report}'])
+    assert code == cli.EXIT_OK
+    assert json.loads(report.read_text())['summary']['total'] == 4
+    assert cli.main(['run', str(collection), '-p', '0']) == cli.EXIT_ERROR
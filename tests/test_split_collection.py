@@ -0,0 +1,243 @@
+"""
+Tests for the split (directory per collection) Git sync layout:
+- Splitting and reassembling collection exports
+- Exports rewriting only changed request files
+- Change detection reading only changed files
+- Import and layout conversion
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.core.database import DatabaseManager
+from src.features import split_collection
+from src.features.collection_io import CollectionExporter
+from src.features.git_sync_manager import GitSyncManager, GitSyncConfig, SyncStatus
+from src.features.split_collection import LAYOUT_SINGLE, LAYOUT_SPLIT
+from src.features.sync_manifest import content_hash
+
+
+class SplitLayoutTestCase(unittest.TestCase):
+    """Base class with a split-layout workspace and one collection."""
+
+    layout = LAYOUT_SPLIT
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db = DatabaseManager(os.path.join(self.test_dir, 'test.db'))
+        self.config = GitSyncConfig(self.test_dir)
+        self.manager = GitSyncManager(self.db, self.config)
+        self.manager.initialize_workspace(create_gitignore=False, collection_layout=self.layout)
+
+        self.coll_id = self.db.create_collection("API")
+        self.db.set_collection_sync_status(self.coll_id, 1)
+        folder_id = self.db.create_folder(self.coll_id, "Users")
+        self.req_ids = [
+            self.db.create_request("List", "https://example.com/users", "GET", self.coll_id, folder_id=folder_id),
+            self.db.create_request("Create", "https://example.com/users", "POST", self.coll_id, folder_id=folder_id),
+            self.db.create_request("List", "https://example.com/orders", "GET", self.coll_id),
+        ]
+        self.db.create_test_assertion(self.req_ids[0], "status_code", "equals", expected_value="200")
+        self.db.create_collection_variable(self.coll_id, "host", "example.com")
+
+        self.collection_dir = self.config.collections_path / "API"
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def mtimes(self):
+        files = split_collection.list_files(self.collection_dir)
+        return {rel_path: stat.st_mtime_ns for rel_path, stat in files.items()}
+
+
+class TestSplitFormat(SplitLayoutTestCase):
+    """Test the split/reassemble functions."""
+
+    def test_roundtrip(self):
+        """Test a split collection reads back to the same export."""
+        export = CollectionExporter(self.db).export_collection(self.coll_id)
+        parts = split_collection.split_collection(export)
+        split_collection.write_split_collection(parts, self.collection_dir)
+
+        data = split_collection.read_split_collection(self.collection_dir)
+        self.assertEqual(content_hash(data['collection']), content_hash(export['collection']))
+
+    def test_file_names(self):
+        """Test one file per request and folder, with duplicates numbered."""
+        parts = split_collection.split_collection(CollectionExporter(self.db).export_collection(self.coll_id))
+        self.assertEqual(sorted(parts), [
+            'collection.json',
+            'folders/Users.json',
+            'requests/Create.json',
+            'requests/List (2).json',
+            'requests/List.json',
+        ])
+        index = parts['collection.json']['collection']
+        self.assertEqual(len(index['requests']), 3)
+        self.assertEqual(index['variables'], [{'key': 'host', 'value': 'example.com'}])
+
+
+class TestSplitSync(SplitLayoutTestCase):
+    """Test Git sync with the split layout."""
+
+    def setUp(self):
+        super().setUp()
+        self.assertTrue(self.manager.sync_to_filesystem()[0])
+
+    def test_export_writes_directory(self):
+        """Test collections are exported as directories."""
+        self.assertEqual(self.manager.get_collection_layout(), LAYOUT_SPLIT)
+        self.assertTrue(split_collection.is_split_collection(self.collection_dir))
+        self.assertFalse((self.config.collections_path / "API.json").exists())
+        self.assertEqual(self.manager.get_sync_status().status, SyncStatus.STATUS_SYNCED)
+
+    def test_edit_rewrites_single_file(self):
+        """Test changing one request rewrites only its file."""
+        before = self.mtimes()
+        self.db.update_request(self.req_ids[1], "Create", "https://example.com/v2/users", "POST")
+        self.manager.sync_to_filesystem()
+
+        after = self.mtimes()
+        changed = [rel_path for rel_path in after if after[rel_path] != before[rel_path]]
+        self.assertEqual(changed, ['requests/Create.json'])
+
+    def test_deleted_request_file_is_removed(self):
+        """Test files of deleted requests are removed on export."""
+        self.db.delete_request(self.req_ids[1])
+        self.manager.sync_to_filesystem()
+        self.assertNotIn('requests/Create.json', split_collection.list_files(self.collection_dir))
+
+    def test_change_detection_reads_changed_files_only(self):
+        """Test an external edit re-reads only the edited file."""
+        file_path = self.collection_dir / "requests" / "Create.json"
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data['url'] = "https://example.com/changed"
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        stat = file_path.stat()
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        reads = []
+        original = split_collection.read_file
+
+        def counting_read_file(directory, rel_path):
+            reads.append(rel_path)
+            return original(directory, rel_path)
+
+        split_collection.read_file = counting_read_file
+        try:
+            changes = self.manager.detect_changes()
+        finally:
+            split_collection.read_file = original
+
+        self.assertEqual(reads, ['requests/Create.json'])
+        self.assertEqual([c['name'] for c in changes['modified_files']], ['API'])
+
+    def test_import_into_new_database(self):
+        """Test a split collection imports with folders, tests and variables."""
+        other_db = DatabaseManager(os.path.join(self.test_dir, 'other.db'))
+        try:
+            manager = GitSyncManager(other_db, self.config)
+            self.assertTrue(manager.sync_from_filesystem()[0])
+
+            collection = other_db.get_all_collections()[0]
+            self.assertEqual(collection['name'], "API")
+            self.assertEqual(len(other_db.get_requests_by_collection(collection['id'])), 3)
+            self.assertEqual(len(other_db.get_folders_by_collection(collection['id'])), 1)
+            self.assertEqual(manager.get_sync_status().status, SyncStatus.STATUS_SYNCED)
+        finally:
+            other_db.close()
+
+    def test_remove_collection_file(self):
+        """Test making a collection private removes its directory."""
+        success, _ = self.manager.remove_collection_file(self.coll_id)
+        self.assertTrue(success)
+        self.assertFalse(self.collection_dir.exists())
+
+
+class TestLayoutConversion(SplitLayoutTestCase):
+    """Test switching an existing workspace between layouts."""
+
+    layout = LAYOUT_SINGLE
+
+    def test_convert_both_ways(self):
+        """Test collections move between the file and directory layouts."""
+        single_file = self.config.collections_path / "API.json"
+        self.manager.sync_to_filesystem()
+        self.assertTrue(single_file.exists())
+
+        success, _ = self.manager.set_collection_layout(LAYOUT_SPLIT)
+        self.assertTrue(success)
+        self.assertFalse(single_file.exists())
+        self.assertTrue(split_collection.is_split_collection(self.collection_dir))
+        self.assertEqual(self.manager.get_sync_status().status, SyncStatus.STATUS_SYNCED)
+
+        success, _ = self.manager.set_collection_layout(LAYOUT_SINGLE)
+        self.assertTrue(success)
+        self.assertTrue(single_file.exists())
+        self.assertFalse(self.collection_dir.exists())
+        self.assertEqual(self.manager.get_sync_status().status, SyncStatus.STATUS_SYNCED)
+
+    def test_unrelated_directory_is_kept(self):
+        """Test a directory named like a collection that is not a split collection is never removed."""
+        notes = self.collection_dir / "notes.txt"
+        notes.parent.mkdir(parents=True)
+        notes.write_text("keep me")
+
+        success, _ = self.manager.export_collection_to_file(self.coll_id)
+        self.assertTrue(success)
+        self.assertTrue(notes.exists())
+
+        success, _ = self.manager.remove_collection_file(self.coll_id)
+        self.assertTrue(success)
+        self.assertTrue(notes.exists())
+        self.assertFalse((self.config.collections_path / "API.json").exists())
+
+    def test_unknown_layout(self):
+        """Test an invalid layout is rejected."""
+        success, _ = self.manager.set_collection_layout("nested")
+        self.assertFalse(success)
+
+
+def test_recursive_watcher(qtbot):
+    """Test edits inside split collection directories are reported."""
+    from src.features.workspace_watcher import WorkspaceWatcher
+
+    root = tempfile.mkdtemp()
+    try:
+        collections = os.path.join(root, 'collections')
+        requests_dir = os.path.join(collections, 'API', 'requests')
+        os.makedirs(requests_dir)
+        request_file = os.path.join(requests_dir, 'List.json')
+        with open(request_file, 'w', encoding='utf-8') as f:
+            f.write('{}')
+
+        watcher = WorkspaceWatcher([collections], debounce_ms=50, recursive=True)
+        reports = []
+        watcher.files_changed.connect(reports.append)
+
+        with open(request_file, 'w', encoding='utf-8') as f:
+            f.write('{"changed": true}')
+        qtbot.waitUntil(lambda: len(reports) == 1, timeout=5000)
+        assert reports[0] == [request_file]
+
+        # A new collection directory is picked up with its files
+        new_dir = os.path.join(collections, 'Other', 'requests')
+        os.makedirs(new_dir)
+        qtbot.wait(200)
+        new_file = os.path.join(new_dir, 'Get.json')
+        with open(new_file, 'w', encoding='utf-8') as f:
+            f.write('{}')
+        qtbot.waitUntil(lambda: any(new_file in report for report in reports), timeout=5000)
+
+        # Removing a directory reports its files
+        shutil.rmtree(os.path.join(collections, 'API'))
+        qtbot.waitUntil(lambda: any(request_file in report for report in reports[1:]), timeout=5000)
+        watcher.stop()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
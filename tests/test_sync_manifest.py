@@ -0,0 +1,225 @@
+"""
+Tests for incremental Git sync change detection:
+- Collection/environment revision counters maintained by database triggers
+- SyncManifest skipping unchanged files and collections
+- Background status thread
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from src.core.database import DatabaseManager
+from src.features.git_sync_manager import GitSyncManager, GitSyncConfig, SyncStatus
+
+
+class TestRevisionCounters(unittest.TestCase):
+    """Test revision counters are bumped by changes to exported content."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db = DatabaseManager(os.path.join(self.test_dir, 'test.db'))
+        self.coll_id = self.db.create_collection("Revisions")
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def revision(self):
+        return self.db.get_collection(self.coll_id)['revision']
+
+    def test_request_changes_bump_collection(self):
+        """Test request create/update/delete bump the owning collection."""
+        before = self.revision()
+        req_id = self.db.create_request("R", "https://example.com", "GET", self.coll_id)
+        after_create = self.revision()
+        self.assertGreater(after_create, before)
+
+        self.db.update_request(req_id, "R2", "https://example.com", "GET")
+        after_update = self.revision()
+        self.assertGreater(after_update, after_create)
+
+        self.db.delete_request(req_id)
+        self.assertGreater(self.revision(), after_update)
+
+    def test_related_tables_bump_collection(self):
+        """Test folders, variables and assertions bump the collection."""
+        req_id = self.db.create_request("R", "https://example.com", "GET", self.coll_id)
+
+        for change in (lambda: self.db.create_folder(self.coll_id, "Folder"),
+                       lambda: self.db.create_collection_variable(self.coll_id, "host", "x"),
+                       lambda: self.db.create_test_assertion(req_id, "status_code", "equals", expected_value="200"),
+                       lambda: self.db.update_collection(self.coll_id, "Renamed")):
+            before = self.revision()
+            change()
+            self.assertGreater(self.revision(), before)
+
+    def test_sync_flag_does_not_bump(self):
+        """Test toggling Git sync does not count as a content change."""
+        before = self.revision()
+        self.db.set_collection_sync_status(self.coll_id, 1)
+        self.assertEqual(self.revision(), before)
+
+    def test_environment_revision(self):
+        """Test environment updates and secret marks bump its revision."""
+        env_id = self.db.create_environment("Env", {"a": "1"})
+        before = self.db.get_environment(env_id)['revision']
+        self.db.update_environment(env_id, "Env", {"a": "2"})
+        self.db.mark_variable_as_secret(env_id, "a")
+        self.assertEqual(self.db.get_environment(env_id)['revision'], before + 2)
+
+
+class TestIncrementalChangeDetection(unittest.TestCase):
+    """Test detect_changes reuses the manifest."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db = DatabaseManager(os.path.join(self.test_dir, 'test.db'))
+        self.config = GitSyncConfig(self.test_dir)
+        self.manager = GitSyncManager(self.db, self.config)
+        self.manager.initialize_workspace(create_gitignore=False)
+
+        self.coll_id = self.db.create_collection("API")
+        self.db.set_collection_sync_status(self.coll_id, 1)
+        self.req_id = self.db.create_request("List", "https://example.com/items", "GET", self.coll_id)
+        self.manager.export_all_collections()
+
+        self.comparisons = []
+        original = self.manager._is_modified
+
+        def counting_is_modified(*args):
+            self.comparisons.append(args[1])
+            return original(*args)
+
+        self.manager._is_modified = counting_is_modified
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_exported_collection_is_not_recompared(self):
+        """Test a freshly exported collection is known to be in sync."""
+        changes = self.manager.detect_changes()
+        self.assertEqual(changes['modified_files'], [])
+        self.assertEqual(self.comparisons, [])
+
+    def test_db_change_triggers_single_recompare(self):
+        """Test a DB edit is re-checked once, then cached."""
+        self.db.update_request(self.req_id, "List", "https://example.com/v2/items", "GET")
+
+        changes = self.manager.detect_changes()
+        self.assertEqual([c['name'] for c in changes['modified_db_items']], ['API'])
+        self.assertEqual(self.comparisons, [self.coll_id])
+
+        changes = self.manager.detect_changes()
+        self.assertEqual(len(changes['modified_db_items']), 1)
+        self.assertEqual(self.comparisons, [self.coll_id])
+
+    def test_file_change_is_detected(self):
+        """Test an external edit of a file is re-parsed and detected."""
+        file_path = self.config.collections_path / "API.json"
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data['collection']['requests'][0]['url'] = "https://example.com/changed"
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        # Make sure the stat differs even on coarse-grained file systems
+        stat = file_path.stat()
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        changes = self.manager.detect_changes()
+        self.assertEqual([c['name'] for c in changes['modified_files']], ['API'])
+
+    def test_changed_paths_limit_the_check(self):
+        """Test a check for changed paths only re-reads the collections they belong to."""
+        orders_id = self.db.create_collection("Orders")
+        self.db.set_collection_sync_status(orders_id, 1)
+        self.manager.export_all_collections()
+
+        file_path = self.config.collections_path / "API.json"
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data['collection']['requests'][0]['url'] = "https://example.com/changed"
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        stat = file_path.stat()
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        checked = []
+        original = self.manager.manifest.get_entry
+        self.manager.manifest.get_entry = lambda kind, name, stat: checked.append(name) or original(kind, name, stat)
+
+        changes = self.manager.detect_changes(changed_paths=[str(file_path)])
+        self.assertEqual([c['name'] for c in changes['modified_files']], ['API'])
+        self.assertEqual(changes['new_db_items'], [])
+        self.assertEqual(checked, ['API.json'])
+
+        # Paths outside the collections directory touch no collection
+        checked.clear()
+        self.manager.detect_changes(changed_paths=[str(self.config.environments_path / "Dev.json")])
+        self.assertEqual(checked, [])
+
+    def test_manifest_is_persisted(self):
+        """Test a new manager (e.g. after restart) reuses the stored manifest."""
+        manager = GitSyncManager(self.db, self.config)
+        manager._is_modified = self.manager._is_modified
+
+        self.assertEqual(manager.get_sync_status().status, SyncStatus.STATUS_SYNCED)
+        self.assertEqual(self.comparisons, [])
+
+    def test_deleted_file_is_pruned(self):
+        """Test manifest entries of removed files are dropped."""
+        os.remove(self.config.collections_path / "API.json")
+        changes = self.manager.detect_changes()
+
+        self.assertEqual([c['name'] for c in changes['new_db_items']], ['API'])
+        self.assertEqual(self.manager.manifest.entries.get('collections'), {})
+
+    def test_read_only_check_returns_manifest_update(self):
+        """Test a check on a read-only connection leaves saving its manifest to the caller."""
+        self.db.update_request(self.req_id, "List", "https://example.com/v2/items", "GET")
+        stored = self.db.get_setting(self.manager.manifest.setting_key)
+
+        reader = DatabaseManager(self.db.db_path, read_only=True)
+        try:
+            manager = GitSyncManager(reader, self.config)
+            status = manager.get_sync_status(save_manifest=False)
+            update = manager.manifest.pending_update()
+            with self.assertRaises(sqlite3.OperationalError):
+                reader.set_setting('x', 'y')
+        finally:
+            reader.close()
+
+        self.assertEqual(status.status, SyncStatus.STATUS_NEEDS_PUSH)
+        self.assertEqual(self.db.get_setting(self.manager.manifest.setting_key), stored)
+        self.assertTrue(self.manager.manifest.save_update(update))
+        self.assertNotEqual(self.db.get_setting(self.manager.manifest.setting_key), stored)
+
+        # An update based on a manifest that was replaced since is dropped
+        self.assertFalse(self.manager.manifest.save_update(update))
+
+
+def test_status_thread(qtbot):
+    """Test the status check runs on a background thread with its own connection."""
+    from src.ui.main_window import GitSyncStatusThread
+
+    test_dir = tempfile.mkdtemp()
+    db_path = os.path.join(test_dir, 'test.db')
+    db = DatabaseManager(db_path)
+    try:
+        GitSyncManager(db, GitSyncConfig(test_dir)).initialize_workspace(create_gitignore=False)
+        coll_id = db.create_collection("Unsynced")
+        db.set_collection_sync_status(coll_id, 1)
+
+        thread = GitSyncStatusThread(db_path, test_dir)
+        with qtbot.waitSignal(thread.status_ready, timeout=5000) as blocker:
+            thread.start()
+        thread.wait()
+
+        assert blocker.args[0].status == SyncStatus.STATUS_NEEDS_PUSH
+    finally:
+        db.close()
+        shutil.rmtree(test_dir, ignore_errors=True)
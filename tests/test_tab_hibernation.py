@@ -0,0 +1,117 @@
+"""
+Tests for Tab Hibernation
+
+Tests offloading of background tab response payloads to disk and their
+rehydration on activation.
+"""
+
+import os
+import time
+import pytest
+from src.features.tab_hibernation import TabHibernator
+
+
+def make_tab_state(body_size: int = 100_000, last_viewed: float = None) -> dict:
+    """Create a tab state with a captured response of the given size."""
+    state = {
+        'request_id': 1,
+        'ui_state': {
+            'url': 'https://api.example.com/items',
+            'response': {
+                'status_code': 200,
+                'headers': {'Content-Type': 'application/json'},
+                'text': 'x' * body_size,
+                'size': body_size,
+                'elapsed_time': 0.25,
+            },
+            'test_results': {'results': [], 'summary': {'total': 0}},
+        },
+    }
+    if last_viewed is not None:
+        state['last_viewed'] = last_viewed
+    return state
+
+
+class TestTabHibernator:
+    """Test hibernation and rehydration of tab payloads."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.hibernator = TabHibernator(idle_seconds=600, max_awake=2, min_payload_bytes=1024)
+
+    def teardown_method(self):
+        """Remove offloaded files."""
+        self.hibernator.cleanup()
+
+    def test_hibernate_and_rehydrate(self):
+        """Test payloads round-trip through disk."""
+        state = make_tab_state()
+        original = dict(state['ui_state']['response'])
+
+        assert self.hibernator.hibernate(state)
+        assert self.hibernator.is_hibernated(state)
+        stub = state['ui_state']['response']
+        assert 'text' not in stub
+        assert stub['status_code'] == 200
+        assert state['ui_state']['test_results'] is None
+        assert os.path.exists(state['hibernated_path'])
+
+        path = state['hibernated_path']
+        assert self.hibernator.rehydrate(state)
+        assert not self.hibernator.is_hibernated(state)
+        assert state['ui_state']['response'] == original
+        assert state['ui_state']['test_results'] == {'results': [], 'summary': {'total': 0}}
+        assert not os.path.exists(path)
+
+    def test_small_payloads_stay_in_memory(self):
+        """Test tabs with small responses are not offloaded."""
+        state = make_tab_state(body_size=10)
+        assert not self.hibernator.hibernate(state)
+        assert state['ui_state']['response']['text'] == 'x' * 10
+
+    def test_rehydrate_without_hibernation(self):
+        """Test rehydrating an awake tab is a no-op."""
+        state = make_tab_state()
+        assert not self.hibernator.rehydrate(state)
+        assert len(state['ui_state']['response']['text']) == 100_000
+
+    def test_lru_budget(self):
+        """Test least recently viewed tabs beyond the budget are selected."""
+        now = time.monotonic()
+        tab_states = {i: make_tab_state(last_viewed=now - i) for i in range(5)}
+
+        selected = self.hibernator.select_for_hibernation(tab_states, active_index=0)
+        # Tab 0 is active; tabs 1 and 2 are the two most recent background tabs
+        assert sorted(selected) == [3, 4]
+
+    def test_idle_tabs(self):
+        """Test tabs idle longer than the threshold are selected."""
+        now = time.monotonic()
+        tab_states = {
+            0: make_tab_state(last_viewed=now),
+            1: make_tab_state(last_viewed=now - 10),
+            2: make_tab_state(last_viewed=now - 3600),
+        }
+        assert self.hibernator.select_for_hibernation(tab_states, active_index=0) == [2]
+
+    def test_hibernate_idle_and_garbage_collection(self):
+        """Test policy application and cleanup of files from closed tabs."""
+        now = time.monotonic()
+        tab_states = {i: make_tab_state(last_viewed=now - i) for i in range(5)}
+
+        assert self.hibernator.hibernate_idle(tab_states, active_index=0) == 2
+        assert len(os.listdir(self.hibernator.temp_dir)) == 2
+
+        # Closing a tab without discard leaves a stray file that is collected later
+        del tab_states[4]
+        self.hibernator.hibernate_idle(tab_states, active_index=0)
+        assert len(os.listdir(self.hibernator.temp_dir)) == 1
+
+    def test_discard(self):
+        """Test discarding removes the offloaded file."""
+        state = make_tab_state()
+        self.hibernator.hibernate(state)
+        path = state['hibernated_path']
+        self.hibernator.discard(state)
+        assert not os.path.exists(path)
+        assert not self.hibernator.is_hibernated(state)
@@ -0,0 +1,187 @@
+"""
+Tests for the Variable Index
+
+Tests the sorted prefix index used by variable autocomplete and its
+synchronization with EnvironmentManager.
+"""
+
+import pytest
+from src.core.database import DatabaseManager
+from src.features.variable_index import VariableIndex, UNDEFINED_MARKER
+from src.features.variable_substitution import EnvironmentManager
+
+
+class TestVariableIndex:
+    """Test prefix lookups and incremental updates."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.index = VariableIndex()
+        self.index.set_scope('env', {'baseUrl': 'https://api.example.com', 'token': 'abc'})
+        self.index.set_scope('col', {'apiKey': 'key-123', 'user_id': '42'})
+
+    def test_prefix_search(self):
+        """Test case-insensitive prefix lookup."""
+        names = [name for name, _, _ in self.index.search('BASE')]
+        assert names == ['baseUrl']
+
+    def test_segment_search(self):
+        """Test camelCase and snake_case segments are searchable."""
+        assert [n for n, _, _ in self.index.search('key')] == ['apiKey']
+        assert [n for n, _, _ in self.index.search('id')] == ['user_id']
+        assert [n for n, _, _ in self.index.search('url')] == ['baseUrl']
+
+    def test_whole_name_matches_first(self):
+        """Test whole-name prefix matches rank before segment matches."""
+        self.index.set_variable('env', 'keyring', 'x')
+        names = [n for n, _, _ in self.index.search('key')]
+        assert names == ['keyring', 'apiKey']
+
+    def test_limit_keeps_whole_name_matches(self):
+        """Test the limit applies after ranking, so segment matches don't crowd out whole names."""
+        self.index.set_scope('ext', {f'api{i}Key': str(i) for i in range(10)})
+        self.index.set_variable('env', 'keyring', 'x')
+        names = [n for n, _, _ in self.index.search('key', limit=3)]
+        assert names[0] == 'keyring'
+        assert len(names) == 3
+
+    def test_limit_stops_scan(self):
+        """Test a limited search stops reading matches once the limit is reached."""
+        reads = []
+
+        class CountingDict(dict):
+            def __getitem__(self, key):
+                reads.append(key)
+                return super().__getitem__(key)
+
+        self.index.set_scope('ext', {f'a{i}': str(i) for i in range(1000)})
+        self.index._scopes['ext'] = CountingDict(self.index._scopes['ext'])
+        assert len(self.index.search('a', limit=5)) == 5
+        assert len(reads) == 5
+
+    def test_empty_prefix_returns_all(self):
+        """Test empty prefix lists every variable in scope order."""
+        results = self.index.search('')
+        assert len(results) == 4
+        assert results[0][2] == 'col'
+
+    def test_limit(self):
+        """Test result limit."""
+        self.index.set_scope('ext', {f'var{i}': str(i) for i in range(100)})
+        assert len(self.index.search('var', limit=10)) == 10
+
+    def test_set_scope_diffs(self):
+        """Test replacing a scope removes stale names and updates values."""
+        self.index.set_scope('env', {'baseUrl': 'https://other.example.com'})
+        assert self.index.search('token') == []
+        assert self.index.search('base') == [('baseUrl', 'https://other.example.com', 'env')]
+
+    def test_same_name_in_several_scopes(self):
+        """Test a name indexed in several scopes is returned once per scope."""
+        self.index.set_variable('ext', 'token', 'extracted')
+        scopes = [scope for _, _, scope in self.index.search('token')]
+        assert scopes == ['ext', 'env']
+
+    def test_undefined_values_skipped(self):
+        """Test empty and undefined values are not offered."""
+        self.index.set_variable('ext', 'missing', UNDEFINED_MARKER)
+        self.index.set_variable('ext', 'empty', '')
+        assert self.index.search('missing') == []
+        assert self.index.search('empty') == []
+
+    def test_remove_variable(self):
+        """Test removing a variable removes all of its keys."""
+        self.index.remove_variable('col', 'apiKey')
+        assert self.index.search('api') == []
+        assert self.index.search('key') == []
+        assert len(self.index) == 3
+
+
+class TestEnvironmentManagerIndex:
+    """Test EnvironmentManager keeps the index in sync."""
+
+    def test_environment_changes_update_index(self):
+        """Test activating, updating and clearing environments."""
+        manager = EnvironmentManager()
+        manager.set_active_environment({'id': 1, 'name': 'Test', 'variables': {'host': 'localhost'}})
+        assert manager.variable_index.search('host') == [('host', 'localhost', 'env')]
+
+        manager.set_variable('port', '8080')
+        assert manager.variable_index.search('port') == [('port', '8080', 'env')]
+
+        manager.clear_active_environment()
+        assert manager.variable_index.search('host') == []
+
+    def test_extracted_and_dynamic_variables(self):
+        """Test extracted variables and built-in dynamic variables are indexed."""
+        manager = EnvironmentManager()
+        manager.set_extracted_variables({'authToken': 'xyz'})
+        assert manager.variable_index.search('auth') == [('authToken', 'xyz', 'ext')]
+
+        # The manager keeps its own copy of the caller's variables
+        extracted = {'authToken': 'xyz'}
+        manager.set_extracted_variables(extracted)
+        extracted['other'] = '1'
+        assert manager.get_extracted_variables() == {'authToken': 'xyz'}
+        assert manager.variable_index.search('guid')[0][2] == 'dynamic'
+
+    def test_collection_scope_refresh(self):
+        """Test the collection scope follows the current collection."""
+        class FakeDb:
+            def get_collection_variables(self, collection_id):
+                return {1: {'version': 'v1'}, 2: {'region': 'eu'}}[collection_id]
+
+        manager = EnvironmentManager(db=FakeDb())
+        assert manager.get_variable_index(1).search('ver') == [('version', 'v1', 'col')]
+
+        index = manager.get_variable_index(2)
+        assert index.search('ver') == []
+        assert index.search('reg') == [('region', 'eu', 'col')]
+
+        assert manager.get_variable_index(None).search('reg') == []
+
+    def test_update_variables(self):
+        """Test several variables are set and removed with one environment write."""
+        db = FakeEnvironmentDb()
+        manager = EnvironmentManager(db=db)
+        manager.set_active_environment(db.get_environment(1))
+        manager.update_variables({'token': 'abc', 'host': 'example.com', 'old': None})
+
+        assert db.writes == 1
+        assert db.variables == manager.get_active_variables() == {'host': 'example.com', 'token': 'abc'}
+        assert manager.variable_index.search('old') == []
+        assert manager.variable_index.search('tok') == [('token', 'abc', 'env')]
+
+
+class FakeEnvironmentDb:
+    """Environment storage that counts writes."""
+
+    def __init__(self):
+        self.variables = {'host': 'localhost', 'old': '1'}
+        self.writes = 0
+
+    def get_environment(self, environment_id):
+        return {'id': environment_id, 'name': 'Test', 'variables': dict(self.variables)}
+
+    def update_environment_variables(self, environment_id, changes):
+        for key, value in changes.items():
+            if value is None:
+                self.variables.pop(key, None)
+            else:
+                self.variables[key] = value
+        self.writes += 1
+        return dict(self.variables)
+
+
+def test_update_environment_variables(tmp_path):
+    """Test the database sets and removes variables in place, keeping the other ones."""
+    db = DatabaseManager(str(tmp_path / 'test.db'))
+    try:
+        env_id = db.create_environment('Test', {'host': 'localhost', 'token': 'old', 'gone': '1'})
+        variables = db.update_environment_variables(env_id, {'token': 'new', 'port': '8080', 'gone': None})
+
+        assert variables == {'host': 'localhost', 'token': 'new', 'port': '8080'}
+        assert db.get_environment(env_id)['variables'] == variables
+        assert db.update_environment_variables(env_id + 1, {'a': '1'}) is None
+    finally:
+        db.close()
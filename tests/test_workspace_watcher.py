@@ -0,0 +1,155 @@
+"""
+Tests for the Git sync workspace watcher:
+- Bursts of file changes are reported once, with the touched files
+- In-place edits, removals and late-created directories are picked up
+- DB fingerprint used by the periodic check
+"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from src.core.database import DatabaseManager
+from src.features.workspace_watcher import WorkspaceWatcher
+
+
+@pytest.fixture
+def workspace():
+    """Create a temporary workspace with a collections directory."""
+    root = tempfile.mkdtemp()
+    collections = os.path.join(root, '.postmini', 'collections')
+    os.makedirs(collections)
+    yield root, collections
+    shutil.rmtree(root, ignore_errors=True)
+
+
+def write(path: str, content: str = '{}'):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def test_burst_is_debounced(qtbot, workspace):
+    """Test many files written at once produce a single report."""
+    _, collections = workspace
+    watcher = WorkspaceWatcher([collections], debounce_ms=100)
+    reports = []
+    watcher.files_changed.connect(reports.append)
+
+    for i in range(50):
+        write(os.path.join(collections, f'c{i}.json'))
+    write(os.path.join(collections, 'notes.txt'))
+
+    qtbot.waitUntil(lambda: len(reports) == 1, timeout=5000)
+    qtbot.wait(300)
+    assert len(reports) == 1
+    assert len(reports[0]) == 50
+    assert all(path.endswith('.json') for path in reports[0])
+    watcher.stop()
+
+
+def test_modification_and_removal(qtbot, workspace):
+    """Test in-place edits and deletions report only the touched file."""
+    _, collections = workspace
+    a = os.path.join(collections, 'a.json')
+    b = os.path.join(collections, 'b.json')
+    write(a)
+    write(b)
+
+    watcher = WorkspaceWatcher([collections], debounce_ms=50)
+    reports = []
+    watcher.files_changed.connect(reports.append)
+
+    write(a, '{"changed": true}')
+    qtbot.waitUntil(lambda: len(reports) == 1, timeout=5000)
+    assert reports[0] == [a]
+
+    os.remove(b)
+    qtbot.waitUntil(lambda: len(reports) == 2, timeout=5000)
+    assert reports[1] == [b]
+    watcher.stop()
+
+
+def test_directory_created_later(qtbot, workspace):
+    """Test a workspace directory created after start is watched."""
+    root, _ = workspace
+    environments = os.path.join(root, '.postmini', 'environments')
+    watcher = WorkspaceWatcher([environments], debounce_ms=50)
+    assert not watcher.is_watching()
+
+    os.makedirs(environments)
+    qtbot.waitUntil(watcher.is_watching, timeout=5000)
+
+    reports = []
+    watcher.files_changed.connect(reports.append)
+    write(os.path.join(environments, 'dev.json'))
+    qtbot.waitUntil(lambda: len(reports) == 1, timeout=5000)
+    watcher.stop()
+
+
+def test_idle_watcher_is_silent(qtbot, workspace):
+    """Test nothing is reported without changes."""
+    _, collections = workspace
+    write(os.path.join(collections, 'a.json'))
+    watcher = WorkspaceWatcher([collections], debounce_ms=50)
+    reports = []
+    watcher.files_changed.connect(reports.append)
+
+    qtbot.wait(200)
+    assert reports == []
+    watcher.stop()
+
+
+def test_sync_fingerprint(workspace):
+    """Test the fingerprint changes only with public items."""
+    root, _ = workspace
+    db = DatabaseManager(os.path.join(root, 'test.db'))
+    try:
+        coll_id = db.create_collection("API")
+        private_fp = db.get_sync_fingerprint()
+
+        db.set_collection_sync_status(coll_id, 1)
+        public_fp = db.get_sync_fingerprint()
+        assert public_fp != private_fp
+        assert db.get_sync_fingerprint() == public_fp
+
+        db.create_request("List", "https://example.com", "GET", coll_id)
+        assert db.get_sync_fingerprint() != public_fp
+
+        db.create_collection("Private")
+        fp = db.get_sync_fingerprint()
+        db.create_request("Other", "https://example.com", "GET", db.get_all_collections()[-1]['id'])
+        assert db.get_sync_fingerprint() == fp
+    finally:
+        db.close()
+
+
+def test_main_window_skips_idle_checks(qtbot, workspace):
+    """Test the periodic check only starts a status thread when the DB changed."""
+    from src.ui.main_window import MainWindow
+    from src.features.git_sync_manager import GitSyncManager, GitSyncConfig
+
+    root, _ = workspace
+    window = MainWindow(db_path=os.path.join(root, 'app.db'))
+    qtbot.addWidget(window)
+    try:
+        GitSyncManager(window.db, GitSyncConfig(root)).initialize_workspace(create_gitignore=False)
+        window.db.create_git_workspace(root)
+        window._setup_git_sync(root)
+        assert window.git_sync_watcher.is_watching()
+
+        window._update_git_sync_status()
+        first = window.git_sync_status_thread
+        qtbot.waitUntil(first.isFinished, timeout=5000)
+
+        window._on_git_sync_timer()
+        assert window.git_sync_status_thread is first
+
+        coll_id = window.db.create_collection("API")
+        window.db.set_collection_sync_status(coll_id, 1)
+        window._on_git_sync_timer()
+        assert window.git_sync_status_thread is not first
+        qtbot.waitUntil(window.git_sync_status_thread.isFinished, timeout=5000)
+    finally:
+        window.close()